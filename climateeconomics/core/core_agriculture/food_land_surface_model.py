@@ -0,0 +1,357 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+import numpy as np
+import pandas as pd
+
+
+class FoodLandSurfaceModel():
+    """
+    Surface needed to feed the population, general implementation to be inherited by the
+    Agriculture and Crop models
+
+    The models set years, year_start, hatom2, column_dict, diet_df, kg_to_kcal_dict,
+    kg_to_m2_dict, red_meat_percentage, white_meat_percentage, param_a, param_b and other_use,
+    the surface for other uses in ha/person
+    """
+
+    def compute_food_land_surface(self, population_df, temperature_df, detail_outputs=True):
+        '''
+        Compute the surface used by each food as matrix products:
+        surface (years, food) = diet (years, food) * population (years) * kg_to_m2 (food) * (1 - productivity reduction) (years)
+        The share of surface of each food is only computed if detail_outputs is True
+        '''
+        population = population_df['population'].values
+        # construct the diet over time
+        self.updated_diet_df = self.update_diet()
+
+        # compute the quantity of food consumed
+        food_quantity = self.compute_quantity_of_food(
+            population, self.diet_matrix)
+
+        # compute the surface needed in Gha
+        food_surface_before = self.compute_surface(
+            food_quantity, self.kg_to_m2_vector, population)
+
+        self.food_surface_without_climate_change = food_surface_before
+        # Add climate change impact to land required
+        food_surface = self.add_climate_impact(
+            food_surface_before, temperature_df)
+
+        surface_df = pd.DataFrame(food_surface, columns=self.surface_columns)
+        # add years data
+        surface_df.insert(loc=0, column='years', value=self.years)
+
+        self.food_land_surface_df = surface_df
+        self.total_food_land_surface['years'] = surface_df['years']
+        self.total_food_land_surface['total surface (Gha)'] = surface_df['total surface (Gha)']
+
+        self.food_land_surface_percentage_df = None
+        if detail_outputs:
+            self.food_land_surface_percentage_df = self.convert_surface_to_percentage(
+                food_surface)
+
+        # diagonals of the derivatives of the surface of each food wrt population
+        # / 1e7 comes from the unit : *1e6 (population in million) /1e4 (m2 to ha) /1e9 (ha to Gha)
+        self.d_food_surface_d_population = self.diet_matrix * self.kg_to_m2_vector / \
+            1e7 * (1 - self.prod_reduction)[:, np.newaxis]
+
+    def compute_quantity_of_food(self, population, diet_matrix):
+        """
+        Compute the quantity of each food of the diet eaten each year
+
+        @param population: input, give the population of each year
+        @type population: array (years)
+        @unit population: millions of people
+
+        @param diet_matrix: amount of food consumed each year, for each food of food_list
+        @type diet_matrix: array (years, food)
+        @unit diet_matrix: kg / person / year
+
+        @param result: amount of food consumed by the global population, each year, for each food of food_list
+        @type result: array (years, food)
+        @unit result: kg / year
+        """
+        # as population is in million of habitants, *1e6 is needed
+        result = population[:, np.newaxis] * diet_matrix * 1e6
+        return(result)
+
+    def compute_surface(self, quantity_of_food, kg_food_to_surface, population):
+        """
+        Compute the surface needed to produce a certain amount of food
+
+        @param quantity_of_food: amount of food consumed by the global population, each year, for each food of food_list
+        @type quantity_of_food: array (years, food)
+        @unit quantity_of_food: kg / year
+
+        @param kg_food_to_surface: the surface needed to produce 1kg of each food of food_list
+        @type kg_food_to_surface: array (food)
+        @unit kg_food_to_surface: m^2 / kg
+
+        @param population: input, give the population of each year
+        @type population: array (years)
+        @unit population: millions of people
+
+        @param result: the surface needed to produce the food quantity in input, columns are surface_columns
+        @type result: array (years, food + 2)
+        @unit result: Gha
+        """
+        food_surface = kg_food_to_surface * quantity_of_food
+        # add other contribution. 1e6 is for million of people,
+        # /hatom2 for future conversion
+        other_surface = self.other_use * \
+            population * 1e6 / self.hatom2
+        # add total data
+        total_surface = food_surface.sum(axis=1) + other_surface
+
+        result = np.column_stack((food_surface, other_surface, total_surface))
+        # put data in [Gha]
+        result = result * self.hatom2 / 1e9
+
+        return(result)
+
+    def update_diet(self):
+        '''
+            update diet data:
+                - compute new kcal/person/year from red and white meat
+                - update proportionally all vegetable kcal/person/year
+                - compute new diet_df
+            the diet is stored as a (years, food) matrix with the foods of food_list
+        '''
+        starting_diet = self.diet_df
+        meat_list = ['red meat', 'white meat']
+        vegetable_list = ['fruits and vegetables', 'potatoes', 'rice and maize']
+        self.food_list = meat_list + \
+            [key for key in starting_diet if key not in meat_list]
+        self.food_index = {food: i for i, food in enumerate(self.food_list)}
+        self.surface_columns = [f'{food} (Gha)' for food in self.food_list] + \
+            ['other (Gha)', 'total surface (Gha)']
+        self.surface_column_index = {
+            column: i for i, column in enumerate(self.surface_columns)}
+        self.kg_to_m2_vector = np.array(
+            [self.kg_to_m2_dict[food] for food in self.food_list])
+        self.kcal_diet_df = {}
+        total_kcal = 0
+        # compute total kcal
+        for key in starting_diet:
+            self.kcal_diet_df[key] = starting_diet[key].values[0] * \
+                self.kg_to_kcal_dict[key]
+            total_kcal += self.kcal_diet_df[key]
+        self.kcal_diet_df['total'] = total_kcal
+
+        # compute the kcal changed of red meat:
+        # kg_food/person/year
+        red_meat_diet = self.kcal_diet_df['total'] * \
+            self.red_meat_percentage / 100 / self.kg_to_kcal_dict['red meat']
+        white_meat_diet = self.kcal_diet_df['total'] * \
+            self.white_meat_percentage / 100 / \
+            self.kg_to_kcal_dict['white meat']
+
+        # removed kcal/person/year
+        removed_red_meat_kcal = self.kcal_diet_df['red meat'] - \
+            self.kcal_diet_df['total'] * self.red_meat_percentage / 100
+        removed_white_meat_kcal = self.kcal_diet_df['white meat'] - \
+            self.kcal_diet_df['total'] * self.white_meat_percentage / 100
+
+        # no impact on eggs and milk
+        diet_matrix = np.zeros((len(self.years), len(self.food_list)),
+                               dtype=np.result_type(red_meat_diet, white_meat_diet))
+        diet_matrix[:] = starting_diet[self.food_list].values[0]
+        diet_matrix[:, self.food_index['red meat']] = red_meat_diet
+        diet_matrix[:, self.food_index['white meat']] = white_meat_diet
+
+        # compute new vegetable diet in kg_food/person/year: add the
+        # removed_kcal proportionally to the kcal of each category of vegetable
+        vegetable_list = [
+            key for key in vegetable_list if key in self.food_index]
+        vegetable_index = [self.food_index[key] for key in vegetable_list]
+        proportion = np.array([self.kcal_diet_df[key] for key in vegetable_list]) / \
+            (self.kcal_diet_df['fruits and vegetables'] +
+             self.kcal_diet_df['potatoes'] + self.kcal_diet_df['rice and maize'])
+        diet_matrix[:, vegetable_index] += (removed_red_meat_kcal + removed_white_meat_kcal)[:, np.newaxis] * \
+            proportion / np.array([self.kg_to_kcal_dict[key]
+                                   for key in vegetable_list])
+        self.diet_matrix = diet_matrix
+
+        changed_diet_df = pd.DataFrame(diet_matrix, columns=self.food_list)
+        changed_diet_df.insert(loc=0, column='years', value=self.years)
+
+        return changed_diet_df
+
+    def convert_surface_to_percentage(self, food_surface):
+        """
+        Express the surface taken by each food type in % and not in Gha
+
+        @param food_surface: surface of each type of food expressed in Gha, and the total surface taken in Gha, columns are surface_columns
+        @type food_surface: array (years, food + 2)
+        @unit food_surface: Gha
+
+        @param land_surface_percentage_df: output of the method, with the share of surface taken by each type of food, in %
+        @type land_surface_percentage_df: dataframe
+        @unit land_surface_percentage_df: %
+        """
+        land_surface_percentage_df = pd.DataFrame(food_surface / food_surface[:, -1][:, np.newaxis] * 100,
+                                                  columns=[self.column_dict.get(column, column)
+                                                           for column in self.surface_columns])
+        land_surface_percentage_df.insert(
+            loc=0, column='years', value=self.years)
+
+        return(land_surface_percentage_df)
+
+    def add_climate_impact(self, food_surface_before, temperature_df):
+        """ Add productivity reduction due to temperature increase and compute the new required surface
+        Inputs: - food_surface_before: array (years, food + 2), Gha ,land required for food production without climate change
+                - parameters of productivity function
+                - temperature_df: dataframe, degree celsius wrt preindustrial level, dataframe of temperature increase
+        """
+        temperature = temperature_df['temp_atmo'].values
+        # Compute the difference in temperature wrt 2020 reference
+        temp = temperature - temperature_df.at[self.year_start, 'temp_atmo']
+        # Compute reduction in productivity due to increase in temperature
+        pdctivity_reduction = self.param_a * temp ** 2 + self.param_b * temp
+        self.prod_reduction = pdctivity_reduction
+        self.productivity_evolution = pd.DataFrame(
+            {"years": self.years, 'productivity_evolution': pdctivity_reduction})
+        # Apply this reduction to increase land surface needed
+        food_surface = food_surface_before * \
+            (1 - pdctivity_reduction)[:, np.newaxis]
+
+        return food_surface
+
+    ####### Gradient #########
+
+    def d_land_surface_d_population(self, column_name_Gha):
+        """
+        Compute the derivate of food_land_surface_df wrt population, for a specific column.
+        derivate_step1 = diet_expression(kg/person/year) * kg_to_m2 / 1e7
+        derivative = derivative_step1 * (1- productivity reduction due to temperature increase)
+        the diagonal of the derivative of each food is computed with the surface in compute_food_land_surface
+
+        need self.column_dict because input column get '(Gha)' at the end
+        """
+        column_name = self.column_dict[column_name_Gha]
+
+        return np.diag(self.d_food_surface_d_population[:, self.food_index[column_name]])
+
+    def d_other_surface_d_population(self):
+        """
+        Compute derivate of land_surface[other] column wrt population_df[population]
+        """
+        number_of_values = len(self.years)
+        # Add climate change impact
+        result = np.diag(np.ones(number_of_values) * self.other_use / 1e3 *
+                         (1 - self.prod_reduction))
+
+        return(result)
+
+    def d_food_land_surface_d_temperature(self, temperature_df, column_name):
+        """
+        Compute the derivative of land surface wrt temperature
+        Final land surface = food_land_surface_step_one * (1 - productivity)
+        productivity = f(temperature)
+        d_food_land_surface_d_temperature =  d_land_d_productivity * d_productivity_d_temperature
+        """
+        number_of_values = len(self.years)
+        idty = np.identity(number_of_values)
+        temp_zero = temperature_df.at[self.year_start, 'temp_atmo']
+        temp = temperature_df['temp_atmo'].values
+        a = self.param_a
+        b = self.param_b
+        land_before = self.food_surface_without_climate_change[:, self.surface_column_index[column_name]]
+        # Step 1: Productivity reduction
+        # temp = temperature - temperature_df.at[self.year_start, 'temp_atmo']
+        # pdctivity_reduction = self.param_a * temp**2 + self.param_b * temp
+        # =at**2 + at0**2 - 2att0 + bt - bt0
+        # Derivative wrt t each year:  2at-2at0 +b
+        d_productivity_d_temperature = idty * \
+            (2 * a * temp - 2 * a * temp_zero + b)
+        # Add derivative wrt t0: 2at0 -2at -b
+        d_productivity_d_temperature[:, 0] += 2 * \
+            a * temp_zero - 2 * a * temp - b
+        # Step 2:d_climate_d_productivity for each t: land = land_before * (1 -
+        # productivity)
+        d_land_d_productivity = -idty * land_before
+        d_food_land_surface_d_temperature = d_land_d_productivity.dot(
+            d_productivity_d_temperature)
+
+        return d_food_land_surface_d_temperature
+
+    def d_surface_d_red_meat_percentage(self, population_df):
+        """
+        Compute the derivative of total food land surface wrt red meat percentage design variable
+        """
+        number_of_values = len(self.years)
+        idty = np.identity(number_of_values)
+        kg_food_to_surface = self.kg_to_m2_dict
+        # red to white meat value influences red meat, white meat, and
+        # vegetable surface
+        red_meat_diet_grad = self.kcal_diet_df['total'] / 100 / \
+            self.kg_to_kcal_dict['red meat'] * kg_food_to_surface['red meat']
+        removed_red_kcal = -self.kcal_diet_df['total'] / 100
+
+        vegetables_column_names = [
+            'fruits and vegetables', 'potatoes', 'rice and maize']
+        # sub total gradient is the sum of all gradients of food category
+        sub_total_surface_grad = red_meat_diet_grad
+        for vegetable_name in vegetables_column_names:
+
+            proportion = self.kcal_diet_df[vegetable_name] / \
+                (self.kcal_diet_df['fruits and vegetables'] + 
+                 self.kcal_diet_df['potatoes'] + self.kcal_diet_df['rice and maize'])
+            sub_total_surface_grad = sub_total_surface_grad + removed_red_kcal * proportion / \
+                self.kg_to_kcal_dict[vegetable_name] * \
+                kg_food_to_surface[vegetable_name]
+
+        total_surface_grad = sub_total_surface_grad * \
+            population_df['population'].values * 1e6 * self.hatom2 / 1e9
+        total_surface_climate_grad = total_surface_grad * \
+            (1 - self.productivity_evolution['productivity_evolution'])
+
+        return total_surface_climate_grad.values * idty
+
+    def d_surface_d_white_meat_percentage(self, population_df):
+        """
+        Compute the derivative of total food land surface wrt white meat percentage design variable
+        """
+        number_of_values = len(self.years)
+        idty = np.identity(number_of_values)
+        kg_food_to_surface = self.kg_to_m2_dict
+        # red to white meat value influences red meat, white meat, and
+        # vegetable surface
+        white_meat_diet_grad = self.kcal_diet_df['total'] / 100 / \
+            self.kg_to_kcal_dict['white meat'] * \
+            kg_food_to_surface['white meat']
+        removed_white_kcal = -self.kcal_diet_df['total'] / 100
+
+        vegetables_column_names = [
+            'fruits and vegetables', 'potatoes', 'rice and maize']
+        # sub total gradient is the sum of all gradients of food category
+        sub_total_surface_grad = white_meat_diet_grad
+        for vegetable_name in vegetables_column_names:
+
+            proportion = self.kcal_diet_df[vegetable_name] / \
+                (self.kcal_diet_df['fruits and vegetables'] + 
+                 self.kcal_diet_df['potatoes'] + self.kcal_diet_df['rice and maize'])
+            sub_total_surface_grad = sub_total_surface_grad + removed_white_kcal * proportion / \
+                self.kg_to_kcal_dict[vegetable_name] * \
+                kg_food_to_surface[vegetable_name]
+
+        total_surface_grad = sub_total_surface_grad * \
+            population_df['population'].values * 1e6 * self.hatom2 / 1e9
+        total_surface_climate_grad = total_surface_grad * \
+            (1 - self.productivity_evolution['productivity_evolution'])
+
+        return total_surface_climate_grad.values * idty
@@ -147,7 +147,7 @@ class Forest():
         """
         Compute gradient of deforestation surface by deforestation_surface (design variable)
         """
-        number_of_values = (self.year_end - self.year_start + 1)
+        number_of_values = len(self.years)
         d_deforestation_surface_d_forests = np.identity(number_of_values)
         for i in range(0, number_of_values):
             if self.forest_surface_df.loc[i, 'forest_surface_evol_cumulative'] != -self.limit_deforestation_surface / 1000:
@@ -161,7 +161,7 @@ class Forest():
         """
         Compute gradient of deforestation surface by deforestation_surface (design variable)
         """
-        number_of_values = (self.year_end - self.year_start + 1)
+        number_of_values = len(self.years)
         d_forestation_surface_d_invest = np.identity(number_of_values)
         for i in range(0, number_of_values):
             if self.forest_surface_df.loc[i, 'forest_surface_evol_cumulative'] != -self.limit_deforestation_surface / 1000:
@@ -175,7 +175,7 @@ class Forest():
         """
         compute the gradient of a cumulative derivative
         """
-        number_of_values = (self.year_end - self.year_start + 1)
+        number_of_values = len(self.years)
         d_cum = np.identity(number_of_values)
         for i in range(0, number_of_values):
             d_cum[i] = derivative[i]
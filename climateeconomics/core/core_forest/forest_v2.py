@@ -20,6 +20,7 @@ from copy import deepcopy
 from energy_models.core.stream_type.energy_models.biomass_dry import BiomassDry
 from energy_models.core.stream_type.carbon_models.carbon_dioxyde import CO2
 from sos_trades_core.tools.cst_manager.constraint_manager import compute_func_with_exp_min, compute_dfunc_with_exp_min
+from climateeconomics.core.tools.parameter_jacobian import parameter_jacobian
 
 
 class Forest():
@@ -124,9 +125,11 @@ class Forest():
         self.CO2_emissions = pd.DataFrame({'years': self.years})
         self.forest_lost_capital = pd.DataFrame({'years': self.years})
 
-    def compute(self, in_dict):
+    def compute(self, in_dict, detail_outputs=True):
         """
         Computation methods
+        The columns of forest_surface_df and CO2_emitted_df only used by the charts are computed
+        if detail_outputs is True
         """
         self.biomass_dry_calorific_value = BiomassDry.data_energy_dict[
             'calorific_value']  # kwh/kg
@@ -156,10 +159,10 @@ class Forest():
         self.compute_deforestation_biomass()
         self.compute_managed_wood_production()
         # sum up global surface data
-        self.sumup_global_surface_data()
+        self.sumup_global_surface_data(detail_outputs)
         # compute capital and lost capital
         # sum up global CO2 data
-        self.compute_global_CO2_production()
+        self.compute_global_CO2_production(detail_outputs)
 
         # compute biomass dry production
         self.compute_biomass_dry_production()
@@ -386,7 +389,7 @@ class Forest():
         self.biomass_dry_df['deforestation_price_per_MWh'] = self.biomass_dry_df['deforestation_price_per_ton'] / \
             self.biomass_dry_calorific_value
 
-    def sumup_global_surface_data(self):
+    def sumup_global_surface_data(self, detail_outputs=True):
         """
         managed wood and unmanaged wood impact forest_surface_df
         """
@@ -395,20 +398,23 @@ class Forest():
         self.forest_surface_df['global_forest_surface'] = self.managed_wood_df['cumulative_surface'] + \
             self.forest_surface_df['unmanaged_forest'] + \
             self.protected_forest_surface
-        self.forest_surface_df['protected_forest_surface'] = self.protected_forest_surface
+        if detail_outputs:
+            self.forest_surface_df['protected_forest_surface'] = self.protected_forest_surface
 
-    def compute_global_CO2_production(self):
+    def compute_global_CO2_production(self, detail_outputs=True):
         """
         compute the global CO2 production in Gt
+        The yearly variations are only computed if detail_outputs is True
         """
         # in Gt of CO2
 
-        self.CO2_emitted_df['delta_CO2_emitted'] = -self.forest_surface_df['delta_global_forest_surface'] * \
-            self.CO2_per_ha / 1000
-        self.CO2_emitted_df['delta_CO2_deforestation'] = -self.forest_surface_df['delta_deforestation_surface'] * \
-            self.CO2_per_ha / 1000
-        self.CO2_emitted_df['delta_CO2_reforestation'] = -self.forest_surface_df['delta_reforestation_surface'] * \
-            self.CO2_per_ha / 1000
+        if detail_outputs:
+            self.CO2_emitted_df['delta_CO2_emitted'] = -self.forest_surface_df['delta_global_forest_surface'] * \
+                self.CO2_per_ha / 1000
+            self.CO2_emitted_df['delta_CO2_deforestation'] = -self.forest_surface_df['delta_deforestation_surface'] * \
+                self.CO2_per_ha / 1000
+            self.CO2_emitted_df['delta_CO2_reforestation'] = -self.forest_surface_df['delta_reforestation_surface'] * \
+                self.CO2_per_ha / 1000
 
         # remove CO2 managed surface from global emission because CO2_per_ha
         # from managed forest = 0
@@ -524,33 +530,36 @@ class Forest():
         return 0.0
 
     # Gradients
+    @parameter_jacobian('deforest_cost_per_ha')
     def compute_d_deforestation_surface_d_invest(self):
         """
 
         Compute gradient of deforestation surface by deforestation_invest (design variable)
         """
-        number_of_values = (self.year_end - self.year_start + 1)
+        number_of_values = len(self.years)
         d_deforestation_surface_d_forests = - \
             np.identity(number_of_values) / self.deforest_cost_per_ha
 
         return d_deforestation_surface_d_forests
 
+    @parameter_jacobian('cost_per_ha')
     def compute_d_reforestation_surface_d_invest(self):
         """
 
         Compute gradient of reforestation surface by invest (design variable)
         """
-        number_of_values = (self.year_end - self.year_start + 1)
+        number_of_values = len(self.years)
         d_forestation_surface_d_invest = np.identity(
             number_of_values) / self.cost_per_ha
 
         return d_forestation_surface_d_invest
 
+    @parameter_jacobian('techno_wood_info')
     def compute_d_mw_surface_d_invest(self):
         """
         compute gradient of managed_wood surface vs managed_wood_investment
         """
-        number_of_values = (self.year_end - self.year_start + 1)
+        number_of_values = len(self.years)
         result = np.identity(number_of_values) * 0.0
         construction_delay = self.techno_wood_info['construction_delay']
         for i in range(construction_delay, number_of_values):
@@ -563,11 +572,12 @@ class Forest():
         Compute gradient of delta managed wood surface, delta deforestation surface, unmanaged wood cumulated surface,
         mw lost capital, deforestation lost capital and reforestation lost capital vs deforestation invest
         """
-        number_of_values = (self.year_end - self.year_start + 1)
+        number_of_values = len(self.years)
 
         d_delta_mw_surface_d_invest = np.zeros(
             (number_of_values, number_of_values))
-        d_delta_deforestation_surface_d_invest = d_deforestation_surface_d_invest
+        # the gradient of the surface vs invest is a cached block
+        d_delta_deforestation_surface_d_invest = d_deforestation_surface_d_invest.copy()
         d_cum_umw_surface_d_invest = np.zeros(
             (number_of_values, number_of_values))
         d_lc_deforestation_d_invest = np.zeros(
@@ -627,7 +637,7 @@ class Forest():
         Compute gradient of delta managed wood surface, delta deforestation surface, unmanaged wood cumulated surface,
         mw lost capital, deforestation lost capital and reforestation lost capital vs reforestation invest
         """
-        number_of_values = (self.year_end - self.year_start + 1)
+        number_of_values = len(self.years)
 
         d_delta_mw_surface_d_invest = np.zeros(
             (number_of_values, number_of_values))
@@ -692,9 +702,9 @@ class Forest():
         Compute gradient of delta managed wood surface, delta deforestation surface, unmanaged wood cumulated surface,
         mw lost capital, deforestation lost capital and reforestation lost capital vs mw invest
         """
-        number_of_values = (self.year_end - self.year_start + 1)
+        number_of_values = len(self.years)
 
-        d_delta_mw_surface_d_invest = d_mw_surface_d_mw_invest
+        d_delta_mw_surface_d_invest = d_mw_surface_d_mw_invest.copy()
         d_delta_deforestation_surface_d_invest = np.zeros(
             (number_of_values, number_of_values))
         d_cum_umw_surface_d_invest = np.zeros(
@@ -822,10 +832,4 @@ class Forest():
 
         compute the gradient of a cumulative derivative
         """
-        number_of_values = (self.year_end - self.year_start + 1)
-        d_cum = np.identity(number_of_values)
-        for i in range(0, number_of_values):
-            d_cum[i] = derivative[i]
-            if i > 0:
-                d_cum[i] += d_cum[i - 1]
-        return d_cum
+        return np.cumsum(derivative, axis=0)
@@ -16,7 +16,6 @@ limitations under the License.
 
 import numpy as np
 import pandas as pd
-from copy import deepcopy
 
 from climateeconomics.core.core_resources.models.uranium_resource.uranium_resource_disc import UraniumResourceDiscipline
 from climateeconomics.core.core_resources.models.coal_resource.coal_resource_disc import CoalResourceDiscipline
@@ -142,67 +141,78 @@ class ResourceMixModel():
         self.resource_list = inputs_dict['resource_list']
         self.init_dataframes()
 
+    def get_values_at_years(self, data_frame, column):
+        '''
+        Get the values of a column for the years of the model, without copy if the
+        dataframe has exactly these years
+        '''
+        if 'years' in data_frame.columns:
+            df_years = data_frame['years'].values
+        else:
+            df_years = data_frame.index.values
+        values = data_frame[column].values
+        if not np.array_equal(df_years, self.years):
+            values = pd.Series(values, index=df_years).reindex(
+                self.years).values
+        return values
+
+    def get_resource_dataframe(self, resource_array):
+        '''
+        Dataframe indexed by years with one column per resource, built on the (years, resource) array
+        '''
+        return pd.DataFrame(resource_array, index=pd.Index(self.years, name='years'),
+                            columns=self.resource_list, copy=False)
+
     def prepare_dataframes(self, inputs_dict):
         '''
-        Set dataframes 'years' column to idx and concatenate inputs df
+        Assemble one (years, resource) array per quantity from the outputs of the resource
+        disciplines, converted in Mt, and the dataframes indexed by years built on them
         '''
-        # initialisation of dataframe:
-        self.all_resource_stock.set_index('years', inplace=True)
-        self.all_resource_price.set_index('years', inplace=True)
-        self.all_resource_use.set_index('years', inplace=True)
-        self.all_resource_production.set_index('years', inplace=True)
-        self.all_resource_recycled_production.set_index('years', inplace=True)
-        self.all_resource_ratio_prod_demand.set_index('years', inplace=True)
-        self.all_resource_ratio_usable_demand.set_index('years', inplace=True)
+        price, production, stock, use, recycled_production = [], [], [], [], []
         for resource in self.resource_list:
-            data_frame_price = deepcopy(
-                inputs_dict[f'{resource}.resource_price'])
-            # set index:
-            if 'years' in data_frame_price.columns:
-                data_frame_price.set_index('years', inplace=True)
-            data_frame_production = deepcopy(
-                inputs_dict[f'{resource}.predictable_production'])
-            if 'years' in data_frame_production.columns:
-                data_frame_production.set_index('years', inplace=True)
-            data_frame_stock = deepcopy(
-                inputs_dict[f'{resource}.resource_stock'])
-            if 'years' in data_frame_stock.columns:
-                data_frame_stock.set_index('years', inplace=True)
-            data_frame_use = deepcopy(inputs_dict[f'{resource}.use_stock'])
-            if 'years' in data_frame_use.columns:
-                data_frame_use.set_index('years', inplace=True)
-            data_frame_recycled_production = deepcopy(inputs_dict[f'{resource}.recycled_production'])
-            if 'years' in data_frame_recycled_production.columns:
-                data_frame_recycled_production.set_index('years', inplace=True)
-            self.resource_demand = deepcopy(inputs_dict[f'resources_demand'])
-            if 'years' in self.resource_demand.columns:
-                self.resource_demand.set_index('years', inplace=True)
-            self.all_resource_price[resource] = data_frame_price['price']
-
-            # add the different resource in one dataframe for production, stock, recycled production
+            conversion = self.conversion_dict[resource]
+            data_frame_price = inputs_dict[f'{resource}.resource_price']
+            data_frame_production = inputs_dict[f'{resource}.predictable_production']
+            data_frame_stock = inputs_dict[f'{resource}.resource_stock']
+            data_frame_use = inputs_dict[f'{resource}.use_stock']
+            data_frame_recycled_production = inputs_dict[f'{resource}.recycled_production']
+
+            # sum of the different types of the resource for production, stock, recycled production
             # and use resource per year:
-            for types in data_frame_use:
-                if types != 'years':
-                    self.all_resource_production[resource] = self.all_resource_production[resource] + \
-                        data_frame_production[types]
-                    self.all_resource_stock[resource] = self.all_resource_stock[resource] + \
-                        data_frame_stock[types]
-                    self.all_resource_use[resource] = self.all_resource_use[resource] + \
-                        data_frame_use[types]
-                    self.all_resource_recycled_production[resource] = self.all_resource_recycled_production[resource] + \
-                        data_frame_recycled_production[types]
-            # conversion in Mt of the different resource:
-            self.all_resource_production[resource] = self.all_resource_production[resource] * \
-                self.conversion_dict[resource]['production']
-            self.all_resource_stock[resource] = self.all_resource_stock[resource] * \
-                self.conversion_dict[resource]['stock']
-            self.all_resource_use[resource] = self.all_resource_use[resource] * \
-                self.conversion_dict[resource]['stock']
-            self.all_resource_recycled_production[resource] = self.all_resource_recycled_production[resource] * \
-                self.conversion_dict[resource]['stock']
-            self.all_resource_price[resource] = self.all_resource_price[resource] * \
-                self.conversion_dict[resource]['price']
-            self.resource_demand[resource] = self.resource_demand[resource] *\
+            types = [column for column in data_frame_use.columns if column != 'years']
+            production.append(sum(self.get_values_at_years(data_frame_production, column)
+                                  for column in types) * conversion['production'])
+            stock.append(sum(self.get_values_at_years(data_frame_stock, column)
+                             for column in types) * conversion['stock'])
+            use.append(sum(self.get_values_at_years(data_frame_use, column)
+                           for column in types) * conversion['stock'])
+            recycled_production.append(sum(self.get_values_at_years(data_frame_recycled_production, column)
+                                           for column in types) * conversion['stock'])
+            price.append(self.get_values_at_years(
+                data_frame_price, 'price') * conversion['price'])
+
+        self.resource_price = np.stack(price, axis=1)
+        self.resource_production = np.stack(production, axis=1)
+        self.resource_stock = np.stack(stock, axis=1)
+        self.resource_use = np.stack(use, axis=1)
+        self.resource_recycled_production = np.stack(
+            recycled_production, axis=1)
+
+        self.all_resource_price = self.get_resource_dataframe(
+            self.resource_price)
+        self.all_resource_production = self.get_resource_dataframe(
+            self.resource_production)
+        self.all_resource_stock = self.get_resource_dataframe(
+            self.resource_stock)
+        self.all_resource_use = self.get_resource_dataframe(self.resource_use)
+        self.all_resource_recycled_production = self.get_resource_dataframe(
+            self.resource_recycled_production)
+
+        # demand of each resource converted in Mt
+        self.resource_demand = inputs_dict['resources_demand'].set_index(
+            'years')
+        for resource in self.resource_list:
+            self.resource_demand[resource] = self.resource_demand[resource] * \
                 self.conversion_dict[resource]['global_demand']
 
     def compute(self, inputs_dict):
@@ -214,9 +224,8 @@ class ResourceMixModel():
         self.compute_ratio()
 
         # price assignment for non modeled resource:
-        data_frame_other_resource_price = deepcopy(
-            inputs_dict['non_modeled_resource_price'])
-        data_frame_other_resource_price.set_index('years', inplace=True)
+        data_frame_other_resource_price = inputs_dict['non_modeled_resource_price'].set_index(
+            'years')
         for resource_non_modeled in data_frame_other_resource_price:
             if resource_non_modeled not in ResourceMixModel.RESOURCE_LIST:
                 self.all_resource_price[resource_non_modeled] = data_frame_other_resource_price[resource_non_modeled]
@@ -229,21 +238,27 @@ class ResourceMixModel():
         The ratio is calculated using the resource_use and demand WITHOUT the ratio applied
         The value of the ratio is capped to 100.0
         '''
-
-        for resource in self.resource_list:
-            # Available resources
-            available_resource = deepcopy(self.all_resource_stock[resource].values) +\
-                deepcopy(self.all_resource_production[resource].values) +\
-                deepcopy(self.all_resource_recycled_production[resource].values)
-            available_resource_limited = compute_func_with_exp_min(
-                np.array(available_resource), 1.0e-10)
-            # Demand without ratio
-            demand_woratio = deepcopy(
-                self.resources_demand_woratio[resource].values * self.conversion_dict[resource]['global_demand'])
-            demand_limited = compute_func_with_exp_min(
-                np.array(demand_woratio), 1.0e-10)
-            self.all_resource_ratio_usable_demand[resource] = np.minimum(
-                np.maximum(available_resource_limited / demand_limited, 1E-15), 1.0) * 100.0
+        # Available resources
+        available_resource = self.resource_stock + \
+            self.resource_production + self.resource_recycled_production
+        self.available_resource_limited = compute_func_with_exp_min(
+            available_resource, 1.0e-10)
+        self.d_available_resource_limited = compute_dfunc_with_exp_min(
+            available_resource, 1.0e-10)
+        # Demand without ratio
+        global_demand_conversion = np.array([self.conversion_dict[resource]['global_demand']
+                                             for resource in self.resource_list])
+        demand_woratio = np.stack([self.get_values_at_years(self.resources_demand_woratio, resource)
+                                   for resource in self.resource_list], axis=1) * global_demand_conversion
+        self.demand_limited = compute_func_with_exp_min(
+            demand_woratio, 1.0e-10)
+        self.d_demand_limited = compute_dfunc_with_exp_min(
+            demand_woratio, 1.0e-10)
+
+        self.resource_ratio_usable_demand = np.minimum(
+            np.maximum(self.available_resource_limited / self.demand_limited, 1E-15), 1.0) * 100.0
+        self.all_resource_ratio_usable_demand = self.get_resource_dataframe(
+            self.resource_ratio_usable_demand)
 
     def get_derivative_all_resource(self, inputs_dict, resource_type):
         """ Compute derivative of total stock regarding year demand
@@ -270,40 +285,31 @@ class ResourceMixModel():
             len(inputs_dict['resources_demand'].index))
         return grad_price, grad_use, grad_stock, grad_recycling, grad_demand
 
-    def get_derivative_ratio(self, inputs_dict, resource_type, output_dict):
-
-        resource_stock = output_dict[ResourceMixModel.ALL_RESOURCE_STOCK][resource_type]
-        resource_production = output_dict[ResourceMixModel.ALL_RESOURCE_PRODUCTION][resource_type]
-        resource_recycled_production = output_dict[ResourceMixModel.ALL_RESOURCE_RECYCLED_PRODUCTION][resource_type]
-        # Use with ratio
-        available_resource = resource_stock + resource_production + resource_recycled_production
-        available_resource_limited = compute_func_with_exp_min(
-            np.array(available_resource), 1.0e-10)
-        d_available_resource_limited = compute_dfunc_with_exp_min(
-            np.array(available_resource), 1.0e-10)
-        demand = inputs_dict['resources_demand_woratio'][resource_type] * self.conversion_dict[resource_type]['global_demand']
-        demand_limited = compute_func_with_exp_min(
-            demand.values, 1.0e-10)
-        d_demand_limited = compute_dfunc_with_exp_min(
-            demand.values, 1.0e-10) 
+    def get_derivative_ratio(self, resource_type):
+        '''
+        Compute the diagonal gradients of the usable demand ratio of a resource wrt stock,
+        demand and recycled production, from the arrays of the last compute_ratio
+        '''
+        i_resource = self.resource_list.index(resource_type)
+        available_resource_limited = self.available_resource_limited[:, i_resource]
+        d_available_resource_limited = self.d_available_resource_limited[:, i_resource]
+        demand_limited = self.demand_limited[:, i_resource]
+        d_demand_limited = self.d_demand_limited[:, i_resource]
 
         # If prod < cons, set the identity element for the given year to
         # the corresponding value
-        d_ratio_d_stock = np.identity(len(inputs_dict['resources_demand_woratio'].index)) * 100.0 * \
-            np.where((available_resource_limited <= demand_limited) * (available_resource_limited / demand_limited > 1E-15),
-                     d_available_resource_limited / demand_limited,
-                     0.0)
-        
-        d_ratio_d_recycling = np.identity(len(inputs_dict['resources_demand_woratio'].index)) * 100.0 * \
-            np.where((available_resource_limited <= demand_limited) * (available_resource_limited / demand_limited > 1E-15),
-                     d_available_resource_limited / demand_limited,
-                     0.0)
-
-        d_ratio_d_demand = np.identity(len(inputs_dict['resources_demand_woratio'].index)) * 100.0 * \
-            np.where((available_resource_limited <= demand_limited) * (available_resource_limited / demand_limited > 1E-15),
-                     -available_resource_limited * d_demand_limited * self.conversion_dict[resource_type]['global_demand'] / 
-                     demand_limited ** 2 ,
-                     0.0)
+        ratio_not_capped = (available_resource_limited <= demand_limited) * \
+            (available_resource_limited / demand_limited > 1E-15)
+        d_ratio_d_stock = np.diag(100.0 * np.where(ratio_not_capped,
+                                                   d_available_resource_limited / demand_limited,
+                                                   0.0))
+
+        d_ratio_d_recycling = d_ratio_d_stock.copy()
+
+        d_ratio_d_demand = np.diag(100.0 * np.where(ratio_not_capped,
+                                                    -available_resource_limited * d_demand_limited * self.conversion_dict[resource_type]['global_demand'] /
+                                                    demand_limited ** 2,
+                                                    0.0))
 
         return d_ratio_d_stock, d_ratio_d_demand, d_ratio_d_recycling
 
@@ -190,12 +190,11 @@ class ResourceMixDiscipline(SoSDiscipline):
         """
         inputs_dict = self.get_sosdisc_inputs()
         resource_list = self.get_sosdisc_inputs('resource_list')
-        output_dict = self.get_sosdisc_outputs()
         for resource_type in resource_list:
             grad_price, grad_use, grad_stock, grad_recycling,  grad_demand = self.all_resource_model.get_derivative_all_resource(
                 inputs_dict, resource_type)
             grad_ratio_on_stock, grad_ratio_on_demand, grad_ratio_on_recycling = self.all_resource_model.get_derivative_ratio(
-                inputs_dict, resource_type, output_dict)
+                resource_type)
 
             for types in inputs_dict[f'{resource_type}.use_stock']:
                 if types != 'years':
@@ -0,0 +1,210 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.optimize import least_squares
+
+from climateeconomics.core.core_sectorization.sector_model import SectorModel
+
+
+class SectorCalibration():
+    '''
+    Least squares fitting of the parameters of a sector model on historical gdp and energy efficiency
+
+    Lightweight alternative to the sectorization_optim_process: SectorModel.compute and its
+    gradients wrt the parameters are called directly, without execution engine, design variables
+    or function manager. The residuals are normalised so that their sum of squares is the
+    gdp_error + energy_eff_error of ObjectivesModel for the sector.
+    '''
+    # bounds of the design space of the sectorization_optim_process usecase
+    DEFAULT_BOUNDS = {'output_alpha': (0.5, 0.99),
+                      'productivity_gr_start': (0.001, 0.1),
+                      'decline_rate_tfp': (0.00001, 0.1),
+                      'productivity_start': (0.01, 2.0),
+                      'energy_eff_k': (0.0, 1.0),
+                      'energy_eff_cst': (1e-5, 2.0),
+                      'energy_eff_xzero': (1900.0, 2050.0),
+                      'energy_eff_max': (1.0, 15.0)}
+    # names of the design variables of the sectorization_optim_process usecase
+    DESIGN_VAR_NAMES = {'output_alpha': 'output_alpha',
+                        'productivity_gr_start': 'prod_gr_start',
+                        'decline_rate_tfp': 'decl_rate_tfp',
+                        'productivity_start': 'prod_start',
+                        'energy_eff_k': 'energy_eff_k',
+                        'energy_eff_cst': 'energy_eff_cst',
+                        'energy_eff_xzero': 'energy_eff_xzero',
+                        'energy_eff_max': 'energy_eff_max'}
+    DESIGN_VAR_SECTOR_SUFFIX = {'Services': 'services',
+                                'Agriculture': 'agri',
+                                'Industry': 'indus'}
+
+    def __init__(self, sector_name, inputs_dict, coupling_inputs, historical_gdp, historical_capital,
+                 historical_energy, parameters=None, bounds=None):
+        '''
+        inputs_dict: parameters of the sector model as given by the sector discipline
+        coupling_inputs: sector_investment, energy_production, workforce_df and damage_df of the sector
+        historical_gdp, historical_capital, historical_energy: dataframes with a column per sector
+        '''
+        self.sector_name = sector_name
+        self.inputs_dict = dict(inputs_dict)
+        self.inputs_dict['prod_function_fitting'] = False
+        self.coupling_inputs = coupling_inputs
+        self.parameters = list(
+            SectorModel.CALIBRATION_PARAMETERS if parameters is None else parameters)
+        self.bounds = dict(self.DEFAULT_BOUNDS)
+        if bounds is not None:
+            self.bounds.update(bounds)
+
+        self.model = SectorModel()
+        self.model.configure_parameters(self.inputs_dict)
+        self.years = self.model.years_range
+        years_mask = historical_gdp['years'].isin(self.years).values
+        self.hist_gdp = historical_gdp.loc[years_mask, sector_name].values
+        self.hist_energy_eff = historical_capital.loc[years_mask, sector_name].values / \
+            historical_energy.loc[years_mask, sector_name].values
+        # normalisation of the residuals as in ObjectivesModel.compute_quadratic_error
+        self.gdp_norm = np.amax(self.hist_gdp) * np.sqrt(len(self.years))
+        self.energy_eff_norm = np.amax(
+            self.hist_energy_eff) * np.sqrt(len(self.years))
+        self.result = None
+
+    def get_initial_values(self):
+        '''
+        Initial parameters from the inputs_dict, moved inside the bounds
+        '''
+        lower_bnd, upper_bnd = self.get_bounds()
+        x0 = np.array([self.inputs_dict[parameter]
+                       for parameter in self.parameters], dtype=float)
+        return np.clip(x0, lower_bnd, upper_bnd)
+
+    def get_bounds(self):
+        lower_bnd = np.array([self.bounds[parameter][0]
+                              for parameter in self.parameters])
+        upper_bnd = np.array([self.bounds[parameter][1]
+                              for parameter in self.parameters])
+        return lower_bnd, upper_bnd
+
+    def compute_model(self, x):
+        '''
+        Configure the sector model with parameters x and compute it
+        '''
+        self.inputs_dict.update(dict(zip(self.parameters, x)))
+        self.model.configure_parameters(self.inputs_dict)
+        # the model sets the index of the coupling dataframes, copies are given
+        self.model.compute({name: df.copy()
+                            for name, df in self.coupling_inputs.items()})
+
+    def compute_residuals(self, x):
+        self.compute_model(x)
+        gdp = self.model.production_df.loc[self.years,
+                                           'output_net_of_damage'].values.astype(float)
+        energy_eff = self.model.capital_df.loc[self.years,
+                                               'energy_efficiency'].values.astype(float)
+        return np.concatenate(((gdp - self.hist_gdp) / self.gdp_norm,
+                               (energy_eff - self.hist_energy_eff) / self.energy_eff_norm))
+
+    def compute_jacobian(self, x):
+        '''
+        Analytic jacobian of the residuals (2 * nb_years, nb_parameters)
+        '''
+        self.compute_model(x)
+        dnetoutput = self.model.dnetoutput_dparameters()
+        denergy_eff = self.model.denergy_efficiency_dparameters()
+        jacobian = np.zeros((2 * len(self.years), len(self.parameters)))
+        for i_param, parameter in enumerate(self.parameters):
+            jacobian[:len(self.years), i_param] = dnetoutput[parameter] / self.gdp_norm
+            if parameter in denergy_eff:
+                jacobian[len(self.years):, i_param] = denergy_eff[parameter] / \
+                    self.energy_eff_norm
+
+        return jacobian
+
+    def run(self, **least_squares_options):
+        '''
+        Fit the parameters, returns the dict of fitted parameters
+        '''
+        options = {'x_scale': 'jac', 'xtol': 1e-10, 'ftol': 1e-12}
+        options.update(least_squares_options)
+        self.result = least_squares(self.compute_residuals, self.get_initial_values(),
+                                    jac=self.compute_jacobian, bounds=self.get_bounds(), **options)
+        # leave the model at the optimum
+        self.compute_model(self.result.x)
+
+        return self.get_fitted_parameters()
+
+    def get_fitted_parameters(self):
+        return dict(zip(self.parameters, self.result.x.tolist()))
+
+    def get_error(self):
+        '''
+        Sum of the gdp and energy efficiency errors at the optimum, the sector objective of the MDO
+        '''
+        return 2 * self.result.cost
+
+    def get_usecase_values(self, ns_macro):
+        '''
+        Fitted parameters as input values of the sector discipline in namespace ns_macro
+        '''
+        return {f'{ns_macro}.{self.sector_name}.{parameter}': value
+                for parameter, value in self.get_fitted_parameters().items()}
+
+    def get_design_var_values(self, ns_optim):
+        '''
+        Fitted parameters as design variable values of the sectorization_optim_process usecase
+        '''
+        suffix = self.DESIGN_VAR_SECTOR_SUFFIX[self.sector_name]
+        return {f'{ns_optim}.{self.DESIGN_VAR_NAMES[parameter]}_{suffix}_in': [value]
+                for parameter, value in self.get_fitted_parameters().items()}
+
+    def update_design_space(self, dspace):
+        '''
+        Get a copy of the design space of the sectorization_optim_process usecase with the fitted values
+        '''
+        dspace = dspace.copy()
+        suffix = self.DESIGN_VAR_SECTOR_SUFFIX[self.sector_name]
+        for parameter, value in self.get_fitted_parameters().items():
+            variable_mask = dspace['variable'] == f'{self.DESIGN_VAR_NAMES[parameter]}_{suffix}_in'
+            dspace.loc[variable_mask, 'value'] = [
+                [value] for _ in range(variable_mask.sum())]
+
+        return dspace
+
+
+def run_sector_calibration(calibration, least_squares_options=None):
+    '''
+    Run a calibration, returns it with its result to be usable from a process pool
+    '''
+    if least_squares_options is None:
+        least_squares_options = {}
+    calibration.run(**least_squares_options)
+    return calibration
+
+
+def calibrate_sectors(calibrations, n_processes=1, least_squares_options=None):
+    '''
+    Run the calibrations of several sectors, in parallel processes if n_processes > 1
+    Returns a dict {sector name: calibration with its result}
+    '''
+    if n_processes > 1 and len(calibrations) > 1:
+        with ProcessPoolExecutor(max_workers=min(n_processes, len(calibrations))) as executor:
+            calibrations = list(executor.map(
+                run_sector_calibration, calibrations, [least_squares_options] * len(calibrations)))
+    else:
+        calibrations = [run_sector_calibration(calibration, least_squares_options)
+                        for calibration in calibrations]
+
+    return {calibration.sector_name: calibration for calibration in calibrations}
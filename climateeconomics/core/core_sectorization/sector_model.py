@@ -27,6 +27,9 @@ class SectorModel():
 
     #Units conversion
     conversion_factor=1.0
+    #Parameters fitted on historical data
+    CALIBRATION_PARAMETERS = ['output_alpha', 'productivity_gr_start', 'decline_rate_tfp', 'productivity_start',
+                              'energy_eff_k', 'energy_eff_cst', 'energy_eff_xzero', 'energy_eff_max']
 
     def __init__(self):
         '''
@@ -509,3 +512,72 @@ class SectorModel():
     
     
     
+
+    ### GRADIENTS WRT PARAMETERS, for production function fitting ###
+
+    def denergy_efficiency_dparameters(self):
+        """ Gradient of energy efficiency wrt the parameters of the logistic function
+        energy_efficiency = cst + max/(1+exp(-k(year-x0)))
+        Returns a dict {parameter: array (nb_years)}
+        """
+        k = self.energy_eff_k
+        xo = self.energy_eff_xzero
+        max_e = self.energy_eff_max
+        years = self.years_range
+        logistic = 1 / (1 + np.exp(-k * (years - xo)))
+        dlogistic = logistic * (1 - logistic)
+        denergy_eff = {'energy_eff_k': max_e * dlogistic * (years - xo),
+                       'energy_eff_cst': np.ones(self.nb_years),
+                       'energy_eff_xzero': - max_e * dlogistic * k,
+                       'energy_eff_max': logistic}
+        return denergy_eff
+
+    def dproductivity_dparameters(self):
+        """ Gradient of productivity wrt productivity parameters
+        productivity(t) = productivity_start * prod((1 - frac*damefrac)/(1-productivity_gr(t'))) for t' < t
+        productivity_gr(t) = productivity_gr_start * exp(-decline_rate_tfp * t)/5
+        Returns a dict {parameter: array (nb_years)}
+        """
+        years = self.years_range
+        t = years - self.year_start
+        productivity = self.productivity_df.loc[years, 'productivity'].values
+        productivity_gr = self.productivity_df.loc[years, 'productivity_growth_rate'].values
+        # d(log(productivity(t))) = sum of dproductivity_gr(t')/(1-productivity_gr(t')) for t' < t
+        dgr_dgr_start = np.exp(-self.decline_rate_tfp * t) / 5
+        dgr_ddecline = - t * productivity_gr
+
+        def cumulate_previous_years(dlog):
+            return np.concatenate(([0.], np.cumsum(dlog[:-1])))
+
+        dproductivity = {'productivity_start': productivity / self.productivity_start,
+                         'productivity_gr_start': productivity * cumulate_previous_years(
+                             dgr_dgr_start / (1 - productivity_gr)),
+                         'decline_rate_tfp': productivity * cumulate_previous_years(
+                             dgr_ddecline / (1 - productivity_gr))}
+        return dproductivity
+
+    def dnetoutput_dparameters(self):
+        """ Gradient of net output wrt CALIBRATION_PARAMETERS
+        output = productivity * (alpha * capital_u**gamma + (1-alpha)* (working_pop)**gamma)**(1/gamma)
+        with capital_u = capital*energy/e_max = energy * capital_utilisation_ratio * energy_efficiency /1e3
+        Returns a dict {parameter: array (nb_years)}
+        """
+        years = self.years_range
+        alpha = self.output_alpha
+        gamma = self.output_gamma
+        working_pop = self.workforce_df.loc[years, 'workforce'].values
+        capital_u = self.capital_df.loc[years, 'usable_capital'].values
+        energy_efficiency = self.capital_df.loc[years, 'energy_efficiency'].values
+        productivity = self.productivity_df.loc[years, 'productivity'].values
+        g = alpha * capital_u**gamma + (1 - alpha) * (working_pop)**gamma
+        doutput_dproductivity = g**(1 / gamma)
+        doutput_dcapitalu = productivity * g**(1 / gamma - 1) * alpha * capital_u**(gamma - 1)
+
+        doutput = {'output_alpha': productivity * (1 / gamma) * g**(1 / gamma - 1) *
+                   (capital_u**gamma - working_pop**gamma)}
+        for parameter, dproductivity in self.dproductivity_dparameters().items():
+            doutput[parameter] = doutput_dproductivity * dproductivity
+        for parameter, denergy_eff in self.denergy_efficiency_dparameters().items():
+            doutput[parameter] = doutput_dcapitalu * capital_u / energy_efficiency * denergy_eff
+
+        return {parameter: self.dnetoutput(doutput[parameter]) for parameter in self.CALIBRATION_PARAMETERS}
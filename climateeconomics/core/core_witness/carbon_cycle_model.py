@@ -16,6 +16,7 @@ limitations under the License.
 import numpy as np
 import pandas as pd
 from copy import deepcopy
+from climateeconomics.core.tools.recurrence_operator import RecurrenceJacobianOperator
 
 
 class CarbonCycle():
@@ -79,7 +80,7 @@ class CarbonCycle():
                                                                   'atmo_conc', 'lower_ocean_conc', 'shallow_ocean_conc', 'ppm', 'atmo_share_since1850', 'atmo_share_sinceystart'])
 
         for key in carboncycle_df.keys():
-            carboncycle_df[key] = 0
+            carboncycle_df[key] = 0.
         carboncycle_df['years'] = self.years_range
         carboncycle_df.loc[self.year_start, 'atmo_conc'] = self.init_conc_atmo
         carboncycle_df.loc[self.year_start,
@@ -90,85 +91,66 @@ class CarbonCycle():
 
         return carboncycle_df
 
-    def compute_atmo_conc(self, year):
+    def compute_concentrations(self):
         """
-        compute atmo conc for t using value at t-1 (MAT in DICE)
+        Compute atmo conc (MAT in DICE), lower ocean conc and upper ocean conc for t using values at t-1
         """
-        p_atmo_conc = self.carboncycle_df.at[year - 
-                                             self.time_step, 'atmo_conc']
-        p_shallow_ocean_conc = self.carboncycle_df.at[year - 
-                                                      self.time_step, 'shallow_ocean_conc']
-        p_emissions = self.CO2_emissions_df.at[year - 
-                                               self.time_step, 'total_emissions']
-        atmo_conc = p_atmo_conc * self.b_eleven + p_shallow_ocean_conc * \
-            self.b_twentyone + p_emissions * self.time_step / self.gtco2_to_gtc
-        # Lower bound
-        self.carboncycle_df.loc[year, 'atmo_conc'] = max(
-            atmo_conc, self.lo_mat)
-        return atmo_conc
-
-    def compute_lower_ocean_conc(self, year):
+        emissions = self.CO2_emissions_df.loc[self.years_range, 'total_emissions'].values
+        nb_years = len(self.years_range)
+        dtype = np.result_type(emissions, float)
+        atmo_conc = np.zeros(nb_years, dtype=dtype)
+        lower_ocean_conc = np.zeros(nb_years, dtype=dtype)
+        shallow_ocean_conc = np.zeros(nb_years, dtype=dtype)
+        atmo_conc[0] = self.init_conc_atmo
+        lower_ocean_conc[0] = self.init_lower_strata
+        shallow_ocean_conc[0] = self.init_upper_strata
+
+        # bounds are compared on real parts to allow complex step derivatives
+        for i in range(1, nb_years):
+            p_atmo_conc = atmo_conc[i - 1]
+            p_lower_ocean_conc = lower_ocean_conc[i - 1]
+            p_shallow_ocean_conc = shallow_ocean_conc[i - 1]
+            atmo_conc[i] = max(p_atmo_conc * self.b_eleven + p_shallow_ocean_conc *
+                               self.b_twentyone + emissions[i - 1] * self.time_step / self.gtco2_to_gtc,
+                               self.lo_mat, key=np.real)
+            lower_ocean_conc[i] = max(p_lower_ocean_conc * self.b_thirtythree +
+                                      p_shallow_ocean_conc * self.b_twentythree,
+                                      self.lo_ml, key=np.real)
+            shallow_ocean_conc[i] = max(p_atmo_conc * self.b_twelve + p_shallow_ocean_conc *
+                                        self.b_twentytwo + p_lower_ocean_conc * self.b_thirtytwo,
+                                        self.lo_mu, key=np.real)
+
+        self.carboncycle_df['atmo_conc'] = atmo_conc
+        self.carboncycle_df['lower_ocean_conc'] = lower_ocean_conc
+        self.carboncycle_df['shallow_ocean_conc'] = shallow_ocean_conc
+
+    def compute_ppm(self):
         """
-        Compute lower ocean conc at t using values at t-1
+         Compute Atmospheric concentrations parts per million
         """
-        p_lower_ocean_conc = self.carboncycle_df.at[year - 
-                                                    self.time_step, 'lower_ocean_conc']
-        p_shallow_ocean_conc = self.carboncycle_df.at[year - 
-                                                      self.time_step, 'shallow_ocean_conc']
-        lower_ocean_conc = p_lower_ocean_conc * self.b_thirtythree + \
-            p_shallow_ocean_conc * self.b_twentythree
-        # Lower bound
-        self.carboncycle_df.loc[year, 'lower_ocean_conc'] = max(
-            lower_ocean_conc, self.lo_ml)
-        return lower_ocean_conc
-
-    def compute_upper_ocean_conc(self, year):
-        """
-        Compute upper ocean conc at t using values at t-1
-        """
-        p_lower_ocean_conc = self.carboncycle_df.at[year - 
-                                                    self.time_step, 'lower_ocean_conc']
-        p_shallow_ocean_conc = self.carboncycle_df.at[year - 
-                                                      self.time_step, 'shallow_ocean_conc']
-        p_atmo_conc = self.carboncycle_df.at[year - 
-                                             self.time_step, 'atmo_conc']
-        shallow_ocean_conc = p_atmo_conc * self.b_twelve + p_shallow_ocean_conc * \
-            self.b_twentytwo + p_lower_ocean_conc * self.b_thirtytwo
-        # Lower Bound
-        self.carboncycle_df.loc[year, 'shallow_ocean_conc'] = max(
-            shallow_ocean_conc, self.lo_mu)
-
-    def compute_ppm(self, year):
-        """
-         Compute Atmospheric concentrations parts per million at t
-        """
-        atmo_conc = self.carboncycle_df.at[year, 'atmo_conc']
-        ppm = atmo_conc / self.gtc_to_ppm
-        self.carboncycle_df.loc[year, 'ppm'] = ppm
+        ppm = self.carboncycle_df['atmo_conc'].values / self.gtc_to_ppm
+        self.carboncycle_df['ppm'] = ppm
         return ppm
 
-    def compute_atmo_share(self, year):
+    def compute_atmo_share(self):
         """
-        Compute atmo share since 1850 and since 2010
+        Compute atmo share since 1850 and since year start, the share is not computed at year start
         """
-        atmo_conc = self.carboncycle_df.at[year, 'atmo_conc']
-        init_atmo_conc = self.carboncycle_df.at[self.year_start, 'atmo_conc']
-
+        atmo_conc = self.carboncycle_df['atmo_conc'].values
         self.CO2_emissions_df['cum_total_emissions'] = self.CO2_emissions_df['total_emissions'].cumsum()
-        init_cum_total_emissions = self.CO2_emissions_df.at[self.year_start,
-                                                            'cum_total_emissions']
-        cum_total_emissions = self.CO2_emissions_df.at[year,
-                                                       'cum_total_emissions']
-
-        atmo_share1850 = ((atmo_conc - 588.0) / 
-                          (cum_total_emissions + .000001))
-        atmo_shareystart = ((atmo_conc - init_atmo_conc) / 
-                            (cum_total_emissions - init_cum_total_emissions))
-
-        self.carboncycle_df.loc[year,
-                                'atmo_share_since1850'] = atmo_share1850
-        self.carboncycle_df.loc[year,
-                                'atmo_share_sinceystart'] = atmo_shareystart
+        cum_total_emissions = self.CO2_emissions_df.loc[self.years_range,
+                                                  'cum_total_emissions'].values
+
+        atmo_share1850 = np.zeros_like(atmo_conc)
+        atmo_shareystart = np.zeros_like(atmo_conc)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            atmo_share1850[1:] = ((atmo_conc[1:] - 588.0) /
+                                  (cum_total_emissions[1:] + .000001))
+            atmo_shareystart[1:] = ((atmo_conc[1:] - atmo_conc[0]) /
+                                    (cum_total_emissions[1:] - cum_total_emissions[0]))
+
+        self.carboncycle_df['atmo_share_since1850'] = atmo_share1850
+        self.carboncycle_df['atmo_share_sinceystart'] = atmo_shareystart
         return atmo_share1850
 
     def compute_d_total_emissions(self):
@@ -263,6 +245,42 @@ class CarbonCycle():
 
         return d_atmoconc_d_totalemissions * self.scale_factor_carbon_cycle, d_lower_d_totalemissions, d_swallow_d_totalemissions, d_atmo1850_dtotalemission, d_atmotoday_dtotalemission
 
+    def compute_d_total_emissions_operator(self, output='atmo_conc'):
+        """
+        Get d_y / d_total_emissions as an operator for long horizons, y is atmo_conc or ppm
+        Same derivative as the atmo_conc block of compute_d_total_emissions without building
+        the (nb_years, nb_years) matrix
+        """
+        time_step = self.time_step
+        gtco2_to_gtc = self.gtco2_to_gtc
+        # states are ordered as atmo conc, shallow ocean conc, lower ocean conc
+        transition = np.array([[self.b_eleven, self.b_twentyone, 0.],
+                               [self.b_twelve, self.b_twentytwo, self.b_thirtytwo],
+                               [0., self.b_twentythree, self.b_thirtythree]])
+        nb_years = len(self.years_range)
+        input_coeffs = np.zeros((nb_years, 3))
+        input_coeffs[:, 0] = time_step / gtco2_to_gtc
+        # the concentrations at their lower bound do not depend on emissions
+        masks = np.array([np.real(self.carboncycle_df['atmo_conc'].values / self.scale_factor_carbon_cycle) > self.lo_mat,
+                          np.real(self.carboncycle_df['shallow_ocean_conc'].values) > self.lo_mu,
+                          np.real(self.carboncycle_df['lower_ocean_conc'].values) > self.lo_ml]).T
+        # the first two years are initialised as in compute_d_total_emissions, the emissions
+        # of year_start reach the atmosphere and the shallow ocean of year 2 whenever the
+        # shallow ocean is above its bound
+        initial_jacobian = np.zeros((3, 3, 3))
+        initial_jacobian[1, 0, 0] = masks[1, 0] * time_step / gtco2_to_gtc
+        initial_jacobian[2, 0, 1] = masks[2, 0] * time_step / gtco2_to_gtc
+        initial_jacobian[2, 0, 0] = masks[2, 1] * time_step / gtco2_to_gtc * self.b_eleven
+        initial_jacobian[2, 1, 0] = masks[2, 1] * time_step / gtco2_to_gtc * self.b_twelve
+        if output == 'ppm':
+            output_scale = 1.0 / self.gtc_to_ppm
+        else:
+            output_scale = self.scale_factor_carbon_cycle
+
+        return RecurrenceJacobianOperator(transition, input_coeffs, masks=masks, output_index=0,
+                                          input_lag=1, output_scale=output_scale,
+                                          initial_jacobian=initial_jacobian)
+
     def compute_d_cum_total_emissions(self):
 
         years = np.arange(self.year_start,
@@ -339,14 +357,9 @@ class CarbonCycle():
         self.inputs_models = inputs_models
         self.CO2_emissions_df = deepcopy(self.inputs_models['CO2_emissions_df'])
         self.CO2_emissions_df.index = self.CO2_emissions_df['years'].values
-        self.compute_ppm(self.year_start)
-
-        for year in self.years_range[1:]:
-            self.compute_atmo_conc(year)
-            self.compute_lower_ocean_conc(year)
-            self.compute_upper_ocean_conc(year)
-            self.compute_ppm(year)
-            self.compute_atmo_share(year)
+        self.compute_concentrations()
+        self.compute_ppm()
+        self.compute_atmo_share()
         self.carboncycle_df = self.carboncycle_df.replace(
             [np.inf, -np.inf], np.nan)
         self.compute_objective()
@@ -16,6 +16,7 @@ limitations under the License.
 import numpy as np
 import pandas as pd
 from energy_models.core.stream_type.carbon_models.nitrous_oxide import N2O
+from climateeconomics.core.tools.parameter_jacobian import parameter_jacobian
 
 
 class CarbonEmissions():
@@ -277,16 +278,13 @@ class CarbonEmissions():
         # derivative matrix initialization
         d_indus_emissions_d_gross_output = np.identity(nb_years) * 0
         d_cum_indus_emissions_d_gross_output = np.identity(nb_years) * 0
-        d_cum_indus_emissions_d_total_CO2_emitted = np.identity(nb_years) * 0
+        d_cum_indus_emissions_d_total_CO2_emitted = self.compute_d_cum_indus_emissions_d_total_CO2_emitted()
 
         i = 0
         line = 0
         for i in range(nb_years):
             for line in range(nb_years):
                 if i > 0 and i <= line:  # fill triangular descendant
-                    d_cum_indus_emissions_d_total_CO2_emitted[line, i] = float(
-                        self.time_step) / self.gtco2_to_gtc
-
                     d_cum_indus_emissions_d_gross_output[line, i] = float(self.time_step) / self.gtco2_to_gtc *\
                         self.CO2_emissions_df.at[years[i], 'sigma'] *\
                         (1.0 - self.energy_emis_share - self.land_emis_share)
@@ -296,22 +294,29 @@ class CarbonEmissions():
 
         return d_indus_emissions_d_gross_output, d_cum_indus_emissions_d_gross_output, d_cum_indus_emissions_d_total_CO2_emitted
 
-    def compute_d_land_emissions(self):
+    @parameter_jacobian('gtco2_to_gtc')
+    def compute_d_cum_indus_emissions_d_total_CO2_emitted(self):
+        """
+        Compute gradient d_cum_indus_emissions/d_total_CO2_emitted, lower triangular without the
+        first year which is fixed
+        """
+        nb_years = len(np.arange(self.year_start,
+                                 self.year_end + 1, self.time_step))
+        d_cum_indus_emissions_d_total_CO2_emitted = np.tril(
+            np.ones((nb_years, nb_years))) * float(self.time_step) / self.gtco2_to_gtc
+        d_cum_indus_emissions_d_total_CO2_emitted[:, 0] = 0.0
 
-        years = np.arange(self.year_start,
-                          self.year_end + 1, self.time_step)
-        nb_years = len(years)
+        return d_cum_indus_emissions_d_total_CO2_emitted
 
-        # derivative matrix initialization
-        d_cum_land_emissions_d_total_CO2_emitted = np.identity(nb_years) * 0
+    @parameter_jacobian('gtco2_to_gtc')
+    def compute_d_land_emissions(self):
 
-        i = 0
-        line = 0
-        for i in range(nb_years):
-            for line in range(nb_years):
-                if i >= 0 and i <= line:  # fill triangular descendant
-                    d_cum_land_emissions_d_total_CO2_emitted[line,
-                                                             i] = 1 / self.gtco2_to_gtc
+        nb_years = len(np.arange(self.year_start,
+                                 self.year_end + 1, self.time_step))
+
+        # lower triangular matrix
+        d_cum_land_emissions_d_total_CO2_emitted = np.tril(
+            np.ones((nb_years, nb_years))) / self.gtco2_to_gtc
 
         return d_cum_land_emissions_d_total_CO2_emitted
 
@@ -319,7 +324,7 @@ class CarbonEmissions():
         """
         compute the gradient of a cumulative derivative
         """
-        number_of_values = (self.year_end - self.year_start + 1)
+        number_of_values = len(self.years_range)
         d_cum = np.identity(number_of_values)
         for i in range(0, number_of_values):
             d_cum[i] = derivative[i]
@@ -14,6 +14,7 @@ See the License for the specific language governing permissions and
 limitations under the License.
 '''
 from sos_trades_core.execution_engine.sos_discipline import SoSDiscipline
+from climateeconomics.core.tools.convergence_telemetry import ConvergenceTelemetry
 
 
 class ClimateEcoDiscipline(SoSDiscipline):
@@ -42,6 +43,113 @@ class ClimateEcoDiscipline(SoSDiscipline):
         'icon': '',
         'version': '',
     }
+    # incremented each time the discipline stores new outputs
+    output_version = 0
+    # outputs only read by the post-processing, not stored in lean mode
+    DETAIL_OUTPUTS = []
+    # global flag, if True the disciplines do not store their detail outputs (optimization runs)
+    lean_mode = False
+    # True if the detail outputs were not stored by the last run
+    detail_outputs_missing = False
+    # True during a full detail run, the detail outputs are then also stored in the data manager
+    full_detail_run = False
+
+    @classmethod
+    def set_lean_mode(cls, lean_mode):
+        """
+        Activate or deactivate the lean mode of all the climate economics disciplines
+        """
+        ClimateEcoDiscipline.lean_mode = lean_mode
+
+    def is_lean(self):
+        """
+        True if the detail outputs of the discipline are skipped in the current run
+        """
+        return self.lean_mode and len(self.DETAIL_OUTPUTS) > 0
+
+    def store_sos_outputs_values(self, dict_values, *args, **kwargs):
+        """
+        Store outputs of the run and invalidate the charts built on the previous outputs
+        The detail outputs are not stored in lean mode, the coupling variables are given to
+        the convergence telemetry of the study if it is activated
+        """
+        self.output_version += 1
+        self.detail_outputs_missing = self.is_lean()
+        if self.detail_outputs_missing:
+            dict_values = {key: value for key, value in dict_values.items()
+                           if key not in self.DETAIL_OUTPUTS}
+        elif self.full_detail_run:
+            self.dm.set_values_from_dict({self.get_var_full_name(key, self._data_out): dict_values[key]
+                                          for key in self.DETAIL_OUTPUTS if key in dict_values})
+        telemetry = ConvergenceTelemetry.get_telemetry(self.ee)
+        if telemetry is not None:
+            telemetry.record_discipline(self, dict_values)
+        super().store_sos_outputs_values(dict_values, *args, **kwargs)
+
+    def run_full_detail(self):
+        """
+        Run the discipline on its current inputs to regenerate the detail outputs skipped by
+        the lean runs
+        """
+        self.full_detail_run = True
+        try:
+            self.run()
+        finally:
+            self.full_detail_run = False
+
+    def get_post_processing_list(self, chart_filters=None):
+        """
+        Get the charts selected by the filters from the cache, charts are only built by
+        build_post_processing_list on the first request after a run for a given selection
+        The cache is also dropped when a value of the discipline is replaced in the data manager,
+        for instance by a reloaded study or set_values_from_dict
+        """
+        if self.detail_outputs_missing and not self.lean_mode:
+            self.run_full_detail()
+        filters_key = self.get_chart_filters_key(chart_filters)
+        chart_values = self.get_chart_values()
+        chart_cache = getattr(self, '_chart_cache', None)
+        if chart_cache is None or chart_cache['output_version'] != self.output_version or \
+                not self.is_same_chart_values(chart_cache['values'], chart_values):
+            chart_cache = {'output_version': self.output_version,
+                           'values': chart_values, 'charts': {}}
+            self._chart_cache = chart_cache
+
+        if filters_key not in chart_cache['charts']:
+            chart_cache['charts'][filters_key] = self.build_post_processing_list(
+                chart_filters)
+
+        return chart_cache['charts'][filters_key]
+
+    def build_post_processing_list(self, chart_filters=None):
+        """
+        Build the charts selected by the filters, to be overloaded by disciplines using the chart cache
+        """
+        return SoSDiscipline.get_post_processing_list(self, chart_filters)
+
+    def get_chart_filters_key(self, chart_filters):
+        """
+        Hashable description of the selected values of each chart filter
+        """
+        if chart_filters is None:
+            return None
+        return tuple((chart_filter.filter_key, str(chart_filter.selected_values))
+                     for chart_filter in chart_filters)
+
+    def get_chart_values(self):
+        """
+        Values of the inputs and outputs of the discipline in the data manager the charts are built on
+        """
+        return list(self.get_sosdisc_inputs().values()) + list(self.get_sosdisc_outputs().values())
+
+    def is_same_chart_values(self, cached_values, values):
+        """
+        True if the data manager still holds the values of the cache, values are compared by
+        identity: the cache keeps a reference on them so that a new value cannot get the id of
+        a cached one and the data is not compared
+        """
+        return len(cached_values) == len(values) and \
+            all(cached_value is value for cached_value, value in zip(cached_values, values))
 
     def get_greataxisrange(self, serie):
         """
@@ -15,7 +15,8 @@ limitations under the License.
 '''
 import numpy as np
 import pandas as pd
-from copy import deepcopy
+
+from climateeconomics.core.tools.time_series import TimeSeries, as_time_series
 
 
 class DamageModel():
@@ -54,93 +55,64 @@ class DamageModel():
 
     def create_dataframe(self):
         '''
-        Create the dataframe and fill it with values at year_start
+        Create the damage time series filled with zeros
         '''
         years_range = np.arange(
             self.year_start,
             self.year_end + 1,
             self.time_step)
         self.years_range = years_range
-        damage_df = pd.DataFrame(
-            index=years_range,
-            columns=['years',
-                     'damages',
-                     'damage_frac_output',
-                     ])
-
-        if 'complex128' in [self.temperature_df['temp_atmo'].dtype]:
-            arr_type = 'complex128'
-        else:
-            arr_type = 'float64'
-
-        damage_df['years'] = self.years_range
-        damage_df['damages'] = np.zeros(
-            len(self.years_range), dtype=arr_type)
-        damage_df['damage_frac_output'] = np.zeros(
-            len(self.years_range), dtype=arr_type)
 
-        return damage_df
+        return TimeSeries(years_range, columns=['damages', 'damage_frac_output'],
+                          dtype=self.temperature_df.dtype)
 
-    def compute_damage_fraction(self, year):
+    def compute_damage_fraction(self, temp_atmo):
         """
-        Compute damages fraction of output at t
-        using variables at t
+        Compute damages fraction of output for all years
         If tipping point = True : Martin Weitzman damage function.
         """
-        temp_atmo = self.temperature_df.at[year, 'temp_atmo']
         if self.tipping_point == True:
-            if temp_atmo < 0:
-                dam = 0.0
-            else:
-                dam = (temp_atmo / self.tp_a1)**self.tp_a2 + \
-                    (temp_atmo / self.tp_a3)**self.tp_a4
+            # no damage for negative temperatures
+            temp_atmo = np.where(np.real(temp_atmo) < 0, 0.0, temp_atmo)
+            dam = (temp_atmo / self.tp_a1)**self.tp_a2 + \
+                (temp_atmo / self.tp_a3)**self.tp_a4
             damage_frac_output = 1 - (1 / (1 + dam))
         else:
             damage_frac_output = self.damag_int * temp_atmo + \
                 self.damag_quad * temp_atmo**self.damag_expo
-        self.damage_df.loc[year, 'damage_frac_output'] = damage_frac_output
         return damage_frac_output
 
-    def compute_damages(self, year):
+    def compute_damage_price_window(self):
         """
-        Compute damages (t) (trillions 2005 USD per year)
-        using variables at t
+        Compute the first and last (excluded) indices of the damages averaged in the CO2 damage price
+        of each year: the 25 next years, truncated at year_end, only year_end for the last year
+        The window is counted in years so that the price does not depend on the time step
         """
-        gross_output = self.economics_df.at[year, 'gross_output']
-        damage_frac_output = self.damage_df.at[year, 'damage_frac_output']
-        damages = gross_output * damage_frac_output
-        self.damage_df.loc[year, 'damages'] = damages
-
-        return damages
+        years = self.years_range
+        index = np.arange(len(years))
+        window_end_year = np.where(years == self.year_end, self.year_end + 1,
+                                   np.minimum(years + 25, self.year_end))
+        window_end = np.searchsorted(years, window_end_year)
+        return index, window_end
 
     def compute_CO2_tax_minus_CO2_damage_constraint(self):
         """
         Compute CO2 tax - CO2 damage constraint:
                  CO2 tax - fact * CO2_damage_price  > 0  
             with CO2_damage_price[year] = 1e3 * 1.01**(year_start-year) * mean(damage_df[year:year+25] (T$)) / total_emissions_ref (Gt)
+        The sliding means are computed with a cumulative sum of damages
         """
-        if 'complex128' in [self.damage_df['damages'].values.dtype]:
-            arr_type = 'complex128'
-        else:
-            arr_type = 'float64'
+        damages = self.damage_df['damages']
+        window_start, window_end = self.compute_damage_price_window()
+        cum_damages = np.concatenate(([0.0], np.cumsum(damages)))
+        mean_damages = (cum_damages[window_end] - cum_damages[window_start]) / \
+            (window_end - window_start)
 
-        co2_damage_price = np.zeros(
-            len(self.damage_df.index), dtype=arr_type)
-
-        damages = self.damage_df['damages'].values.tolist()
-
-        for i, year in enumerate(self.damage_df.index):
-
-            if year == self.year_end:
-                co2_damage_price[i] = 1e3 * 1.01**i * \
-                    damages[i] / self.total_emissions_ref
-            else:
-                k = max(year + 25 - self.year_end, 0)
-                co2_damage_price[i] = 1e3 * 1.01**i * \
-                    np.mean(damages[i:i + 25 - k]) / self.total_emissions_ref
+        co2_damage_price = 1e3 * 1.01**(self.years_range - self.year_start) * \
+            mean_damages / self.total_emissions_ref
 
         self.co2_damage_price_df = pd.DataFrame(
-            {'years': self.damage_df.index, 'CO2_damage_price': co2_damage_price})
+            {'years': self.damage_df.years, 'CO2_damage_price': co2_damage_price})
 
     def compute_gradient(self):
         """
@@ -151,39 +123,32 @@ class DamageModel():
         d_constraint/d_CO2_taxes, 
         d_constraint/d_temp_atmo, 
         d_constraint_economics
+        All damages gradients are diagonal
         """
-        years = np.arange(self.year_start, self.year_end + 1, self.time_step)
-        nb_years = len(years)
-        i = 0
-        line = 0
-        ddamage_frac_output_temp_atmo = np.zeros((nb_years, nb_years))
-        ddamages_temp_atmo = np.zeros((nb_years, nb_years))
-        ddamages_gross_output = np.zeros((nb_years, nb_years))
-
-        for i in range(nb_years):
-            for line in range(nb_years):
-                if i == line:
-                    temp_atmo = self.temperature_df.at[years[line],
-                                                       'temp_atmo']
-                    if self.tipping_point == True:
-                        if temp_atmo < 0:
-                            ddamage_frac_output_temp_atmo[line, i] = 0.0
-                        else:
-                            ddamage_frac_output_temp_atmo[line, i] = ((self.tp_a4 * (temp_atmo / self.tp_a3)**self.tp_a4) +
-                                                                      (self.tp_a2 * (temp_atmo / self.tp_a1)**self.tp_a2)) / \
-                                (temp_atmo * (
-                                    ((temp_atmo / self.tp_a1)**self.tp_a2)
-                                    + ((temp_atmo / self.tp_a3)**self.tp_a4)
-                                    + 1.0) ** 2.0)
-                    else:
-                        ddamage_frac_output_temp_atmo[line, i] = self.damag_int + \
-                            self.damag_quad * self.damag_expo * \
-                            temp_atmo ** (self.damag_expo - 1)
-
-                    ddamages_temp_atmo[line, i] = ddamage_frac_output_temp_atmo[line,
-                                                                                i] * self.economics_df.at[years[line], 'gross_output']
-                    ddamages_gross_output[line,
-                                          i] = self.damage_df.at[years[line], 'damage_frac_output']
+        nb_years = len(self.years_range)
+        temp_atmo = self.temperature_df.get('temp_atmo', self.years_range)
+        gross_output = self.economics_df.get('gross_output', self.years_range)
+
+        if self.tipping_point == True:
+            negative_temp = np.real(temp_atmo) < 0
+            temp_atmo = np.where(negative_temp, 1.0, temp_atmo)
+            ddamage_frac_output = ((self.tp_a4 * (temp_atmo / self.tp_a3)**self.tp_a4) +
+                                   (self.tp_a2 * (temp_atmo / self.tp_a1)**self.tp_a2)) / \
+                (temp_atmo * (
+                    ((temp_atmo / self.tp_a1)**self.tp_a2)
+                    + ((temp_atmo / self.tp_a3)**self.tp_a4)
+                    + 1.0) ** 2.0)
+            ddamage_frac_output = np.where(
+                negative_temp, 0.0, ddamage_frac_output)
+        else:
+            ddamage_frac_output = self.damag_int + \
+                self.damag_quad * self.damag_expo * \
+                temp_atmo ** (self.damag_expo - 1)
+
+        ddamage_frac_output_temp_atmo = np.diag(ddamage_frac_output)
+        ddamages_temp_atmo = np.diag(ddamage_frac_output * gross_output)
+        ddamages_gross_output = np.diag(
+            self.damage_df['damage_frac_output'])
 
         dconstraint_temp_atmo, dconstraint_economics = self.compute_dconstraint(
             ddamages_temp_atmo, ddamages_gross_output)
@@ -195,50 +160,41 @@ class DamageModel():
     def compute_dconstraint(self, ddamages_temp_atmo, ddamages_gross_output):
         '''
         Compute gradient of constraint wrt temp_atmo and economics
+        The CO2 damage price of a year only depends on the damages of its window: the gradient
+        is the band of the window weights scaled by the diagonal gradient of damages
         '''
-        years = np.arange(self.year_start, self.year_end + 1, self.time_step)
-        nb_years = len(years)
-        dconstraint_temp_atmo = np.zeros((nb_years, nb_years))
-        dconstraint_economics = np.zeros((nb_years, nb_years))
-        damage_constraint_factor = self.damage_constraint_factor
-
-        for i, year in enumerate(years):
+        nb_years = len(self.years_range)
+        window_start, window_end = self.compute_damage_price_window()
+        columns = np.arange(nb_years)
+        in_window = (columns >= window_start[:, np.newaxis]) & (
+            columns < window_end[:, np.newaxis])
+        window_weights = in_window * (1e3 * 1.01**(self.years_range - self.year_start) / (
+            window_end - window_start) / self.total_emissions_ref)[:, np.newaxis]
 
-            if year == self.year_end:
-                dconstraint_temp_atmo[i, i] = 1e3 * 1.01**i * ddamages_temp_atmo[i][i] / \
-                    self.total_emissions_ref
-
-                dconstraint_economics[i, i] = 1e3 * 1.01**i * ddamages_gross_output[i][i] / \
-                    self.total_emissions_ref
-
-            else:
-                k = max(year + 25 - self.year_end, 0)
-                for j in range(0, 25 - k):
-                    dconstraint_temp_atmo[i, i + j] = 1e3 * 1.01**i * ddamages_temp_atmo[i + j][i + j] / (
-                        25 - k) / self.total_emissions_ref
-
-                    dconstraint_economics[i, i + j] = 1e3 * 1.01**i * ddamages_gross_output[i + j][i + j] / (
-                        25 - k) / self.total_emissions_ref
+        dconstraint_temp_atmo = window_weights * np.diag(ddamages_temp_atmo)
+        dconstraint_economics = window_weights * np.diag(ddamages_gross_output)
 
         return dconstraint_temp_atmo, dconstraint_economics
 
     def compute(self, economics_df, temperature_df):
         """
         Compute the outputs of the model
+        economics_df and temperature_df are dataframes or time series, damage_df is returned
+        as a dataframe indexed by years
         """
-        self.economics_df = economics_df
-        self.economics_df.index = self.economics_df['years'].values
-
-        self.temperature_df = temperature_df
-        self.temperature_df.index = self.temperature_df['years'].values
+        self.economics_df = as_time_series(economics_df, ['gross_output'])
+        self.temperature_df = as_time_series(temperature_df, ['temp_atmo'])
 
         self.damage_df = self.create_dataframe()
 
-        for year in self.years_range:
-            self.compute_damage_fraction(year)
-            self.compute_damages(year)
+        damage_frac_output = self.compute_damage_fraction(
+            self.temperature_df.get('temp_atmo', self.years_range))
+        self.damage_df['damage_frac_output'] = damage_frac_output
+        self.damage_df['damages'] = self.economics_df.get(
+            'gross_output', self.years_range) * damage_frac_output
 
-        self.damage_df = self.damage_df.replace([np.inf, -np.inf], np.nan)
+        # infinite and nan damages are set to 0
+        self.damage_df.values[~np.isfinite(self.damage_df.values)] = 0.0
         self.compute_CO2_tax_minus_CO2_damage_constraint()
 
-        return self.damage_df.fillna(0.0), self.co2_damage_price_df
+        return self.damage_df.to_dataframe(), self.co2_damage_price_df
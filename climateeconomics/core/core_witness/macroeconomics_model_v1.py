@@ -24,6 +24,9 @@ class MacroEconomics():
     Economic model that compute the evolution of capital, consumption, output...
     '''
     PC_CONSUMPTION_CONSTRAINT = 'pc_consumption_constraint'
+    # columns of the economics_df coupling output
+    ECONOMICS_DF_COLUMNS = ['years', 'gross_output',
+                            'pc_consumption', 'output_net_of_d']
 
     def __init__(self, param):
         '''
@@ -212,17 +215,15 @@ class MacroEconomics():
         year_end_recovery = 2031
         workforce_df = self.workforce_df
         # For all years employment_rate = base value
-        workforce_df['employment_rate'] = self.employment_rate_base_value
-        # Compute recovery phase
-        years_recovery = np.arange(year_covid, year_end_recovery + 1)
-        x_recovery = years_recovery + 1 - year_covid
-        employment_rate_recovery = self.employment_a_param * \
+        employment_rate = np.full(
+            self.nb_years, float(self.employment_rate_base_value))
+        # Compute recovery phase on the years of the time grid in the recovery period
+        recovery = (self.years_range >= year_covid) & (
+            self.years_range <= year_end_recovery)
+        x_recovery = self.years_range[recovery] + 1 - year_covid
+        employment_rate[recovery] = self.employment_a_param * \
             x_recovery**self.employment_power_param
-        employment_rate_recovery_df = pd.DataFrame(
-            {'years': years_recovery, 'employment_rate': employment_rate_recovery})
-        employment_rate_recovery_df.index = years_recovery
-        # Then replace values in original dataframe by recoveries values
-        workforce_df.update(employment_rate_recovery_df)
+        workforce_df['employment_rate'] = employment_rate
 
         self.workforce_df = workforce_df
         return workforce_df
@@ -582,9 +583,11 @@ class MacroEconomics():
                                                            tolerable_delta=tolerable_delta,
                                                            delta_type='normal', reference_value=ref_usable_capital)
 
-    def compute(self, inputs, damage_prod=False):
+    def compute(self, inputs, damage_prod=False, detail_outputs=True):
         """
         Compute all models for year range
+        The output growth and the detailed economics_df are only computed if detail_outputs is True,
+        otherwise the returned economics_df only has the columns of ECONOMICS_DF_COLUMNS
         """
         self.create_dataframe()
         self.damage_prod = damage_prod
@@ -622,8 +625,9 @@ class MacroEconomics():
             self.compute_consumption_pc(year)
             # capital t+1 :
             self.compute_capital(year+1)
-        for year in self.years_range:
-            self.compute_output_growth(year)
+        if detail_outputs:
+            for year in self.years_range:
+                self.compute_output_growth(year)
         self.economics_df = self.economics_df.replace(
             [np.inf, -np.inf], np.nan)
         # Compute consumption per capita constraint
@@ -637,7 +641,12 @@ class MacroEconomics():
         self.compute_delta_capital_constraint()
         self.compute_delta_capital_constraint_dc()
         self.compute_delta_capital_lin_to_quad_constraint()
-        return self.economics_df.fillna(0.0), self.energy_investment.fillna(0.0), self.global_investment_constraint, \
+        if detail_outputs:
+            economics_df = self.economics_df.fillna(0.0)
+        else:
+            economics_df = self.economics_df[self.ECONOMICS_DF_COLUMNS].fillna(
+                0.0)
+        return economics_df, self.energy_investment.fillna(0.0), self.global_investment_constraint, \
             self.energy_investment_wo_renewable.fillna(0.0), self.pc_consumption_constraint, self.workforce_df, \
             self.capital_df, self.emax_enet_constraint
 
@@ -765,13 +774,10 @@ class MacroEconomics():
 
         """
 
-        years = np.arange(self.year_start,
-                          self.year_end + 1, self.time_step)
-        nb_years = len(years)
-
         net_output = self.economics_df['output_net_of_d'].values
         energy_investment_wo_tax = self.share_energy_investment.values * net_output
-        denergy_investment_wo_tax = np.identity(nb_years) / 100.0 * net_output
+        # diagonal block, the share is in percent
+        denergy_investment_wo_tax = np.diag(net_output / 100.0)
         denergy_investment_wo_renewable = denergy_investment_wo_tax * 1e3
 
         self.co2_emissions_Gt['Total CO2 emissions'].clip(
@@ -824,12 +830,8 @@ class MacroEconomics():
         return dren_investments
 
     def compute_dinvestment_dshare_energy_investement(self, denergy_investment):
-        years = np.arange(self.year_start,
-                          self.year_end + 1, self.time_step)
-        nb_years = len(years)
         net_output = self.economics_df['output_net_of_d'].values
-        dinvestment = denergy_investment - \
-            np.identity(nb_years) / 100.0 * net_output
+        dinvestment = denergy_investment - np.diag(net_output / 100.0)
         dne_investment = dinvestment - denergy_investment
 
         return dinvestment, dne_investment
@@ -914,10 +916,8 @@ class MacroEconomics():
         return denergy_investment, dinvestment, dne_investment
 
     def compute_dinvestment_dtotal_share_of_gdp(self):
-        years = self.years_range
-        nb_years = len(years)
         net_output = self.economics_df['output_net_of_d'].values
-        dnon_energy_investment = np.identity(nb_years) / 100.0 * net_output
+        dnon_energy_investment = np.diag(net_output / 100.0)
         dinvestment = dnon_energy_investment
 
         return dinvestment, dnon_energy_investment
@@ -16,6 +16,8 @@ limitations under the License.
 import numpy as np
 import pandas as pd
 
+from climateeconomics.core.tools.parameter_jacobian import parameter_jacobian
+
 
 class NonUseCapitalObjective():
     '''
@@ -29,8 +31,9 @@ class NonUseCapitalObjective():
         self.param = param
         self.set_data()
         self.non_use_capital_objective = np.array([0.0])
-        self.non_use_capital_df = None
-        self.techno_capital_df = None
+        self.capital_keys = None
+        # preallocated (years, techno) arrays by variable name
+        self.capital_arrays = {}
         self.non_use_capital_cons = np.array([0.0])
         self.forest_lost_capital_cons = np.array([0.0])
 
@@ -57,51 +60,90 @@ class NonUseCapitalObjective():
             self.year_end + 1)
         self.delta_years = len(self.years_range)
 
+    def set_capital_keys(self, non_use_capital_keys, techno_capital_keys):
+        '''
+        Set the names of the non use capital and techno capital inputs, resolved once by the discipline
+        If not set the keys are found in the inputs_dict at each compute
+        '''
+        self.capital_keys = {'non_use_capital': list(non_use_capital_keys),
+                             'techno_capital': list(techno_capital_keys)}
+
+    def get_capital_keys(self, name, inputs_dict):
+        if self.capital_keys is not None:
+            return self.capital_keys[name]
+        return [key for key in inputs_dict if key.endswith(name)]
+
+    @staticmethod
+    def get_capital_column(capital_df):
+        '''
+        Get the name of the value column of a techno capital dataframe
+        '''
+        return [column for column in capital_df.columns if column != 'years'][0]
+
     def compute(self, inputs_dict):
         """
         Compute the sum of non_use_capitals
         """
         self.create_year_range()
 
-        self.non_use_capital_df = self.agreggate_and_compute_sum(
+        self.non_use_capital = self.fill_capital_array(
             'non_use_capital', inputs_dict)
-
-        self.techno_capital_df = self.agreggate_and_compute_sum(
+        self.techno_capital = self.fill_capital_array(
             'techno_capital', inputs_dict)
+        self.sum_non_use_capital = self.non_use_capital.sum(axis=1)
+        self.sum_techno_capital = self.techno_capital.sum(axis=1)
         if self.is_dev:
             self.forest_lost_capital = inputs_dict['forest_lost_capital']
 
         self.compute_objective()
         self.compute_constraint()
 
-    def agreggate_and_compute_sum(self, name, inputs_dict):
+    def fill_capital_array(self, name, inputs_dict):
         '''
-        Aggregate each variable that ends with name in a dataframe and compute the sum of each column
+        Fill the (years, techno) array of the variables named name in place, the array is only
+        reallocated if the number of technos or the type of the values change
         '''
-        name_df_list = [value.drop(
-            ['years'], axis=1) for key, value in inputs_dict.items() if key.endswith(name)]
+        values = []
+        for key in self.get_capital_keys(name, inputs_dict):
+            capital_df = inputs_dict[key]
+            values.append(capital_df[self.get_capital_column(capital_df)].values)
+        dtype = np.result_type(float, *values)
+        capital_array = self.capital_arrays.get(name)
+        if capital_array is None or capital_array.shape != (self.delta_years, len(values)) \
+                or capital_array.dtype != dtype:
+            capital_array = np.zeros((self.delta_years, len(values)), dtype=dtype)
+            self.capital_arrays[name] = capital_array
+        for i_techno, value in enumerate(values):
+            capital_array[:, i_techno] = value
 
-        non_use_capital_df = pd.DataFrame({'years': self.years_range})
+        return capital_array
 
-        if len(name_df_list) != 0:
-            non_use_capital_df_concat = pd.concat(name_df_list, axis=1)
-            name_sum = 'Sum of ' + name.replace('_', ' ')
+    def get_capital_detail_df(self, name, inputs_dict):
+        '''
+        Aggregate each variable named name in a dataframe with the sum and the capital of each techno
+        Only used for post-processing
+        '''
+        capital_df_list = [inputs_dict[key].drop(['years'], axis=1)
+                           for key in self.get_capital_keys(name, inputs_dict)]
 
-            non_use_capital_df[name_sum] = non_use_capital_df_concat.sum(
-                axis=1)
+        capital_detail_df = pd.DataFrame({'years': self.years_range})
 
-            non_use_capital_df = pd.concat(
-                [non_use_capital_df, non_use_capital_df_concat], axis=1)
+        if len(capital_df_list) != 0:
+            capital_df_concat = pd.concat(capital_df_list, axis=1)
+            capital_df_concat.index = capital_detail_df.index
+            capital_detail_df['Sum of ' + name.replace('_', ' ')] = capital_df_concat.sum(axis=1)
+            capital_detail_df = pd.concat(
+                [capital_detail_df, capital_df_concat], axis=1)
 
-        return non_use_capital_df
+        return capital_detail_df
 
     def compute_objective(self):
         '''
         Compute objective
         '''
-        if 'Sum of non use capital' in self.non_use_capital_df:
+        if self.non_use_capital.shape[1] != 0:
             self.non_use_capital_objective_wo_ponderation = np.asarray(
-                [self.non_use_capital_df['Sum of non use capital'].sum()]) / self.delta_years
+                [self.sum_non_use_capital.sum()]) / self.delta_years
             self.non_use_capital_objective = self.alpha * \
                 (1 - self.gamma) * self.non_use_capital_objective_wo_ponderation / \
                 self.non_use_capital_obj_ref
@@ -110,7 +152,7 @@ class NonUseCapitalObjective():
         '''
         Compute constraint
         '''
-        if 'Sum of non use capital' in self.non_use_capital_df:
+        if self.non_use_capital.shape[1] != 0:
             self.non_use_capital_cons = (
                 self.non_use_capital_cons_limit - self.non_use_capital_objective_wo_ponderation) / self.non_use_capital_cons_ref
 
@@ -147,26 +189,60 @@ class NonUseCapitalObjective():
 
     def get_non_use_capital_df(self):
         '''
-        Get non_use capital dataframe with all non_use capitals
+        Get non_use capital dataframe with the sum of non_use capitals
         '''
-        return self.non_use_capital_df
+        non_use_capital_df = pd.DataFrame({'years': self.years_range})
+        if self.non_use_capital.shape[1] != 0:
+            non_use_capital_df['Sum of non use capital'] = self.sum_non_use_capital
+        return non_use_capital_df
 
     def get_techno_capital_df(self):
         '''
-        Get techno capital dataframe with all non_use capitals
+        Get techno capital dataframe with the sum of techno capitals
         '''
-        return self.techno_capital_df
+        techno_capital_df = pd.DataFrame({'years': self.years_range})
+        if self.techno_capital.shape[1] != 0:
+            techno_capital_df['Sum of techno capital'] = self.sum_techno_capital
+        return techno_capital_df
 
     def get_energy_capital_trillion_dollars(self):
         '''
         Get energy capital dataframe in trillion dollars
         The sum is in G$ (1e9 $)
         '''
-        if 'Sum of techno capital' in self.techno_capital_df:
-            sum_techno_capital = self.techno_capital_df['Sum of techno capital'].values / 1e3
+        if self.techno_capital.shape[1] != 0:
+            sum_techno_capital = self.sum_techno_capital / 1e3
         else:
             sum_techno_capital = 0.0
         energy_capital_df = pd.DataFrame({'years': self.years_range,
                                           'energy_capital': sum_techno_capital})
 
         return energy_capital_df
+
+    @parameter_jacobian('alpha', 'gamma', 'non_use_capital_obj_ref', 'non_use_capital_cons_ref')
+    def compute_d_objective_and_constraint(self):
+        '''
+        Gradients of the objective and of the constraint wrt each non use capital, the same for each techno
+        '''
+        delta_years = self.year_end - self.year_start + 1
+        d_objective = np.ones(delta_years) * self.alpha * \
+            (1 - self.gamma) / self.non_use_capital_obj_ref / delta_years
+        d_cons = - np.ones(delta_years) / \
+            self.non_use_capital_cons_ref / delta_years
+
+        return d_objective, d_cons
+
+    @parameter_jacobian()
+    def compute_d_energy_capital(self):
+        '''
+        Gradient of the energy capital in trillion dollars wrt each techno capital in G$
+        '''
+        return np.identity(self.year_end - self.year_start + 1) / 1.e3
+
+    @parameter_jacobian('forest_lost_capital_cons_ref')
+    def compute_d_forest_lost_capital_cons(self):
+        '''
+        Gradient of the forest lost capital constraint wrt each lost capital column
+        '''
+        delta_years = self.year_end - self.year_start + 1
+        return - np.ones(delta_years) / self.forest_lost_capital_cons_ref / delta_years
@@ -17,6 +17,7 @@ from itertools import chain
 from pandas import DataFrame, concat
 import numpy as np
 from copy import deepcopy
+from climateeconomics.core.tools.time_grid import TimeGrid
 
 
 class Population:
@@ -43,6 +44,8 @@ class Population:
         self.year_start = inputs['year_start']
         self.year_end = inputs['year_end']
         self.time_step = inputs['time_step']
+        # the population ages year by year, on a coarse grid the model runs on annual years
+        self.time_grid = TimeGrid(self.year_start, self.year_end, self.time_step)
         self.pop_init_df = inputs['population_start']
         self.br_upper = inputs['birth_rate_upper']
         self.br_lower = inputs['birth_rate_lower']
@@ -71,10 +74,7 @@ class Population:
         '''
         Create the dataframe and fill it with values at year_start
         '''
-        years_range = np.arange(
-            self.year_start,
-            self.year_end + 1,
-            self.time_step)
+        years_range = self.time_grid.annual_years
         self.years_range = years_range
         # Prepare columns of population df
         pop_column = [str(x) for x in np.arange(0, 100)]
@@ -95,7 +95,7 @@ class Population:
         pop_by_age.append(self.pop_init_df.iloc[-1, 1])
 
         self.total_pop = self.pop_init_df['population'].sum()
-        self.population_dict = {2020: np.array(
+        self.population_dict = {self.year_start: np.array(
             pop_by_age + [self.total_pop])}
 
         column_list = self.age_list.copy()
@@ -347,15 +347,16 @@ class Population:
 
         return self.life_expectancy_df
 
-    def compute(self, in_dict):
+    def compute(self, in_dict, detail_outputs=True):
         """
         Compute all
+        The cumulative deaths of death_dict are only computed if detail_outputs is True
         """
         self.create_dataframe()
         year_range = self.years_range
-        self.economics_df = in_dict['economics_df']
+        self.economics_df = self.time_grid.to_annual(in_dict['economics_df'])
         self.economics_df.index = self.economics_df['years'].values
-        self.temperature_df = in_dict['temperature_df']
+        self.temperature_df = self.time_grid.to_annual(in_dict['temperature_df'])
         self.temperature_df.index = self.temperature_df['years'].values
         self.compute_knowledge()
         # Loop over year to compute population evolution. except last year
@@ -394,21 +395,28 @@ class Population:
                                 'climate': self.climate_death_rate_df,
                                 'total': self.death_rate_df}
         # Calculation of cumulative deaths
-        for effect in self.death_rate_dict:
-            self.death_dict[effect] = DataFrame(
-                self.death_list_dict[effect], index=self.years_range)
-            self.death_dict[effect]['total'] = self.death_dict[effect].sum(
-                axis=1, skipna=True)
-            self.death_dict[effect]['cum_total'] = self.death_dict[effect]['total'].cumsum(
-            )
+        self.death_dict = {}
+        if detail_outputs:
+            for effect in self.death_rate_dict:
+                self.death_dict[effect] = DataFrame(
+                    self.death_list_dict[effect], index=self.years_range)
+                self.death_dict[effect]['total'] = self.death_dict[effect].sum(
+                    axis=1, skipna=True)
+                self.death_dict[effect]['cum_total'] = self.death_dict[effect]['total'].cumsum(
+                )
 
         for effect in self.death_dict:
             self.death_dict[effect].fillna(0.0)
             self.death_rate_dict[effect].fillna(0.0)
 
-        return self.population_df.fillna(0.0), self.birth_rate.fillna(0.0), self.death_rate_dict, \
-            self.birth_df.fillna(
-                0.0), self.death_dict, self.life_expectancy_df.fillna(0.0), self.working_age_population_df.fillna(0.0)
+        # outputs are given on the time grid, annual values are kept for the gradients
+        to_grid = self.time_grid.to_grid
+        return to_grid(self.population_df.fillna(0.0)), to_grid(self.birth_rate.fillna(0.0)), \
+            {effect: to_grid(df) for effect, df in self.death_rate_dict.items()}, \
+            to_grid(self.birth_df.fillna(0.0)), \
+            {effect: to_grid(df) for effect, df in self.death_dict.items()}, \
+            to_grid(self.life_expectancy_df.fillna(0.0)), to_grid(
+                self.working_age_population_df.fillna(0.0))
 
     # GRADIENTS OF POPULATION WTR GDP
     def compute_d_pop_d_output(self):
@@ -449,7 +457,7 @@ class Population:
                                                                                                                           d_pop_1549_d_output,
                                                                                                                           d_pop_tot_d_output,
                                                                                                                           d_working_pop_d_output)
-        return d_pop_tot_d_output, d_working_pop_d_output
+        return self.time_grid.project_jacobian(d_pop_tot_d_output), self.time_grid.project_jacobian(d_working_pop_d_output)
 
     def d_birthrate_d_output(self, year, d_pop_tot_d_output):
         """ Compute the derivative of birth rate wrt output
@@ -740,7 +748,7 @@ class Population:
                                                                                                                   d_pop_1549_d_temp,
                                                                                                                   d_pop_tot_d_temp,
                                                                                                                   d_working_pop_d_temp)
-        return d_pop_tot_d_temp, d_working_pop_d_temp
+        return self.time_grid.project_jacobian(d_pop_tot_d_temp), self.time_grid.project_jacobian(d_working_pop_d_temp)
 
     def d_birthrate_d_temp(self, year, d_pop_tot_d_temp):
         """ Compute the derivative of birth rate wrt temp
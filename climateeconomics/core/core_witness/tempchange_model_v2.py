@@ -18,6 +18,8 @@ from copy import deepcopy
 import numpy as np
 import pandas as pd
 from pandas.core.frame import DataFrame
+from climateeconomics.core.tools.recurrence_operator import RecurrenceJacobianOperator
+from climateeconomics.core.tools.parameter_jacobian import parameter_jacobian
 
 
 class TempChange(object):
@@ -98,7 +100,7 @@ class TempChange(object):
                      'temp_atmo',
                      'temp_ocean'])
         for key in temperature_df.keys():
-            temperature_df[key] = 0
+            temperature_df[key] = 0.
         temperature_df['years'] = years_range
         temperature_df.loc[self.year_start,
                            'temp_ocean'] = self.init_temp_ocean
@@ -255,43 +257,41 @@ class TempChange(object):
         self.temperature_df['forcing'] = forcing
 
     ######### DICE ########
-    def compute_temp_atmo(self, year):
-        """
-        Compute temperature of atmosphere (t) using t-1 values
-        """
-        p_temp_atmo = self.temperature_df.at[year -
-                                             self.time_step, 'temp_atmo']
-        p_temp_ocean = self.temperature_df.at[year -
-                                              self.time_step, 'temp_ocean']
-        forcing = self.temperature_df.at[year, 'forcing']
-        temp_atmo = p_temp_atmo + (self.climate_upper / (5.0 / self.time_step)) * \
-            ((forcing - (self.forcing_eq_co2 / self.eq_temp_impact) *
-              p_temp_atmo) - ((self.transfer_upper / (5.0 / self.time_step)) * (p_temp_atmo - p_temp_ocean)))
-        # Lower bound
-        self.temperature_df.loc[year, 'temp_atmo'] = min(
-            temp_atmo, self.up_tatmo)
-        return temp_atmo
-
-    def compute_temp_ocean(self, year):
+    def compute_temp_dice(self):
         """
-        Compute temperature of lower ocean  at t using t-1 values
+        Compute temperature of atmosphere and lower ocean at t using t-1 values
         """
-        p_temp_ocean = self.temperature_df.at[year -
-                                              self.time_step, 'temp_ocean']
-        p_temp_atmo = self.temperature_df.at[year -
-                                             self.time_step, 'temp_atmo']
-        temp_ocean = p_temp_ocean + (self.transfer_lower / (5.0 / self.time_step)) * \
-            (p_temp_atmo - p_temp_ocean)
-        # Bounds
-        temp_ocean = max(temp_ocean, self.lo_tocean)
-        self.temperature_df.loc[year, 'temp_ocean'] = min(
-            temp_ocean, self.up_tocean)
-        return temp_ocean
+        forcing = self.temperature_df['forcing'].values
+        nb_years = len(self.years_range)
+        dtype = np.result_type(forcing, float)
+        temp_atmo = np.zeros(nb_years, dtype=dtype)
+        temp_ocean = np.zeros(nb_years, dtype=dtype)
+        temp_atmo[0] = self.init_temp_atmo
+        temp_ocean[0] = self.init_temp_ocean
+
+        # bounds are compared on real parts to allow complex step derivatives
+        for i in range(1, nb_years):
+            p_temp_atmo = temp_atmo[i - 1]
+            p_temp_ocean = temp_ocean[i - 1]
+            t_atmo = p_temp_atmo + (self.climate_upper / (5.0 / self.time_step)) * \
+                ((forcing[i] - (self.forcing_eq_co2 / self.eq_temp_impact) *
+                  p_temp_atmo) - ((self.transfer_upper / (5.0 / self.time_step)) * (p_temp_atmo - p_temp_ocean)))
+            # Upper bound
+            temp_atmo[i] = min(t_atmo, self.up_tatmo, key=np.real)
+            t_ocean = p_temp_ocean + (self.transfer_lower / (5.0 / self.time_step)) * \
+                (p_temp_atmo - p_temp_ocean)
+            # Bounds
+            t_ocean = max(t_ocean, self.lo_tocean, key=np.real)
+            temp_ocean[i] = min(t_ocean, self.up_tocean, key=np.real)
+
+        self.temperature_df['temp_atmo'] = temp_atmo
+        self.temperature_df['temp_ocean'] = temp_ocean
+        return temp_atmo
 
     ######### FUND ########
-    def compute_temp_fund(self, year, temperature):
+    def get_fund_coefficients(self):
         """
-        Compute temperature of atmosphere (t) using t-1 values following FUND Model
+        Get the decay of temperature and the forcing coefficient of FUND Model
         """
         alpha = -42.7
         beta_l = 29.1
@@ -301,22 +301,36 @@ class TempChange(object):
                              beta_l * cs +
                              beta_q * cs * cs,
                              1)
-        radiative_forcing = self.temperature_df.loc[self.temperature_df['years'] == year, 'forcing'].values[0]
-        temperature = (1-1/e_folding_time)*temperature + cs/(5.35*np.log(2)*e_folding_time)*radiative_forcing
+        return 1 - 1 / e_folding_time, cs / (5.35 * np.log(2) * e_folding_time)
 
-        self.temperature_df.loc[self.temperature_df['years'] == year, 'temp_atmo'] = temperature
-        return temperature
+    def compute_temp_fund(self):
+        """
+        Compute temperature of atmosphere (t) using t-1 values following FUND Model
+        """
+        decay, coeff = self.get_fund_coefficients()
+        forcing = self.temperature_df['forcing'].values
+        temp_atmo = np.zeros(len(self.years_range),
+                             dtype=np.result_type(forcing, float))
+        temp_atmo[0] = self.init_temp_atmo
+        for i in range(1, len(self.years_range)):
+            temp_atmo[i] = decay * temp_atmo[i - 1] + coeff * forcing[i]
+
+        self.temperature_df['temp_atmo'] = temp_atmo
+        return temp_atmo
 
-    def compute_sea_level_fund(self, year, sea_level, temperature):
+    def compute_sea_level_fund(self, temperature):
         """
         Compute seal level (t) using t-1 values following FUND Model
         """
         rho = 500
         gamma = 2
-        seal_level = (1 - 1 / rho) * sea_level + gamma * temperature / rho
+        sea_level = np.zeros_like(temperature)
+        for i in range(1, len(temperature)):
+            sea_level[i] = (1 - 1 / rho) * sea_level[i - 1] + \
+                gamma * temperature[i] / rho
 
-        self.temperature_df.loc[self.temperature_df['years'] == year, 'sea_level'] = seal_level
-        return seal_level
+        self.temperature_df['sea_level'] = sea_level
+        return sea_level
 
     ######### CONSTRAINT ########
     def compute_temperature_year_end_constraint(self):
@@ -548,6 +562,7 @@ class TempChange(object):
 
         return d_tempatmo_d_atmoconc, d_tempocean_d_atmoconc
 
+    @parameter_jacobian('climate_sensitivity')
     def compute_d_temp_d_forcing_fund(self):
         """
         computes derivative of FUND temperature function
@@ -572,6 +587,39 @@ class TempChange(object):
         mat[:, 0] = 0.0
         return mat
 
+    ######### LONG HORIZON GRADIENTS ########
+    def compute_d_temp_atmo_operator(self):
+        """
+        Get the derivatives of DICE temp_atmo and temp_ocean wrt the variable of compute_d_forcing as
+        operators for long horizons, without building the (nb_years, nb_years) matrices
+        """
+        climate_upper = self.climate_upper * self.time_step / 5.0
+        transfer_upper = self.transfer_upper * self.time_step / 5.0
+        transfer_lower = self.transfer_lower * self.time_step / 5.0
+        # states are ordered as temp_atmo, temp_ocean
+        transition = np.array([[1.0 - climate_upper * self.forcing_eq_co2 / self.eq_temp_impact -
+                                climate_upper * transfer_upper, climate_upper * transfer_upper],
+                               [transfer_lower, 1.0 - transfer_lower]])
+        nb_years = len(self.years_range)
+        input_coeffs = np.zeros((nb_years, 2))
+        input_coeffs[:, 0] = climate_upper * self.compute_d_forcing()
+        # if temp_atmo is saturated at up_tatmo, it won't depend on atmo_conc anymore
+        masks = np.ones((nb_years, 2))
+        masks[:, 0] = self.temperature_df['temp_atmo'].values != self.up_tatmo
+
+        return RecurrenceJacobianOperator(transition, input_coeffs, masks=masks, output_index=0), \
+            RecurrenceJacobianOperator(
+                transition, input_coeffs, masks=masks, output_index=1)
+
+    def compute_d_temp_d_forcing_fund_operator(self):
+        """
+        Get the derivative of FUND temperature wrt forcing as an operator for long horizons
+        """
+        decay, coeff = self.get_fund_coefficients()
+        input_coeffs = np.full(len(self.years_range), coeff)
+
+        return RecurrenceJacobianOperator(decay, input_coeffs)
+
     def compute(self, in_dict):
         """
         Compute all
@@ -579,21 +627,17 @@ class TempChange(object):
         self.ghg_cycle_df = in_dict['ghg_cycle_df']
 
         self.compute_forcing()
-        temperature = self.init_temp_atmo
         sea_level = 0.0
         self.temperature_df['sea_level'] = sea_level
 
         if self.temperature_model == 'DICE':
 
-            for year in self.years_range[1:]:
-                self.compute_temp_atmo(year)
-                self.compute_temp_ocean(year)
+            self.compute_temp_dice()
 
         elif self.temperature_model == 'FUND':
 
-            for year in self.years_range[1:]:
-                temperature = self.compute_temp_fund(year, temperature)
-                sea_level = self.compute_sea_level_fund(year, sea_level, temperature)
+            temperature = self.compute_temp_fund()
+            self.compute_sea_level_fund(temperature)
 
         elif self.temperature_model == 'FAIR':
 
@@ -13,17 +13,164 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 '''
+import numpy as np
+import pandas as pd
+
 from sos_trades_core.study_manager.study_manager import StudyManager
 from sos_trades_core.tools.base_functions.specific_check import specific_check_years
+from climateeconomics.core.tools.warm_start_store import WarmStartStore
+from climateeconomics.core.tools.convergence_telemetry import ConvergenceTelemetry
+from climateeconomics.core.core_witness.climateeco_discipline import ClimateEcoDiscipline
 
 
 class ClimateEconomicsStudyManager(StudyManager):
     '''
     Class that overloads study manager to define a specific check for climate economics usecases
+
+    If warm_start_directory is set, the converged coupling variables and the design variables
+    are saved in a WarmStartStore after each run, and the nearest snapshot of the usecase is
+    reloaded after the data of the study are loaded
+    In lean runs the disciplines do not compute and store their detail outputs (see
+    ClimateEcoDiscipline.DETAIL_OUTPUTS), they are regenerated when the charts are requested.
+    By default (lean_run None) the runs of studies driven by an optim scenario are lean
+    If record_convergence is set, the residuals of the coupling variables are recorded during the
+    run in a ConvergenceTelemetry
     '''
+    warm_start_directory = None
+    lean_run = None
+    record_convergence = False
+    # class of the driver of the optimization studies
+    OPTIM_SCENARIO_CLASS = 'SoSOptimScenario'
+    # coupling variables saved in the warm start snapshots
+    WARM_START_VARIABLES = ['economics_df', 'temperature_df', 'population_df', 'working_age_population_df',
+                            'CO2_emissions_df', 'carboncycle_df', 'ghg_cycle_df', 'damage_df',
+                            'energy_production', 'energy_investment', 'CO2_taxes', 'land_demand_df',
+                            'food_land_surface_df', 'forest_surface_df']
+    # parameters that change the structure of the study, they define the key of a snapshot
+    STRUCTURAL_PARAMETERS = ['year_start', 'year_end', 'time_step',
+                             'temperature_model', 'forcing_model', 'energy_list', 'ccs_list']
 
     def specific_check(self):
         """
         Check that the column years of the input dataframes are in [year_start, year_end]
         """
         specific_check_years(self.execution_engine.dm)
+
+    def load_data(self, *args, **kwargs):
+        result = super().load_data(*args, **kwargs)
+        if self.warm_start_directory is not None:
+            self.load_warm_start()
+        return result
+
+    def is_lean_run(self):
+        '''
+        True if the detail outputs are skipped during the run, by default if an optim scenario
+        drives the disciplines
+        '''
+        if self.lean_run is not None:
+            return self.lean_run
+        return any(discipline['classname'] == self.OPTIM_SCENARIO_CLASS
+                   for discipline in self.execution_engine.dm.disciplines_dict.values())
+
+    def run(self, *args, **kwargs):
+        ClimateEcoDiscipline.set_lean_mode(self.is_lean_run())
+        if self.record_convergence:
+            ConvergenceTelemetry.activate(self.execution_engine)
+        try:
+            result = super().run(*args, **kwargs)
+        finally:
+            ClimateEcoDiscipline.set_lean_mode(False)
+        if self.warm_start_directory is not None:
+            self.save_warm_start()
+        return result
+
+    def get_relative_name(self, full_name):
+        '''
+        Name of a variable below the study, snapshots do not depend on the study name
+        '''
+        return full_name[len(self.study_name) + 1:] if full_name.startswith(f'{self.study_name}.') else full_name
+
+    def get_full_names(self, var_names):
+        dm = self.execution_engine.dm
+        return [full_name for var_name in var_names
+                for full_name in dm.get_all_namespaces_from_var_name(var_name)]
+
+    def get_structural_parameters(self):
+        dm = self.execution_engine.dm
+        return {self.get_relative_name(full_name): dm.get_value(full_name)
+                for full_name in self.get_full_names(self.STRUCTURAL_PARAMETERS)}
+
+    def get_design_space_names(self):
+        return self.get_full_names(['design_space'])
+
+    def get_usecase_name(self):
+        return self.__class__.__module__
+
+    def get_warm_start_values(self):
+        '''
+        Get the coupling variables and the design variables as a dict {name below the study: value}
+        '''
+        dm = self.execution_engine.dm
+        full_names = self.get_full_names(self.WARM_START_VARIABLES)
+        for design_space_name in self.get_design_space_names():
+            full_names += self.get_full_names(
+                dm.get_value(design_space_name)['variable'])
+
+        return {self.get_relative_name(full_name): dm.get_value(full_name)
+                for full_name in full_names if dm.get_value(full_name) is not None}
+
+    def save_warm_start(self):
+        '''
+        Save the coupling variables and the design variables in the warm start store
+        '''
+        return WarmStartStore(self.warm_start_directory).save(
+            self.get_usecase_name(), self.get_structural_parameters(), self.get_warm_start_values())
+
+    def load_warm_start(self):
+        '''
+        Set the values of the nearest snapshot of the usecase in the study
+        Returns the list of variables set
+        '''
+        store = WarmStartStore(self.warm_start_directory)
+        key = store.find_nearest(
+            self.get_usecase_name(), self.get_structural_parameters())
+        if key is None:
+            return []
+
+        return self.set_warm_start_values(store.load(key))
+
+    def set_warm_start_values(self, warm_start_values):
+        '''
+        Set warm start values {name below the study: value} in the study
+        Only values with the same shape as the current ones are set, the design space values of the
+        design variables are updated to start the optimization from the warm start values
+        Returns the list of variables set
+        '''
+        dm = self.execution_engine.dm
+        values_dict = {}
+        for name, value in warm_start_values.items():
+            full_name = f'{self.study_name}.{name}'
+            if full_name in dm.get_all_namespaces_from_var_name(name.split('.')[-1]) \
+                    and self.is_same_structure(dm.get_value(full_name), value):
+                values_dict[full_name] = value
+
+        for design_space_name in self.get_design_space_names():
+            design_space = dm.get_value(design_space_name).copy()
+            design_values = {variable: values_dict[full_name]
+                             for variable in design_space['variable']
+                             for full_name in dm.get_all_namespaces_from_var_name(variable)
+                             if full_name in values_dict}
+            if len(design_values) > 0:
+                design_space['value'] = [design_values.get(variable, value) for variable, value in
+                                         zip(design_space['variable'], design_space['value'])]
+                values_dict[design_space_name] = design_space
+
+        self.execution_engine.load_study_from_input_dict(values_dict)
+        return list(values_dict.keys())
+
+    def is_same_structure(self, current_value, value):
+        if isinstance(current_value, pd.DataFrame):
+            return isinstance(value, pd.DataFrame) and current_value.shape == value.shape \
+                and list(current_value.columns) == list(value.columns) \
+                and ('years' not in value or np.array_equal(current_value['years'].values, value['years'].values))
+        return np.shape(current_value) == np.shape(value)
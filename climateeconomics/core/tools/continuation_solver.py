@@ -0,0 +1,80 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+from concurrent.futures import ProcessPoolExecutor
+
+
+class ContinuationSolver():
+    '''
+    Continuation of optimization studies along a parameter, for instance alpha for a pareto front
+
+    The parameter values are sorted and each study is seeded with the warm start values (design
+    variables and coupling variables, see ClimateEconomicsStudyManager.get_warm_start_values)
+    of its converged neighbour. With two chains the values are swept from both ends towards the
+    middle and the chains can run in parallel processes.
+    study_factory: function building a loaded study for a parameter value, it must be defined
+    at module level to run the chains in processes
+    '''
+
+    def __init__(self, study_factory, parameter_values, n_chains=1, n_processes=1):
+        if n_chains not in (1, 2):
+            raise ValueError(
+                f'Continuation runs with 1 or 2 chains, got {n_chains}')
+        self.study_factory = study_factory
+        self.parameter_values = sorted(parameter_values)
+        self.n_chains = n_chains
+        self.n_processes = n_processes
+
+    def get_chains(self):
+        if self.n_chains == 1:
+            return [self.parameter_values]
+        middle = (len(self.parameter_values) + 1) // 2
+        return [self.parameter_values[:middle], self.parameter_values[middle:][::-1]]
+
+    def run(self):
+        '''
+        Run all the studies, returns the warm start values of each study as a dict
+        {parameter value: warm start values} sorted by parameter value
+        '''
+        chains = self.get_chains()
+        if self.n_processes > 1 and len(chains) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.n_processes, len(chains))) as executor:
+                chain_results = list(executor.map(
+                    run_continuation_chain, [self.study_factory] * len(chains), chains))
+        else:
+            chain_results = [run_continuation_chain(self.study_factory, chain)
+                             for chain in chains]
+
+        results = {}
+        for chain_result in chain_results:
+            results.update(chain_result)
+        return {value: results[value] for value in sorted(results)}
+
+
+def run_continuation_chain(study_factory, parameter_values):
+    '''
+    Run the studies of a chain in order, each study is seeded with the results of the previous one
+    '''
+    results = {}
+    warm_start_values = None
+    for value in parameter_values:
+        study = study_factory(value)
+        if warm_start_values is not None:
+            study.set_warm_start_values(warm_start_values)
+        study.run()
+        warm_start_values = study.get_warm_start_values()
+        results[value] = warm_start_values
+
+    return results
@@ -0,0 +1,169 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+from weakref import WeakKeyDictionary
+
+import numpy as np
+import pandas as pd
+
+
+class ConvergenceTelemetry():
+    '''
+    Normalised residual of each coupling variable at each MDA iteration
+
+    Once activated on an execution engine, the climate economics disciplines of its study give
+    their coupling inputs and outputs to the telemetry at each execution (see ClimateEcoDiscipline).
+    Each new value of a variable is an iteration of this variable, its residual is
+    ||value - previous value|| / ||value||. Values seen again unchanged, by another discipline
+    reading the same variable for instance, are not new iterations.
+    The iterations are shared by all the variables: a new iteration starts when a discipline is
+    executed a second time in the current iteration. A new MDA run starts when a discipline is
+    executed again while none of its followed inputs changed, the execution is then driven by
+    another input (a design variable of an optimisation for instance), or when start_mda_run is
+    called.
+    Only the variables of the list are followed to keep the overhead low.
+    '''
+    DEFAULT_VARIABLES = ['economics_df', 'temperature_df', 'damage_df', 'population_df',
+                         'working_age_population_df', 'CO2_emissions_df', 'carboncycle_df',
+                         'energy_production', 'energy_investment', 'CO2_taxes', 'land_demand_df',
+                         'total_food_land_surface', 'forest_surface_df', 'CO2_land_emissions']
+    HISTORY_COLUMNS = ['mda_run', 'iteration', 'variable', 'residual']
+    # telemetry of each activated execution engine
+    telemetries = WeakKeyDictionary()
+
+    def __init__(self, variables=None):
+        self.variables = set(
+            self.DEFAULT_VARIABLES if variables is None else variables)
+        self.reset()
+
+    @classmethod
+    def activate(cls, execution_engine, variables=None):
+        '''
+        Record the convergence of the MDAs of the study of the execution engine
+        '''
+        telemetry = cls(variables)
+        cls.telemetries[execution_engine] = telemetry
+        return telemetry
+
+    @classmethod
+    def deactivate(cls, execution_engine):
+        cls.telemetries.pop(execution_engine, None)
+
+    @classmethod
+    def get_telemetry(cls, execution_engine):
+        '''
+        Telemetry of the execution engine, None if it is not activated
+        '''
+        return cls.telemetries.get(execution_engine)
+
+    @staticmethod
+    def get_array(value):
+        '''
+        Float array of the numerical values of a variable, None for other types
+        '''
+        if isinstance(value, pd.DataFrame):
+            value = value[[column for column in value.columns if column != 'years']].values
+        try:
+            return np.real(np.asarray(value)).astype(float).flatten()
+        except (TypeError, ValueError):
+            return None
+
+    def start_mda_run(self):
+        '''
+        Start a new MDA run, the next values start its first iteration
+        '''
+        self.mda_run += 1
+        self.iteration = 1
+        self.executed_disciplines = set()
+        self.discipline_inputs = {}
+
+    def start_iteration(self):
+        self.iteration += 1
+        self.executed_disciplines = set()
+
+    def record(self, values_dict):
+        '''
+        Record the residuals of the followed variables of values_dict {variable name: value} at
+        the current iteration, return the names of the variables with a new value
+        '''
+        if self.mda_run == 0:
+            self.start_mda_run()
+        new_values = []
+        for name, value in values_dict.items():
+            if name not in self.variables:
+                continue
+            array = self.get_array(value)
+            if array is None:
+                continue
+            previous_array = self.previous_values.get(name)
+            if previous_array is not None and previous_array.shape == array.shape:
+                if np.array_equal(previous_array, array):
+                    continue
+                self.history.append((self.mda_run, self.iteration, name,
+                                     np.linalg.norm(array - previous_array) / max(np.linalg.norm(array), np.finfo(float).tiny)))
+            self.previous_values[name] = array
+            new_values.append(name)
+        return new_values
+
+    def record_discipline(self, discipline, outputs_dict):
+        '''
+        Record the followed inputs and outputs of a discipline execution
+        '''
+        discipline_name = discipline.get_disc_full_name()
+        input_names = [name for name in discipline._data_in if name in self.variables]
+        inputs_dict = {name: discipline.get_sosdisc_inputs(name)
+                       for name in input_names}
+        if self.mda_run > 0 and discipline_name in self.discipline_inputs and len(input_names) > 0 and \
+                all(np.array_equal(self.discipline_inputs[discipline_name].get(name), self.get_array(value))
+                    for name, value in inputs_dict.items()):
+            self.start_mda_run()
+        elif discipline_name in self.executed_disciplines:
+            self.start_iteration()
+        self.record(inputs_dict)
+        self.executed_disciplines.add(discipline_name)
+        self.discipline_inputs[discipline_name] = {name: self.get_array(value)
+                                                   for name, value in inputs_dict.items()}
+        self.record(outputs_dict)
+
+    def get_history_df(self):
+        '''
+        Dataframe of the residuals, a column per variable and a row per MDA run and iteration
+        from 1, the variables without new value at an iteration are NaN
+        '''
+        records_df = pd.DataFrame(self.history, columns=self.HISTORY_COLUMNS)
+        if records_df.empty:
+            return pd.DataFrame(index=pd.MultiIndex.from_tuples([], names=['mda_run', 'iteration']))
+        history_df = records_df.pivot_table(index=['mda_run', 'iteration'], columns='variable',
+                                            values='residual', aggfunc='last')
+        history_df.columns.name = None
+        return history_df
+
+    def get_final_residuals(self):
+        '''
+        Last residual of each variable in the last MDA run, the slowest variables first
+        '''
+        final_residuals = {}
+        for mda_run, _, name, residual in self.history:
+            if mda_run == self.mda_run:
+                final_residuals[name] = residual
+        return pd.Series(final_residuals, dtype=float).sort_values(ascending=False)
+
+    def reset(self):
+        self.history = []
+        self.previous_values = {}
+        self.mda_run = 0
+        self.iteration = 0
+        self.executed_disciplines = set()
+        self.discipline_inputs = {}
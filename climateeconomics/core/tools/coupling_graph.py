@@ -0,0 +1,189 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+
+class CouplingGraph():
+    '''
+    Data flow graph between the configured disciplines of a coupling
+
+    Disciplines are keyed by their full name and variables are identified by their full name,
+    which holds the namespace value of shared variables. The graph is built after
+    ee.configure() so that the dynamic inputs and outputs (setup_sos_disciplines) are included.
+    The strongly connected components give the disciplines that need an MDA, the other
+    disciplines can run once before or after it.
+    '''
+
+    def __init__(self, disciplines_io):
+        '''
+        disciplines_io: dict {discipline name: (set of input ids, set of output ids)}, in the
+        order of the process
+        '''
+        self.disciplines = list(disciplines_io)
+        self.disciplines_io = disciplines_io
+        self.successors = self.compute_successors()
+
+    @classmethod
+    def from_coupling(cls, coupling):
+        '''
+        Graph of the sub disciplines of a configured coupling, a nested coupling is seen as one
+        discipline. Two disciplines with the same full name get an index suffix so that none of
+        them is dropped.
+        '''
+        disciplines_io = {}
+        for discipline in coupling.sos_disciplines:
+            input_ids = set(discipline.get_input_data_names())
+            output_ids = set(discipline.get_output_data_names())
+            name = discipline.get_disc_full_name()
+            i = 1
+            while name in disciplines_io:
+                i += 1
+                name = f'{discipline.get_disc_full_name()} ({i})'
+            # variables computed inside a nested coupling are not inputs of it
+            disciplines_io[name] = (input_ids - output_ids, output_ids)
+
+        return cls(disciplines_io)
+
+    def compute_successors(self):
+        '''
+        Disciplines using an output of each discipline
+        '''
+        producers = {}
+        for name, (_, output_ids) in self.disciplines_io.items():
+            for output_id in output_ids:
+                producers.setdefault(output_id, []).append(name)
+
+        successors = {name: set() for name in self.disciplines}
+        for name, (input_ids, _) in self.disciplines_io.items():
+            for input_id in input_ids:
+                for producer in producers.get(input_id, []):
+                    successors[producer].add(name)
+
+        return successors
+
+    def get_strongly_connected_components(self):
+        '''
+        Strongly connected components in topological order (Tarjan algorithm, iterative to handle
+        long chains), disciplines of a component are in the order of the process
+        '''
+        index = {}
+        low_link = {}
+        stack = []
+        on_stack = set()
+        components = []
+        order = {name: i for i, name in enumerate(self.disciplines)}
+
+        for root in self.disciplines:
+            if root in index:
+                continue
+            work = [(root, iter(sorted(self.successors[root], key=order.get)))]
+            index[root] = low_link[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                name, successors = work[-1]
+                for successor in successors:
+                    if successor not in index:
+                        index[successor] = low_link[successor] = len(index)
+                        stack.append(successor)
+                        on_stack.add(successor)
+                        work.append(
+                            (successor, iter(sorted(self.successors[successor], key=order.get))))
+                        break
+                    if successor in on_stack:
+                        low_link[name] = min(low_link[name], index[successor])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low_link[parent] = min(low_link[parent], low_link[name])
+                    if low_link[name] == index[name]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == name:
+                                break
+                        components.append(sorted(component, key=order.get))
+
+        # Tarjan gives the components in reverse topological order
+        return components[::-1]
+
+    def get_topological_order(self):
+        return [name for component in self.get_strongly_connected_components()
+                for name in component]
+
+    def is_cyclic(self, component):
+        return len(component) > 1 or component[0] in self.successors[component[0]]
+
+    def get_reachable(self, names, successors):
+        reachable = set()
+        to_visit = list(names)
+        while to_visit:
+            name = to_visit.pop()
+            for successor in successors[name]:
+                if successor not in reachable:
+                    reachable.add(successor)
+                    to_visit.append(successor)
+        return reachable
+
+    def split_disciplines(self):
+        '''
+        Split the disciplines in (upstream, coupled, downstream) lists in topological order
+        The coupled disciplines are the cyclic components and the disciplines between them, they
+        need an MDA. Upstream disciplines do not depend on them and downstream disciplines do not
+        feed them, they run once.
+        '''
+        components = self.get_strongly_connected_components()
+        cyclic_names = {name for component in components if self.is_cyclic(component)
+                        for name in component}
+        predecessors = {name: set() for name in self.disciplines}
+        for name, successors in self.successors.items():
+            for successor in successors:
+                predecessors[successor].add(name)
+        descendants = self.get_reachable(cyclic_names, self.successors)
+        ancestors = self.get_reachable(cyclic_names, predecessors)
+
+        upstream, coupled, downstream = [], [], []
+        for name in self.get_topological_order():
+            if name in cyclic_names or (name in descendants and name in ancestors):
+                coupled.append(name)
+            elif name in descendants:
+                downstream.append(name)
+            else:
+                upstream.append(name)
+
+        return upstream, coupled, downstream
+
+    def get_saved_evaluations(self, nb_mda_iterations):
+        '''
+        Expected number of discipline evaluations saved per MDA when the upstream and downstream
+        disciplines run once instead of at each of the nb_mda_iterations
+        '''
+        upstream, _, downstream = self.split_disciplines()
+        return (len(upstream) + len(downstream)) * max(nb_mda_iterations - 1, 0)
+
+    def get_report(self, nb_mda_iterations=10):
+        upstream, coupled, downstream = self.split_disciplines()
+        nb_flat = len(self.disciplines) * nb_mda_iterations
+        nb_saved = self.get_saved_evaluations(nb_mda_iterations)
+        lines = [f'Coupling graph of {len(self.disciplines)} disciplines',
+                 f'upstream disciplines ({len(upstream)}): {", ".join(upstream)}',
+                 f'coupled disciplines ({len(coupled)}): {", ".join(coupled)}',
+                 f'downstream disciplines ({len(downstream)}): {", ".join(downstream)}',
+                 f'discipline evaluations for {nb_mda_iterations} MDA iterations: '
+                 f'{nb_flat} in one coupling, {nb_flat - nb_saved} with a sub-MDA ({nb_saved} saved)']
+        return '\n'.join(lines)
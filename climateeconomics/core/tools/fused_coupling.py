@@ -0,0 +1,363 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import logging
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import bmat, csc_matrix, csr_matrix, identity, issparse
+from scipy.sparse.linalg import splu
+
+
+class LocalDiscipline():
+    '''
+    Mixin running a discipline of a FusedCoupling outside of the execution engine
+
+    The inputs are read in the coupling values of the fused coupling, then in the inputs of the
+    fused discipline. The outputs and the partial derivatives are kept in the local discipline.
+    '''
+
+    def setup_local(self, fused_coupling, sos_name):
+        self.fused_coupling = fused_coupling
+        self.sos_name = sos_name
+        self.dynamic_inputs = {}
+        self.local_outputs = {}
+        self.partial_derivatives = {}
+
+    @property
+    def _data_in(self):
+        return self.fused_coupling.discipline._data_in
+
+    def get_input_names(self):
+        return list(self.DESC_IN.keys()) + [key for key in self.dynamic_inputs if key not in self.DESC_IN]
+
+    def get_sosdisc_inputs(self, keys=None, in_dict=False, **kwargs):
+        if keys is None:
+            return {key: self.fused_coupling.get_value(key) for key in self.get_input_names()}
+        if isinstance(keys, str):
+            return self.fused_coupling.get_value(keys)
+        if in_dict:
+            return {key: self.fused_coupling.get_value(key) for key in keys}
+        return [self.fused_coupling.get_value(key) for key in keys]
+
+    def get_sosdisc_outputs(self, keys=None, in_dict=False, **kwargs):
+        if keys is None:
+            return dict(self.local_outputs)
+        if isinstance(keys, str):
+            return self.local_outputs.get(keys)
+        if in_dict:
+            return {key: self.local_outputs.get(key) for key in keys}
+        return [self.local_outputs.get(key) for key in keys]
+
+    def store_sos_outputs_values(self, dict_values, *args, **kwargs):
+        self.local_outputs.update(dict_values)
+
+    def add_inputs(self, inputs_dict, *args, **kwargs):
+        self.dynamic_inputs = dict(inputs_dict)
+
+    def set_dynamic_default_values(self, default_values_dict):
+        self.fused_coupling.discipline.set_dynamic_default_values(
+            default_values_dict)
+
+    def set_partial_derivative_for_other_types(self, y_key, x_key, value):
+        self.partial_derivatives[(tuple(y_key), tuple(x_key))] = value
+
+
+class FusedCoupling():
+    '''
+    Small system of coupled disciplines solved inside a single discipline
+
+    Each discipline class is instanciated as a LocalDiscipline. The coupling variables are the
+    outputs of a discipline read by another one, the other inputs are the inputs of the fused
+    discipline. The system starts with a Gauss-Seidel sweep from the initial values of the
+    coupling variables, then Newton steps (I - dF/dy) dy = F(y) - y are taken with the partial
+    derivatives of the disciplines until the residual is below the tolerance.
+    The total derivatives of the outputs wrt the inputs are
+    dz/dx = dF/dx + dF/dy (I - dF/dy)^-1 dF/dx
+    A variable is referenced by a key (name, column) for a dataframe column, (name, ) otherwise.
+    After solve, n_iterations and residual give the number of iterations and the relative residual
+    of the coupling variables. As for the MDA with max_mda_iter, a warning is logged when the
+    residual is still above the tolerance after max_iter iterations.
+    '''
+
+    def __init__(self, discipline, discipline_classes, logger=None):
+        '''
+        discipline: fused discipline giving the inputs (get_sosdisc_inputs, _data_in) and the
+        dynamic default values (set_dynamic_default_values)
+        discipline_classes: dict {name: discipline class}
+        logger: logger of the fused discipline, the module logger by default
+        '''
+        self.discipline = discipline
+        self.logger = logger if logger is not None else logging.getLogger(__name__)
+        self.coupling_names = self.get_coupling_names(discipline_classes)
+        self.disciplines = {}
+        for name, discipline_class in discipline_classes.items():
+            local_class = type(f'Local{discipline_class.__name__}',
+                               (LocalDiscipline, discipline_class), {})
+            local_discipline = local_class.__new__(local_class)
+            local_discipline.setup_local(self, name)
+            self.disciplines[name] = local_discipline
+        self.coupling_values = {}
+        self.input_values = None
+        self.n_iterations = 0
+        self.residual = None
+
+    @staticmethod
+    def get_coupling_names(discipline_classes):
+        output_names = {name for discipline_class in discipline_classes.values()
+                        for name in discipline_class.DESC_OUT}
+        coupling_names = []
+        for discipline_class in discipline_classes.values():
+            coupling_names.extend([name for name in discipline_class.DESC_IN
+                                   if name in output_names and name not in coupling_names])
+        return coupling_names
+
+    @classmethod
+    def get_desc(cls, discipline_classes):
+        '''
+        DESC_IN and DESC_OUT of the fused discipline: the inputs which are not coupling variables
+        and all the outputs of the disciplines
+        '''
+        coupling_names = cls.get_coupling_names(discipline_classes)
+        desc_in = {}
+        desc_out = {}
+        for discipline_class in discipline_classes.values():
+            for name, desc in discipline_class.DESC_IN.items():
+                if name not in coupling_names:
+                    desc_in.setdefault(name, desc)
+            desc_out.update(discipline_class.DESC_OUT)
+        return desc_in, desc_out
+
+    def get_value(self, name):
+        if name in self.coupling_names:
+            return self.coupling_values.get(name)
+        if self.input_values is not None:
+            return self.input_values.get(name)
+        return self.discipline.get_sosdisc_inputs(name)
+
+    def setup(self):
+        '''
+        Setup the disciplines, returns their dynamic inputs
+        '''
+        dynamic_inputs = {}
+        for local_discipline in self.disciplines.values():
+            local_discipline.setup_sos_disciplines()
+            dynamic_inputs.update(local_discipline.dynamic_inputs)
+        return dynamic_inputs
+
+    def init_execution(self):
+        for local_discipline in self.disciplines.values():
+            local_discipline.init_execution()
+
+    def get_outputs(self):
+        outputs = {}
+        for local_discipline in self.disciplines.values():
+            outputs.update(local_discipline.local_outputs)
+        return outputs
+
+    def run_gauss_seidel(self):
+        '''
+        Run each discipline once, a discipline runs as soon as all its coupling inputs have a value
+        '''
+        remaining = list(self.disciplines.values())
+        while remaining:
+            local_discipline = next((local_discipline for local_discipline in remaining
+                                     if all(self.coupling_values.get(name) is not None
+                                            for name in local_discipline.DESC_IN if name in self.coupling_names)),
+                                    None)
+            if local_discipline is None:
+                missing = sorted({name for local_discipline in remaining for name in local_discipline.DESC_IN
+                                  if name in self.coupling_names and self.coupling_values.get(name) is None})
+                raise ValueError(
+                    f'Initial values are needed for the coupling variables {missing}')
+            local_discipline.run()
+            self.update_coupling_values(local_discipline.local_outputs)
+            remaining.remove(local_discipline)
+
+    def update_coupling_values(self, outputs):
+        self.coupling_values.update({name: value for name, value in outputs.items()
+                                     if name in self.coupling_names})
+
+    def solve(self, input_values, initial_values, tolerance=1.0e-10, max_iter=50):
+        '''
+        Solve the coupling variables for the inputs of the fused discipline
+        initial_values: dict {coupling name: initial value or None}
+        Returns the outputs of all the disciplines
+        '''
+        self.input_values = input_values
+        try:
+            self.coupling_values = {name: value for name, value in initial_values.items()
+                                    if name in self.coupling_names and value is not None}
+            self.run_gauss_seidel()
+            self.n_iterations = 1
+            while True:
+                for local_discipline in self.disciplines.values():
+                    local_discipline.run()
+                outputs = self.get_outputs()
+                coupling_keys = self.get_keys(self.coupling_values)
+                coupling_vector = self.to_vector(self.coupling_values, coupling_keys)
+                residual = self.to_vector(outputs, coupling_keys) - coupling_vector
+                self.residual = np.linalg.norm(residual) / \
+                    max(np.linalg.norm(coupling_vector), 1.0)
+                if self.residual <= tolerance:
+                    break
+                if self.n_iterations >= max_iter:
+                    self.logger.warning(f'The fused coupling has reached its maximum number of iterations {max_iter} '
+                                        f'but the residual {self.residual} is still above the tolerance {tolerance}')
+                    break
+                self.n_iterations += 1
+                d_couplings = self.get_coupling_jacobian(coupling_keys)
+                step = splu(csc_matrix(identity(d_couplings.shape[0]) - d_couplings)).solve(residual)
+                self.coupling_values = self.from_vector(
+                    self.coupling_values, coupling_keys, coupling_vector + step)
+        finally:
+            self.input_values = None
+        return outputs
+
+    def linearize(self):
+        for local_discipline in self.disciplines.values():
+            local_discipline.partial_derivatives = {}
+            local_discipline.compute_sos_jacobian()
+
+    def get_partial_derivatives(self):
+        partial_derivatives = {}
+        for local_discipline in self.disciplines.values():
+            partial_derivatives.update(local_discipline.partial_derivatives)
+        return partial_derivatives
+
+    def get_coupling_jacobian(self, coupling_keys):
+        '''
+        Partial derivatives of the coupling outputs wrt the coupling inputs at the last run
+        '''
+        self.linearize()
+        sizes = self.get_sizes(self.coupling_values, coupling_keys)
+        return self.assemble(self.get_partial_derivatives(), coupling_keys, coupling_keys, sizes, sizes)
+
+    def compute_total_derivatives(self):
+        '''
+        Total derivatives of the outputs wrt the inputs of the fused discipline at the solution,
+        returns a dict {(output key, input key): jacobian}
+        '''
+        input_values = self.discipline.get_sosdisc_inputs()
+        self.input_values = input_values
+        try:
+            self.linearize()
+        finally:
+            self.input_values = None
+        partial_derivatives = self.get_partial_derivatives()
+        coupling_keys = self.get_keys(self.coupling_values)
+        coupling_sizes = self.get_sizes(self.coupling_values, coupling_keys)
+        coupling_index = {key: index for index, key in enumerate(coupling_keys)}
+        splu_factor = splu(csc_matrix(identity(sum(coupling_sizes.values())) -
+                                      self.assemble(partial_derivatives, coupling_keys, coupling_keys,
+                                                    coupling_sizes, coupling_sizes)))
+        offsets = np.cumsum([0] + [coupling_sizes[key] for key in coupling_keys])
+
+        input_keys = []
+        output_keys = []
+        for y_key, x_key in partial_derivatives:
+            if x_key[0] not in self.coupling_names and x_key not in input_keys:
+                input_keys.append(x_key)
+            if y_key not in output_keys:
+                output_keys.append(y_key)
+        outputs = self.get_outputs()
+        output_sizes = self.get_sizes(outputs, output_keys)
+
+        total_derivatives = {}
+        for x_key in input_keys:
+            x_size = self.get_sizes(input_values, [x_key])
+            d_couplings_d_x = self.assemble(partial_derivatives, coupling_keys, [x_key],
+                                            coupling_sizes, x_size)
+            if d_couplings_d_x.nnz > 0:
+                d_couplings_d_x = splu_factor.solve(d_couplings_d_x.toarray())
+            else:
+                d_couplings_d_x = None
+            for y_key in output_keys:
+                total = None
+                if (y_key, x_key) in partial_derivatives:
+                    total = self.to_block(partial_derivatives[(y_key, x_key)],
+                                          (output_sizes[y_key], x_size[x_key])).toarray()
+                if d_couplings_d_x is not None:
+                    for coupling_key in coupling_keys:
+                        if (y_key, coupling_key) in partial_derivatives:
+                            index = coupling_index[coupling_key]
+                            term = self.to_block(partial_derivatives[(y_key, coupling_key)],
+                                                 (output_sizes[y_key], coupling_sizes[coupling_key])) @ \
+                                d_couplings_d_x[offsets[index]:offsets[index + 1]]
+                            total = term if total is None else total + term
+                if total is not None:
+                    total_derivatives[(y_key, x_key)] = total
+        return total_derivatives
+
+    def get_keys(self, values):
+        keys = []
+        for name, value in values.items():
+            if isinstance(value, pd.DataFrame):
+                keys.extend([(name, column)
+                             for column in value.columns if column != 'years'])
+            else:
+                keys.append((name,))
+        return keys
+
+    def get_sizes(self, values, keys):
+        sizes = {}
+        for key in keys:
+            value = values[key[0]]
+            if len(key) == 2:
+                sizes[key] = len(value[key[1]])
+            elif isinstance(value, pd.DataFrame):
+                sizes[key] = len(value) * \
+                    len([column for column in value.columns if column != 'years'])
+            else:
+                sizes[key] = np.size(value)
+        return sizes
+
+    def to_vector(self, values, keys):
+        return np.concatenate([np.ravel(values[key[0]][key[1]].values) if len(key) == 2 else
+                               np.ravel(values[key[0]]) for key in keys])
+
+    def from_vector(self, values, keys, vector):
+        '''
+        Copy of the values with the variables of keys read in vector
+        '''
+        new_values = {name: value.copy() if isinstance(value, pd.DataFrame) else value
+                      for name, value in values.items()}
+        offset = 0
+        for key in keys:
+            value = new_values[key[0]]
+            size = len(value) if len(key) == 2 else np.size(value)
+            if len(key) == 2:
+                value[key[1]] = vector[offset:offset + size]
+            elif np.isscalar(value):
+                new_values[key[0]] = vector[offset]
+            else:
+                new_values[key[0]] = np.reshape(
+                    vector[offset:offset + size], np.shape(value))
+            offset += size
+        return new_values
+
+    def to_block(self, value, shape):
+        if issparse(value):
+            return csr_matrix(value)
+        return csr_matrix(np.reshape(np.asarray(value), shape))
+
+    def assemble(self, partial_derivatives, y_keys, x_keys, y_sizes, x_sizes):
+        '''
+        Sparse jacobian of the y_keys wrt the x_keys, missing partial derivatives are zero
+        '''
+        blocks = [[self.to_block(partial_derivatives[(y_key, x_key)], (y_sizes[y_key], x_sizes[x_key]))
+                   if (y_key, x_key) in partial_derivatives else csr_matrix((y_sizes[y_key], x_sizes[x_key]))
+                   for x_key in x_keys] for y_key in y_keys]
+        return bmat(blocks, format='csr')
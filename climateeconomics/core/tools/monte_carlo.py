@@ -0,0 +1,231 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+class StreamingQuantile():
+    '''
+    P-square estimator of a quantile of each element of a stream of arrays (Jain and Chlamtac)
+    Five markers are kept per element whatever the number of samples
+    '''
+
+    def __init__(self, probability):
+        self.probability = probability
+        self.first_samples = []
+        self.heights = None
+        self.positions = None
+        p = probability
+        self.desired_positions = np.array([0., 2. * p, 4. * p, 2. + 2. * p, 4.])
+        self.increments = np.array([0., p / 2., p, (1. + p) / 2., 1.])
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        if self.heights is None:
+            self.first_samples.append(values)
+            if len(self.first_samples) == 5:
+                self.heights = np.sort(np.array(self.first_samples), axis=0)
+                self.positions = np.repeat(
+                    np.arange(5.)[:, np.newaxis], values.size, axis=1).reshape((5,) + values.shape)
+                self.desired_positions = np.repeat(
+                    self.desired_positions[:, np.newaxis], values.size, axis=1).reshape((5,) + values.shape)
+                self.first_samples = []
+            return
+
+        heights, positions = self.heights, self.positions
+        # extreme markers follow the minimum and the maximum
+        heights[0] = np.minimum(heights[0], values)
+        heights[4] = np.maximum(heights[4], values)
+        # markers above the new value are shifted
+        positions[1:4] += values < heights[1:4]
+        positions[4] += 1.
+        self.desired_positions += self.increments.reshape(
+            (5,) + (1,) * values.ndim)
+
+        for i in range(1, 4):
+            delta = self.desired_positions[i] - positions[i]
+            move = ((delta >= 1.) & (positions[i + 1] - positions[i] > 1.)) | \
+                ((delta <= -1.) & (positions[i - 1] - positions[i] < -1.))
+            if not np.any(move):
+                continue
+            step = np.sign(delta) * move
+            parabolic = heights[i] + step / (positions[i + 1] - positions[i - 1]) * (
+                (positions[i] - positions[i - 1] + step) * (heights[i + 1] - heights[i]) /
+                (positions[i + 1] - positions[i]) +
+                (positions[i + 1] - positions[i] - step) * (heights[i] - heights[i - 1]) /
+                (positions[i] - positions[i - 1]))
+            neighbour_heights = np.where(step > 0, heights[i + 1], heights[i - 1])
+            neighbour_positions = np.where(
+                step > 0, positions[i + 1], positions[i - 1])
+            linear = heights[i] + step * (neighbour_heights - heights[i]) / \
+                np.where(move, neighbour_positions - positions[i], 1.)
+            in_bounds = (heights[i - 1] < parabolic) & (parabolic < heights[i + 1])
+            heights[i] = np.where(move, np.where(
+                in_bounds, parabolic, linear), heights[i])
+            positions[i] += step
+
+    def get_value(self):
+        if self.heights is None:
+            return np.quantile(np.array(self.first_samples), self.probability, axis=0)
+        return self.heights[2].copy()
+
+
+class StreamingStatistics():
+    '''
+    Mean, variance (Welford) and quantiles of each element of a stream of arrays, in constant memory
+    '''
+
+    def __init__(self, quantiles=(0.05, 0.5, 0.95)):
+        self.count = 0
+        self.mean = None
+        self.sum_squares = None
+        self.quantiles = {probability: StreamingQuantile(probability)
+                          for probability in quantiles}
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        if self.mean is None:
+            self.mean = np.zeros_like(values)
+            self.sum_squares = np.zeros_like(values)
+        self.count += 1
+        delta = values - self.mean
+        self.mean += delta / self.count
+        self.sum_squares += delta * (values - self.mean)
+        for quantile in self.quantiles.values():
+            quantile.update(values)
+
+    def get_variance(self):
+        if self.count < 2:
+            return np.zeros_like(self.mean)
+        return self.sum_squares / (self.count - 1)
+
+    def get_dataframe(self, years=None):
+        '''
+        Dataframe with mean, std and a column P<percent> per quantile, with a years column if given
+        '''
+        statistics_df = pd.DataFrame({'mean': self.mean.flatten(),
+                                      'std': np.sqrt(self.get_variance()).flatten()})
+        for probability, quantile in self.quantiles.items():
+            statistics_df[f'P{round(100 * probability)}'] = quantile.get_value().flatten()
+        if years is not None:
+            statistics_df.insert(0, 'years', years)
+        return statistics_df
+
+
+class MonteCarloRunner():
+    '''
+    Monte-Carlo propagation of parameter uncertainties through a study
+
+    Parameters are sampled from their distributions (scipy.stats frozen distributions) and set on
+    all the variables with their name, the outputs of each sample are aggregated by streaming
+    estimators so that the memory does not depend on the number of samples.
+    With several processes each worker builds the study once with study_factory and evaluates
+    its samples on it. study_factory must be defined at module level and return a loaded study.
+    outputs: dict {output name: column}, column is None for array outputs
+    '''
+
+    def __init__(self, study_factory, distributions, outputs, n_samples, n_processes=1, seed=0,
+                 quantiles=(0.05, 0.5, 0.95)):
+        self.study_factory = study_factory
+        self.distributions = distributions
+        self.outputs = outputs
+        self.n_samples = n_samples
+        self.n_processes = n_processes
+        self.seed = seed
+        self.quantiles = quantiles
+        self.statistics = {}
+        self.years = {}
+        self.n_failed = 0
+
+    def get_samples(self):
+        '''
+        Samples of the parameters, dataframe with a column per parameter
+        '''
+        rng = np.random.default_rng(self.seed)
+        return pd.DataFrame({parameter: distribution.rvs(size=self.n_samples, random_state=rng)
+                             for parameter, distribution in self.distributions.items()})
+
+    def run(self):
+        '''
+        Evaluate all the samples, returns the statistics of each output as a dict of dataframes
+        '''
+        self.statistics = {name: StreamingStatistics(self.quantiles)
+                           for name in self.outputs}
+        self.n_failed = 0
+        samples = self.get_samples().to_dict('records')
+
+        if self.n_processes > 1:
+            with ProcessPoolExecutor(max_workers=self.n_processes, initializer=init_monte_carlo_worker,
+                                     initargs=(self.study_factory,)) as executor:
+                chunksize = max(1, len(samples) // (4 * self.n_processes))
+                for result in executor.map(evaluate_monte_carlo_sample, samples,
+                                           [self.outputs] * len(samples), chunksize=chunksize):
+                    self.add_result(result)
+        else:
+            init_monte_carlo_worker(self.study_factory)
+            for sample in samples:
+                self.add_result(
+                    evaluate_monte_carlo_sample(sample, self.outputs))
+
+        return self.get_results()
+
+    def add_result(self, result):
+        if result is None:
+            self.n_failed += 1
+            return
+        for name, (years, values) in result.items():
+            self.years[name] = years
+            self.statistics[name].update(values)
+
+    def get_results(self):
+        return {name: statistics.get_dataframe(self.years.get(name))
+                for name, statistics in self.statistics.items() if statistics.count > 0}
+
+
+# study of the worker process, built once by init_monte_carlo_worker
+_worker_study = None
+
+
+def init_monte_carlo_worker(study_factory):
+    global _worker_study
+    _worker_study = study_factory()
+
+
+def evaluate_monte_carlo_sample(sample, outputs):
+    '''
+    Run the study of the worker with the sampled parameters
+    Returns {output name: (years or None, values)}, None if the evaluation failed
+    '''
+    ee = _worker_study.execution_engine
+    values_dict = {full_name: value for parameter, value in sample.items()
+                   for full_name in ee.dm.get_all_namespaces_from_var_name(parameter)}
+    try:
+        ee.load_study_from_input_dict(values_dict)
+        ee.execute()
+    except Exception:
+        return None
+
+    result = {}
+    for name, column in outputs.items():
+        value = ee.dm.get_value(ee.dm.get_all_namespaces_from_var_name(name)[0])
+        if column is None:
+            result[name] = (None, np.real(np.asarray(value, dtype=complex)).flatten())
+        else:
+            years = value['years'].values if 'years' in value else None
+            result[name] = (years, np.real(value[column].values.astype(complex)))
+    return result
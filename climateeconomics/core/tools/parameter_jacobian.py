@@ -0,0 +1,65 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+from functools import wraps
+
+import numpy as np
+import pandas as pd
+
+# model attributes defining the years of every jacobian block
+TIME_PARAMETERS = ('year_start', 'year_end', 'time_step')
+
+
+def get_parameter_key(value):
+    '''
+    Comparable key of a parameter value, arrays and dataframes are compared on their content
+    '''
+    if isinstance(value, dict):
+        return tuple((key, get_parameter_key(item)) for key, item in value.items())
+    if isinstance(value, pd.DataFrame):
+        return tuple(value.columns), value.values.tobytes()
+    if isinstance(value, np.ndarray):
+        return value.shape, value.dtype.str, value.tobytes()
+    return value
+
+
+def parameter_jacobian(*parameters):
+    '''
+    Decorator of the model methods computing jacobian blocks which only depend on the years and
+    on fixed parameters of the model, not on the coupling values
+
+    The blocks are computed at the first call and reused by the next compute_sos_jacobian calls
+    as long as year_start, year_end, time_step and the given parameters (attribute names of
+    the model) are unchanged. The model is built in init_execution so blocks are computed once
+    per configure. The cached arrays are read-only, callers must not modify them in place.
+    '''
+    def decorator(method):
+        @wraps(method)
+        def cached_method(model):
+            key = tuple(get_parameter_key(getattr(model, name, None))
+                        for name in TIME_PARAMETERS + parameters)
+            cache = model.__dict__.setdefault('_parameter_jacobians', {})
+            cached_key, blocks = cache.get(method.__name__, (None, None))
+            if blocks is None or cached_key != key:
+                blocks = method(model)
+                for block in blocks if isinstance(blocks, tuple) else (blocks,):
+                    if isinstance(block, np.ndarray):
+                        block.flags.writeable = False
+                cache[method.__name__] = (key, blocks)
+            return blocks
+
+        return cached_method
+
+    return decorator
@@ -0,0 +1,256 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import json
+import time
+from importlib import import_module
+from itertools import product
+from os.path import exists
+
+import numpy as np
+import pandas as pd
+
+from sos_trades_core.execution_engine.execution_engine import ExecutionEngine
+
+
+class ProcessBenchmark():
+    '''
+    Run processes on their usecase for a matrix of MDA settings and record for each combination
+    the wall time, the number of discipline calls, the number of iterations of each MDA and the
+    final residual in a csv or json history file
+
+    The wall time is the time of the execution plus the time of the linearization of the
+    differentiated outputs wrt the differentiated inputs under the linearization mode of the
+    combination. Processes without differentiated variables are only executed, their
+    linearization mode is NO_LINEARIZATION.
+
+    The history is appended at each run so that the benchmarks of several sessions or machines
+    can be compared, get_fastest_configurations gives the fastest converged settings per process.
+    '''
+    # process name: (process repository, process, usecase module)
+    PROCESSES = {'witness': ('climateeconomics.sos_processes.iam.witness', 'witness', 'usecase_witness'),
+                 'witness_coarse': ('climateeconomics.sos_processes.iam.witness', 'witness_coarse',
+                                    'usecase_witness_coarse_new'),
+                 'dice_model': ('climateeconomics.sos_processes.iam.dice', 'dice_model', 'usecase'),
+                 'sectorization_process': ('climateeconomics.sos_processes.iam.witness', 'sectorization_process',
+                                           'usecase'),
+                 'resources_process': ('climateeconomics.sos_processes.iam.witness', 'resources_process', 'usecase')}
+    # process name: (differentiated inputs, differentiated outputs), names below the study
+    DIFFERENTIATED_VARIABLES = {'witness': (['total_investment_share_of_gdp'], ['welfare_objective']),
+                                'witness_coarse': (['total_investment_share_of_gdp'], ['welfare_objective'])}
+    NO_LINEARIZATION = 'none'
+    SUB_MDA_CLASSES = ['MDAGaussSeidel', 'GSNewtonMDA', 'GSPureNewtonMDA']
+    HISTORY_COLUMNS = ['process', 'sub_mda_class', 'n_processes', 'linearization_mode', 'status',
+                       'wall_time', 'execute_time', 'linearize_time', 'discipline_calls', 'mda_iterations',
+                       'max_mda_iterations', 'final_residual', 'error', 'date']
+    STUDY_NAME = 'Benchmark'
+
+    def __init__(self, history_file, processes=None, sub_mda_classes=None, n_processes_list=(1,),
+                 linearization_modes=('auto',), numerical_values=None, differentiated_variables=None):
+        '''
+        history_file: csv or json file, the records are appended to it
+        numerical_values: other values of the root coupling, {'tolerance': 1e-10} for instance
+        differentiated_variables: {process name: (inputs, outputs)} to update DIFFERENTIATED_VARIABLES
+        '''
+        self.history_file = history_file
+        self.processes = list(self.PROCESSES) if processes is None else list(processes)
+        self.sub_mda_classes = self.SUB_MDA_CLASSES if sub_mda_classes is None else list(
+            sub_mda_classes)
+        self.n_processes_list = list(n_processes_list)
+        self.linearization_modes = list(linearization_modes)
+        self.numerical_values = {'tolerance': 1.0e-10, 'max_mda_iter': 200}
+        if numerical_values is not None:
+            self.numerical_values.update(numerical_values)
+        self.differentiated_variables = dict(self.DIFFERENTIATED_VARIABLES)
+        if differentiated_variables is not None:
+            self.differentiated_variables.update(differentiated_variables)
+
+    def get_combinations(self):
+        '''
+        Combinations of settings, the linearization modes only apply to the processes with
+        differentiated variables
+        '''
+        combinations = []
+        for process_name in self.processes:
+            linearization_modes = self.linearization_modes if process_name in self.differentiated_variables \
+                else [self.NO_LINEARIZATION]
+            combinations.extend(product([process_name], self.sub_mda_classes, self.n_processes_list,
+                                        linearization_modes))
+        return combinations
+
+    def build_study(self, process_name):
+        '''
+        Build an execution engine with the process and the data of its usecase
+        '''
+        repo, process, usecase_module = self.PROCESSES[process_name]
+        ee = ExecutionEngine(self.STUDY_NAME)
+        builder = ee.factory.get_builder_from_process(repo, process)
+        ee.factory.set_builders_to_coupling_builder(builder)
+        ee.configure()
+
+        usecase = import_module(f'{repo}.{process}.{usecase_module}').Study(
+            execution_engine=ee)
+        usecase.study_name = self.STUDY_NAME
+        values_dict = {}
+        for dict_values in usecase.setup_usecase():
+            values_dict.update(dict_values)
+
+        return ee, values_dict
+
+    def run_case(self, process_name, sub_mda_class, n_processes, linearization_mode):
+        '''
+        Run a process with the MDA settings, returns the record of the run
+        '''
+        record = {'process': process_name, 'sub_mda_class': sub_mda_class, 'n_processes': n_processes,
+                  'linearization_mode': linearization_mode, 'date': time.strftime('%Y-%m-%d %H:%M:%S')}
+        try:
+            ee, values_dict = self.build_study(process_name)
+            settings = dict(self.numerical_values)
+            settings.update({'sub_mda_class': sub_mda_class,
+                             'n_processes': n_processes})
+            if linearization_mode != self.NO_LINEARIZATION:
+                settings['linearization_mode'] = linearization_mode
+            values_dict.update({f'{self.STUDY_NAME}.{key}': value
+                                for key, value in settings.items()})
+            ee.load_study_from_input_dict(values_dict)
+
+            start_time = time.perf_counter()
+            ee.execute()
+            record['execute_time'] = time.perf_counter() - start_time
+            # the MDAs are read before the linearization
+            mda_results = get_mda_results(ee)
+
+            record['linearize_time'] = 0.0
+            if linearization_mode != self.NO_LINEARIZATION:
+                inputs, outputs = self.differentiated_variables[process_name]
+                start_time = time.perf_counter()
+                linearize_study(ee, [f'{self.STUDY_NAME}.{name}' for name in inputs],
+                                [f'{self.STUDY_NAME}.{name}' for name in outputs])
+                record['linearize_time'] = time.perf_counter() - start_time
+            record['wall_time'] = record['execute_time'] + \
+                record['linearize_time']
+
+            final_residuals = [residual for _, residual in mda_results.values()
+                               if not np.isnan(residual)]
+            record.update({'status': 'done',
+                           'discipline_calls': get_discipline_calls(ee),
+                           'mda_iterations': json.dumps({name: iterations for name, (iterations, _)
+                                                         in mda_results.items()}),
+                           'max_mda_iterations': max([iterations for iterations, _ in mda_results.values()],
+                                                     default=0),
+                           'final_residual': max(final_residuals, default=np.nan)})
+        except Exception as error:
+            # a failing combination is recorded, the other ones are still run
+            record.update({'status': 'failed', 'error': repr(error)})
+
+        return record
+
+    def run(self):
+        '''
+        Run all the combinations, each record is appended to the history when its run is done
+        Returns the records of the session as a dataframe
+        '''
+        records = []
+        for combination in self.get_combinations():
+            record = self.run_case(*combination)
+            self.append_to_history(record)
+            records.append(record)
+
+        return pd.DataFrame(records, columns=self.HISTORY_COLUMNS)
+
+    def append_to_history(self, record):
+        record = {column: record.get(column, np.nan)
+                  for column in self.HISTORY_COLUMNS}
+        if self.history_file.endswith('.json'):
+            history = []
+            if exists(self.history_file):
+                with open(self.history_file, 'r') as history_file:
+                    history = json.load(history_file)
+            history.append({key: None if isinstance(value, float) and np.isnan(value) else value
+                            for key, value in record.items()})
+            with open(self.history_file, 'w') as history_file:
+                json.dump(history, history_file, indent=1)
+        else:
+            pd.DataFrame([record], columns=self.HISTORY_COLUMNS).to_csv(
+                self.history_file, mode='a', header=not exists(self.history_file), index=False)
+
+    def load_history(self):
+        if self.history_file.endswith('.json'):
+            with open(self.history_file, 'r') as history_file:
+                return pd.DataFrame(json.load(history_file), columns=self.HISTORY_COLUMNS)
+        return pd.read_csv(self.history_file)
+
+    @staticmethod
+    def get_fastest_configurations(history_df):
+        '''
+        Fastest converged MDA settings per process, on the mean wall time of their runs
+        '''
+        done_df = history_df[history_df['status'] == 'done']
+        mean_df = done_df.groupby(['process', 'sub_mda_class', 'n_processes', 'linearization_mode'],
+                                  as_index=False)[['wall_time', 'discipline_calls', 'max_mda_iterations']].mean()
+        fastest_index = mean_df.groupby('process')['wall_time'].idxmin()
+
+        return mean_df.loc[fastest_index].reset_index(drop=True)
+
+
+def get_discipline_calls(ee):
+    '''
+    Total number of executions of the disciplines of the study, couplings excluded
+    '''
+    return int(sum(getattr(discipline_info['reference'], 'n_calls', 0) or 0
+                   for discipline_info in ee.dm.disciplines_dict.values()
+                   if not hasattr(discipline_info['reference'], 'sub_mda_list')))
+
+
+def get_mda_results(ee):
+    '''
+    Number of iterations and final residual of each MDA of the study, the MDAs are named by the
+    full name of their coupling and their index in it
+    '''
+    mda_results = {}
+    for discipline_info in ee.dm.disciplines_dict.values():
+        coupling = discipline_info['reference']
+        for i, sub_mda in enumerate(getattr(coupling, 'sub_mda_list', None) or []):
+            residuals = get_mda_residuals(sub_mda)
+            mda_results[f'{coupling.get_disc_full_name()}.MDA_{i}'] = (
+                len(residuals), residuals[-1] if len(residuals) > 0 else np.nan)
+    return mda_results
+
+
+def get_mda_residuals(sub_mda):
+    '''
+    Normed residuals of the iterations of an MDA
+    '''
+    # gemseo stores (residual, iteration) tuples
+    return [float(np.real(residual[0] if isinstance(residual, (tuple, list)) else residual))
+            for residual in getattr(sub_mda, 'residual_history', [])]
+
+
+def linearize_study(ee, inputs, outputs):
+    '''
+    Linearize the root coupling of an executed study, with the linearization mode of the study
+    '''
+    root_process = ee.root_process
+    root_process.add_differentiated_inputs(inputs)
+    root_process.add_differentiated_outputs(outputs)
+    return root_process.linearize(root_process.local_data, force_no_exec=True)
+
+
+if '__main__' == __name__:
+    benchmark = ProcessBenchmark('process_benchmark_history.csv',
+                                 processes=['dice_model', 'witness_coarse'],
+                                 linearization_modes=['direct', 'adjoint'])
+    benchmark.run()
+    print(benchmark.get_fastest_configurations(benchmark.load_history()))
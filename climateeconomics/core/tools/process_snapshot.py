@@ -0,0 +1,212 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import hashlib
+import json
+from os import makedirs
+from os.path import join, exists
+
+
+class ProcessSnapshotCache():
+    '''
+    Serialisable snapshots of the builders of a process, to skip the get_builders of the process
+    and of its sub-processes when the same process is built again
+
+    A snapshot holds the namespaces defined by the process (every add_ns_def of the build, relative
+    to the study name, see BuildRecorder), the post-processing modules it registers and the tree
+    of its builders: discipline modules and couplings with their builder info. It is keyed by the process and its arguments (techno_dict,
+    process_level...). Processes with other builders (scatter, optim scenario) are not cached and
+    are built as usual.
+    Snapshots are kept in memory for the session and in json files if a directory is given.
+    '''
+    STUDY_NAME_TAG = '<study_name>'
+    COUPLING_CLASS_NAME = 'SoSCoupling'
+    # builder args set by the factory, not part of the builder info
+    FACTORY_ARGS = ['sos_name', 'ee', 'cls_builder']
+    # in-memory snapshots of the session {key: snapshot}
+    snapshots = {}
+
+    def __init__(self, directory=None):
+        self.directory = directory
+
+    @staticmethod
+    def get_snapshot_key(repo, process, **process_args):
+        key_content = json.dumps([repo, process, process_args],
+                                 sort_keys=True, default=str)
+        return hashlib.sha1(key_content.encode('utf-8')).hexdigest()
+
+    def get_builders(self, ee, repo, process, **process_args):
+        '''
+        Builders of the process, from its snapshot if the process was already built with the
+        same arguments
+        '''
+        key = self.get_snapshot_key(repo, process, **process_args)
+        snapshot = self.load(key)
+        if snapshot is not None:
+            return self.restore(ee, snapshot)
+
+        builders, snapshot = self.build(ee, repo, process, **process_args)
+        if snapshot is not None:
+            self.save(key, snapshot)
+        return builders
+
+    def build(self, ee, repo, process, **process_args):
+        '''
+        Build the process and its snapshot, the snapshot is None if the builders are not supported
+        '''
+        with BuildRecorder(ee) as recorder:
+            builders = ee.factory.get_builder_from_process(
+                repo, process, **process_args)
+
+        builder_list = builders if isinstance(builders, list) else [builders]
+        try:
+            builder_descriptions = [self.describe_builder(builder) for builder in builder_list]
+        except ValueError:
+            return builders, None
+
+        snapshot = {'namespaces': {name: self.to_relative_value(ee, value)
+                                   for name, value in recorder.namespaces.items()},
+                    'post_processings': recorder.post_processings,
+                    'builders': builder_descriptions,
+                    'is_list': isinstance(builders, list)}
+        return builders, snapshot
+
+    def restore(self, ee, snapshot):
+        ee.ns_manager.add_ns_def({name: self.to_absolute_value(ee, value)
+                                  for name, value in snapshot['namespaces'].items()})
+        for namespace, module in snapshot['post_processings']:
+            ee.post_processing_manager.add_post_processing_module_to_namespace(
+                namespace, module)
+        builders = [self.create_builder(ee, description)
+                    for description in snapshot['builders']]
+        return builders if snapshot['is_list'] else builders[0]
+
+    def to_relative_value(self, ee, value):
+        if value == ee.study_name or value.startswith(f'{ee.study_name}.'):
+            return self.STUDY_NAME_TAG + value[len(ee.study_name):]
+        return value
+
+    def to_absolute_value(self, ee, value):
+        if value.startswith(self.STUDY_NAME_TAG):
+            return ee.study_name + value[len(self.STUDY_NAME_TAG):]
+        return value
+
+    def describe_builder(self, builder):
+        '''
+        Serialisable description of a builder, ValueError if the builder is not supported
+        '''
+        builder_info = {key: value for key, value in builder.args.items()
+                        if key not in self.FACTORY_ARGS}
+        try:
+            json.dumps(builder_info)
+        except TypeError:
+            raise ValueError(
+                f'Builder {builder.sos_name} has non serialisable builder info')
+
+        if builder.cls.__name__ == self.COUPLING_CLASS_NAME:
+            sub_builders = builder.args.get('cls_builder', [])
+            if not isinstance(sub_builders, list):
+                sub_builders = [sub_builders]
+            return {'name': builder.sos_name, 'coupling': True, 'builder_info': builder_info,
+                    'sub_builders': [self.describe_builder(sub_builder) for sub_builder in sub_builders]}
+        if 'cls_builder' in builder.args:
+            raise ValueError(
+                f'Builder {builder.sos_name} of type {builder.cls.__name__} is not supported')
+
+        return {'name': builder.sos_name, 'coupling': False, 'builder_info': builder_info,
+                'module': f'{builder.cls.__module__}.{builder.cls.__name__}'}
+
+    def create_builder(self, ee, description):
+        if description['coupling']:
+            builder = ee.factory.create_builder_coupling(description['name'])
+            builder.set_builder_info('cls_builder', [self.create_builder(ee, sub_description)
+                                                     for sub_description in description['sub_builders']])
+        else:
+            builder = ee.factory.get_builder_from_module(
+                description['name'], description['module'])
+        for key, value in description['builder_info'].items():
+            builder.set_builder_info(key, value)
+        return builder
+
+    def load(self, key):
+        if key not in self.snapshots and self.directory is not None:
+            snapshot_path = join(self.directory, f'{key}.json')
+            if exists(snapshot_path):
+                with open(snapshot_path, 'r') as snapshot_file:
+                    self.snapshots[key] = json.load(snapshot_file)
+        return self.snapshots.get(key)
+
+    def save(self, key, snapshot):
+        self.snapshots[key] = snapshot
+        if self.directory is not None:
+            makedirs(self.directory, exist_ok=True)
+            with open(join(self.directory, f'{key}.json'), 'w') as snapshot_file:
+                json.dump(snapshot, snapshot_file, indent=1)
+
+
+class BuildRecorder():
+    '''
+    Record the namespaces definitions and the post-processings registered on an execution engine
+    while a process is built
+
+    Used as a context manager: the add_ns_def of the namespace manager and the
+    add_post_processing_module_to_namespace of the post-processing manager are wrapped on enter
+    and the previous methods are restored on exit. Every definition is recorded, also the ones
+    that set a namespace to its current value.
+    '''
+
+    def __init__(self, ee):
+        self.ee = ee
+        # {namespace name: last value defined during the build}
+        self.namespaces = {}
+        # [namespace, module] in the order of registration
+        self.post_processings = []
+        self.wrapped_methods = []
+
+    def __enter__(self):
+        self.wrap(self.ee.ns_manager, 'add_ns_def', self.record_ns_def)
+        self.wrap(self.ee.post_processing_manager, 'add_post_processing_module_to_namespace',
+                  self.record_post_processing)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        for manager, method_name, instance_method in reversed(self.wrapped_methods):
+            if instance_method is None:
+                delattr(manager, method_name)
+            else:
+                setattr(manager, method_name, instance_method)
+        self.wrapped_methods = []
+        return False
+
+    def wrap(self, manager, method_name, record):
+        '''
+        Replace the method of the manager by a method that records the call then calls it, the
+        method previously set on the instance, if any, is kept to be restored
+        '''
+        method = getattr(manager, method_name)
+        self.wrapped_methods.append(
+            (manager, method_name, vars(manager).get(method_name)))
+
+        def recorded_method(*args, **kwargs):
+            record(*args, **kwargs)
+            return method(*args, **kwargs)
+
+        setattr(manager, method_name, recorded_method)
+
+    def record_ns_def(self, ns_info, *args, **kwargs):
+        self.namespaces.update(ns_info)
+
+    def record_post_processing(self, namespace, module, *args, **kwargs):
+        self.post_processings.append([namespace, module])
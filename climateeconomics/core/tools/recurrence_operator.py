@@ -0,0 +1,105 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import numpy as np
+from scipy.sparse.linalg import LinearOperator
+
+
+class RecurrenceJacobianOperator(LinearOperator):
+    '''
+    Jacobian of a time recurrence linearised along a trajectory, applied without building
+    the (nb_years, nb_years) matrix
+
+    The derivative of the state x (nb_states per year) with respect to the input u follows
+        x_i = initial_jacobian[i] @ u[:nb_initial_years]  for i < nb_initial_years
+        x_i = mask_i * (transition @ x_{i-1} + input_coeffs_i * u_{i - input_lag})  otherwise
+    and the output is y_i = output_scale * x_i[output_index].
+    mask_i is 0 for the states saturated at a bound at year i. initial_jacobian
+    (nb_initial_years, nb_states, nb_initial_years) holds the states of the first years when the
+    model initialises them apart from the recurrence, by default only x_0 = 0.
+    Products with a vector (jacobian vector product) run the recurrence forward and products
+    with the transpose (vector jacobian product) run the adjoint recurrence backward, both in
+    O(nb_years) memory.
+    '''
+
+    def __init__(self, transition, input_coeffs, masks=None, output_index=0, input_lag=0,
+                 output_scale=1.0, initial_jacobian=None):
+        self.transition = np.atleast_2d(transition)
+        nb_states = self.transition.shape[0]
+        input_coeffs = np.asarray(input_coeffs, dtype=float)
+        if input_coeffs.ndim == 1:
+            input_coeffs = input_coeffs.reshape(-1, nb_states)
+        self.input_coeffs = input_coeffs
+        nb_years = len(input_coeffs)
+        if masks is None:
+            masks = np.ones((nb_years, nb_states))
+        self.masks = np.asarray(masks, dtype=float).reshape(nb_years, nb_states)
+        self.output_index = output_index
+        self.input_lag = input_lag
+        self.output_scale = output_scale
+        if initial_jacobian is None:
+            initial_jacobian = np.zeros((1, nb_states, 1))
+        self.initial_jacobian = np.asarray(initial_jacobian, dtype=float)
+        super().__init__(dtype=float, shape=(nb_years, nb_years))
+
+    def _matmat(self, directions):
+        nb_years = self.shape[0]
+        directions = np.asarray(directions).reshape(nb_years, -1)
+        states = np.zeros(
+            (self.transition.shape[0], directions.shape[1]), dtype=directions.dtype)
+        outputs = np.zeros_like(directions)
+        nb_initial_years = len(self.initial_jacobian)
+        for i in range(nb_years):
+            if i < nb_initial_years:
+                states = self.initial_jacobian[i] @ directions[:nb_initial_years]
+            else:
+                states = self.masks[i][:, np.newaxis] * (self.transition @ states +
+                                                         np.outer(self.input_coeffs[i], directions[i - self.input_lag]))
+            outputs[i] = self.output_scale * states[self.output_index]
+
+        return outputs
+
+    def _rmatmat(self, adjoints):
+        nb_years = self.shape[0]
+        adjoints = np.asarray(adjoints).reshape(nb_years, -1)
+        # adjoint of the masked states of the next year
+        masked_adjoint = np.zeros(
+            (self.transition.shape[0], adjoints.shape[1]), dtype=adjoints.dtype)
+        gradient = np.zeros_like(adjoints)
+        nb_initial_years = len(self.initial_jacobian)
+        for i in range(nb_years - 1, -1, -1):
+            state_adjoint = self.transition.T @ masked_adjoint
+            state_adjoint[self.output_index] += self.output_scale * adjoints[i]
+            if i < nb_initial_years:
+                gradient[:nb_initial_years] += self.initial_jacobian[i].T @ state_adjoint
+                # the first years do not depend on the states of the previous year
+                masked_adjoint = np.zeros_like(masked_adjoint)
+            else:
+                masked_adjoint = self.masks[i][:, np.newaxis] * state_adjoint
+                gradient[i - self.input_lag] += self.input_coeffs[i] @ masked_adjoint
+
+        return gradient
+
+    def _matvec(self, direction):
+        return self._matmat(direction).reshape(np.shape(direction))
+
+    def _rmatvec(self, adjoint):
+        return self._rmatmat(adjoint).reshape(np.shape(adjoint))
+
+    def to_array(self):
+        '''
+        Materialise the (nb_years, nb_years) jacobian, for checks on short horizons
+        '''
+        return self._matmat(np.identity(self.shape[0]))
@@ -0,0 +1,94 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+from copy import deepcopy
+
+
+class ScenarioDataBuilder():
+    '''
+    Build the input data of a multi-scenario study from a single base usecase
+
+    The base usecase is set up once with SCENARIO_TAG in place of the scenario name.
+    Keys containing the tag are duplicated for each scenario, keys without it are common
+    to the whole study. Each scenario only stores its own overrides, the values of the
+    base usecase (dataframes, arrays...) are shared between scenarios and never copied:
+    they must be considered read-only, an in-place modification of a shared value changes
+    it in every scenario. Use copy_values=True to get independent values per scenario.
+    '''
+    SCENARIO_TAG = '__scenario__'
+
+    def __init__(self, base_data):
+        '''
+        base_data: dict or list of dicts as returned by a usecase setup_usecase method
+        '''
+        if isinstance(base_data, dict):
+            base_data = [base_data]
+
+        self.common_data = {}
+        self.scenario_template = {}
+        for dict_data in base_data:
+            for key, value in dict_data.items():
+                if self.SCENARIO_TAG in key:
+                    self.scenario_template[key] = value
+                else:
+                    self.common_data[key] = value
+
+        self.scenario_overrides = {}
+
+    @property
+    def scenario_list(self):
+        return list(self.scenario_overrides.keys())
+
+    def add_scenario(self, scenario_name, overrides=None):
+        '''
+        Register a scenario with its sparse overrides
+        overrides: dict of values, keys may contain SCENARIO_TAG
+        '''
+        if self.SCENARIO_TAG in scenario_name:
+            raise ValueError(
+                f'Scenario name {scenario_name} cannot contain {self.SCENARIO_TAG}')
+        if overrides is None:
+            overrides = {}
+        self.scenario_overrides[scenario_name] = {self.get_scenario_key(key, scenario_name): value
+                                                  for key, value in overrides.items()}
+
+    def get_scenario_key(self, key, scenario_name):
+        return key.replace(self.SCENARIO_TAG, scenario_name)
+
+    def get_scenario_data(self, scenario_name, copy_values=False):
+        '''
+        Get the full input dict of one scenario, base values are shared and not copied
+        unless copy_values is True
+        '''
+        scenario_data = {self.get_scenario_key(key, scenario_name): value
+                         for key, value in self.scenario_template.items()}
+        scenario_data.update(self.scenario_overrides[scenario_name])
+        if copy_values:
+            scenario_data = deepcopy(scenario_data)
+
+        return scenario_data
+
+    def get_values_dict(self, copy_values=False):
+        '''
+        Get the input dict of the whole study: common data and data of every scenario
+        With copy_values, each scenario gets its own copy of the base values
+        '''
+        values_dict = deepcopy(
+            self.common_data) if copy_values else dict(self.common_data)
+        for scenario_name in self.scenario_overrides:
+            values_dict.update(self.get_scenario_data(
+                scenario_name, copy_values=copy_values))
+
+        return values_dict
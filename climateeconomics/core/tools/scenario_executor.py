@@ -0,0 +1,265 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import gc
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import pandas as pd
+from sos_trades_core.execution_engine.execution_engine import ExecutionEngine
+
+
+class ScenarioExecutor():
+    '''
+    Run the scenarios of a multi-scenario usecase one by one in worker processes instead of
+    instantiating all of them in the study
+
+    Each worker builds the scenario process alone, loads the data of its scenario taken from
+    the values dict of the multi-scenario usecase, executes it and sends back only the gathered
+    outputs (paths below the scenario node). At most max_pending scenarios are submitted at a
+    time so that the memory does not depend on the number of scenarios.
+    The names of the multi-scenario usecase are mapped to the scenario process with the values of
+    the namespaces in both processes (see load_namespaces), the namespaces of ns_to_update are
+    defined for each scenario. Names out of the namespaces are local to the disciplines of the
+    scenario node.
+    The outputs of each finished scenario are written in the data manager of the multi-scenario
+    study if an execution engine is given, a gather study (see build_gather_study) for instance, so
+    that its post-processings show the finished scenarios while the others are still running, and
+    given to on_result(scenario, outputs).
+    '''
+    # inputs of the multi-scenario study which are not inputs of a scenario
+    MULTI_SCENARIO_INPUTS = ['scenario_list', 'n_subcouplings_parallel']
+    # node of the gather study holding the gathered outputs, post-processings are on it
+    GATHER_NODE = 'Post-processing'
+    GATHER_DISCIPLINE = 'climateeconomics.sos_wrapping.sos_wrapping_witness.scenario_gather.scenario_gather_discipline.ScenarioGatherDiscipline'
+
+    def __init__(self, repo, process, study_name, scatter_name, scenario_list, values_dict, outputs,
+                 n_processes=1, max_pending=None, execution_engine=None, on_result=None,
+                 ms_process=None, ns_to_update=()):
+        '''
+        repo, process: process of a single scenario
+        values_dict: input dict of the multi-scenario usecase
+        outputs: paths of the gathered outputs below the scenario node
+        ms_process: multi-scenario process of the same repo, its namespaces are loaded to map the
+        names of values_dict
+        ns_to_update: namespaces defined for each scenario by the multi-scenario process
+        '''
+        self.repo = repo
+        self.process = process
+        self.study_name = study_name
+        self.scatter_name = scatter_name
+        self.scenario_list = list(scenario_list)
+        self.values_dict = values_dict
+        self.outputs = list(outputs)
+        self.n_processes = n_processes
+        self.max_pending = 2 * n_processes if max_pending is None else max_pending
+        self.execution_engine = execution_engine
+        self.on_result = on_result
+        self.ns_to_update = list(ns_to_update)
+        # {namespace name: value} in the multi-scenario process and in the scenario process
+        self.ms_namespaces = {}
+        self.scenario_namespaces = {}
+        if ms_process is not None:
+            self.load_namespaces(ms_process)
+        # True if the outputs are written in a gather study, its inputs are dataframes
+        self.dataframe_outputs = False
+        self.results = {}
+        self.errors = {}
+
+    @property
+    def namespace_w(self):
+        return f'{self.study_name}.{self.scatter_name}'
+
+    def load_namespaces(self, ms_process):
+        '''
+        Values of the namespaces defined by the builders of the multi-scenario process and of the
+        scenario process, the processes are not configured
+        '''
+        self.ms_namespaces = get_process_namespaces(
+            self.repo, ms_process, self.study_name)
+        self.scenario_namespaces = get_process_namespaces(
+            self.repo, self.process, self.study_name)
+
+    def get_name_mapping(self, scenario):
+        '''
+        {name in the multi-scenario study: [names in the scenario process]} for the namespaces and
+        the scenario node, a value shared by namespaces with other values in the scenario process
+        gives all of them
+        '''
+        name_mapping = {}
+        for ns_name, scenario_value in self.scenario_namespaces.items():
+            ms_value = self.ms_namespaces.get(ns_name)
+            if ms_value is None:
+                continue
+            if ns_name in self.ns_to_update:
+                ms_value = self.get_scenario_namespace_value(
+                    ms_value, scenario)
+            if scenario_value not in name_mapping.setdefault(ms_value, []):
+                name_mapping[ms_value].append(scenario_value)
+        # local variables of the disciplines of the scenario and inputs of the study
+        name_mapping.setdefault(
+            f'{self.namespace_w}.{scenario}', [self.study_name])
+        name_mapping.setdefault(self.study_name, [self.study_name])
+        return name_mapping
+
+    def get_scenario_namespace_value(self, value, scenario):
+        '''
+        Value of a namespace of ns_to_update for a scenario, the scenario node is inserted after
+        the scatter node
+        '''
+        if value == self.namespace_w or value.startswith(f'{self.namespace_w}.'):
+            return f'{self.namespace_w}.{scenario}{value[len(self.namespace_w):]}'
+        return value
+
+    def get_scenario_values(self, scenario):
+        '''
+        Input dict of a scenario for its process built alone with the same study name, the data
+        of the other scenarios are skipped
+        '''
+        name_mapping = self.get_name_mapping(scenario)
+        # the longest prefix of a name gives its namespace
+        prefixes = sorted(name_mapping, key=len, reverse=True)
+        other_scenarios = tuple(f'{self.namespace_w}.{other_scenario}.' for other_scenario in self.scenario_list
+                                if other_scenario != scenario)
+        scenario_values = {}
+        for key, value in self.values_dict.items():
+            if key.split('.')[-1] in self.MULTI_SCENARIO_INPUTS or key.startswith(other_scenarios):
+                continue
+            for prefix in prefixes:
+                if key.startswith(f'{prefix}.'):
+                    for scenario_prefix in name_mapping[prefix]:
+                        scenario_values[scenario_prefix +
+                                        key[len(prefix):]] = value
+                    break
+
+        return scenario_values
+
+    def run(self):
+        '''
+        Run all the scenarios, returns the outputs of the scenarios which succeeded as a dict
+        {scenario: {output path: value}}, the errors of the other ones are in self.errors
+        '''
+        self.results = {}
+        self.errors = {}
+        if self.n_processes > 1:
+            with ProcessPoolExecutor(max_workers=self.n_processes) as executor:
+                # {future: scenario}
+                pending = {}
+                for scenario in self.scenario_list:
+                    if len(pending) >= self.max_pending:
+                        self.wait_results(pending)
+                    try:
+                        future = executor.submit(run_scenario, self.repo, self.process, self.study_name,
+                                                 scenario, self.get_scenario_values(scenario), self.outputs)
+                    except Exception as error:
+                        # the pool is broken, the next scenarios fail the same way
+                        self.errors[scenario] = repr(error)
+                        continue
+                    pending[future] = scenario
+                while len(pending) > 0:
+                    self.wait_results(pending)
+        else:
+            for scenario in self.scenario_list:
+                self.add_result(*run_scenario(self.repo, self.process, self.study_name, scenario,
+                                              self.get_scenario_values(scenario), self.outputs))
+
+        return self.results
+
+    def wait_results(self, pending):
+        '''
+        Wait for at least one of the pending futures {future: scenario} and add their results, a
+        worker which died or outputs which cannot be sent back are an error of the scenario
+        '''
+        done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+        for future in done:
+            scenario = pending.pop(future)
+            try:
+                result = future.result()
+            except Exception as error:
+                self.errors[scenario] = repr(error)
+                continue
+            self.add_result(*result)
+
+    def add_result(self, scenario, outputs, error):
+        if outputs is None:
+            self.errors[scenario] = error
+            return
+        if self.dataframe_outputs:
+            for path, value in outputs.items():
+                if not isinstance(value, pd.DataFrame):
+                    raise TypeError(
+                        f'Gathered output {path} of {scenario} is a {type(value).__name__}, the gather study only holds dataframes')
+        self.results[scenario] = outputs
+        if self.execution_engine is not None:
+            self.execution_engine.dm.set_values_from_dict({f'{self.namespace_w}.{scenario}.{path}': value
+                                                           for path, value in outputs.items()})
+        if self.on_result is not None:
+            self.on_result(scenario, outputs)
+
+    def build_gather_study(self, post_processing_module=None):
+        '''
+        Light study with the scenario list and the gathered outputs of the scenarios at their
+        paths in the multi-scenario study (see ScenarioGatherDiscipline), the post-processing
+        module is registered on its Post-processing node
+        The study is set as the execution engine of the executor, the gathered outputs must then
+        be dataframes
+        '''
+        ee = ExecutionEngine(self.study_name)
+        ee.ns_manager.add_ns_def({'ns_scatter_scenario': self.namespace_w,
+                                  'ns_post_processing': f'{self.study_name}.{self.GATHER_NODE}'})
+        builder = ee.factory.get_builder_from_module(
+            self.GATHER_NODE, self.GATHER_DISCIPLINE)
+        ee.factory.set_builders_to_coupling_builder(builder)
+        ee.configure()
+        ee.load_study_from_input_dict({f'{self.namespace_w}.scenario_list': self.scenario_list,
+                                       f'{self.study_name}.{self.GATHER_NODE}.gathered_outputs': self.outputs})
+        if post_processing_module is not None:
+            ee.post_processing_manager.add_post_processing_module_to_namespace(
+                'ns_post_processing', post_processing_module)
+        self.execution_engine = ee
+        self.dataframe_outputs = True
+        return ee
+
+
+def get_process_namespaces(repo, process, study_name):
+    '''
+    {namespace name: value} defined by the builders of a process, the process is not configured
+    '''
+    ee = ExecutionEngine(study_name)
+    ee.factory.get_builder_from_process(repo, process)
+    return {name: namespace.get_value() for name, namespace in ee.ns_manager.shared_ns_dict.items()}
+
+
+def run_scenario(repo, process, study_name, scenario, scenario_values, outputs):
+    '''
+    Build and execute the process of a scenario with its data
+    Returns (scenario, {output path: value}, None), or (scenario, None, error) if the run failed
+    '''
+    try:
+        ee = ExecutionEngine(study_name)
+        builder = ee.factory.get_builder_from_process(repo, process)
+        ee.factory.set_builders_to_coupling_builder(builder)
+        ee.configure()
+        ee.load_study_from_input_dict(scenario_values)
+        ee.execute()
+        result = {path: ee.dm.get_value(f'{study_name}.{path}')
+                  for path in outputs}
+    except Exception as error:
+        # a failing scenario does not stop the others
+        return scenario, None, repr(error)
+
+    # the study of the scenario is released before the next one is built
+    del ee
+    gc.collect()
+    return scenario, result, None
@@ -0,0 +1,179 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import numpy as np
+
+
+class ScenarioResultsCube():
+    '''
+    Results of a multi-scenario study stored in a (scenario, year, variable) array
+
+    A variable is a column of a dataframe output of each scenario, identified by
+    a name and described by (df_path, column) where df_path is the path of the
+    dataframe below the scenario node
+    The cube is valid for the stamp of the data manager it has been built on, see
+    get_data_manager_stamp
+    '''
+
+    def __init__(self, scenario_list, years, stamp=None):
+        self.scenario_list = list(scenario_list)
+        self.years = np.asarray(years)
+        self.stamp = stamp
+        self.variables = {}
+        self.values = np.empty((len(self.scenario_list), len(self.years), 0))
+
+    def add_variables(self, df_per_scenario, variables):
+        '''
+        Extract variables from dataframes and store them in the cube
+        df_per_scenario: dict {df_path: {scenario: dataframe}}
+        variables: dict {variable_name: (df_path, column)}
+        '''
+        new_variables = [name for name in variables
+                         if name not in self.variables]
+        new_values = np.full(
+            (len(self.scenario_list), len(self.years), len(new_variables)), np.nan)
+
+        for i_var, name in enumerate(new_variables):
+            df_path, column = variables[name]
+            for i_scenario, scenario in enumerate(self.scenario_list):
+                df = df_per_scenario[df_path][scenario]
+                # a column missing in a scenario or a scenario not run yet stays NaN
+                if df is not None and column in df:
+                    rows, cube_rows = self.get_aligned_rows(df)
+                    new_values[i_scenario, cube_rows,
+                               i_var] = df[column].values[rows]
+            self.variables[name] = self.values.shape[2] + i_var
+
+        self.values = np.concatenate((self.values, new_values), axis=2)
+
+    def get_aligned_rows(self, df):
+        '''
+        Get the rows of the dataframe which are in the years of the cube and their
+        position in the cube
+        '''
+        if 'years' in df:
+            df_years = df['years'].values
+        else:
+            df_years = df.index.values
+        cube_rows = np.searchsorted(self.years, df_years)
+        cube_rows = np.minimum(cube_rows, len(self.years) - 1)
+        rows = np.where(self.years[cube_rows] == df_years)[0]
+
+        return rows, cube_rows[rows]
+
+    def is_valid(self, scenario_list, years, stamp):
+        '''
+        Check that the cube has the same scenarios and years and that the data manager has not
+        been modified since the cube was built
+        '''
+        return self.stamp == stamp and self.scenario_list == list(scenario_list) and \
+            np.array_equal(self.years, years)
+
+    def get(self, name, scenario_list=None):
+        '''
+        Get the (scenario, year) array of a variable
+        '''
+        values = self.values[:, :, self.variables[name]]
+        if scenario_list is not None:
+            values = values[self.get_scenario_indices(scenario_list)]
+        return values
+
+    def get_at_year(self, name, year):
+        '''
+        Get the values of a variable at a specific year for all scenarios
+        '''
+        i_year = np.searchsorted(self.years, year)
+        if i_year == len(self.years) or self.years[i_year] != year:
+            raise KeyError(f'Year {year} is not in the years of the results cube')
+        return self.values[:, i_year, self.variables[name]]
+
+    def get_scenario_indices(self, scenario_list):
+        index = {scenario: i for i, scenario in enumerate(self.scenario_list)}
+        return [index[scenario] for scenario in scenario_list]
+
+    def get_dict(self, name):
+        '''
+        Get a variable as a dict {scenario: list of values per year} for the charts
+        '''
+        return dict(zip(self.scenario_list, self.get(name).tolist()))
+
+
+def get_data_manager_stamp(execution_engine):
+    '''
+    Modification stamp of the data manager of the study, incremented each time values are set
+    by set_values_from_dict (runs, loaded studies, gathered results)
+    The first call wraps set_values_from_dict of the data manager to count the modifications,
+    in-place modifications of the values are not seen
+    '''
+    dm = execution_engine.dm
+    if getattr(dm, 'modification_stamp', None) is None:
+        dm.modification_stamp = 0
+        set_values_from_dict = dm.set_values_from_dict
+
+        def set_values_from_dict_stamped(*args, **kwargs):
+            dm.modification_stamp += 1
+            return set_values_from_dict(*args, **kwargs)
+
+        dm.set_values_from_dict = set_values_from_dict_stamped
+
+    return dm.modification_stamp
+
+
+def get_scenario_results_cube(execution_engine, namespace_w, scenario_list, years, variables):
+    '''
+    Get the results cube of the scenarios gathered below namespace_w
+
+    The cube is built on the first call after a modification of the data manager and stored
+    on the execution engine, the next calls only read the dataframes of the variables which
+    are not in the cube yet
+    variables: dict {variable_name: (df_path, column)}
+    '''
+    stamp = get_data_manager_stamp(execution_engine)
+    cubes = getattr(execution_engine, 'scenario_results_cubes', None)
+    if cubes is None:
+        cubes = {}
+        execution_engine.scenario_results_cubes = cubes
+
+    cube = cubes.get(namespace_w)
+    if cube is None or not cube.is_valid(scenario_list, years, stamp):
+        cube = ScenarioResultsCube(scenario_list, years, stamp=stamp)
+        cubes[namespace_w] = cube
+
+    missing_variables = {name: variable for name, variable in variables.items()
+                         if name not in cube.variables}
+    if len(missing_variables) > 0:
+        df_paths = list(dict.fromkeys(df_path for df_path, column in missing_variables.values()))
+        df_per_scenario = {df_path: {scenario: execution_engine.dm.get_value(f'{namespace_w}.{scenario}.{df_path}')
+                                     for scenario in scenario_list}
+                           for df_path in df_paths}
+        cube.add_variables(df_per_scenario, missing_variables)
+
+    return cube
+
+
+def get_pareto_front(x_values, y_values):
+    '''
+    Get the pareto front maximizing y for increasing x as two lists of coordinates
+    Scenarios without values (NaN) are ignored
+    '''
+    x_values = np.asarray(x_values)
+    y_values = np.asarray(y_values)
+    has_values = ~(np.isnan(x_values) | np.isnan(y_values))
+    x_values, y_values = x_values[has_values], y_values[has_values]
+    sort_index = np.lexsort((y_values, x_values))
+    sorted_x, sorted_y = x_values[sort_index], y_values[sort_index]
+    on_front = sorted_y >= np.maximum.accumulate(sorted_y)
+
+    return sorted_x[on_front].tolist(), sorted_y[on_front].tolist()
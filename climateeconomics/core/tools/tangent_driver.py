@@ -0,0 +1,145 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import numpy as np
+
+
+class PartialDerivativesRecorder():
+    '''
+    Mixin of a discipline which records the partial derivatives set by its compute_sos_jacobian
+    in partial_derivatives {(output variable, input variable): value}, with the variables named
+    as in TangentDriver, to check them against the core model
+    '''
+
+    def set_partial_derivative_for_other_types(self, y_key_column, x_key_column, value):
+        if not hasattr(self, 'partial_derivatives'):
+            self.partial_derivatives = {}
+        # the scalar outputs and inputs are given as 1-tuples
+        y_variable = y_key_column[0] if len(y_key_column) == 1 else y_key_column
+        x_variable = x_key_column[0] if len(x_key_column) == 1 else x_key_column
+        self.partial_derivatives[(y_variable, x_variable)] = value
+        super().set_partial_derivative_for_other_types(y_key_column, x_key_column, value)
+
+
+class TangentDriver():
+    '''
+    Forward mode derivatives of a core model by complex step
+
+    compute_function takes a dict of inputs and returns a dict of outputs, the core model
+    is evaluated directly without running the discipline. A variable is either the name of
+    an array or a (dataframe name, column) tuple.
+    Each perturbation direction costs one complex run of the model: a full jacobian needs
+    one run per input scalar, a check of an analytic jacobian only needs a few random
+    directions whatever the number of years.
+    '''
+
+    def __init__(self, compute_function, inputs_dict, step=1e-15):
+        self.compute_function = compute_function
+        self.inputs_dict = inputs_dict
+        self.step = step
+
+    def get_value(self, values_dict, variable):
+        if isinstance(variable, tuple):
+            name, column = variable
+            return values_dict[name][column].values
+        return np.atleast_1d(values_dict[variable])
+
+    def get_perturbed_inputs(self, input_variables, direction):
+        '''
+        Get a copy of the inputs with a complex perturbation step * direction on the input variables
+        '''
+        inputs = dict(self.inputs_dict)
+        start = 0
+        for variable in input_variables:
+            value = self.get_value(self.inputs_dict, variable)
+            perturbed_value = value.astype(complex) + \
+                1j * self.step * direction[start:start + len(value)]
+            start += len(value)
+            if isinstance(variable, tuple):
+                name, column = variable
+                # only the dataframes which are perturbed are copied
+                if inputs[name] is self.inputs_dict[name]:
+                    inputs[name] = inputs[name].copy()
+                inputs[name][column] = perturbed_value
+            elif np.ndim(self.inputs_dict[variable]) == 0:
+                inputs[variable] = perturbed_value[0]
+            else:
+                inputs[variable] = perturbed_value
+
+        return inputs
+
+    def get_size(self, values_dict, variables):
+        return sum(len(self.get_value(values_dict, variable)) for variable in variables)
+
+    def compute_directional_derivatives(self, input_variables, output_variables, directions):
+        '''
+        Compute the derivatives of the outputs along each direction, the model is run
+        once per direction with a complex perturbation, the runs are sequential
+        directions: array (n_directions, n_inputs) with inputs concatenated in the order of input_variables
+        returns an array (n_directions, n_outputs) with outputs concatenated in the order of output_variables
+        '''
+        directions = np.atleast_2d(directions)
+        derivatives = []
+        for direction in directions:
+            outputs = self.compute_function(
+                self.get_perturbed_inputs(input_variables, direction))
+            derivatives.append(np.concatenate([np.imag(self.get_value(outputs, variable))
+                                               for variable in output_variables]) / self.step)
+
+        return np.array(derivatives)
+
+    def compute_jacobian(self, input_variables, output_variables):
+        '''
+        Compute the full jacobian (n_outputs, n_inputs), one run per input scalar
+        '''
+        n_inputs = self.get_size(self.inputs_dict, input_variables)
+        return self.compute_directional_derivatives(input_variables, output_variables,
+                                                   np.identity(n_inputs)).T
+
+    def assemble_jacobian(self, partial_derivatives, input_variables, output_variables):
+        '''
+        Assemble the jacobian (n_outputs, n_inputs) from the blocks
+        {(output variable, input variable): value} set by a discipline, missing blocks are zeros
+        '''
+        outputs = self.compute_function(self.inputs_dict)
+        input_sizes = [len(self.get_value(self.inputs_dict, variable))
+                       for variable in input_variables]
+        blocks = []
+        for y_variable in output_variables:
+            n_y = len(self.get_value(outputs, y_variable))
+            row = []
+            for x_variable, n_x in zip(input_variables, input_sizes):
+                value = partial_derivatives.get((y_variable, x_variable))
+                if value is None:
+                    value = np.zeros((n_y, n_x))
+                elif hasattr(value, 'toarray'):
+                    value = value.toarray()
+                row.append(np.reshape(value, (n_y, n_x)))
+            blocks.append(row)
+
+        return np.block(blocks)
+
+    def check_jacobian(self, jacobian, input_variables, output_variables, n_directions=3,
+                       rtol=1e-5, atol=1e-8, seed=0):
+        '''
+        Check an analytic jacobian (n_outputs, n_inputs) on a few random directions
+        '''
+        n_inputs = self.get_size(self.inputs_dict, input_variables)
+        directions = np.random.default_rng(seed).standard_normal(
+            (n_directions, n_inputs))
+        derivatives = self.compute_directional_derivatives(
+            input_variables, output_variables, directions)
+
+        return np.allclose(directions @ np.asarray(jacobian).T, derivatives, rtol=rtol, atol=atol)
@@ -0,0 +1,111 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import numpy as np
+import pandas as pd
+
+
+class TimeGrid():
+    '''
+    Time grid of a study, years from year_start to year_end every time_step years
+
+    With a coarse grid (time_step > 1) the dataframes exchanged between models have one row
+    per period. Models which need annual steps internally interpolate their inputs on the
+    annual years, run annually and sample their outputs back on the grid, their annual
+    jacobians are projected on the grid with project_jacobian.
+    '''
+
+    def __init__(self, year_start, year_end, time_step=1):
+        self.year_start = year_start
+        self.year_end = year_end
+        self.time_step = time_step
+        self.years = np.arange(year_start, year_end + 1, time_step)
+        self.annual_years = np.arange(year_start, year_end + 1)
+        self.is_annual = time_step == 1
+        # position of the grid years in the annual years
+        self.grid_index = self.years - year_start
+        self.interpolation_matrix = self.get_interpolation_matrix()
+
+    def get_interpolation_matrix(self):
+        '''
+        Matrix (n_annual_years, n_years) of the linear interpolation of grid values on annual
+        years, years after the last grid year keep the last value
+        '''
+        matrix = np.zeros((len(self.annual_years), len(self.years)))
+        i_period = np.minimum(np.searchsorted(
+            self.years, self.annual_years, side='right') - 1, len(self.years) - 1)
+        if len(self.years) > 1:
+            i_next = np.minimum(i_period + 1, len(self.years) - 1)
+            weight = np.clip((self.annual_years - self.years[i_period]) / self.time_step, 0., 1.)
+            weight[i_next == i_period] = 0.
+            matrix[np.arange(len(self.annual_years)), i_next] += weight
+            matrix[np.arange(len(self.annual_years)), i_period] += 1. - weight
+        else:
+            matrix[:, 0] = 1.
+
+        return matrix
+
+    def to_annual(self, df):
+        '''
+        Interpolate a dataframe with one row per grid year on the annual years
+        The years column, if any, is rebuilt, the index is set to the annual years
+        Complex values (complex step) are kept complex
+        '''
+        if self.is_annual:
+            return df
+        columns = [column for column in df.columns if column != 'years']
+        values = df[columns].values
+        values = values.astype(np.result_type(values.dtype, float))
+        annual_df = pd.DataFrame(self.interpolation_matrix @ values,
+                                 index=self.annual_years, columns=columns)
+        if 'years' in df:
+            annual_df.insert(0, 'years', self.annual_years)
+
+        return annual_df
+
+    def to_grid(self, df):
+        '''
+        Sample a dataframe with one row per annual year on the grid years
+        '''
+        if self.is_annual:
+            return df
+        return df.iloc[self.grid_index]
+
+    def project_jacobian(self, annual_jacobian):
+        '''
+        Jacobian between grid values of an annual jacobian (n_annual_years, n_annual_years)
+        '''
+        if self.is_annual:
+            return annual_jacobian
+        return annual_jacobian[self.grid_index] @ self.interpolation_matrix
+
+
+def interpolate_to_annual(df, year_end=None):
+    '''
+    Interpolate the output dataframe of a coarse grid run on annual years for reporting
+    df must have a years column, year_end defaults to the last year of the dataframe
+    '''
+    years = df['years'].values
+    if year_end is None:
+        year_end = years[-1]
+    annual_years = np.arange(years[0], year_end + 1)
+    annual_df = pd.DataFrame({'years': annual_years})
+    for column in df.columns:
+        if column != 'years':
+            values = df[column].values
+            annual_df[column] = np.interp(
+                annual_years, years, values.astype(np.result_type(values.dtype, float)))
+
+    return annual_df
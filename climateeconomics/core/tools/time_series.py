@@ -0,0 +1,128 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import numpy as np
+import pandas as pd
+
+
+class TimeSeries():
+    '''
+    Years vector and a contiguous (years, columns) float64 or complex128 block with named columns
+
+    Lightweight container for the coupling data exchanged between core models, the conversion
+    to and from a dataframe with a years column is done at the discipline boundaries only.
+    Columns are views on the block, the block is complex as soon as a complex column is set.
+    '''
+    YEARS = 'years'
+
+    def __init__(self, years, values=None, columns=(), dtype=None):
+        self.years = np.asarray(years)
+        self.columns = list(columns)
+        self.column_index = {column: i for i,
+                             column in enumerate(self.columns)}
+        if values is None:
+            values = np.zeros((len(self.years), len(self.columns)),
+                              dtype=float if dtype is None else dtype)
+        values = np.asarray(values)
+        if values.ndim == 1:
+            values = values.reshape(-1, 1)
+        if values.shape != (len(self.years), len(self.columns)):
+            raise ValueError(
+                f'Values of shape {values.shape} do not match {len(self.years)} years and {len(self.columns)} columns')
+        if dtype is None:
+            dtype = np.complex128 if np.iscomplexobj(values) else np.float64
+        self.values = np.ascontiguousarray(values, dtype=dtype)
+
+    @classmethod
+    def from_dataframe(cls, df, columns=None):
+        '''
+        Build a time series from a dataframe with a years column, all the other columns by default
+        '''
+        if columns is None:
+            columns = [column for column in df.columns if column != cls.YEARS]
+        values = df[columns].to_numpy()
+        if not np.iscomplexobj(values):
+            values = values.astype(np.float64)
+        return cls(df[cls.YEARS].values, values, columns)
+
+    def to_dataframe(self, years_index=True):
+        '''
+        Dataframe with a years column and a column per series, indexed by years by default
+        '''
+        df = pd.DataFrame(self.values, columns=self.columns,
+                          index=self.years if years_index else None)
+        df.insert(0, self.YEARS, self.years)
+        return df
+
+    @property
+    def dtype(self):
+        return self.values.dtype
+
+    def __len__(self):
+        return len(self.years)
+
+    def __contains__(self, column):
+        return column == self.YEARS or column in self.column_index
+
+    def __getitem__(self, column):
+        if column == self.YEARS:
+            return self.years
+        return self.values[:, self.column_index[column]]
+
+    def __setitem__(self, column, column_values):
+        column_values = np.asarray(column_values)
+        if np.iscomplexobj(column_values) and not np.iscomplexobj(self.values):
+            self.values = self.values.astype(np.complex128)
+        if column in self.column_index:
+            self.values[:, self.column_index[column]] = column_values
+        else:
+            self.column_index[column] = len(self.columns)
+            self.columns.append(column)
+            self.values = np.ascontiguousarray(np.column_stack(
+                (self.values, np.broadcast_to(column_values, len(self.years)))))
+
+    def get_year_indices(self, years):
+        '''
+        Positions of years in the years vector, KeyError if a year is missing
+        '''
+        indices = np.searchsorted(self.years, years)
+        indices = np.minimum(indices, len(self.years) - 1)
+        if not np.array_equal(self.years[indices], years):
+            raise KeyError(f'Years {years} are not all in the time series')
+        return indices
+
+    def get(self, column, years=None):
+        '''
+        Values of a column, on some years only if years is given
+        '''
+        if years is None:
+            return self[column]
+        return self[column][self.get_year_indices(years)]
+
+    def select_years(self, years):
+        return TimeSeries(years, self.values[self.get_year_indices(years)], self.columns)
+
+    def copy(self):
+        return TimeSeries(self.years.copy(), self.values.copy(), self.columns)
+
+
+def as_time_series(data, columns=None):
+    '''
+    Migration helper for the models accepting a dataframe or a time series as input
+    A dataframe is converted, restricted to columns if given, a time series is returned as is
+    '''
+    if isinstance(data, TimeSeries):
+        return data
+    return TimeSeries.from_dataframe(data, columns)
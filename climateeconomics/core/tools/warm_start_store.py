@@ -0,0 +1,156 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import hashlib
+import json
+import time
+from os import makedirs, fdopen, replace, remove
+from os.path import join, exists
+from tempfile import mkstemp
+
+import numpy as np
+import pandas as pd
+
+
+class WarmStartStore():
+    '''
+    Snapshots of the converged coupling variables and design variables of studies, one
+    compressed .npz file per snapshot and a json manifest describing the snapshots
+
+    A snapshot is keyed by a hash of the usecase name and of its structural parameters
+    (years, model options...). Dataframes are stored as float arrays with their columns in
+    the manifest, non numerical variables are not stored.
+    '''
+    MANIFEST_NAME = 'warm_start_manifest.json'
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.manifest_path = join(directory, self.MANIFEST_NAME)
+        self.manifest = self.read_manifest()
+
+    def read_manifest(self):
+        if exists(self.manifest_path):
+            with open(self.manifest_path, 'r') as manifest_file:
+                return json.load(manifest_file)
+        return {}
+
+    def write_file(self, file_name, write_function, mode='wb'):
+        '''
+        Write a file of the store in a temporary file renamed at the end, so that a reader never
+        sees a partially written file
+        '''
+        file_descriptor, tmp_path = mkstemp(
+            dir=self.directory, prefix=f'.{file_name}.')
+        try:
+            with fdopen(file_descriptor, mode) as tmp_file:
+                write_function(tmp_file)
+            replace(tmp_path, join(self.directory, file_name))
+        except BaseException:
+            if exists(tmp_path):
+                remove(tmp_path)
+            raise
+
+    @staticmethod
+    def get_json_parameters(structural_parameters):
+        '''
+        Get the structural parameters with json compatible values
+        '''
+        return json.loads(json.dumps(structural_parameters, sort_keys=True, default=str))
+
+    @classmethod
+    def get_snapshot_key(cls, usecase_name, structural_parameters):
+        key_content = json.dumps([usecase_name, cls.get_json_parameters(structural_parameters)],
+                                 sort_keys=True)
+        return hashlib.sha1(key_content.encode('utf-8')).hexdigest()
+
+    def save(self, usecase_name, structural_parameters, values_dict):
+        '''
+        Save a snapshot of values_dict {variable name: dataframe, array or float}, an existing
+        snapshot with the same key is replaced
+        Returns the key of the snapshot
+        '''
+        key = self.get_snapshot_key(usecase_name, structural_parameters)
+        entries = {}
+        variables = {}
+        for i_var, (name, value) in enumerate(values_dict.items()):
+            try:
+                if isinstance(value, pd.DataFrame):
+                    entries[f'{i_var}'] = np.real(value.values).astype(float)
+                    variables[name] = {'entry': f'{i_var}', 'type': 'dataframe',
+                                       'columns': [str(column) for column in value.columns]}
+                else:
+                    entries[f'{i_var}'] = np.real(
+                        np.asarray(value)).astype(float)
+                    variables[name] = {'entry': f'{i_var}', 'type': 'array'}
+            except (TypeError, ValueError):
+                # non numerical values are not part of a warm start
+                pass
+
+        makedirs(self.directory, exist_ok=True)
+        self.write_file(f'{key}.npz',
+                        lambda npz_file: np.savez_compressed(npz_file, **entries))
+        # snapshots saved by other stores on the same directory are kept
+        self.manifest = self.read_manifest()
+        self.manifest[key] = {'usecase': usecase_name,
+                              'structural_parameters': self.get_json_parameters(structural_parameters),
+                              'variables': variables,
+                              'time': time.time()}
+        self.write_file(self.MANIFEST_NAME,
+                        lambda manifest_file: json.dump(
+                            self.manifest, manifest_file, indent=1, sort_keys=True),
+                        mode='w')
+
+        return key
+
+    def load(self, key):
+        '''
+        Load the values of a snapshot as a dict {variable name: dataframe or array}
+        '''
+        values_dict = {}
+        with np.load(join(self.directory, f'{key}.npz')) as npz_file:
+            for name, variable in self.manifest[key]['variables'].items():
+                value = npz_file[variable['entry']]
+                if variable['type'] == 'dataframe':
+                    value = pd.DataFrame(value, columns=variable['columns'])
+                    if 'years' in value:
+                        value['years'] = value['years'].astype(int)
+                        value.index = value['years'].values
+                elif value.ndim == 0:
+                    # floats are saved as 0-d arrays
+                    value = value.item()
+                values_dict[name] = value
+
+        return values_dict
+
+    def find_nearest(self, usecase_name, structural_parameters):
+        '''
+        Get the key of the snapshot of the usecase with the fewest structural parameters different
+        from structural_parameters, the most recent one for equal distances
+        Returns None if the usecase has no snapshot
+        '''
+        parameters = self.get_json_parameters(structural_parameters)
+        nearest_key = None
+        nearest_distance = None
+        for key, snapshot in self.manifest.items():
+            if snapshot['usecase'] != usecase_name:
+                continue
+            snapshot_parameters = snapshot['structural_parameters']
+            distance = sum(snapshot_parameters.get(name) != parameters.get(name)
+                           for name in set(parameters) | set(snapshot_parameters))
+            if nearest_key is None or (distance, -snapshot['time']) < (nearest_distance, -self.manifest[nearest_key]['time']):
+                nearest_key = key
+                nearest_distance = distance
+
+        return nearest_key
@@ -20,6 +20,7 @@ from os.path import join, dirname
 from sos_trades_core.study_manager.study_manager import StudyManager
 from climateeconomics.sos_processes.iam.witness.climate_process.usecase import Study as climate_usecase
 from sos_trades_core.tools.post_processing.post_processing_factory import PostProcessingFactory
+from climateeconomics.core.tools.scenario_data_builder import ScenarioDataBuilder
 
 
 class Study(StudyManager):
@@ -37,25 +38,23 @@ class Study(StudyManager):
         # Set public values at a specific namespace
         climate_usecase_inst.study_name = f'{self.study_name}.{self.scatter_scenario}'
 
-        values_dict = {}
-        scenario_list = []
+        # the base usecase is set up once, scenarios only store their
+        # forcing model
+        scenarioUseCase = climate_usecase(
+            execution_engine=self.execution_engine)
+        scenarioUseCase.study_name = f'{climate_usecase_inst.study_name}.{ScenarioDataBuilder.SCENARIO_TAG}'
+        scenario_builder = ScenarioDataBuilder(
+            scenarioUseCase.setup_usecase())
+
         forcing_model_list = ['DICE', 'Myhre', 'Etminan', 'Meinshausen']
         for forcing_model in forcing_model_list:
             scenario_i = f'scenario_{forcing_model}'
             scenario_i = scenario_i.replace('.', ',')
-            scenario_list.append(scenario_i)
-            values_dict[f'{self.study_name}.{self.scatter_scenario}.{scenario_i}.Temperature.forcing_model'] = forcing_model
-
-        values_dict[f'{self.study_name}.scenario_list'] = scenario_list
-
-        for scenario in scenario_list:
-            scenarioUseCase = climate_usecase(
-                execution_engine=self.execution_engine)
-            scenarioUseCase.study_name = f'{climate_usecase_inst.study_name}.{scenario}'
-            scenarioData = scenarioUseCase.setup_usecase()
+            scenario_builder.add_scenario(
+                scenario_i, {f'{scenarioUseCase.study_name}.Temperature.forcing_model': forcing_model})
 
-            for dict_data in scenarioData:
-                values_dict.update(dict_data)
+        values_dict = scenario_builder.get_values_dict()
+        values_dict[f'{self.study_name}.scenario_list'] = scenario_builder.scenario_list
 
         return values_dict
 
@@ -0,0 +1,87 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+from os.path import join, dirname
+
+import numpy as np
+import pandas as pd
+
+from climateeconomics.core.core_sectorization.sector_calibration import SectorCalibration, calibrate_sectors
+from climateeconomics.core.core_sectorization.sectorization_objectives_model import ObjectivesModel
+
+# same data and initial capital as the sectorization_process usecase from 2000 to 2020
+DATA_DIR = join(dirname(dirname(dirname(dirname(dirname(__file__))))),
+                'tests', 'data', 'sectorization_fitting')
+CAPITAL_START = {'Industry': 37.15058,
+                 'Agriculture': 4.035565,
+                 'Services': 139.1369}
+
+
+def build_sector_calibrations(year_start=2000, year_end=2020):
+    '''
+    Build the calibrations of the three sectors on historical data, the sector parameters
+    are the default values of the sector disciplines
+    '''
+    years = np.arange(year_start, year_end + 1)
+    hist_invest = pd.read_csv(join(DATA_DIR, 'hist_invest_sectors.csv'))
+    hist_energy = pd.read_csv(join(DATA_DIR, 'hist_energy_sect.csv'))
+    hist_workforce = pd.read_csv(join(DATA_DIR, 'hist_workforce_sect.csv'))
+    hist_gdp = pd.read_csv(join(DATA_DIR, 'hist_gdp_sect.csv'))
+    hist_capital = pd.read_csv(join(DATA_DIR, 'hist_capital_sect.csv'))
+    damage_df = pd.DataFrame(
+        {'years': years, 'damage_frac_output': np.zeros(len(years))})
+
+    calibrations = []
+    for sector_disc in ObjectivesModel.SECTORS_DISC_LIST:
+        sector = sector_disc.sector_name
+        inputs_dict = {name: desc['default'] for name, desc in sector_disc.DESC_IN.items()
+                       if 'default' in desc}
+        inputs_dict.update({'year_start': year_start,
+                            'year_end': year_end,
+                            'time_step': 1,
+                            'capital_start': CAPITAL_START[sector],
+                            'damage_to_productivity': False,
+                            'init_output_growth': 0})
+        years_mask = hist_invest['years'].isin(years).values
+        coupling_inputs = {'sector_investment': pd.DataFrame({'years': years,
+                                                              'investment': hist_invest.loc[years_mask, sector].values}),
+                           'energy_production': pd.DataFrame({'years': years,
+                                                              'Total production': hist_energy.loc[years_mask, sector].values}),
+                           'workforce_df': pd.DataFrame({'years': years,
+                                                         'workforce': hist_workforce.loc[years_mask, sector].values}),
+                           'damage_df': damage_df}
+        calibrations.append(SectorCalibration(sector, inputs_dict, coupling_inputs,
+                                              hist_gdp, hist_capital, hist_energy))
+
+    return calibrations
+
+
+def run_sector_calibrations(n_processes=3, ns_optim='usecase.SectorsOpt'):
+    '''
+    Calibrate the three sectors in parallel
+    Returns the fitted parameters as design variable values of the sectorization_optim_process usecase
+    '''
+    sector_calibrations = calibrate_sectors(
+        build_sector_calibrations(), n_processes=n_processes)
+    design_var_values = {}
+    for calibration in sector_calibrations.values():
+        design_var_values.update(calibration.get_design_var_values(ns_optim))
+
+    return design_var_values
+
+
+if '__main__' == __name__:
+    for name, value in run_sector_calibrations().items():
+        print(name, value)
@@ -34,6 +34,13 @@ class ProcessBuilder(WITNESSSubProcessBuilder):
             self, ee)
         self.invest_discipline = INVEST_DISCIPLINE_OPTIONS[2]
         self.process_level = process_level
+        self.fused_climate_economy = False
+
+    def setup_process(self, *args, fused_climate_economy=False, **kwargs):
+        WITNESSSubProcessBuilder.setup_process(self, *args, **kwargs)
+        # if True the climate-economy disciplines of witness_wo_energy are solved in a single
+        # discipline
+        self.fused_climate_economy = fused_climate_economy
 
     def get_builders(self):
 
@@ -41,11 +48,15 @@ class ProcessBuilder(WITNESSSubProcessBuilder):
         # retrieve energy process
 
         if self.process_level == 'dev':
+            if self.fused_climate_economy:
+                raise ValueError(
+                    'The fused climate-economy option is only available for the val process level')
             chain_builders_witness = self.ee.factory.get_builder_from_process(
                 'climateeconomics.sos_processes.iam', 'witness_wo_energy_dev')
         else:
             chain_builders_witness = self.ee.factory.get_builder_from_process(
-                'climateeconomics.sos_processes.iam', 'witness_wo_energy')
+                'climateeconomics.sos_processes.iam', 'witness_wo_energy',
+                fused_climate_economy=self.fused_climate_economy)
         chain_builders.extend(chain_builders_witness)
 
         # if one invest discipline then we need to setup all subprocesses
@@ -68,6 +79,9 @@ class ProcessBuilder(WITNESSSubProcessBuilder):
         self.ee.post_processing_manager.add_post_processing_module_to_namespace(
             'ns_witness',
             'climateeconomics.sos_wrapping.sos_wrapping_witness.post_proc_witness_optim.post_processing_witness_full')
+        self.ee.post_processing_manager.add_post_processing_module_to_namespace(
+            'ns_witness',
+            'climateeconomics.sos_wrapping.sos_wrapping_witness.post_proc_convergence.post_processing_convergence')
         for resource_namespace in ['ns_coal_resource', 'ns_oil_resource', 'ns_natural_gas_resource', 'ns_uranium_resource', 'ns_copper_resource']:
             self.ee.post_processing_manager.add_post_processing_module_to_namespace(
                 resource_namespace, 'climateeconomics.sos_wrapping.sos_wrapping_resources.post_proc_resource.post_processing_resource')
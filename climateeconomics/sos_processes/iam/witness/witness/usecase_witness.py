@@ -55,6 +55,9 @@ class Study(ClimateEconomicsStudyManager):
             invest_discipline=self.invest_discipline, techno_dict=techno_dict)
         self.sub_study_path_dict = self.dc_energy.sub_study_path_dict
 
+    def get_witness_datacase(self):
+        return datacase_witness(self.year_start, self.year_end, self.time_step)
+
     def setup_constraint_land_use(self):
         func_df = DataFrame(
             columns=['variable', 'parent', 'ftype', 'weight', AGGR_TYPE])
@@ -91,8 +94,7 @@ class Study(ClimateEconomicsStudyManager):
         self.energy_mda_usecase = self.dc_energy
         # -- load data from witness
         if self.process_level == 'val':
-            dc_witness = datacase_witness(
-                self.year_start, self.year_end, self.time_step)
+            dc_witness = self.get_witness_datacase()
             dc_witness.study_name = self.study_name
 
             witness_input_list = dc_witness.setup_usecase()
@@ -0,0 +1,51 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+from climateeconomics.sos_processes.iam.witness.witness.usecase_witness import Study as witness_usecase
+from climateeconomics.sos_processes.iam.witness_wo_energy.datacase_witness_wo_energy import DataStudy as datacase_witness
+from climateeconomics.sos_processes.iam.witness.agriculture_mix_process.usecase import AGRI_MIX_TECHNOLOGIES_LIST_FOR_OPT
+from energy_models.core.energy_study_manager import DEFAULT_TECHNO_DICT
+from energy_models.core.energy_process_builder import INVEST_DISCIPLINE_OPTIONS
+
+
+class Study(witness_usecase):
+    '''
+    WITNESS usecase with Macroeconomics, Population and the climate models solved in a single
+    ClimateEconomyCore discipline (fused_climate_economy option of the witness process)
+    '''
+
+    def __init__(self, year_start=2020, year_end=2100, time_step=1, bspline=True, run_usecase=False, execution_engine=None,
+                 invest_discipline=INVEST_DISCIPLINE_OPTIONS[2], techno_dict=DEFAULT_TECHNO_DICT, agri_techno_list=AGRI_MIX_TECHNOLOGIES_LIST_FOR_OPT):
+        super().__init__(year_start=year_start, year_end=year_end, time_step=time_step, bspline=bspline,
+                         run_usecase=run_usecase, execution_engine=execution_engine,
+                         invest_discipline=invest_discipline, techno_dict=techno_dict,
+                         agri_techno_list=agri_techno_list, process_level='val')
+
+    def setup_process(self):
+        builder = self.execution_engine.factory.get_builder_from_process(
+            'climateeconomics.sos_processes.iam.witness', 'witness',
+            techno_dict=self.techno_dict, invest_discipline=self.invest_discipline, process_level='val',
+            fused_climate_economy=True)
+        self.execution_engine.factory.set_builders_to_coupling_builder(builder)
+        self.execution_engine.configure()
+
+    def get_witness_datacase(self):
+        return datacase_witness(self.year_start, self.year_end, self.time_step, fused_climate_economy=True)
+
+
+if '__main__' == __name__:
+    uc_cls = Study(run_usecase=True)
+    uc_cls.load_data()
+    uc_cls.run()
@@ -0,0 +1,56 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+from scipy import stats
+
+from climateeconomics.core.tools.monte_carlo import MonteCarloRunner
+from climateeconomics.sos_processes.iam.witness.witness_coarse.usecase_witness_coarse_new import Study
+
+# uncertain climate sensitivity, damage and TFP decline parameters
+DISTRIBUTIONS = {'eq_temp_impact': stats.lognorm(s=0.25, scale=3.1),
+                 'damag_quad': stats.uniform(0.0015, 0.0015),
+                 'tp_a3': stats.uniform(5.0, 2.5),
+                 'tp_a4': stats.uniform(6.0, 1.5),
+                 'decline_rate_tfp': stats.uniform(0.015, 0.015)}
+# output name: column, None for array outputs
+OUTPUTS = {'temperature_df': 'temp_atmo',
+           'damage_df': 'damages',
+           'utility_df': 'discounted_utility',
+           'welfare_objective': None}
+
+
+def build_witness_coarse_study():
+    '''
+    Loaded witness_coarse usecase, built once per worker process
+    '''
+    study = Study()
+    study.load_data()
+    return study
+
+
+def run_witness_coarse_monte_carlo(n_samples=1000, n_processes=4, seed=0):
+    '''
+    Returns the statistics of the outputs as a dict of dataframes with years, mean, std, P5, P50
+    and P95 columns
+    '''
+    runner = MonteCarloRunner(build_witness_coarse_study, DISTRIBUTIONS, OUTPUTS, n_samples,
+                              n_processes=n_processes, seed=seed)
+    return runner.run()
+
+
+if '__main__' == __name__:
+    for name, statistics_df in run_witness_coarse_monte_carlo(n_samples=100).items():
+        print(name)
+        print(statistics_df)
@@ -0,0 +1,47 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import numpy as np
+
+from climateeconomics.sos_processes.iam.witness.witness_coarse_optim_process.usecase_witness_optim_invest_distrib import Study as witness_optim_usecase
+from climateeconomics.core.tools.continuation_solver import ContinuationSolver
+
+
+def build_alpha_study(alpha):
+    '''
+    Build the optimization study of a single scenario of the alpha sweep
+    '''
+    study = witness_optim_usecase(run_usecase=True)
+    study.load_data()
+    study.execution_engine.load_study_from_input_dict(
+        {f'{study.study_name}.{study.optim_name}.{study.coupling_name}.{study.extra_name}.alpha': alpha})
+    return study
+
+
+def run_alpha_continuation(alpha_list=None, n_chains=2, n_processes=2):
+    '''
+    Sweep alpha by continuation instead of solving the scenarios of usecase_witness_ms_optim
+    independently, each optimization starts from the design variables and MDA state of its
+    converged neighbour, the two chains start from both ends of the alpha list
+    '''
+    if alpha_list is None:
+        alpha_list = np.linspace(0, 100, 11, endpoint=True) / 100.0
+
+    return ContinuationSolver(build_alpha_study, alpha_list, n_chains=n_chains,
+                              n_processes=n_processes).run()
+
+
+if '__main__' == __name__:
+    results = run_alpha_continuation()
@@ -16,6 +16,34 @@ limitations under the License.
 from sos_trades_core.sos_processes.base_process_builder import BaseProcessBuilder
 
 
+# scenario build map, the namespaces of ns_to_update are defined for each scenario
+SCENARIO_MAP = {'input_name': 'scenario_list',
+                'input_type': 'string_list',
+                'input_ns': 'ns_scatter_scenario',
+                'output_name': 'scenario_name',
+                'scatter_ns': 'ns_scenario',
+                'gather_ns': 'ns_scatter_scenario',
+                'ns_to_update': ['ns_witness',
+                                 'ns_functions',
+                                 'ns_energy_mix',
+                                 'ns_public',
+                                 'ns_optim',
+                                 'ns_flue_gas',
+                                 'ns_energy_study',
+                                 'ns_energy',
+                                 'ns_carbon_capture',
+                                 'ns_carbon_storage',
+                                 'ns_land_use',
+                                 'ns_renewable',
+                                 'ns_fossil',
+                                 'ns_ccs',
+                                 'ns_resource',
+                                 #'ns_ref',
+                                 'ns_agriculture',
+                                 'ns_invest',
+                                 ]}
+
+
 class ProcessBuilder(BaseProcessBuilder):
 
     # ontology information
@@ -28,32 +56,7 @@ class ProcessBuilder(BaseProcessBuilder):
 
     def get_builders(self):
 
-        # scenario build map
-        scenario_map = {'input_name': 'scenario_list',
-                        'input_type': 'string_list',
-                        'input_ns': 'ns_scatter_scenario',
-                        'output_name': 'scenario_name',
-                        'scatter_ns': 'ns_scenario',
-                        'gather_ns': 'ns_scatter_scenario',
-                        'ns_to_update': ['ns_witness',
-                                         'ns_functions',
-                                         'ns_energy_mix',
-                                         'ns_public',
-                                         'ns_optim',
-                                         'ns_flue_gas',
-                                         'ns_energy_study',
-                                         'ns_energy',
-                                         'ns_carbon_capture',
-                                         'ns_carbon_storage',
-                                         'ns_land_use',
-                                         'ns_renewable',
-                                         'ns_fossil',
-                                         'ns_ccs',
-                                         'ns_resource',
-                                         #'ns_ref',
-                                         'ns_agriculture',
-                                         'ns_invest',
-                                         ]}
+        scenario_map = dict(SCENARIO_MAP)
 
         self.ee.smaps_manager.add_build_map(
             'scenario_list', scenario_map)
@@ -0,0 +1,56 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+from sos_trades_core.tools.post_processing.post_processing_factory import PostProcessingFactory
+
+from climateeconomics.sos_processes.iam.witness.witness_coarse_ms_optim_process.usecase_witness_ms_optim import Study
+from climateeconomics.sos_processes.iam.witness.witness_coarse_ms_optim_process.process import SCENARIO_MAP
+from climateeconomics.sos_wrapping.sos_wrapping_witness.post_proc_witness_ms.post_processing_witness_full import \
+    GATHERED_OUTPUTS
+from climateeconomics.core.tools.scenario_executor import ScenarioExecutor
+
+
+def run_witness_coarse_ms_optim_scenarios(n_processes=4, on_result=None):
+    '''
+    Run the scenarios of usecase_witness_ms_optim in worker processes, the gathered outputs of
+    each finished scenario are written in a gather study with the post-processings of the
+    multi-scenario process, so that they can be computed before the end of the sweep
+    The multi-scenario study is not configured, only its values dict is set up
+    Returns the execution engine of the gather study and the executor
+    '''
+    study = Study()
+    values_dict = study.setup_usecase()
+
+    executor = ScenarioExecutor('climateeconomics.sos_processes.iam.witness', 'witness_coarse_optim_process',
+                                study.study_name, study.scatter_scenario,
+                                values_dict[f'{study.study_name}.{study.scatter_scenario}.scenario_list'],
+                                values_dict, GATHERED_OUTPUTS, n_processes=n_processes, on_result=on_result,
+                                ms_process='witness_coarse_ms_optim_process',
+                                ns_to_update=SCENARIO_MAP['ns_to_update'])
+    gather_ee = executor.build_gather_study(
+        'climateeconomics.sos_wrapping.sos_wrapping_witness.post_proc_witness_ms.post_processing_witness_full')
+    executor.run()
+    return gather_ee, executor
+
+
+if '__main__' == __name__:
+    def print_scenario(scenario, outputs):
+        print(f'{scenario} done')
+
+    gather_ee, executor = run_witness_coarse_ms_optim_scenarios(
+        on_result=print_scenario)
+    print(f'Failed scenarios: {executor.errors}')
+    PostProcessingFactory().get_post_processing_by_namespace(
+        gather_ee, f'{gather_ee.study_name}.Post-processing', [])
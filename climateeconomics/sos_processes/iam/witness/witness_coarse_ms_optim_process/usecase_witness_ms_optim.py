@@ -21,6 +21,7 @@ from sos_trades_core.study_manager.study_manager import StudyManager
 from climateeconomics.sos_processes.iam.witness.witness_coarse_optim_process.usecase_witness_optim_invest_distrib import Study as witness_optim_usecase
 from sos_trades_core.tools.post_processing.post_processing_factory import PostProcessingFactory
 from climateeconomics.core.tools.ClimateEconomicsStudyManager import ClimateEconomicsStudyManager
+from climateeconomics.core.tools.scenario_data_builder import ScenarioDataBuilder
 
 
 class Study(ClimateEconomicsStudyManager):
@@ -38,27 +39,25 @@ class Study(ClimateEconomicsStudyManager):
         # Set public values at a specific namespace
         witness_ms_usecase.study_name = f'{self.study_name}.{self.scatter_scenario}'
 
-        values_dict = {}
-        scenario_list = []
+        # the base usecase is set up once, scenarios only store their alpha
+        scenarioUseCase = witness_optim_usecase(
+            bspline=self.bspline, execution_engine=self.execution_engine)
+        scenarioUseCase.optim_name = f'{ScenarioDataBuilder.SCENARIO_TAG}.{scenarioUseCase.optim_name}'
+        scenarioUseCase.study_name = witness_ms_usecase.study_name
+        scenario_builder = ScenarioDataBuilder(
+            scenarioUseCase.setup_usecase())
+
         alpha_list = np.linspace(0, 100, 11, endpoint=True) / 100.0
         for alpha_i in alpha_list:
             scenario_i = 'scenario_\u03B1=%.2f' % alpha_i
             scenario_i = scenario_i.replace('.', ',')
-            scenario_list.append(scenario_i)
-            values_dict[f'{self.study_name}.{self.scatter_scenario}.{scenario_i}.{witness_ms_usecase.optim_name}.{witness_ms_usecase.coupling_name}.{witness_ms_usecase.extra_name}.alpha'] = alpha_i
+            scenario_builder.add_scenario(
+                scenario_i, {f'{scenarioUseCase.study_name}.{scenarioUseCase.optim_name}.{scenarioUseCase.coupling_name}.{scenarioUseCase.extra_name}.alpha': alpha_i})
 
-        values_dict[f'{self.study_name}.{self.scatter_scenario}.scenario_list'] = scenario_list
+        values_dict = scenario_builder.get_values_dict()
+        values_dict[f'{self.study_name}.{self.scatter_scenario}.scenario_list'] = scenario_builder.scenario_list
         values_dict[f'{self.study_name}.epsilon0'] = 1.0
         values_dict[f'{self.study_name}.n_subcouplings_parallel'] = 11
-        for scenario in scenario_list:
-            scenarioUseCase = witness_optim_usecase(
-                bspline=self.bspline, execution_engine=self.execution_engine)
-            scenarioUseCase.optim_name = f'{scenario}.{scenarioUseCase.optim_name}'
-            scenarioUseCase.study_name = witness_ms_usecase.study_name
-            scenarioData = scenarioUseCase.setup_usecase()
-
-            for dict_data in scenarioData:
-                values_dict.update(dict_data)
         year_start = scenarioUseCase.year_start
         year_end = scenarioUseCase.year_end
         years = np.arange(year_start, year_end + 1)
@@ -19,6 +19,7 @@ limitations under the License.
 from energy_models.sos_processes.energy.MDA.energy_process_v0.usecase import INVEST_DISC_NAME
 from energy_models.sos_processes.witness_sub_process_builder import WITNESSSubProcessBuilder
 from energy_models.core.energy_process_builder import INVEST_DISCIPLINE_OPTIONS
+from climateeconomics.core.tools.process_snapshot import ProcessSnapshotCache
 
 
 class ProcessBuilder(WITNESSSubProcessBuilder):
@@ -39,8 +40,9 @@ class ProcessBuilder(WITNESSSubProcessBuilder):
         extra_name = 'WITNESS'
         self.invest_discipline = INVEST_DISCIPLINE_OPTIONS[2]
 
-        chain_builders = self.ee.factory.get_builder_from_process(
-            'climateeconomics.sos_processes.iam.witness', 'witness',
+        # the witness builders are rebuilt from their snapshot if the process was already built
+        chain_builders = ProcessSnapshotCache().get_builders(
+            self.ee, 'climateeconomics.sos_processes.iam.witness', 'witness',
             techno_dict=self.techno_dict, invest_discipline=self.invest_discipline, process_level=self.process_level)
 
         # modify namespaces defined in the child process
@@ -0,0 +1,115 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+from energy_models.sos_processes.witness_sub_process_builder import WITNESSSubProcessBuilder
+from energy_models.core.energy_process_builder import INVEST_DISCIPLINE_OPTIONS
+from climateeconomics.core.tools.coupling_graph import CouplingGraph
+from climateeconomics.sos_processes.iam.witness.witness.usecase_witness import Study as witness_usecase
+
+# name of the coupling of the strongly coupled disciplines
+COUPLED_MDA_NAME = 'CoupledMDA'
+
+
+class WitnessCouplingAnalysis():
+    '''
+    Coupling graph of the witness process configured with the data of the witness usecase
+
+    The dynamic inputs and outputs of the energy disciplines depend on the data (energy and
+    techno lists), the flat witness process is therefore configured with the usecase data in a
+    separate execution engine before the graph is built. Analyses are cached by process options.
+    '''
+    analyses = {}
+
+    def __init__(self, techno_dict, invest_discipline, process_level):
+        flat_study = witness_usecase(invest_discipline=invest_discipline, techno_dict=techno_dict,
+                                     process_level=process_level)
+        flat_study.load_data()
+        root_process = flat_study.execution_engine.root_process
+
+        self.coupling_graph = CouplingGraph.from_coupling(root_process)
+        upstream, coupled, downstream = self.coupling_graph.split_disciplines()
+        # positions in the builders list of the witness process, which builds the disciplines
+        # of the root coupling in the same order
+        position = {name: i for i, name in enumerate(
+            self.coupling_graph.disciplines)}
+        self.upstream = [position[name] for name in upstream]
+        self.coupled = [position[name] for name in coupled]
+        self.downstream = [position[name] for name in downstream]
+
+        # local inputs of the coupled disciplines, with their dynamic inputs, are below the
+        # sub-coupling: names relative to the study name
+        dm = flat_study.execution_engine.dm
+        prefix_length = len(flat_study.study_name) + 1
+        self.coupled_local_inputs = {}
+        for i in self.coupled:
+            for full_name in self.get_local_inputs(root_process.sos_disciplines[i], dm):
+                self.coupled_local_inputs[full_name[prefix_length:]] = \
+                    f'{COUPLED_MDA_NAME}.{full_name[prefix_length:]}'
+
+    @classmethod
+    def get_analysis(cls, techno_dict, invest_discipline, process_level):
+        key = (str(techno_dict), invest_discipline, process_level)
+        if key not in cls.analyses:
+            cls.analyses[key] = cls(
+                techno_dict, invest_discipline, process_level)
+        return cls.analyses[key]
+
+    @classmethod
+    def get_local_inputs(cls, discipline, dm):
+        '''
+        Full names of the local inputs of a discipline and of the disciplines of a nested coupling
+        '''
+        local_inputs = [full_name for full_name in discipline.get_input_data_names()
+                        if dm.get_data(full_name, 'visibility') == 'Local']
+        for sub_discipline in getattr(discipline, 'sos_disciplines', None) or []:
+            local_inputs.extend(cls.get_local_inputs(sub_discipline, dm))
+        return local_inputs
+
+
+class ProcessBuilder(WITNESSSubProcessBuilder):
+
+    # ontology information
+    _ontology_data = {
+        'label': 'WITNESS Process with sub-MDA on strongly coupled disciplines',
+        'description': '',
+        'category': '',
+        'version': '',
+    }
+
+    def get_builders(self):
+
+        self.invest_discipline = INVEST_DISCIPLINE_OPTIONS[2]
+
+        chain_builders = self.ee.factory.get_builder_from_process(
+            'climateeconomics.sos_processes.iam.witness', 'witness',
+            techno_dict=self.techno_dict, invest_discipline=self.invest_discipline, process_level=self.process_level)
+
+        # the disciplines upstream and downstream of the cycles run once, the others are
+        # solved by a sub-MDA seen as a single discipline by the root coupling
+        analysis = WitnessCouplingAnalysis.get_analysis(
+            self.techno_dict, self.invest_discipline, self.process_level)
+        self.ee.logger.info(analysis.coupling_graph.get_report())
+        if len(chain_builders) != len(analysis.coupling_graph.disciplines):
+            raise ValueError(
+                f'The witness process has {len(chain_builders)} builders but {len(analysis.coupling_graph.disciplines)} configured disciplines')
+
+        coupling_builder = self.ee.factory.create_builder_coupling(
+            COUPLED_MDA_NAME)
+        coupling_builder.set_builder_info(
+            'cls_builder', [chain_builders[i] for i in analysis.coupled])
+
+        return [chain_builders[i] for i in analysis.upstream] + [coupling_builder] + \
+            [chain_builders[i] for i in analysis.downstream]
@@ -0,0 +1,77 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+from energy_models.core.energy_study_manager import DEFAULT_TECHNO_DICT
+from energy_models.core.energy_process_builder import INVEST_DISCIPLINE_OPTIONS
+from climateeconomics.sos_processes.iam.witness.witness.usecase_witness import Study as witness_usecase
+from climateeconomics.sos_processes.iam.witness.witness_scc.process import COUPLED_MDA_NAME, WitnessCouplingAnalysis
+from climateeconomics.sos_processes.iam.witness.agriculture_mix_process.usecase import AGRI_MIX_TECHNOLOGIES_LIST_FOR_OPT
+from climateeconomics.core.tools.ClimateEconomicsStudyManager import ClimateEconomicsStudyManager
+
+
+class Study(ClimateEconomicsStudyManager):
+
+    def __init__(self, year_start=2020, year_end=2100, time_step=1, bspline=True, run_usecase=False, execution_engine=None,
+                 invest_discipline=INVEST_DISCIPLINE_OPTIONS[2], techno_dict=DEFAULT_TECHNO_DICT, agri_techno_list=AGRI_MIX_TECHNOLOGIES_LIST_FOR_OPT,
+                 process_level='val'):
+        super().__init__(__file__, run_usecase=run_usecase, execution_engine=execution_engine)
+        self.year_start = year_start
+        self.year_end = year_end
+        self.time_step = time_step
+        self.invest_discipline = invest_discipline
+        self.techno_dict = techno_dict
+        self.process_level = process_level
+        self.witness_uc = witness_usecase(
+            self.year_start, self.year_end, self.time_step, bspline=bspline, execution_engine=execution_engine,
+            invest_discipline=invest_discipline, techno_dict=techno_dict, agri_techno_list=agri_techno_list,
+            process_level=process_level)
+        self.sub_study_path_dict = self.witness_uc.sub_study_path_dict
+
+    def setup_usecase(self):
+        '''
+        Data of the witness usecase, the local inputs of the disciplines of the sub-MDA (dynamic
+        inputs included) are moved below it
+        '''
+        self.witness_uc.study_name = self.study_name
+        witness_data_list = self.witness_uc.setup_usecase()
+        self.dspace = self.witness_uc.dspace
+        self.func_df = self.witness_uc.func_df
+
+        coupled_local_inputs = WitnessCouplingAnalysis.get_analysis(
+            self.techno_dict, self.invest_discipline, self.process_level).coupled_local_inputs
+        prefix_length = len(self.study_name) + 1
+        setup_data_list = []
+        for values_dict in witness_data_list:
+            setup_data_list.append({
+                f'{self.study_name}.{coupled_local_inputs[name[prefix_length:]]}'
+                if name[prefix_length:] in coupled_local_inputs else name: value
+                for name, value in values_dict.items()})
+
+        coupled_mda_prefix = f'{self.study_name}.{COUPLED_MDA_NAME}'
+        numerical_values_dict = {
+            f'{coupled_mda_prefix}.max_mda_iter': 50,
+            f'{coupled_mda_prefix}.tolerance': 1.0e-10,
+            f'{coupled_mda_prefix}.linearization_mode': 'adjoint',
+            f'{coupled_mda_prefix}.sub_mda_class': 'GSPureNewtonMDA'}
+        setup_data_list.append(numerical_values_dict)
+
+        return setup_data_list
+
+
+if '__main__' == __name__:
+    uc_cls = Study(run_usecase=True)
+    uc_cls.load_data()
+    uc_cls.run()
@@ -29,6 +29,7 @@ from climateeconomics.sos_processes.iam.witness.resources_process.usecase import
 from climateeconomics.sos_processes.iam.witness.forest_v1_process.usecase import Study as datacase_forest
 from climateeconomics.sos_processes.iam.witness.agriculture_process.usecase import update_dspace_dict_with
 from sos_trades_core.study_manager.study_manager import StudyManager
+from climateeconomics.sos_processes.iam.witness_wo_energy.process import CLIMATE_ECONOMY_CORE_NAME
 OBJECTIVE = FunctionManagerDisc.OBJECTIVE
 INEQ_CONSTRAINT = FunctionManagerDisc.INEQ_CONSTRAINT
 EQ_CONSTRAINT = FunctionManagerDisc.EQ_CONSTRAINT
@@ -39,8 +40,12 @@ AGGR_TYPE_DELTA = FunctionManager.AGGR_TYPE_DELTA
 AGGR_TYPE_LIN_TO_QUAD = FunctionManager.AGGR_TYPE_LIN_TO_QUAD
 
 class DataStudy():
-    def __init__(self, year_start=2020, year_end=2100, time_step=1):
+    def __init__(self, year_start=2020, year_end=2100, time_step=1, fused_climate_economy=False):
         self.study_name = 'default_name'
+        # the local variables of Damage and Macroeconomics are in the fused discipline if fused
+        self.fused_climate_economy = fused_climate_economy
+        self.damage_name = f'.{CLIMATE_ECONOMY_CORE_NAME}' if fused_climate_economy else '.Damage'
+        self.macroeconomics_name = f'.{CLIMATE_ECONOMY_CORE_NAME}' if fused_climate_economy else '.Macroeconomics'
         self.year_start = year_start
         self.year_end = year_end
         self.time_step = time_step
@@ -60,10 +65,10 @@ class DataStudy():
         witness_input[self.study_name + '.year_end'] = self.year_end
         witness_input[self.study_name + '.time_step'] = self.time_step
 
-        witness_input[self.study_name +
-                      '.Damage.tipping_point'] = True
-        witness_input[self.study_name +
-                      '.Macroeconomics.damage_to_productivity'] = True
+        witness_input[self.study_name + self.damage_name +
+                      '.tipping_point'] = True
+        witness_input[self.study_name + self.macroeconomics_name +
+                      '.damage_to_productivity'] = True
         witness_input[self.study_name +
                       '.frac_damage_prod'] = 0.30
         witness_input[self.study_name +
@@ -73,7 +78,7 @@ class DataStudy():
         witness_input[self.study_name +
                       '.init_gross_output'] = 130.187
         # Relax constraint for 15 first years
-        witness_input[self.study_name + '.Damage.damage_constraint_factor'] = np.concatenate(
+        witness_input[self.study_name + self.damage_name + '.damage_constraint_factor'] = np.concatenate(
             (np.linspace(1.0, 1.0, 20), np.asarray([1] * (len(years) - 20))))
 #         witness_input[self.study_name +
 #                       '.Damage.damage_constraint_factor'] = np.asarray([1] * len(years))
@@ -184,7 +189,7 @@ class DataStudy():
         # WITNESS
         # setup objectives
 
-        witness_input[f'{self.study_name}.Macroeconomics.CO2_tax_efficiency'] = default_co2_efficiency
+        witness_input[f'{self.study_name}{self.macroeconomics_name}.CO2_tax_efficiency'] = default_co2_efficiency
 
         witness_input[f'{self.study_name}.beta'] = 1.0
         witness_input[f'{self.study_name}.gamma'] = 0.5
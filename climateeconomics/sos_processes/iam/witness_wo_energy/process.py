@@ -19,6 +19,9 @@ limitations under the License.
 # All rights reserved.
 from sos_trades_core.sos_processes.base_process_builder import BaseProcessBuilder
 
+# name of the discipline solving the climate-economy disciplines when they are fused
+CLIMATE_ECONOMY_CORE_NAME = 'ClimateEconomyCore'
+
 
 class ProcessBuilder(BaseProcessBuilder):
 
@@ -30,6 +33,15 @@ class ProcessBuilder(BaseProcessBuilder):
         'version': '',
     }
 
+    def __init__(self, ee):
+        BaseProcessBuilder.__init__(self, ee)
+        self.fused_climate_economy = False
+
+    def setup_process(self, fused_climate_economy=False):
+        # if True Macroeconomics, Population and the climate models are solved in a single
+        # ClimateEconomyCore discipline
+        self.fused_climate_economy = fused_climate_economy
+
     def get_builders(self):
 
         ns_scatter = self.ee.study_name
@@ -51,7 +63,19 @@ class ProcessBuilder(BaseProcessBuilder):
                      'Utility': 'climateeconomics.sos_wrapping.sos_wrapping_witness.utilitymodel.utilitymodel_discipline.UtilityModelDiscipline',
                      'Policy': 'climateeconomics.sos_wrapping.sos_wrapping_witness.policymodel.policy_discipline.PolicyDiscipline'}
 
-        builder_list = self.create_builder_list(mods_dict, ns_dict=ns_dict)
+        if self.fused_climate_economy:
+            # the coupling variables of these disciplines are solved in the run of the fused
+            # discipline, the outer MDA sees a single discipline with the total derivatives
+            ns_dict['ns_public'] = ns_scatter
+            builder_list = self.create_builder_list(
+                {CLIMATE_ECONOMY_CORE_NAME: 'climateeconomics.sos_wrapping.sos_wrapping_witness.climate_economy_core.climate_economy_core_discipline.ClimateEconomyCoreDiscipline'},
+                ns_dict=ns_dict)
+            chain_builders_population = []
+        else:
+            builder_list = self.create_builder_list(mods_dict, ns_dict=ns_dict)
+
+            chain_builders_population = self.ee.factory.get_builder_from_process(
+                'climateeconomics.sos_processes.iam.witness', 'population_process')
 
         chain_builders_landuse = self.ee.factory.get_builder_from_process(
             'climateeconomics.sos_processes.iam.witness', 'land_use_v1_process')
@@ -61,8 +85,6 @@ class ProcessBuilder(BaseProcessBuilder):
             'climateeconomics.sos_processes.iam.witness', 'agriculture_process')
         builder_list.extend(chain_builders_agriculture)
 
-        chain_builders_population = self.ee.factory.get_builder_from_process(
-            'climateeconomics.sos_processes.iam.witness', 'population_process')
         builder_list.extend(chain_builders_population)
 
         chain_builders_forest = self.ee.factory.get_builder_from_process(
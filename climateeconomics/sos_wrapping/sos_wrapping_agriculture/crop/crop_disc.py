@@ -322,6 +322,9 @@ class CropDiscipline(ClimateEcoDiscipline):
         'N2O_land_emission_detailed': {'type': 'dataframe', 'unit': 'GtN2O',
                                        'visibility': ClimateEcoDiscipline.SHARED_VISIBILITY, 'namespace': 'ns_crop'},
     }
+    DETAIL_OUTPUTS = ['food_land_surface_percentage_df', 'crop_productivity_evolution', 'mix_detailed_prices',
+                      'mix_detailed_production', 'cost_details']
+
 
     CROP_CHARTS = 'crop and diet charts'
 
@@ -337,7 +340,7 @@ class CropDiscipline(ClimateEcoDiscipline):
         # -- configure class with inputs
         self.crop_model.configure_parameters_update(input_dict)
         # -- compute
-        self.crop_model.compute()
+        self.crop_model.compute(detail_outputs=not self.is_lean())
 
         # Scale production TWh -> PWh
         techno_production = self.crop_model.mix_detailed_production[[
@@ -404,7 +407,7 @@ class CropDiscipline(ClimateEcoDiscipline):
         high_calorific_value = inputs_dict['data_fuel_dict']['high_calorific_value']
         model = self.crop_model
         model.configure_parameters_update(inputs_dict)
-        model.compute()
+        model.compute(detail_outputs=False)
 
         # get variable
         food_land_surface_df = model.food_land_surface_df
@@ -599,7 +602,7 @@ class CropDiscipline(ClimateEcoDiscipline):
 
         return chart_filters
 
-    def get_post_processing_list(self, chart_filters=None):
+    def build_post_processing_list(self, chart_filters=None):
         '''
         For the outputs, making a graph for tco vs year for each range and for specific
         value of ToT with a shift of five year between then
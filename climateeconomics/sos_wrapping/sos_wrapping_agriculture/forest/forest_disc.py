@@ -235,6 +235,9 @@ class ForestDiscipline(ClimateEcoDiscipline):
         'forest_lost_capital': {
             'type': 'dataframe', 'unit': 'G$', 'visibility': ClimateEcoDiscipline.SHARED_VISIBILITY, 'namespace': 'ns_forest'},
     }
+    DETAIL_OUTPUTS = [Forest.FOREST_DETAIL_SURFACE_DF,
+                      Forest.CO2_EMITTED_DETAIL_DF]
+
 
     FOREST_CHARTS = 'Forest chart'
 
@@ -252,7 +255,8 @@ class ForestDiscipline(ClimateEcoDiscipline):
 
         #-- compute
         inputs_dict = self.get_sosdisc_inputs()
-        self.forest_model.compute(inputs_dict)
+        self.forest_model.compute(
+            inputs_dict, detail_outputs=not self.is_lean())
         # Scale production TWh -> PWh
         techno_production = self.forest_model.techno_production[[
             'years', 'biomass_dry (TWh)']]
@@ -298,7 +302,7 @@ class ForestDiscipline(ClimateEcoDiscipline):
         Compute jacobian for each coupling variable
         """
         inputs_dict = self.get_sosdisc_inputs()
-        self.forest_model.compute(inputs_dict)
+        self.forest_model.compute(inputs_dict, detail_outputs=False)
         wood_techno_dict = inputs_dict['wood_techno_dict']
         scaling_factor_techno_production = inputs_dict['scaling_factor_techno_production']
         scaling_factor_techno_consumption = inputs_dict['scaling_factor_techno_consumption']
@@ -489,7 +493,7 @@ class ForestDiscipline(ClimateEcoDiscipline):
 
         return chart_filters
 
-    def get_post_processing_list(self, chart_filters=None):
+    def build_post_processing_list(self, chart_filters=None):
         '''
         For the outputs, making a graph for tco vs year for each range and for specific
         value of ToT with a shift of five year between then
@@ -19,6 +19,7 @@ from sos_trades_core.tools.post_processing.pareto_front_optimal_charts.instancia
     InstantiatedParetoFrontOptimalChart
 from sos_trades_core.tools.post_processing.charts.two_axes_instanciated_chart import InstanciatedSeries, TwoAxesInstanciatedChart
 from sos_trades_core.execution_engine.data_manager import DataManager
+from climateeconomics.core.tools.scenario_results_cube import get_scenario_results_cube
 
 
 def post_processing_filters(execution_engine, namespace):
@@ -43,7 +44,7 @@ def post_processings(execution_engine, namespace, filters):
     else:
         graphs_list = ['Temperature vs Welfare']
 
-    temperature_df_dict, utility_df_dict, scenario_list, year_end, namespace_w = get_df(
+    cube, scenario_list, year_end, namespace_w = get_results_cube(
         execution_engine, namespace)
 
     """
@@ -57,12 +58,10 @@ def post_processings(execution_engine, namespace, filters):
 
         chart_name = f'Temperature in {year_end} vs Welfare'
 
-        temperature = {}
-        welfare = {}
-
-        for scenario in scenario_list:
-            temperature[scenario] = temperature_df_dict[scenario]['temp_atmo'][year_end]
-            welfare[scenario] = utility_df_dict[scenario]['welfare'][year_end]
+        temperature = dict(
+            zip(scenario_list, cube.get_at_year('temp_atmo', year_end).tolist()))
+        welfare = dict(
+            zip(scenario_list, cube.get_at_year('welfare', year_end).tolist()))
 
         min_temp = min(list(temperature.values()))
         max_temp = max(list(temperature.values()))
@@ -168,28 +167,23 @@ def post_processings(execution_engine, namespace, filters):
 
 
 
-def get_df(execution_engine, namespace):
+def get_results_cube(execution_engine, namespace):
 
-    temperature_df_dict = {}
-    utility_df_dict = {}
     scatter_scenario = 'Control rate scenarios'
     namespace_w = f'{execution_engine.study_name}.{scatter_scenario}'
 
     scenario_key = execution_engine.dm.get_data_id(f'{namespace_w}.scenario_list')
     scenario_list = execution_engine.dm.data_dict[scenario_key][DataManager.VALUE]
 
-    for scenario in scenario_list:
-        temperature_df_namespace = f'{namespace_w}.{scenario}.temperature_df'
-        utility_df_namespace = f'{namespace_w}.{scenario}.utility_df'
-
-        x_key = execution_engine.dm.get_data_id(temperature_df_namespace)
-        y_key = execution_engine.dm.get_data_id(utility_df_namespace)
-
-        temperature_df_dict[scenario] = execution_engine.dm.data_dict[x_key][DataManager.VALUE]
-        utility_df_dict[scenario] = execution_engine.dm.data_dict[y_key][DataManager.VALUE]
-
     year_end_namespace = f'{namespace_w}.year_end'
     year_key = execution_engine.dm.get_data_id(year_end_namespace)
     year_end = execution_engine.dm.data_dict[year_key][DataManager.VALUE]
 
-    return temperature_df_dict, utility_df_dict, scenario_list, year_end, namespace_w
+    # DICE dataframes are indexed by year with a 5 years time step
+    years = execution_engine.dm.get_value(
+        f'{namespace_w}.{scenario_list[0]}.temperature_df').index.values
+    cube = get_scenario_results_cube(execution_engine, namespace_w, scenario_list, years,
+                                     {'temp_atmo': ('temperature_df', 'temp_atmo'),
+                                      'welfare': ('utility_df', 'welfare')})
+
+    return cube, scenario_list, year_end, namespace_w
@@ -139,7 +139,7 @@ class MacroeconomicsDiscipline(ClimateEcoDiscipline):
 
         return chart_filters
 
-    def get_post_processing_list(self, chart_filters=None):
+    def build_post_processing_list(self, chart_filters=None):
 
         instanciated_charts = []
 
@@ -159,7 +159,7 @@ class ObjectivesDiscipline(ClimateEcoDiscipline):
 
         return chart_filters
 
-    def get_post_processing_list(self, chart_filters=None):
+    def build_post_processing_list(self, chart_filters=None):
 
         instanciated_charts = []
 
@@ -232,7 +232,7 @@ class ServicesDiscipline(ClimateEcoDiscipline):
 
         return chart_filters
 
-    def get_post_processing_list(self, chart_filters=None):
+    def build_post_processing_list(self, chart_filters=None):
 
         instanciated_charts = []
 
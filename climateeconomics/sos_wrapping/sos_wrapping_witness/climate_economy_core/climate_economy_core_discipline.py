@@ -0,0 +1,107 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+from climateeconomics.core.core_witness.climateeco_discipline import ClimateEcoDiscipline
+from climateeconomics.core.tools.fused_coupling import FusedCoupling
+from climateeconomics.sos_wrapping.sos_wrapping_witness.macroeconomics.macroeconomics_discipline import MacroeconomicsDiscipline
+from climateeconomics.sos_wrapping.sos_wrapping_witness.carboncycle.carboncycle_discipline import CarbonCycleDiscipline
+from climateeconomics.sos_wrapping.sos_wrapping_witness.carbonemissions.carbonemissions_discipline import CarbonemissionsDiscipline
+from climateeconomics.sos_wrapping.sos_wrapping_witness.damagemodel.damagemodel_discipline import DamageDiscipline
+from climateeconomics.sos_wrapping.sos_wrapping_witness.tempchange.tempchange_discipline import TempChangeDiscipline
+from climateeconomics.sos_wrapping.sos_wrapping_witness.utilitymodel.utilitymodel_discipline import UtilityModelDiscipline
+from climateeconomics.sos_wrapping.sos_wrapping_witness.policymodel.policy_discipline import PolicyDiscipline
+from climateeconomics.sos_wrapping.sos_wrapping_witness.population.population_discipline import PopulationDiscipline
+
+
+class ClimateEconomyCoreDiscipline(ClimateEcoDiscipline):
+    '''
+    Macroeconomics, Population and the climate models of WITNESS solved as a single discipline
+
+    The coupling variables between these disciplines are solved in the run by a FusedCoupling
+    (Gauss-Seidel sweep then Newton steps), the outer MDA only exchanges the inputs and outputs
+    of the block and linearizes it with the total derivatives of the block.
+    The initial values of the coupling variables are the current values of the outputs, either
+    set in the study or computed by the previous run.
+    '''
+
+    # ontology information
+    _ontology_data = {
+        'label': 'WITNESS Climate Economy Core Model',
+        'type': 'Research',
+        'source': 'SoSTrades Project',
+        'validated': '',
+        'validated_by': 'SoSTrades Project',
+        'last_modification_date': '',
+        'category': '',
+        'definition': '',
+        'icon': 'fas fa-cogs fa-fw',
+        'version': '',
+    }
+    _maturity = 'Research'
+
+    DISCIPLINES = {'Macroeconomics': MacroeconomicsDiscipline,
+                   'Carboncycle': CarbonCycleDiscipline,
+                   'Carbon_emissions': CarbonemissionsDiscipline,
+                   'Damage': DamageDiscipline,
+                   'Temperature_change': TempChangeDiscipline,
+                   'Utility': UtilityModelDiscipline,
+                   'Policy': PolicyDiscipline,
+                   'Population': PopulationDiscipline}
+
+    DESC_IN, DESC_OUT = FusedCoupling.get_desc(DISCIPLINES)
+    DESC_IN.update({
+        'max_mda_iter': {'type': 'int', 'default': 50, 'unit': '-', 'user_level': 3},
+        'tolerance': {'type': 'float', 'default': 1.0e-10, 'unit': '-', 'user_level': 3}})
+    # convergence of the last solve of the coupling variables
+    DESC_OUT.update({
+        'fused_coupling_n_iterations': {'type': 'int', 'unit': '-'},
+        'fused_coupling_residual': {'type': 'float', 'unit': '-'}})
+    DETAIL_OUTPUTS = [name for discipline_class in DISCIPLINES.values()
+                      if issubclass(discipline_class, ClimateEcoDiscipline)
+                      for name in discipline_class.DETAIL_OUTPUTS]
+
+    def __init__(self, sos_name, ee):
+
+        self.fused_coupling = FusedCoupling(
+            self, self.DISCIPLINES, logger=ee.logger)
+        ClimateEcoDiscipline.__init__(self, sos_name, ee)
+
+    def setup_sos_disciplines(self):
+
+        self.add_inputs(self.fused_coupling.setup())
+
+    def init_execution(self):
+        self.fused_coupling.init_execution()
+
+    def run(self):
+        max_mda_iter, tolerance = self.get_sosdisc_inputs(
+            ['max_mda_iter', 'tolerance'])
+        initial_values = {name: self.get_sosdisc_outputs(name)
+                          for name in self.fused_coupling.coupling_names}
+
+        outputs = self.fused_coupling.solve(self.get_sosdisc_inputs(), initial_values,
+                                            tolerance=tolerance, max_iter=max_mda_iter)
+        outputs.update({'fused_coupling_n_iterations': self.fused_coupling.n_iterations,
+                        'fused_coupling_residual': self.fused_coupling.residual})
+
+        self.store_sos_outputs_values(outputs)
+
+    def compute_sos_jacobian(self):
+        """
+        Total derivatives of the block, the coupling variables are eliminated with the partial
+        derivatives of the disciplines at the solution
+        """
+        for (y_key, x_key), value in self.fused_coupling.compute_total_derivatives().items():
+            self.set_partial_derivative_for_other_types(y_key, x_key, value)
@@ -124,6 +124,8 @@ class MacroeconomicsDiscipline(ClimateEcoDiscipline):
         'delta_capital_lintoquad': {'type': 'array', 'unit': '-', 'visibility': ClimateEcoDiscipline.SHARED_VISIBILITY,
                                     'namespace': 'ns_functions'}
     }
+    DETAIL_OUTPUTS = ['economics_detail_df']
+
 
     def setup_sos_disciplines(self):
 
@@ -200,11 +202,12 @@ class MacroeconomicsDiscipline(ClimateEcoDiscipline):
         # Model execution
         economics_df, energy_investment, global_investment_constraint, energy_investment_wo_renewable, \
             pc_consumption_constraint, workforce_df, capital_df, emax_enet_constraint = \
-            self.macro_model.compute(macro_inputs)
+            self.macro_model.compute(
+                macro_inputs, detail_outputs=not self.is_lean())
 
         # Store output data
         dict_values = {'economics_detail_df': economics_df,
-                       'economics_df': economics_df[['years', 'gross_output', 'pc_consumption', 'output_net_of_d']],
+                       'economics_df': economics_df[MacroEconomics.ECONOMICS_DF_COLUMNS],
                        'energy_investment': energy_investment,
                        'global_investment_constraint': global_investment_constraint,
                        'energy_investment_wo_renewable': energy_investment_wo_renewable,
@@ -625,7 +628,7 @@ class MacroeconomicsDiscipline(ClimateEcoDiscipline):
 
         return chart_filters
 
-    def get_post_processing_list(self, chart_filters=None):
+    def build_post_processing_list(self, chart_filters=None):
 
         instanciated_charts = []
 
@@ -635,12 +638,10 @@ class MacroeconomicsDiscipline(ClimateEcoDiscipline):
                 if chart_filter.filter_key == 'charts':
                     chart_list = chart_filter.selected_values
 
-        economics_df = deepcopy(
-            self.get_sosdisc_outputs('economics_detail_df'))
+        economics_df = self.get_sosdisc_outputs('economics_detail_df')
         co2_invest_limit, capital_utilisation_ratio = deepcopy(
             self.get_sosdisc_inputs(['co2_invest_limit', 'capital_utilisation_ratio']))
-        workforce_df = deepcopy(
-            self.get_sosdisc_outputs('workforce_df'))
+        workforce_df = self.get_sosdisc_outputs('workforce_df')
 
         if 'output of damage' in chart_list:
 
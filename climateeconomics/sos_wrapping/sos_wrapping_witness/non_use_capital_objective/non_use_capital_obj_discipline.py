@@ -165,7 +165,15 @@ class NonUseCapitalObjectiveDiscipline(SoSDiscipline):
             # the list could be appended with other capital than energy
             all_non_use_capital_list.extend(full_techno_list)
 
+        # names of the capital inputs, resolved once here and used by the model and the gradients
+        self.non_use_capital_keys = []
+        self.techno_capital_keys = []
         for non_use_capital_tuple in all_non_use_capital_list:
+            if f'{non_use_capital_tuple[0]}non_use_capital' not in dynamic_inputs:
+                self.non_use_capital_keys.append(
+                    f'{non_use_capital_tuple[0]}non_use_capital')
+                self.techno_capital_keys.append(
+                    f'{non_use_capital_tuple[0]}techno_capital')
             dynamic_inputs[f'{non_use_capital_tuple[0]}non_use_capital'] = {'type': 'dataframe',
                                                                             'visibility': SoSDiscipline.SHARED_VISIBILITY,
                                                                             'namespace': non_use_capital_tuple[1],
@@ -181,6 +189,8 @@ class NonUseCapitalObjectiveDiscipline(SoSDiscipline):
 
         inp_dict = self.get_sosdisc_inputs()
         self.model = NonUseCapitalObjective(inp_dict)
+        self.model.set_capital_keys(
+            self.non_use_capital_keys, self.techno_capital_keys)
 
     def run(self):
         # get inputs
@@ -212,47 +222,28 @@ class NonUseCapitalObjectiveDiscipline(SoSDiscipline):
         non_use_capital_objective
         """
         inputs_dict = self.get_sosdisc_inputs()
-        years = np.arange(inputs_dict['year_start'],
-                          inputs_dict['year_end'] + 1)
-        non_use_capital_obj_ref = inputs_dict['non_use_capital_obj_ref']
-        alpha, gamma = inputs_dict['alpha'], inputs_dict['gamma']
-        non_use_capital_cons_ref = inputs_dict['non_use_capital_cons_ref']
-        is_dev = inputs_dict['is_dev']
-        outputs_dict = self.get_sosdisc_outputs()
-        non_use_capital_df = outputs_dict['non_use_capital_df']
-        input_nonusecapital_list = [
-            key for key in inputs_dict.keys() if key.endswith('non_use_capital')]
-        delta_years = len(non_use_capital_df['years'].values)
-        for non_use_capital in input_nonusecapital_list:
-            column_name = [
-                col for col in inputs_dict[non_use_capital].columns if col != 'years'][0]
+        # the gradients are the same for each techno and only depend on
+        # parameters, they are computed once by the model
+        d_objective, d_cons = self.model.compute_d_objective_and_constraint()
+        d_energy_capital = self.model.compute_d_energy_capital()
+        for non_use_capital in self.non_use_capital_keys:
+            column_name = NonUseCapitalObjective.get_capital_column(
+                inputs_dict[non_use_capital])
             self.set_partial_derivative_for_other_types(
-                ('non_use_capital_objective',), (non_use_capital, column_name),
-                np.ones(len(years)) * alpha * (1 - gamma) / non_use_capital_obj_ref / delta_years)
+                ('non_use_capital_objective',), (non_use_capital, column_name), d_objective)
             self.set_partial_derivative_for_other_types(
-                ('non_use_capital_cons',), (non_use_capital, column_name),
-                - np.ones(len(years)) / non_use_capital_cons_ref / delta_years)
-        input_capital_list = [
-            key for key in inputs_dict.keys() if key.endswith('techno_capital')]
-
-        for capital in input_capital_list:
-            column_name = [
-                col for col in inputs_dict[capital].columns if col != 'years'][0]
-            self.set_partial_derivative_for_other_types(
-                ('energy_capital', 'energy_capital'), (capital, column_name), np.identity(len(years)) / 1.e3)
-        if is_dev:
-            forest_lost_capital_cons_ref = inputs_dict['forest_lost_capital_cons_ref']
-            self.set_partial_derivative_for_other_types(
-                ('forest_lost_capital_cons',
-                 ), ('forest_lost_capital', 'reforestation'),
-                - np.ones(len(years)) / forest_lost_capital_cons_ref / delta_years)
-            self.set_partial_derivative_for_other_types(
-                ('forest_lost_capital_cons',), ('forest_lost_capital', 'managed_wood'),
-                - np.ones(len(years)) / forest_lost_capital_cons_ref / delta_years)
+                ('non_use_capital_cons',), (non_use_capital, column_name), d_cons)
+
+        for capital in self.techno_capital_keys:
+            column_name = NonUseCapitalObjective.get_capital_column(
+                inputs_dict[capital])
             self.set_partial_derivative_for_other_types(
-                ('forest_lost_capital_cons',
-                 ), ('forest_lost_capital', 'deforestation'),
-                - np.ones(len(years)) / forest_lost_capital_cons_ref / delta_years)
+                ('energy_capital', 'energy_capital'), (capital, column_name), d_energy_capital)
+        if inputs_dict['is_dev']:
+            d_forest_lost_capital_cons = self.model.compute_d_forest_lost_capital_cons()
+            for column in ['reforestation', 'managed_wood', 'deforestation']:
+                self.set_partial_derivative_for_other_types(
+                    ('forest_lost_capital_cons',), ('forest_lost_capital', column), d_forest_lost_capital_cons)
 
     def get_chart_filter_list(self):
 
@@ -283,7 +274,14 @@ class NonUseCapitalObjectiveDiscipline(SoSDiscipline):
 
         if 'Non Use Capitals' in chart_list:
 
-            non_use_capital_df = self.get_sosdisc_outputs('non_use_capital_df')
+            # the capital of each techno is only aggregated for post-processing
+            inputs_dict = self.get_sosdisc_inputs()
+            model = NonUseCapitalObjective(inputs_dict)
+            model.set_capital_keys(
+                self.non_use_capital_keys, self.techno_capital_keys)
+            model.create_year_range()
+            non_use_capital_df = model.get_capital_detail_df(
+                'non_use_capital', inputs_dict)
 
             years = list(non_use_capital_df['years'].values)
 
@@ -20,7 +20,6 @@ from sos_trades_core.tools.post_processing.charts.two_axes_instanciated_chart im
 from sos_trades_core.tools.post_processing.charts.chart_filter import ChartFilter
 from os.path import join, dirname
 from pathlib import Path
-from copy import deepcopy
 import pandas as pd
 import numpy as np
 
@@ -97,6 +96,8 @@ class PopulationDiscipline(ClimateEcoDiscipline):
         'life_expectancy_df': {'type': 'dataframe', 'unit': 'age'}
     }
 
+    DETAIL_OUTPUTS = ['death_rate_dict', 'death_dict']
+
     _maturity = 'Research'
 
     def init_execution(self):
@@ -110,7 +111,7 @@ class PopulationDiscipline(ClimateEcoDiscipline):
 
         # model execution
         population_detail_df, birth_rate_df, death_rate_dict, birth_df, death_dict, life_expectancy_df, working_age_population_df = self.model.compute(
-            in_dict)
+            in_dict, detail_outputs=not self.is_lean())
 
         population_df = population_detail_df[['years', 'total']]
         population_df = population_df.rename(columns={"total": "population"})
@@ -172,7 +173,7 @@ class PopulationDiscipline(ClimateEcoDiscipline):
 
         return chart_filters
 
-    def get_post_processing_list(self, chart_filters=None):
+    def build_post_processing_list(self, chart_filters=None):
 
         # For the outputs, making a graph for tco vs year for each range and for specific
         # value of ToT with a shift of five year between then
@@ -187,18 +188,13 @@ class PopulationDiscipline(ClimateEcoDiscipline):
                 if chart_filter.filter_key == 'years':
                     years_list = chart_filter.selected_values
 
-        pop_df = deepcopy(
-            self.get_sosdisc_outputs('population_detail_df'))
-        birth_rate_df = deepcopy(
-            self.get_sosdisc_outputs('birth_rate_df'))
-        birth_df = deepcopy(
-            self.get_sosdisc_outputs('birth_df'))
-        death_rate_dict = deepcopy(
-            self.get_sosdisc_outputs('death_rate_dict'))
-        death_dict = deepcopy(
-            self.get_sosdisc_outputs('death_dict'))
-        life_expectancy_df = deepcopy(
-            self.get_sosdisc_outputs('life_expectancy_df'))
+        # charts only read the outputs, they are not copied
+        pop_df = self.get_sosdisc_outputs('population_detail_df')
+        birth_rate_df = self.get_sosdisc_outputs('birth_rate_df')
+        birth_df = self.get_sosdisc_outputs('birth_df')
+        death_rate_dict = self.get_sosdisc_outputs('death_rate_dict')
+        death_dict = self.get_sosdisc_outputs('death_dict')
+        life_expectancy_df = self.get_sosdisc_outputs('life_expectancy_df')
 
         if 'World population' in chart_list:
 
@@ -19,7 +19,8 @@ from sos_trades_core.tools.post_processing.pareto_front_optimal_charts.instancia
     InstantiatedParetoFrontOptimalChart
 from sos_trades_core.tools.post_processing.charts.two_axes_instanciated_chart import InstanciatedSeries, TwoAxesInstanciatedChart
 from sos_trades_core.execution_engine.data_manager import DataManager
-from copy import deepcopy
+from climateeconomics.core.tools.scenario_results_cube import get_scenario_results_cube
+import numpy as np
 
 
 def post_processing_filters(execution_engine, namespace):
@@ -58,6 +59,28 @@ def post_processings(execution_engine, namespace, filters):
                 selected_scenarios = chart_filter.selected_values
 
         selected_scenarios = scenario_list
+    # all the charts read their data from the results cube, the dataframes
+    # of each scenario are extracted only once
+    years = execution_engine.dm.get_value(
+        f'{namespace_w}.{scenario_list[0]}.Temperature.temperature_detail_df')['years'].values
+    cube_variables = {'temp_atmo': ('Temperature.temperature_detail_df', 'temp_atmo'),
+                      'forcing': ('Temperature.temperature_detail_df', 'forcing')}
+    other_forcing_variables = []
+    if 'Forcing per scenario' in graphs_list:
+        cube_variables['CO2 forcing'] = (
+            'Temperature.forcing_detail_df', 'CO2 forcing')
+        for scenario in scenario_list:
+            forcing_df = execution_engine.dm.get_value(
+                f'{namespace_w}.{scenario}.Temperature.forcing_detail_df')
+            for col in forcing_df.columns:
+                if col not in ['years', 'CO2 forcing'] and f'other RF {col}' not in cube_variables:
+                    cube_variables[f'other RF {col}'] = (
+                        'Temperature.forcing_detail_df', col)
+                    other_forcing_variables.append(f'other RF {col}')
+    cube = get_scenario_results_cube(
+        execution_engine, namespace_w, scenario_list, years, cube_variables)
+    years = years.tolist()
+
     """
         -------------
         -------------
@@ -72,15 +95,7 @@ def post_processings(execution_engine, namespace, filters):
         x_axis_name = 'Years'
         y_axis_name = 'Temperature [degrees Celsius above preindustrial]'
 
-        temperature_dict = {}
-        for scenario in scenario_list:
-            temperature_detail_df = execution_engine.dm.get_value(
-                f'{namespace_w}.{scenario}.Temperature.temperature_detail_df')
-            temperature_dict[scenario] = temperature_detail_df['temp_atmo'].values.tolist(
-            )
-            years = temperature_detail_df['years'].values.tolist(
-            )
-        new_chart = get_scenario_comparison_chart(years, temperature_dict,
+        new_chart = get_scenario_comparison_chart(years, cube.get_dict('temp_atmo'),
                                                   chart_name=chart_name,
                                                   x_axis_name=x_axis_name, y_axis_name=y_axis_name, selected_scenarios=selected_scenarios)
 
@@ -91,15 +106,7 @@ def post_processings(execution_engine, namespace, filters):
         x_axis_name = 'Years'
         y_axis_name = 'Forcing [W.m-2]'
 
-        temperature_dict = {}
-        for scenario in scenario_list:
-            temperature_detail_df = execution_engine.dm.get_value(
-                f'{namespace_w}.{scenario}.Temperature.temperature_detail_df')
-            temperature_dict[scenario] = temperature_detail_df['forcing'].values.tolist(
-            )
-            years = temperature_detail_df['years'].values.tolist(
-            )
-        new_chart = get_scenario_comparison_chart(years, temperature_dict,
+        new_chart = get_scenario_comparison_chart(years, cube.get_dict('forcing'),
                                                   chart_name=chart_name,
                                                   x_axis_name=x_axis_name, y_axis_name=y_axis_name, selected_scenarios=selected_scenarios)
 
@@ -109,15 +116,7 @@ def post_processings(execution_engine, namespace, filters):
         x_axis_name = 'Years'
         y_axis_name = 'CO2 Forcing [W.m-2]'
 
-        forcing_dict = {}
-        for scenario in scenario_list:
-            forcing_df = execution_engine.dm.get_value(
-                f'{namespace_w}.{scenario}.Temperature.forcing_detail_df')
-            forcing_dict[scenario] = forcing_df['CO2 forcing'].values.tolist(
-            )
-            years = forcing_df['years'].values.tolist(
-            )
-        new_chart = get_scenario_comparison_chart(years, forcing_dict,
+        new_chart = get_scenario_comparison_chart(years, cube.get_dict('CO2 forcing'),
                                                   chart_name=chart_name,
                                                   x_axis_name=x_axis_name, y_axis_name=y_axis_name, selected_scenarios=selected_scenarios)
 
@@ -129,22 +128,21 @@ def post_processings(execution_engine, namespace, filters):
 
         forcing_dict = {}
         selected_scenarios_other = []
-        for scenario in scenario_list:
-            forcing_df = deepcopy(execution_engine.dm.get_value(
-                f'{namespace_w}.{scenario}.Temperature.forcing_detail_df'))
-            for col in forcing_df.columns:
-                if col not in ['years', 'CO2 forcing']:
-                    if f'other RF {scenario}' in forcing_dict:
-                        forcing_dict[f'other RF {scenario}'] += forcing_df[col].values
-                    else:
-                        forcing_dict[f'other RF {scenario}'] = forcing_df[col].values
+        if len(other_forcing_variables) > 0:
+            # forcing models do not have the same other forcing columns,
+            # missing columns are NaN in the cube
+            other_forcing = np.stack([cube.get(col)
+                                      for col in other_forcing_variables], axis=2)
+            has_other_forcing = ~np.all(
+                np.isnan(other_forcing), axis=(1, 2))
+            other_forcing = np.nansum(other_forcing, axis=2)
+            for i, scenario in enumerate(scenario_list):
+                if has_other_forcing[i]:
+                    forcing_dict[f'other RF {scenario}'] = other_forcing[i].tolist()
                     if scenario in selected_scenarios:
-                        selected_scenarios_other.append(f'other RF {scenario}')
-            years = forcing_df['years'].values.tolist(
-            )
-        forcing_dict_in_list = {key: value.tolist()
-                                for key, value in forcing_dict.items()}
-        new_chart = get_scenario_comparison_chart(years, forcing_dict_in_list,
+                        selected_scenarios_other.append(
+                            f'other RF {scenario}')
+        new_chart = get_scenario_comparison_chart(years, forcing_dict,
                                                   chart_name=chart_name,
                                                   x_axis_name=x_axis_name, y_axis_name=y_axis_name, selected_scenarios=selected_scenarios_other)
 
@@ -0,0 +1,82 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+from sos_trades_core.tools.post_processing.charts.chart_filter import ChartFilter
+from sos_trades_core.tools.post_processing.plotly_native_charts.instantiated_plotly_native_chart import InstantiatedPlotlyNativeChart
+
+from plotly import graph_objects as go
+
+from climateeconomics.core.tools.convergence_telemetry import ConvergenceTelemetry
+
+CONVERGENCE_CHART = 'MDA convergence per coupling variable'
+
+
+def post_processing_filters(execution_engine, namespace):
+    '''
+    WARNING : the execution_engine and namespace arguments are necessary to retrieve the filters
+    '''
+    filters = []
+
+    chart_list = [CONVERGENCE_CHART]
+    filters.append(ChartFilter('Charts', chart_list, chart_list, 'Charts'))
+
+    return filters
+
+
+def post_processings(execution_engine, namespace, filters):
+    '''
+    WARNING : the execution_engine and namespace arguments are necessary to retrieve the post_processings
+    '''
+    instanciated_charts = []
+
+    # Overload default value with chart filter
+    graphs_list = [CONVERGENCE_CHART]
+    if filters is not None:
+        graphs_list = []
+        for chart_filter in filters:
+            if chart_filter.filter_key == 'Charts':
+                graphs_list.extend(chart_filter.selected_values)
+
+    if CONVERGENCE_CHART in graphs_list:
+        new_chart = get_chart_convergence(execution_engine)
+        if new_chart is not None:
+            instanciated_charts.append(new_chart)
+
+    return instanciated_charts
+
+
+def get_chart_convergence(execution_engine, chart_name=CONVERGENCE_CHART):
+    '''
+    Residual of each coupling variable at each iteration of the last MDA run in log scale, None if
+    the convergence telemetry of the study (see ConvergenceTelemetry) is not activated or empty
+    '''
+    telemetry = ConvergenceTelemetry.get_telemetry(execution_engine)
+    if telemetry is None or len(telemetry.history) == 0:
+        return None
+
+    history_df = telemetry.get_history_df()
+    last_run = history_df.index.get_level_values('mda_run').max()
+    last_run_df = history_df.xs(last_run, level='mda_run')
+    fig = go.Figure()
+    for variable in last_run_df.columns:
+        residuals = last_run_df[variable].dropna()
+        fig.add_trace(go.Scatter(x=residuals.index.tolist(), y=residuals.values.tolist(),
+                                 mode='lines+markers', name=variable))
+    fig.update_xaxes(title_text='Iteration')
+    fig.update_yaxes(title_text='Normalised residual', type='log')
+
+    return InstantiatedPlotlyNativeChart(fig, chart_name=f'{chart_name} (MDA run {last_run})',
+                                         default_title=True)
@@ -23,6 +23,33 @@ import numpy as np
 import pandas as pd
 
 from climateeconomics.sos_processes.iam.witness.witness_optim_sub_process.usecase_witness_optim_sub import OPTIM_NAME, COUPLING_NAME, EXTRA_NAME
+from climateeconomics.core.tools.scenario_results_cube import get_scenario_results_cube, get_pareto_front
+
+WITNESS_PATH = f'{OPTIM_NAME}.{COUPLING_NAME}.{EXTRA_NAME}'
+# variables of the results cube needed by each chart {variable: (df_path, column)}
+CHART_VARIABLES = {'Temperature vs Welfare': ['temp_atmo', 'welfare'],
+                   'CO2 Emissions vs Welfare': ['total_emissions', 'welfare'],
+                   'CO2 Emissions vs min(Utility)': ['total_emissions', 'discounted_utility'],
+                   'CO2 tax per scenario': ['CO2_tax'],
+                   'Temperature per scenario': ['temp_atmo'],
+                   'Welfare per scenario': ['welfare'],
+                   'Utility per scenario': ['discounted_utility'],
+                   'CO2 emissions per scenario': ['total_emissions'],
+                   'ppm(mean) vs Welfare': ['ppm', 'welfare'],
+                   'Total production per scenario': ['Total production (uncut)'],
+                   'ppm per scenario': ['ppm'],
+                   'invest per scenario': ['energy_investment']}
+CUBE_VARIABLES = {'temp_atmo': (f'{WITNESS_PATH}.Temperature_change.temperature_detail_df', 'temp_atmo'),
+                  'welfare': (f'{WITNESS_PATH}.utility_df', 'welfare'),
+                  'discounted_utility': (f'{WITNESS_PATH}.utility_df', 'discounted_utility'),
+                  'total_emissions': (f'{WITNESS_PATH}.Carbon_emissions.CO2_emissions_detail_df', 'total_emissions'),
+                  'ppm': (f'{WITNESS_PATH}.Carboncycle.carboncycle_detail_df', 'ppm'),
+                  'CO2_tax': (f'{WITNESS_PATH}.CO2_taxes', 'CO2_tax'),
+                  'Total production (uncut)': (f'{WITNESS_PATH}.EnergyMix.energy_production_detailed', 'Total production (uncut)'),
+                  'energy_investment': (f'{WITNESS_PATH}.energy_investment', 'energy_investment')}
+# outputs of each scenario read by the charts, the dataframes of the cube variables
+GATHERED_OUTPUTS = list(dict.fromkeys(
+    df_path for df_path, column in CUBE_VARIABLES.values()))
 
 
 def post_processing_filters(execution_engine, namespace):
@@ -73,13 +100,23 @@ def post_processings(execution_engine, namespace, filters):
 
         selected_scenarios = scenario_list
 
-    df_paths = [f'{OPTIM_NAME}.{COUPLING_NAME}.{EXTRA_NAME}.year_start',
-                f'{OPTIM_NAME}.{COUPLING_NAME}.{EXTRA_NAME}.year_end', ]
+    df_paths = [f'{WITNESS_PATH}.year_start',
+                f'{WITNESS_PATH}.year_end', ]
     year_start_dict, year_end_dict = get_df_per_scenario_dict(
         execution_engine, df_paths, scenario_list)
     year_start, year_end = year_start_dict[scenario_list[0]
                                            ], year_end_dict[scenario_list[0]]
-    years = np.arange(year_start, year_end).tolist()
+    years = np.arange(year_start, year_end + 1)
+
+    # all the charts read their data from the results cube, the dataframes
+    # of each scenario are extracted only once
+    cube_variables = {}
+    for graph in graphs_list:
+        for variable in CHART_VARIABLES.get(graph, []):
+            cube_variables[variable] = CUBE_VARIABLES[variable]
+    cube = get_scenario_results_cube(
+        execution_engine, namespace_w, scenario_list, years, cube_variables)
+    years = years.tolist()
 
     """
         -------------
@@ -95,19 +132,9 @@ def post_processings(execution_engine, namespace, filters):
         x_axis_name = f'Temperature increase since industrial revolution in degree Celsius'
         y_axis_name = 'Welfare'
 
-        df_paths = [f'{OPTIM_NAME}.{COUPLING_NAME}.{EXTRA_NAME}.Temperature_change.temperature_detail_df',
-                    f'{OPTIM_NAME}.{COUPLING_NAME}.{EXTRA_NAME}.utility_df'
-                    ]
-        (temperature_df_dict, utility_df_dict) = get_df_per_scenario_dict(
-            execution_engine, df_paths, scenario_list)
-
-        last_temperature_dict, welfare_dict = {}, {}
-        for scenario in scenario_list:
-            last_temperature_dict[scenario] = temperature_df_dict[scenario]['temp_atmo'][year_end]
-            welfare_dict[scenario] = utility_df_dict[scenario]['welfare'][year_end]
-        namespace_w = f'{execution_engine.study_name}.{scatter_scenario}'
-
-        new_pareto_chart = get_chart_pareto_front(last_temperature_dict, welfare_dict, scenario_list,
+        new_pareto_chart = get_chart_pareto_front(cube.get_at_year('temp_atmo', year_end),
+                                                  cube.get_at_year(
+                                                      'welfare', year_end), scenario_list,
                                                   namespace_w, chart_name=chart_name,
                                                   x_axis_name=x_axis_name, y_axis_name=y_axis_name)
 
@@ -119,20 +146,9 @@ def post_processings(execution_engine, namespace, filters):
         x_axis_name = f'Summed CO2 emissions'
         y_axis_name = f'Welfare in {year_end}'
 
-        df_paths = [f'{OPTIM_NAME}.{COUPLING_NAME}.{EXTRA_NAME}.Carbon_emissions.CO2_emissions_detail_df',
-                    f'{OPTIM_NAME}.{COUPLING_NAME}.{EXTRA_NAME}.utility_df',
-                    ]
-        (co2_emissions_df_dict, utility_df_dict) = get_df_per_scenario_dict(
-            execution_engine, df_paths)
-
-        summed_co2_emissions_dict, welfare_dict = {}, {}
-        for scenario in scenario_list:
-            summed_co2_emissions_dict[scenario] = co2_emissions_df_dict[scenario]['total_emissions'].sum(
-            )
-            welfare_dict[scenario] = utility_df_dict[scenario]['welfare'][year_end]
-        namespace_w = f'{execution_engine.study_name}.{scatter_scenario}'
-
-        new_pareto_chart = get_chart_pareto_front(summed_co2_emissions_dict, welfare_dict, scenario_list,
+        new_pareto_chart = get_chart_pareto_front(np.nansum(cube.get('total_emissions'), axis=1),
+                                                  cube.get_at_year(
+                                                      'welfare', year_end), scenario_list,
                                                   namespace_w, chart_name=chart_name,
                                                   x_axis_name=x_axis_name, y_axis_name=y_axis_name)
 
@@ -144,21 +160,9 @@ def post_processings(execution_engine, namespace, filters):
         x_axis_name = f'Summed CO2 emissions'
         y_axis_name = 'min( Utility )'
 
-        df_paths = [f'{OPTIM_NAME}.{COUPLING_NAME}.{EXTRA_NAME}.Carbon_emissions.CO2_emissions_detail_df',
-                    f'{OPTIM_NAME}.{COUPLING_NAME}.{EXTRA_NAME}.utility_df',
-                    ]
-        (co2_emissions_df_dict, utility_df_dict) = get_df_per_scenario_dict(
-            execution_engine, df_paths)
-
-        summed_co2_emissions_dict, min_utility_dict = {}, {}
-        for scenario in scenario_list:
-            summed_co2_emissions_dict[scenario] = co2_emissions_df_dict[scenario]['total_emissions'].sum(
-            )
-            min_utility_dict[scenario] = min(
-                utility_df_dict[scenario]['discounted_utility'])
-        namespace_w = f'{execution_engine.study_name}.{scatter_scenario}'
-
-        new_pareto_chart = get_chart_pareto_front(summed_co2_emissions_dict, min_utility_dict, scenario_list,
+        new_pareto_chart = get_chart_pareto_front(np.nansum(cube.get('total_emissions'), axis=1),
+                                                  np.nanmin(
+                                                      cube.get('discounted_utility'), axis=1), scenario_list,
                                                   namespace_w, chart_name=chart_name,
                                                   x_axis_name=x_axis_name, y_axis_name=y_axis_name)
 
@@ -170,20 +174,9 @@ def post_processings(execution_engine, namespace, filters):
         x_axis_name = f'Mean ppm'
         y_axis_name = f'Welfare in {year_end}'
 
-        df_paths = [f'{OPTIM_NAME}.{COUPLING_NAME}.{EXTRA_NAME}.Carboncycle.carboncycle_detail_df',
-                    f'{OPTIM_NAME}.{COUPLING_NAME}.{EXTRA_NAME}.utility_df',
-                    ]
-        (carboncycle_detail_df_dict, utility_df_dict) = get_df_per_scenario_dict(
-            execution_engine, df_paths)
-
-        mean_co2_ppm_dict, welfare_dict = {}, {}
-        for scenario in scenario_list:
-            mean_co2_ppm_dict[scenario] = carboncycle_detail_df_dict[scenario]['ppm'].mean(
-            )
-            welfare_dict[scenario] = utility_df_dict[scenario]['welfare'][year_end]
-        namespace_w = f'{execution_engine.study_name}.{scatter_scenario}'
-
-        new_pareto_chart = get_chart_pareto_front(mean_co2_ppm_dict, welfare_dict, scenario_list,
+        new_pareto_chart = get_chart_pareto_front(np.nanmean(cube.get('ppm'), axis=1),
+                                                  cube.get_at_year(
+                                                      'welfare', year_end), scenario_list,
                                                   namespace_w, chart_name=chart_name,
                                                   x_axis_name=x_axis_name, y_axis_name=y_axis_name)
 
@@ -203,15 +196,7 @@ def post_processings(execution_engine, namespace, filters):
         x_axis_name = 'Years'
         y_axis_name = 'Price ($/tCO2)'
 
-        df_paths = [f'{OPTIM_NAME}.{COUPLING_NAME}.{EXTRA_NAME}.CO2_taxes', ]
-        (co2_taxes_df_dict,) = get_df_per_scenario_dict(
-            execution_engine, df_paths)
-        co2_tax_dict = {}
-        for scenario in scenario_list:
-            co2_tax_dict[scenario] = co2_taxes_df_dict[scenario]['CO2_tax'].values.tolist(
-            )
-
-        new_chart = get_scenario_comparison_chart(years, co2_tax_dict,
+        new_chart = get_scenario_comparison_chart(years, cube, 'CO2_tax',
                                                   chart_name=chart_name,
                                                   x_axis_name=x_axis_name, y_axis_name=y_axis_name, selected_scenarios=selected_scenarios)
 
@@ -223,16 +208,7 @@ def post_processings(execution_engine, namespace, filters):
         x_axis_name = 'Years'
         y_axis_name = 'Temperature (degrees Celsius above preindustrial)'
 
-        df_paths = [
-            f'{OPTIM_NAME}.{COUPLING_NAME}.{EXTRA_NAME}.Temperature_change.temperature_detail_df', ]
-        (temperature_detail_df_dict,) = get_df_per_scenario_dict(
-            execution_engine, df_paths)
-        temperature_dict = {}
-        for scenario in scenario_list:
-            temperature_dict[scenario] = temperature_detail_df_dict[scenario]['temp_atmo'].values.tolist(
-            )
-
-        new_chart = get_scenario_comparison_chart(years, temperature_dict,
+        new_chart = get_scenario_comparison_chart(years, cube, 'temp_atmo',
                                                   chart_name=chart_name,
                                                   x_axis_name=x_axis_name, y_axis_name=y_axis_name, selected_scenarios=selected_scenarios)
 
@@ -243,27 +219,21 @@ def post_processings(execution_engine, namespace, filters):
         chart_name = 'Welfare per scenario'
         y_axis_name = f'Welfare in {year_end}'
 
-        df_paths = [f'{OPTIM_NAME}.{COUPLING_NAME}.{EXTRA_NAME}.utility_df',
-                    ]
-        (utility_df_dict,) = get_df_per_scenario_dict(execution_engine, df_paths)
-
-        welfare_dict = {}
-        for scenario in scenario_list:
-            welfare_dict[scenario] = utility_df_dict[scenario]['welfare'][year_end]
+        welfare = cube.get_at_year('welfare', year_end)
 
-        min_y = min(list(welfare_dict.values()))
-        max_y = max(list(welfare_dict.values()))
+        min_y = np.nanmin(welfare)
+        max_y = np.nanmax(welfare)
 
         new_chart = TwoAxesInstanciatedChart('', y_axis_name,
                                              [], [
                                                  min_y * 0.95, max_y * 1.05],
                                              chart_name)
 
-        for scenario, welfare in welfare_dict.items():
+        for scenario, welfare_scenario in zip(scenario_list, welfare.tolist()):
             if scenario in selected_scenarios:
                 serie = InstanciatedSeries(
                     [''],
-                    [welfare], scenario, 'bar')
+                    [welfare_scenario], scenario, 'bar')
 
                 new_chart.series.append(serie)
 
@@ -275,15 +245,7 @@ def post_processings(execution_engine, namespace, filters):
         x_axis_name = 'Years'
         y_axis_name = 'Discounted Utility (trill $)'
 
-        df_paths = [f'{OPTIM_NAME}.{COUPLING_NAME}.{EXTRA_NAME}.utility_df', ]
-        (utility_df_dict,) = get_df_per_scenario_dict(execution_engine, df_paths)
-
-        utility_dict = {}
-        for scenario in scenario_list:
-            utility_dict[scenario] = utility_df_dict[scenario]['discounted_utility'].values.tolist(
-            )
-
-        new_chart = get_scenario_comparison_chart(years, utility_dict,
+        new_chart = get_scenario_comparison_chart(years, cube, 'discounted_utility',
                                                   chart_name=chart_name,
                                                   x_axis_name=x_axis_name, y_axis_name=y_axis_name, selected_scenarios=selected_scenarios)
 
@@ -295,17 +257,7 @@ def post_processings(execution_engine, namespace, filters):
         x_axis_name = 'Years'
         y_axis_name = 'Carbon emissions (Gtc)'
 
-        df_paths = [
-            f'{OPTIM_NAME}.{COUPLING_NAME}.{EXTRA_NAME}.Carbon_emissions.CO2_emissions_detail_df']
-        (co2_emissions_df_dict,) = get_df_per_scenario_dict(
-            execution_engine, df_paths)
-
-        co2_emissions_dict = {}
-        for scenario in scenario_list:
-            co2_emissions_dict[scenario] = co2_emissions_df_dict[scenario]['total_emissions'].values.tolist(
-            )
-
-        new_chart = get_scenario_comparison_chart(years, co2_emissions_dict,
+        new_chart = get_scenario_comparison_chart(years, cube, 'total_emissions',
                                                   chart_name=chart_name,
                                                   x_axis_name=x_axis_name, y_axis_name=y_axis_name, selected_scenarios=selected_scenarios)
 
@@ -317,17 +269,7 @@ def post_processings(execution_engine, namespace, filters):
         x_axis_name = 'Years'
         y_axis_name = 'Atmospheric concentrations parts per million'
 
-        df_paths = [
-            f'{OPTIM_NAME}.{COUPLING_NAME}.{EXTRA_NAME}.Carboncycle.carboncycle_detail_df']
-        (carboncycle_detail_df_dict,) = get_df_per_scenario_dict(
-            execution_engine, df_paths)
-
-        co2_ppm_dict, welfare_dict = {}, {}
-        for scenario in scenario_list:
-            co2_ppm_dict[scenario] = carboncycle_detail_df_dict[scenario]['ppm'].values.tolist(
-            )
-
-        new_chart = get_scenario_comparison_chart(years, co2_ppm_dict,
+        new_chart = get_scenario_comparison_chart(years, cube, 'ppm',
                                                   chart_name=chart_name,
                                                   x_axis_name=x_axis_name, y_axis_name=y_axis_name, selected_scenarios=selected_scenarios)
 
@@ -351,17 +293,7 @@ def post_processings(execution_engine, namespace, filters):
         x_axis_name = 'Years'
         y_axis_name = 'Total production'
 
-        df_paths = [
-            f'{OPTIM_NAME}.{COUPLING_NAME}.{EXTRA_NAME}.EnergyMix.energy_production_detailed']
-        (energy_production_detailed_df_dict,) = get_df_per_scenario_dict(
-            execution_engine, df_paths)
-
-        energy_production_detailed_dict = {}
-        for scenario in scenario_list:
-            energy_production_detailed_dict[scenario] = energy_production_detailed_df_dict[
-                scenario]['Total production (uncut)'].values.tolist()
-
-        new_chart = get_scenario_comparison_chart(years, energy_production_detailed_dict,
+        new_chart = get_scenario_comparison_chart(years, cube, 'Total production (uncut)',
                                                   chart_name=chart_name,
                                                   x_axis_name=x_axis_name, y_axis_name=y_axis_name, selected_scenarios=selected_scenarios)
 
@@ -372,19 +304,7 @@ def post_processings(execution_engine, namespace, filters):
         x_axis_name = 'Years'
         y_axis_name = f'total energy investment'
 
-        # Get the total energy investment
-
-        df_paths = [
-            f'{OPTIM_NAME}.{COUPLING_NAME}.{EXTRA_NAME}.energy_investment']
-        (energy_investment_df_dict,) = get_df_per_scenario_dict(
-            execution_engine, df_paths)
-
-        energy_investment_dict = {}
-        for scenario in scenario_list:
-            energy_investment_dict[scenario] = energy_investment_df_dict[
-                scenario]['energy_investment'].values.tolist()
-
-        new_chart = get_scenario_comparison_chart(years, energy_investment_dict,
+        new_chart = get_scenario_comparison_chart(years, cube, 'energy_investment',
                                                   chart_name=chart_name,
                                                   x_axis_name=x_axis_name, y_axis_name=y_axis_name, selected_scenarios=selected_scenarios)
 
@@ -393,19 +313,20 @@ def post_processings(execution_engine, namespace, filters):
     return instanciated_charts
 
 
-def get_scenario_comparison_chart(x_list, y_dict, chart_name, x_axis_name, y_axis_name, selected_scenarios):
+def get_scenario_comparison_chart(x_list, cube, variable, chart_name, x_axis_name, y_axis_name, selected_scenarios):
 
+    values = cube.get(variable)
     min_x = min(x_list)
     max_x = max(x_list)
-    min_y = min([min(list(y)) for y in y_dict.values()])
-    max_y = max([max(list(y)) for y in y_dict.values()])
+    min_y = np.nanmin(values)
+    max_y = np.nanmax(values)
 
     new_chart = TwoAxesInstanciatedChart(x_axis_name, y_axis_name,
                                          [min_x - 5, max_x + 5], [
                                              min_y - max_y * 0.05, max_y * 1.05],
                                          chart_name)
 
-    for scenario, y_values in y_dict.items():
+    for scenario, y_values in zip(cube.scenario_list, values.tolist()):
         if scenario in selected_scenarios:
             new_series = InstanciatedSeries(
                 x_list, y_values, scenario, 'lines', True)
@@ -415,18 +336,18 @@ def get_scenario_comparison_chart(x_list, y_dict, chart_name, x_axis_name, y_axi
     return new_chart
 
 
-def get_chart_pareto_front(x_dict, y_dict, scenario_list, namespace_w, chart_name='Pareto Front',
+def get_chart_pareto_front(x_values, y_values, scenario_list, namespace_w, chart_name='Pareto Front',
                            x_axis_name='x', y_axis_name='y'):
     '''
-    Function that, given two dictionaries and a scenario_list, returns a pareto front
+    Function that, given two arrays of values per scenario and a scenario_list, returns a pareto front
 
-    :params: x_dict, dict containing the data for the x axis of the pareto front per scenario
-    :type: dict
+    :params: x_values, array containing the data for the x axis of the pareto front per scenario
+    :type: ndarray
 
-    :params: y_dict, dict containing the data for the y axis of the pareto front per scenario
-    :type: dict
+    :params: y_values, array containing the data for the y axis of the pareto front per scenario
+    :type: ndarray
 
-    :params: scenario_list, list containing the name of the scenarios 
+    :params: scenario_list, list containing the name of the scenarios, in the order of x_values and y_values
     :type: list
 
     :params: namespace_w, namespace of scatter scenario
@@ -439,11 +360,12 @@ def get_chart_pareto_front(x_dict, y_dict, scenario_list, namespace_w, chart_nam
     :type: InstantiatedParetoFrontOptimalChart
     '''
 
-    min_x = min(list(x_dict.values()))
-    max_x = max(list(x_dict.values()))
+    # scenarios not run yet have NaN values
+    min_x = np.nanmin(x_values)
+    max_x = np.nanmax(x_values)
 
-    max_y = max(list(y_dict.values()))
-    min_y = min(list(y_dict.values()))
+    max_y = np.nanmax(y_values)
+    min_y = np.nanmin(y_values)
 
     new_pareto_chart = InstantiatedParetoFrontOptimalChart(
         abscissa_axis_name=f'{x_axis_name}',
@@ -453,30 +375,20 @@ def get_chart_pareto_front(x_dict, y_dict, scenario_list, namespace_w, chart_nam
             min_y - max_y * 0.03, max_y * 1.03],
         chart_name=chart_name)
 
-    for scenario in scenario_list:
-        new_serie = InstanciatedSeries([x_dict[scenario]],
-                                       [y_dict[scenario]],
+    for scenario, x_value, y_value in zip(scenario_list, np.asarray(x_values).tolist(), np.asarray(y_values).tolist()):
+        if np.isnan(x_value) or np.isnan(y_value):
+            continue
+        new_serie = InstanciatedSeries([x_value],
+                                       [y_value],
                                        scenario, 'scatter',
                                        custom_data=f'{namespace_w}.{scenario}')
         new_pareto_chart.add_serie(new_serie)
 
     # Calculating and adding pareto front
-    sorted_x = sorted(x_dict.values())
-    sorted_scenarios = []
-    for val in sorted_x:
-        for scen, x_val in x_dict.items():
-            if x_val == val:
-                sorted_scenarios.append(scen)
-
-    sorted_list = sorted([[x_dict[scenario], y_dict[scenario]]
-                          for scenario in sorted_scenarios])
-    pareto_front = [sorted_list[0]]
-    for pair in sorted_list[1:]:
-        if pair[1] >= pareto_front[-1][1]:
-            pareto_front.append(pair)
+    pareto_x, pareto_y = get_pareto_front(x_values, y_values)
 
     pareto_front_serie = InstanciatedSeries(
-        [pair[0] for pair in pareto_front], [pair[1] for pair in pareto_front], 'Pareto front', 'lines')
+        pareto_x, pareto_y, 'Pareto front', 'lines')
     new_pareto_chart.add_pareto_front_optimal(pareto_front_serie)
 
     return new_pareto_chart
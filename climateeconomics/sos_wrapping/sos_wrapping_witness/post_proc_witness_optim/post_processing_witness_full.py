@@ -106,46 +106,40 @@ def get_chart_green_energies(execution_engine, namespace, chart_name='Energies C
     # Prepare data
     multilevel_df, years = get_multilevel_df(
         execution_engine, namespace, columns=['price_per_kWh', 'price_per_kWh_wotaxes', 'CO2_per_kWh', 'production', 'invest'])
-    energy_list = list(set(multilevel_df.index.droplevel(1)))
+    # (energy, year) arrays aggregated over the technos of each energy
+    production_df = multilevel_df['production']
+    energy_production_df = production_df.groupby(level=0).sum()
+    energy_list = energy_production_df.index.tolist()
+    energy_production = energy_production_df.values
+    energy_invest = multilevel_df['invest'].groupby(level=0).sum().values
+    energy_total_CO2 = (multilevel_df['CO2_per_kWh'] *
+                        production_df).groupby(level=0).sum().values
+    energy_total_price = (multilevel_df['price_per_kWh'] *
+                          production_df).groupby(level=0).sum().values
+    energy_total_price_wotaxes = (multilevel_df['price_per_kWh_wotaxes'] *
+                                  production_df).groupby(level=0).sum().values
 
     # Create Figure
     chart_name = f'{chart_name}'
     fig = go.Figure()
     # Get min and max CO2 emissions for colorscale and max of production for
     # marker size
-    array_of_cmin, array_of_cmax, array_of_pmax, array_of_pintmax = [], [], [], []
-    for (array_c, array_p) in multilevel_df[['CO2_per_kWh', 'production']].values:
-        array_of_cmin += [array_c.min()]
-        array_of_cmax += [array_c.max()]
-        array_of_pmax += [array_p.max()]
-        array_of_pintmax += [array_p.sum()]
-    cmin, cmax = np.min(array_of_cmin), np.max(array_of_cmax)
-    pmax, pintmax = np.max(array_of_pmax), np.max(array_of_pintmax)
+    cmin, cmax = multilevel_df['CO2_per_kWh'].values.min(
+    ), multilevel_df['CO2_per_kWh'].values.max()
+    pmax, pintmax = production_df.values.max(), production_df.values.sum(axis=1).max()
+    EnergyMix = execution_engine.dm.get_disciplines_with_name(
+        f'{namespace}.EnergyMix')[0]
+    CO2_taxes = EnergyMix.get_sosdisc_inputs('CO2_taxes')['CO2_tax'].values
     if summary:
         # Create a graph to aggregate the informations on all years
-        price_per_kWh, price_per_kWh_wotaxes, CO2_per_kWh, production, invest = [], [], [], [], []
-        total_CO2, total_price, total_price_wotaxes = [], [], []
-        EnergyMix = execution_engine.dm.get_disciplines_with_name(
-            f'{namespace}.EnergyMix')[0]
-        CO2_taxes, CO2_taxes_array = EnergyMix.get_sosdisc_inputs('CO2_taxes')[
-            'CO2_tax'].values, []
-        for i, energy in enumerate(energy_list):
-            # energies level
-            production += [np.sum(multilevel_df.groupby(level=0)
-                                  ['production'].sum()[energy]), ]
-            invest += [np.sum(multilevel_df.groupby(level=0)
-                              ['invest'].sum()[energy]), ]
-            total_CO2 += [np.sum((multilevel_df.loc[energy]['CO2_per_kWh']
-                                  * multilevel_df.loc[energy]['production']).sum()), ]
-            total_price += [np.sum((multilevel_df.loc[energy]['price_per_kWh']
-                                    * multilevel_df.loc[energy]['production']).sum()), ]
-            total_price_wotaxes += [np.sum((multilevel_df.loc[energy]['price_per_kWh_wotaxes']
-                                            * multilevel_df.loc[energy]['production']).sum()), ]
-            CO2_per_kWh += [np.divide(total_CO2[i], production[i]), ]
-            price_per_kWh += [np.divide(total_price[i], production[i]), ]
-            price_per_kWh_wotaxes += [
-                np.divide(total_price_wotaxes[i], production[i]), ]
-            CO2_taxes_array += [np.mean(CO2_taxes), ]
+        production = energy_production.sum(axis=1)
+        invest = energy_invest.sum(axis=1)
+        total_CO2 = energy_total_CO2.sum(axis=1)
+        CO2_per_kWh = np.divide(total_CO2, production)
+        price_per_kWh = np.divide(energy_total_price.sum(axis=1), production)
+        price_per_kWh_wotaxes = np.divide(
+            energy_total_price_wotaxes.sum(axis=1), production)
+        CO2_taxes_array = np.ones(len(energy_list)) * np.mean(CO2_taxes)
         customdata = [energy_list, price_per_kWh, CO2_per_kWh,
                       production, invest, total_CO2, CO2_taxes_array,
                       price_per_kWh_wotaxes]
@@ -159,15 +153,15 @@ def get_chart_green_energies(execution_engine, namespace, chart_name='Energies C
                         '<br>Mean CO2 taxes: %{customdata[6]: .2e}'
         marker_sizes = np.multiply(production, 20.0) / \
             pintmax + 10.0
-        scatter_mean = go.Scatter(x=list(price_per_kWh_wotaxes), y=list(CO2_per_kWh),
+        scatter_mean = go.Scatter(x=price_per_kWh_wotaxes.tolist(), y=CO2_per_kWh.tolist(),
                                   customdata=list(np.asarray(customdata).T),
                                   hovertemplate=hovertemplate,
                                   text=energy_list,
                                   textposition="top center",
                                   mode='markers+text',
-                                  marker=dict(color=CO2_per_kWh,
+                                  marker=dict(color=CO2_per_kWh.tolist(),
                                               cmin=cmin, cmax=cmax,
-                                              colorscale='RdYlGn_r', size=list(marker_sizes),
+                                              colorscale='RdYlGn_r', size=marker_sizes.tolist(),
                                               colorbar=dict(title='CO2 per kWh', thickness=20)),
                                   visible=False)
         fig.add_trace(scatter_mean)
@@ -177,29 +171,15 @@ def get_chart_green_energies(execution_engine, namespace, chart_name='Energies C
             ################
             #-energy level-#
             ################
-            price_per_kWh, price_per_kWh_wotaxes, CO2_per_kWh, production, invest = [], [], [], [], []
-            total_CO2, total_price, total_price_wotaxes = [], [], []
-            EnergyMix = execution_engine.dm.get_disciplines_with_name(
-                f'{namespace}.EnergyMix')[0]
-            CO2_taxes, CO2_taxes_array = EnergyMix.get_sosdisc_inputs('CO2_taxes')[
-                'CO2_tax'].values, []
-            for i, energy in enumerate(energy_list):
-                # energies level
-                production += [multilevel_df.groupby(level=0)
-                               ['production'].sum()[energy][i_year], ]
-                invest += [multilevel_df.groupby(level=0)
-                           ['invest'].sum()[energy][i_year], ]
-                total_CO2 += [(multilevel_df.loc[energy]['CO2_per_kWh'] *
-                               multilevel_df.loc[energy]['production']).sum()[i_year], ]
-                total_price += [(multilevel_df.loc[energy]['price_per_kWh']
-                                 * multilevel_df.loc[energy]['production']).sum()[i_year], ]
-                total_price_wotaxes += [(multilevel_df.loc[energy]['price_per_kWh_wotaxes']
-                                         * multilevel_df.loc[energy]['production']).sum()[i_year], ]
-                CO2_per_kWh += [np.divide(total_CO2[i], production[i]), ]
-                price_per_kWh += [np.divide(total_price[i], production[i]), ]
-                price_per_kWh_wotaxes += [
-                    np.divide(total_price_wotaxes[i], production[i]), ]
-                CO2_taxes_array += [CO2_taxes[i], ]
+            production = energy_production[:, i_year]
+            invest = energy_invest[:, i_year]
+            total_CO2 = energy_total_CO2[:, i_year]
+            CO2_per_kWh = np.divide(total_CO2, production)
+            price_per_kWh = np.divide(
+                energy_total_price[:, i_year], production)
+            price_per_kWh_wotaxes = np.divide(
+                energy_total_price_wotaxes[:, i_year], production)
+            CO2_taxes_array = np.ones(len(energy_list)) * CO2_taxes[i_year]
             customdata = [energy_list, price_per_kWh, CO2_per_kWh,
                           production, invest, total_CO2, CO2_taxes_array,
                           price_per_kWh_wotaxes]
@@ -213,15 +193,15 @@ def get_chart_green_energies(execution_engine, namespace, chart_name='Energies C
                             '<br>CO2 taxes: %{customdata[6]: .2e}'
             marker_sizes = np.multiply(production, 20.0) / \
                 pmax + 10.0
-            scatter = go.Scatter(x=list(price_per_kWh_wotaxes), y=list(CO2_per_kWh),
+            scatter = go.Scatter(x=price_per_kWh_wotaxes.tolist(), y=CO2_per_kWh.tolist(),
                                  customdata=list(np.asarray(customdata).T),
                                  hovertemplate=hovertemplate,
                                  text=energy_list,
                                  textposition="top center",
                                  mode='markers+text',
-                                 marker=dict(color=CO2_per_kWh,
+                                 marker=dict(color=CO2_per_kWh.tolist(),
                                              cmin=cmin, cmax=cmax,
-                                             colorscale='RdYlGn_r', size=list(marker_sizes),
+                                             colorscale='RdYlGn_r', size=marker_sizes.tolist(),
                                              colorbar=dict(title='CO2 per kWh', thickness=20)),
                                  visible=False)
             fig.add_trace(scatter)
@@ -251,77 +231,114 @@ def get_chart_green_energies(execution_engine, namespace, chart_name='Energies C
     return new_chart
 
 
-def get_multilevel_df(execution_engine, namespace, columns=None):
-    '''! Function to create the dataframe with all the data necessary for the graphs in a multilevel [energy, technologies]
+def get_techno_disciplines(execution_engine, namespace):
+    '''! Function to get the techno disciplines of the energy mix
     @param execution_engine: Current execution engine object, from which the data is extracted
     @param namespace: Namespace at which the data can be accessed
 
-    @return multilevel_df: Dataframe
+    @return techno_index: list of (energy, techno) tuples
+    @return techno_disc_list: list of techno disciplines in the order of techno_index
+    @return years: array of years
     '''
     EnergyMix = execution_engine.dm.get_disciplines_with_name(
         f'{namespace}.EnergyMix')[0]
-    # Construct a DataFrame to organize the data on two levels: energy and
-    # techno
-    idx = pd.MultiIndex.from_tuples([], names=['energy', 'techno'])
-    multilevel_df = pd.DataFrame(
-        index=idx,
-        columns=['production', 'invest', 'CO2_per_kWh', 'price_per_kWh', 'price_per_kWh_wotaxes'])
     energy_list = EnergyMix.get_sosdisc_inputs('energy_list')
+    years = np.arange(EnergyMix.get_sosdisc_inputs(
+        'year_start'), EnergyMix.get_sosdisc_inputs('year_end') + 1, 1)
+    techno_index, techno_disc_list = [], []
     for energy in energy_list:
         energy_disc = execution_engine.dm.get_disciplines_with_name(
             f'{namespace}.EnergyMix.{energy}')[0]
         techno_list = energy_disc.get_sosdisc_inputs('technologies_list')
         for techno in techno_list:
-            techno_disc = execution_engine.dm.get_disciplines_with_name(
-                f'{namespace}.EnergyMix.{energy}.{techno}')[0]
-            production_techno = techno_disc.get_sosdisc_outputs(
+            techno_index.append((energy, techno))
+            techno_disc_list.append(execution_engine.dm.get_disciplines_with_name(
+                f'{namespace}.EnergyMix.{energy}.{techno}')[0])
+
+    return techno_index, techno_disc_list, years
+
+
+def get_CO2_per_use(techno_disc, nb_years):
+    '''! Function to compute the CO2 emitted by the use of the energy produced by a techno
+    @param techno_disc: techno discipline
+    @param nb_years: number of years
+
+    @return CO2_per_use: array of CO2 per use per year
+    '''
+    data_fuel_dict = techno_disc.get_sosdisc_inputs('data_fuel_dict')
+    CO2_per_use = np.zeros(nb_years)
+    if 'CO2_per_use' in data_fuel_dict and 'high_calorific_value' in data_fuel_dict:
+        if data_fuel_dict['CO2_per_use_unit'] == 'kg/kg':
+            CO2_per_use = np.ones(
+                nb_years) * data_fuel_dict['CO2_per_use'] / data_fuel_dict['high_calorific_value']
+        elif data_fuel_dict['CO2_per_use_unit'] == 'kg/kWh':
+            CO2_per_use = np.ones(
+                nb_years) * data_fuel_dict['CO2_per_use']
+
+    return CO2_per_use
+
+
+def build_multilevel_df(techno_index, columns, years, values):
+    '''! Function to build the multilevel dataframe from the data of all technos in one go
+    @param techno_index: list of (energy, techno) tuples
+    @param columns: list of variables
+    @param years: array of years
+    @param values: (techno, variable, year) array
+
+    @return multilevel_df: Dataframe with an (energy, techno) index and (variable, year) columns
+    '''
+    idx = pd.MultiIndex.from_tuples(techno_index, names=['energy', 'techno'])
+    multilevel_columns = pd.MultiIndex.from_product(
+        [columns, years], names=['variable', 'year'])
+    multilevel_df = pd.DataFrame(values.reshape(len(techno_index), len(columns) * len(years)),
+                                 index=idx, columns=multilevel_columns)
+
+    return multilevel_df
+
+
+def get_multilevel_df(execution_engine, namespace, columns=None):
+    '''! Function to create the dataframe with all the data necessary for the graphs in a multilevel [energy, technologies]
+    @param execution_engine: Current execution engine object, from which the data is extracted
+    @param namespace: Namespace at which the data can be accessed
+    @param columns: list of variables to extract, all variables if None
+
+    @return multilevel_df: Dataframe with an (energy, techno) index and (variable, year) columns
+    @return years: array of years
+    '''
+    if columns is None:
+        columns = ['production', 'invest', 'CO2_per_kWh',
+                   'price_per_kWh', 'price_per_kWh_wotaxes']
+    techno_index, techno_disc_list, years = get_techno_disciplines(
+        execution_engine, namespace)
+    # Collect the data of all technos in a preallocated (techno, variable,
+    # year) array
+    values = np.zeros((len(techno_index), len(columns), len(years)))
+    for i_techno, ((energy, techno), techno_disc) in enumerate(zip(techno_index, techno_disc_list)):
+        techno_values = {}
+        if 'production' in columns:
+            techno_values['production'] = techno_disc.get_sosdisc_outputs(
                 'techno_production')[f'{energy} (TWh)'].values *\
                 techno_disc.get_sosdisc_inputs(
                     'scaling_factor_techno_production')
-            invest_techno = techno_disc.get_sosdisc_inputs('invest_level')[
+        if 'invest' in columns:
+            techno_values['invest'] = techno_disc.get_sosdisc_inputs('invest_level')[
                 f'invest'].values *\
                 techno_disc.get_sosdisc_inputs('scaling_factor_invest_level')
+        if 'CO2_per_kWh' in columns:
             # Calculate total CO2 emissions
-            data_fuel_dict = techno_disc.get_sosdisc_inputs('data_fuel_dict')
             carbon_emissions = techno_disc.get_sosdisc_outputs(
                 'CO2_emissions_detailed')
-            CO2_per_use = np.zeros(
-                len(carbon_emissions['years']))
-            if 'CO2_per_use' in data_fuel_dict and 'high_calorific_value' in data_fuel_dict:
-                if data_fuel_dict['CO2_per_use_unit'] == 'kg/kg':
-                    CO2_per_use = np.ones(
-                        len(carbon_emissions['years'])) * data_fuel_dict['CO2_per_use'] / data_fuel_dict['high_calorific_value']
-                elif data_fuel_dict['CO2_per_use_unit'] == 'kg/kWh':
-                    CO2_per_use = np.ones(
-                        len(carbon_emissions['years'])) * data_fuel_dict['CO2_per_use']
-            for emission_type in carbon_emissions:
-                if emission_type == techno:
-                    total_carbon_emissions = CO2_per_use + \
-                        carbon_emissions[techno].values
-            CO2_per_kWh_techno = total_carbon_emissions
-            # Data for scatter plot
-            price_per_kWh_techno = techno_disc.get_sosdisc_outputs('techno_prices')[
-                f'{techno}'].values
-            price_per_kWh_wotaxes_techno = techno_disc.get_sosdisc_outputs('techno_prices')[
-                f'{techno}_wotaxes'].values
-            idx = pd.MultiIndex.from_tuples(
-                [(f'{energy}', f'{techno}')], names=['energy', 'techno'])
-            columns_techno = ['energy', 'technology',
-                              'production', 'invest',
-                              'CO2_per_kWh', 'price_per_kWh',
-                              'price_per_kWh_wotaxes']
-            techno_df = pd.DataFrame([(energy, techno, production_techno, invest_techno,
-                                       CO2_per_kWh_techno, price_per_kWh_techno, price_per_kWh_wotaxes_techno)],
-                                     index=idx, columns=columns_techno)
-            multilevel_df = multilevel_df.append(techno_df)
-
-    years = np.arange(EnergyMix.get_sosdisc_inputs(
-        'year_start'), EnergyMix.get_sosdisc_inputs('year_end') + 1, 1)
-
-    # If columns is not None, return a subset of multilevel_df with selected
-    # columns
-    if columns != None and type(columns) == list:
-        multilevel_df = pd.DataFrame(multilevel_df[columns])
+            techno_values['CO2_per_kWh'] = get_CO2_per_use(techno_disc, len(carbon_emissions['years'])) + \
+                carbon_emissions[techno].values
+        # Data for scatter plot
+        if 'price_per_kWh' in columns or 'price_per_kWh_wotaxes' in columns:
+            techno_prices = techno_disc.get_sosdisc_outputs('techno_prices')
+            techno_values['price_per_kWh'] = techno_prices[f'{techno}'].values
+            techno_values['price_per_kWh_wotaxes'] = techno_prices[f'{techno}_wotaxes'].values
+        for i_column, column in enumerate(columns):
+            values[i_techno, i_column] = techno_values[column]
+
+    multilevel_df = build_multilevel_df(techno_index, columns, years, values)
 
     return multilevel_df, years
 
@@ -338,8 +355,16 @@ def get_chart_Global_CO2_breakdown_sankey(execution_engine, namespace, chart_nam
     # Prepare data
     multilevel_df, years = get_CO2_breakdown_multilevel_df(
         execution_engine, namespace)
-    energy_list = list(set(multilevel_df.index.droplevel(1)))
-    technologies_list = list(multilevel_df.index.droplevel(0))
+    # (energy, year) arrays aggregated over the technos of each energy
+    production_df = multilevel_df['production']
+    energy_production_df = production_df.groupby(level=0).sum()
+    energy_list = energy_production_df.index.tolist()
+    energy_production = energy_production_df.values
+    CO2_types = ['CO2_from_production', 'CO2_per_use',
+                 'CO2_after_use', 'CO2_from_other_consumption']
+    energy_CO2 = {CO2_type: (multilevel_df[CO2_type] * production_df).groupby(level=0).sum().values
+                  for CO2_type in CO2_types}
+
     label_col1 = ['CO2 from production',
                   'CO2 per use', 'CO2 from other consumption']
     label_col2 = energy_list
@@ -348,201 +373,43 @@ def get_chart_Global_CO2_breakdown_sankey(execution_engine, namespace, chart_nam
 
     # Create Figure
     chart_name = f'{chart_name}'
-    fig = go.Figure()
 
     # Fill figure with data by year
     # i_label_dict associates each label with an integer value
     i_label_dict = dict((key, i) for i, key in enumerate(label_list))
     fig = go.Figure()
-    cmap_over = cm.get_cmap('Reds')
-    cmap_under = cm.get_cmap('Greens')
     if summary:
-        source, target = [], []
-        source_name, target_name = [], []
-        flux, flux_color = [], []
-        production_list = []
-        for i, energy in enumerate(energy_list):
-            # energies level
-            production = np.sum(multilevel_df.groupby(
-                level=0)['production'].sum()[energy])
-            # per kWh
-            CO2_from_production = np.mean((multilevel_df.loc[energy]['CO2_from_production'] *
-                                           multilevel_df.loc[energy]['production']).sum() / multilevel_df.groupby(
-                level=0)['production'].sum()[energy])
-            CO2_per_use = np.mean((multilevel_df.loc[energy]['CO2_per_use'] *
-                                   multilevel_df.loc[energy]['production']).sum() / multilevel_df.groupby(
-                level=0)['production'].sum()[energy])
-            CO2_after_use = np.mean((multilevel_df.loc[energy]['CO2_after_use'] *
-                                     multilevel_df.loc[energy]['production']).sum() / multilevel_df.groupby(
-                level=0)['production'].sum()[energy])
-            CO2_from_other_consumption = np.mean((multilevel_df.loc[energy]['CO2_from_other_consumption'] *
-                                                  multilevel_df.loc[energy]['production']).sum() / multilevel_df.groupby(
-                level=0)['production'].sum()[energy])
-            # total
-            CO2_from_production_tot = np.sum((multilevel_df.loc[energy]['CO2_from_production'] *
-                                              multilevel_df.loc[energy]['production']).sum()) +\
-                1e-20
-            CO2_per_use_tot = np.sum((multilevel_df.loc[energy]['CO2_per_use'] *
-                                      multilevel_df.loc[energy]['production']).sum()) +\
-                1e-20
-            CO2_after_use_tot = np.sum((multilevel_df.loc[energy]['CO2_after_use'] *
-                                        multilevel_df.loc[energy]['production']).sum()) +\
-                1e-20
-            CO2_from_other_consumption_tot = np.sum((multilevel_df.loc[energy]['CO2_from_other_consumption'] *
-                                                     multilevel_df.loc[energy]['production']).sum()) +\
-                1e-20
-            # col1 to col2
-            source += [i_label_dict['CO2 from production'], ]
-            source_name += ['CO2 from production', ]
-            target += [i_label_dict[energy], ]
-            target_name += [energy, ]
-            flux += [CO2_from_production_tot, ]
-            flux_color += [CO2_from_production, ]
-            production_list += [production, ]
-            source += [i_label_dict['CO2 per use'], ]
-            source_name += ['CO2 per use', ]
-            target += [i_label_dict[energy], ]
-            target_name += [energy, ]
-            flux += [CO2_per_use_tot, ]
-            flux_color += [CO2_per_use, ]
-            production_list += [production, ]
-            source += [
-                i_label_dict[f'CO2 from other consumption'], ]
-            source_name += [f'CO2 from other consumption', ]
-            target += [i_label_dict[energy], ]
-            target_name += [energy, ]
-            flux += [CO2_from_other_consumption_tot, ]
-            flux_color += [CO2_from_other_consumption, ]
-            production_list += [production, ]
-            # col2 to col3
-            source += [i_label_dict[energy], ]
-            source_name += [energy, ]
-            target += [i_label_dict['Total CO2 emissions'], ]
-            target_name += ['Total CO2 emissions', ]
-            flux += [CO2_after_use_tot, ]
-            flux_color += [CO2_after_use, ]
-            production_list += [production, ]
-        customdata = list(
-            np.array([source_name, target_name, production_list, flux_color,
-                      np.where(np.array(flux) <= 1e-20, 0.0, np.array(flux))]).T)
+        production = energy_production.sum(axis=1)
+        # per kWh
+        CO2_per_kWh = {CO2_type: np.mean(energy_CO2[CO2_type] / energy_production, axis=1)
+                       for CO2_type in CO2_types}
+        # total
+        CO2_tot = {CO2_type: energy_CO2[CO2_type].sum(axis=1) + 1e-20
+                   for CO2_type in CO2_types}
         hovertemplate = '<br>Source: %{customdata[0]}' + \
                         '<br>Target: %{customdata[1]}' + \
                         '<br>Aggregated Production: %{customdata[2]: .2e}' + \
                         '<br>Mean CO2 per kWh (color): %{customdata[3]: .2e}' + \
                         '<br>Aggregated Total CO2 (thickness): %{customdata[4]: .2e}'
-        rgba_list_over = cmap_over(
-            0.1 + np.abs(flux_color) / np.max(np.abs(flux_color)))
-        rgba_list_under = cmap_under(
-            0.1 + np.abs(flux_color) / np.max(np.abs(flux_color)))
-        color_over = ['rgb' + str(tuple(int((255 * (x * 0.8 + 0.2)))
-                                        for x in rgba[0:3])) for rgba in rgba_list_over]
-        color_under = ['rgb' + str(tuple(int((255 * (x * 0.8 + 0.2)))
-                                         for x in rgba[0:3])) for rgba in rgba_list_under]
-        color = np.where(np.array(flux_color) > 0.0, color_over, color_under)
-        link = dict(source=source, target=target,
-                    value=list(np.where(np.abs(flux) > 0.0, 1.0 +
-                                        100.0 * np.abs(flux) / np.max(np.abs(flux)), 0.0)),
-                    color=list(color),
-                    customdata=customdata,
-                    hovertemplate=hovertemplate,)
-        sankey = go.Sankey(node=dict(pad=15, thickness=20, line=dict(color="black", width=0.5),
-                                     label=list(i_label_dict.keys()), color="black"),
-                           link=link,
-                           visible=False)
-        fig.add_trace(sankey)
+        fig.add_trace(get_CO2_breakdown_sankey(
+            energy_list, i_label_dict, production, CO2_per_kWh, CO2_tot, hovertemplate))
 
     else:
         for i_year in range(len(years)):
-            source, target = [], []
-            source_name, target_name = [], []
-            flux, flux_color = [], []
-            production_list = []
-            for i, energy in enumerate(energy_list):
-                # energies level
-                production = multilevel_df.groupby(
-                    level=0)['production'].sum()[energy][i_year]
-                # per kWh
-                CO2_from_production = (multilevel_df.loc[energy]['CO2_from_production'] *
-                                       multilevel_df.loc[energy]['production']).sum()[i_year] / production
-                CO2_per_use = (multilevel_df.loc[energy]['CO2_per_use'] *
-                               multilevel_df.loc[energy]['production']).sum()[i_year] / production
-                CO2_after_use = (multilevel_df.loc[energy]['CO2_after_use'] *
-                                 multilevel_df.loc[energy]['production']).sum()[i_year] / production
-                CO2_from_other_consumption = (multilevel_df.loc[energy]['CO2_from_other_consumption'] *
-                                              multilevel_df.loc[energy]['production']).sum()[i_year] / production
-                # total
-                CO2_from_production_tot = (multilevel_df.loc[energy]['CO2_from_production'] *
-                                           multilevel_df.loc[energy]['production']).sum()[i_year] +\
-                    1e-20
-                CO2_per_use_tot = (multilevel_df.loc[energy]['CO2_per_use'] *
-                                   multilevel_df.loc[energy]['production']).sum()[i_year] +\
-                    1e-20
-                CO2_after_use_tot = (multilevel_df.loc[energy]['CO2_after_use'] *
-                                     multilevel_df.loc[energy]['production']).sum()[i_year] +\
-                    1e-20
-                CO2_from_other_consumption_tot = (multilevel_df.loc[energy]['CO2_from_other_consumption'] *
-                                                  multilevel_df.loc[energy]['production']).sum()[i_year] +\
-                    1e-20
-                # col1 to col2
-                source += [i_label_dict['CO2 from production'], ]
-                source_name += ['CO2 from production', ]
-                target += [i_label_dict[energy], ]
-                target_name += [energy, ]
-                flux += [CO2_from_production_tot, ]
-                flux_color += [CO2_from_production, ]
-                production_list += [production, ]
-                source += [i_label_dict['CO2 per use'], ]
-                source_name += ['CO2 per use', ]
-                target += [i_label_dict[energy], ]
-                target_name += [energy, ]
-                flux += [CO2_per_use_tot, ]
-                flux_color += [CO2_per_use, ]
-                production_list += [production, ]
-                source += [
-                    i_label_dict[f'CO2 from other consumption'], ]
-                source_name += [f'CO2 from other consumption', ]
-                target += [i_label_dict[energy], ]
-                target_name += [energy, ]
-                flux += [CO2_from_other_consumption_tot, ]
-                flux_color += [CO2_from_other_consumption, ]
-                production_list += [production, ]
-                # col2 to col3
-                source += [i_label_dict[energy], ]
-                source_name += [energy, ]
-                target += [i_label_dict['Total CO2 emissions'], ]
-                target_name += ['Total CO2 emissions', ]
-                flux += [CO2_after_use_tot, ]
-                flux_color += [CO2_after_use, ]
-                production_list += [production, ]
-            customdata = list(
-                np.array([source_name, target_name, production_list, flux_color,
-                          np.where(np.array(flux) <= 1e-20, 0.0, np.array(flux))]).T)
+            production = energy_production[:, i_year]
+            # per kWh
+            CO2_per_kWh = {CO2_type: energy_CO2[CO2_type][:, i_year] / production
+                           for CO2_type in CO2_types}
+            # total
+            CO2_tot = {CO2_type: energy_CO2[CO2_type][:, i_year] + 1e-20
+                       for CO2_type in CO2_types}
             hovertemplate = '<br>Source: %{customdata[0]}' + \
                             '<br>Target: %{customdata[1]}' + \
                             '<br>Production: %{customdata[2]: .2e}' + \
                             '<br>CO2 per kWh (color): %{customdata[3]: .2e}' + \
                             '<br>Total CO2 (thickness): %{customdata[4]: .2e}'
-            rgba_list_over = cmap_over(
-                0.1 + np.abs(flux_color) / np.max(np.abs(flux_color)))
-            rgba_list_under = cmap_under(
-                0.1 + np.abs(flux_color) / np.max(np.abs(flux_color)))
-            color_over = ['rgb' + str(tuple(int((255 * (x * 0.8 + 0.2)))
-                                            for x in rgba[0:3])) for rgba in rgba_list_over]
-            color_under = ['rgb' + str(tuple(int((255 * (x * 0.8 + 0.2)))
-                                             for x in rgba[0:3])) for rgba in rgba_list_under]
-            color = np.where(np.array(flux_color) > 0.0,
-                             color_over, color_under)
-            link = dict(source=source, target=target,
-                        value=list(np.where(
-                            np.abs(flux) > 0.0, 1.0 + 100.0 * np.abs(flux) / np.max(np.abs(flux)), 0.0)),
-                        color=list(color),
-                        customdata=customdata,
-                        hovertemplate=hovertemplate,)
-            sankey = go.Sankey(node=dict(pad=15, thickness=20, line=dict(color="black", width=0.5),
-                                         label=list(i_label_dict.keys()), color="black"),
-                               link=link,
-                               visible=False)
-            fig.add_trace(sankey)
+            fig.add_trace(get_CO2_breakdown_sankey(
+                energy_list, i_label_dict, production, CO2_per_kWh, CO2_tot, hovertemplate))
 
         # Prepare year slider and layout updates
         steps = []
@@ -570,69 +437,107 @@ def get_chart_Global_CO2_breakdown_sankey(execution_engine, namespace, chart_nam
     return new_chart
 
 
+def get_CO2_breakdown_sankey(energy_list, i_label_dict, production, CO2_per_kWh, CO2_tot, hovertemplate):
+    '''! Function to create one Sankey trace of the CO2 breakdown
+    @param energy_list: list of energies
+    @param i_label_dict: dict associating each label with an integer value
+    @param production: array of production per energy
+    @param CO2_per_kWh: dict of arrays of CO2 per kWh per energy for each CO2 type
+    @param CO2_tot: dict of arrays of total CO2 per energy for each CO2 type
+    @param hovertemplate: String, hover template of the links
+
+    @return sankey: go.Sankey trace
+    '''
+    cmap_over = cm.get_cmap('Reds')
+    cmap_under = cm.get_cmap('Greens')
+    source, target = [], []
+    source_name, target_name = [], []
+    flux, flux_color = [], []
+    production_list = []
+    # col1 to col2 then col2 to col3
+    links = [('CO2 from production', None, 'CO2_from_production'),
+             ('CO2 per use', None, 'CO2_per_use'),
+             ('CO2 from other consumption', None, 'CO2_from_other_consumption'),
+             (None, 'Total CO2 emissions', 'CO2_after_use')]
+    for i, energy in enumerate(energy_list):
+        for link_source, link_target, CO2_type in links:
+            link_source = energy if link_source is None else link_source
+            link_target = energy if link_target is None else link_target
+            source += [i_label_dict[link_source], ]
+            source_name += [link_source, ]
+            target += [i_label_dict[link_target], ]
+            target_name += [link_target, ]
+            flux += [CO2_tot[CO2_type][i], ]
+            flux_color += [CO2_per_kWh[CO2_type][i], ]
+            production_list += [production[i], ]
+    customdata = list(
+        np.array([source_name, target_name, production_list, flux_color,
+                  np.where(np.array(flux) <= 1e-20, 0.0, np.array(flux))]).T)
+    rgba_list_over = cmap_over(
+        0.1 + np.abs(flux_color) / np.max(np.abs(flux_color)))
+    rgba_list_under = cmap_under(
+        0.1 + np.abs(flux_color) / np.max(np.abs(flux_color)))
+    color_over = ['rgb' + str(tuple(int((255 * (x * 0.8 + 0.2)))
+                                    for x in rgba[0:3])) for rgba in rgba_list_over]
+    color_under = ['rgb' + str(tuple(int((255 * (x * 0.8 + 0.2)))
+                                     for x in rgba[0:3])) for rgba in rgba_list_under]
+    color = np.where(np.array(flux_color) > 0.0, color_over, color_under)
+    link = dict(source=source, target=target,
+                value=list(np.where(np.abs(flux) > 0.0, 1.0 +
+                                    100.0 * np.abs(flux) / np.max(np.abs(flux)), 0.0)),
+                color=list(color),
+                customdata=customdata,
+                hovertemplate=hovertemplate,)
+    sankey = go.Sankey(node=dict(pad=15, thickness=20, line=dict(color="black", width=0.5),
+                                 label=list(i_label_dict.keys()), color="black"),
+                       link=link,
+                       visible=False)
+
+    return sankey
+
+
 def get_CO2_breakdown_multilevel_df(execution_engine, namespace):
     '''! Function to create the dataframe with all the data necessary for the CO2 breakdown graphs in a multilevel [energy, technologies]
     @param execution_engine: Current execution engine object, from which the data is extracted
     @param namespace: Namespace at which the data can be accessed
 
-    @return multilevel_df: Dataframe
+    @return multilevel_df: Dataframe with an (energy, techno) index and (variable, year) columns
+    @return years: array of years
     '''
-    EnergyMix = execution_engine.dm.get_disciplines_with_name(
-        f'{namespace}.EnergyMix')[0]
-    energy_list = EnergyMix.get_sosdisc_inputs('energy_list')
-    years = np.arange(EnergyMix.get_sosdisc_inputs(
-        'year_start'), EnergyMix.get_sosdisc_inputs('year_end') + 1, 1)
-    # Construct a DataFrame to organize the data on two levels: energy and
-    # techno
-    idx = pd.MultiIndex.from_tuples([], names=['energy', 'techno'])
+    techno_index, techno_disc_list, years = get_techno_disciplines(
+        execution_engine, namespace)
     columns = ['production', 'CO2_from_production',
                'CO2_per_use', 'CO2_after_use', 'CO2_from_other_consumption']
-    multilevel_df = pd.DataFrame(
-        index=idx,
-        columns=columns)
-    for energy in energy_list:
-        energy_disc = execution_engine.dm.get_disciplines_with_name(
-            f'{namespace}.EnergyMix.{energy}')[0]
-        techno_list = energy_disc.get_sosdisc_inputs('technologies_list')
-        for techno in techno_list:
-            techno_disc = execution_engine.dm.get_disciplines_with_name(
-                f'{namespace}.EnergyMix.{energy}.{techno}')[0]
-            production_techno = techno_disc.get_sosdisc_outputs(
-                'techno_production')[f'{energy} (TWh)'].values *\
-                techno_disc.get_sosdisc_inputs(
-                    'scaling_factor_techno_production')
-            # Calculate total CO2 emissions
-            data_fuel_dict = techno_disc.get_sosdisc_inputs('data_fuel_dict')
-            carbon_emissions = techno_disc.get_sosdisc_outputs(
-                'CO2_emissions_detailed')
-            CO2_per_use = np.zeros(
-                len(carbon_emissions['years']))
-            if 'CO2_per_use' in data_fuel_dict and 'high_calorific_value' in data_fuel_dict:
-                if data_fuel_dict['CO2_per_use_unit'] == 'kg/kg':
-                    CO2_per_use = np.ones(
-                        len(carbon_emissions['years'])) * data_fuel_dict['CO2_per_use'] / data_fuel_dict['high_calorific_value']
-                elif data_fuel_dict['CO2_per_use_unit'] == 'kg/kWh':
-                    CO2_per_use = np.ones(
-                        len(carbon_emissions['years'])) * data_fuel_dict['CO2_per_use']
-            CO2_from_other_consumption = np.zeros(len(years))
-            for emission_type in carbon_emissions:
-                if emission_type == 'years':
-                    continue
-                elif emission_type == 'production':
-                    CO2_from_production = carbon_emissions[emission_type].values
-                elif emission_type == techno:
-                    total_carbon_emissions = CO2_per_use + \
-                        carbon_emissions[techno].values
-                else:
-                    CO2_from_other_consumption += carbon_emissions[emission_type].values
-            CO2_after_use = total_carbon_emissions
-            idx = pd.MultiIndex.from_tuples(
-                [(f'{energy}', f'{techno}')], names=['energy', 'techno'])
-            columns_techno = ['energy', 'technology', 'production', 'CO2_from_production',
-                              'CO2_per_use', 'CO2_after_use', 'CO2_from_other_consumption']
-            techno_df = pd.DataFrame([[energy, techno, production_techno, CO2_from_production, CO2_per_use, CO2_after_use, CO2_from_other_consumption]],
-                                     index=idx, columns=columns_techno)
-            multilevel_df = multilevel_df.append(techno_df)
+    # Collect the data of all technos in a preallocated (techno, variable,
+    # year) array
+    values = np.zeros((len(techno_index), len(columns), len(years)))
+    for i_techno, ((energy, techno), techno_disc) in enumerate(zip(techno_index, techno_disc_list)):
+        production_techno = techno_disc.get_sosdisc_outputs(
+            'techno_production')[f'{energy} (TWh)'].values *\
+            techno_disc.get_sosdisc_inputs(
+                'scaling_factor_techno_production')
+        # Calculate total CO2 emissions
+        carbon_emissions = techno_disc.get_sosdisc_outputs(
+            'CO2_emissions_detailed')
+        CO2_per_use = get_CO2_per_use(
+            techno_disc, len(carbon_emissions['years']))
+        CO2_from_production = np.zeros(len(years))
+        CO2_after_use = CO2_per_use
+        CO2_from_other_consumption = np.zeros(len(years))
+        for emission_type in carbon_emissions:
+            if emission_type == 'years':
+                continue
+            elif emission_type == 'production':
+                CO2_from_production = carbon_emissions[emission_type].values
+            elif emission_type == techno:
+                CO2_after_use = CO2_per_use + \
+                    carbon_emissions[techno].values
+            else:
+                CO2_from_other_consumption += carbon_emissions[emission_type].values
+        values[i_techno] = [production_techno, CO2_from_production,
+                            CO2_per_use, CO2_after_use, CO2_from_other_consumption]
+
+    multilevel_df = build_multilevel_df(techno_index, columns, years, values)
 
     return multilevel_df, years
 
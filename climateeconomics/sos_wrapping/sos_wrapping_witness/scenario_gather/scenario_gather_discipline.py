@@ -0,0 +1,66 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+from sos_trades_core.execution_engine.sos_discipline import SoSDiscipline
+
+
+class ScenarioGatherDiscipline(SoSDiscipline):
+    '''
+    Holds the gathered outputs of the scenarios of a multi-scenario study run by a
+    ScenarioExecutor, so that the post-processings of the multi-scenario study read them at the
+    same paths without instantiating the scenarios
+
+    A dataframe input is created for each scenario and each gathered output, at
+    <ns_scatter_scenario>.<scenario>.<output path>: the gathered outputs are dataframes, the
+    ScenarioExecutor raises a TypeError for other types. The discipline has nothing to compute.
+    '''
+
+    # ontology information
+    _ontology_data = {
+        'label': 'Scenario Gather Model',
+        'type': 'Research',
+        'source': 'SoSTrades Project',
+        'validated': '',
+        'validated_by': 'SoSTrades Project',
+        'last_modification_date': '',
+        'category': '',
+        'definition': '',
+        'icon': 'fas fa-list fa-fw',
+        'version': '',
+    }
+    _maturity = 'Research'
+
+    DESC_IN = {
+        'scenario_list': {'type': 'string_list', 'visibility': SoSDiscipline.SHARED_VISIBILITY,
+                          'namespace': 'ns_scatter_scenario', 'structuring': True},
+        'gathered_outputs': {'type': 'list', 'subtype_descriptor': {'list': 'string'}, 'default': [],
+                             'user_level': 3, 'structuring': True},
+    }
+
+    def setup_sos_disciplines(self):
+        dynamic_inputs = {}
+        if 'scenario_list' in self._data_in and 'gathered_outputs' in self._data_in:
+            scenario_list, gathered_outputs = self.get_sosdisc_inputs(
+                ['scenario_list', 'gathered_outputs'])
+            if scenario_list is not None and gathered_outputs is not None:
+                for scenario in scenario_list:
+                    for path in gathered_outputs:
+                        dynamic_inputs[f'{scenario}.{path}'] = {'type': 'dataframe', 'user_level': 3,
+                                                                'visibility': SoSDiscipline.SHARED_VISIBILITY,
+                                                                'namespace': 'ns_scatter_scenario'}
+        self.add_inputs(dynamic_inputs)
+
+    def run(self):
+        pass
@@ -210,7 +210,6 @@ class TempChangeDiscipline(ClimateEcoDiscipline):
                 ('temperature_df', 'temp_atmo'), ('ghg_cycle_df', 'co2_ppm'), d_tempatmo_d_atmoconc, )
 
             # temperature_constraint
-            d_tempatmo_d_atmoconc, _ = self.model.compute_d_temp_atmo()
             self.set_partial_derivative_for_other_types(
                 ('temperature_constraint',), ('ghg_cycle_df', 'co2_ppm'),
                 -d_tempatmo_d_atmoconc[-1] / temperature_constraint_ref, )
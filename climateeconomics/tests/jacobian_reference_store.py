@@ -0,0 +1,238 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import bz2
+import json
+import os
+import pickle
+import tempfile
+import zipfile
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from glob import glob
+from importlib import import_module
+from os.path import join, dirname, basename, exists
+
+import numpy as np
+from scipy.sparse import csr_matrix, issparse
+
+
+class JacobianReferenceStore():
+    '''
+    Reference jacobians stored as one LZMA compressed .npz file per test, with a json manifest
+    listing the (output, input) blocks stored in the file
+
+    Blocks with few non zero values are stored in CSR format, the others as dense arrays, and
+    the blocks of a file are concatenated in a few arrays: one entry per block would make the
+    zip headers bigger than the values. Zero blocks are only described in the manifest.
+    An array of a file is only read when a block needs it, blocks are built on access.
+    Each file holds its own manifest so that tests dumped in parallel never write the same file.
+    check_jacobian of sos_trades_core still reads the bz2 pickles, the gradient tests keep them
+    until it can read the store.
+    '''
+    MANIFEST_KEY = '__manifest__'
+    EXTENSIONS = ('.pkl', '.npz')
+    # blocks with a lower ratio of non zero values are stored as sparse matrices
+    SPARSE_DENSITY = 0.3
+
+    def __init__(self, directory):
+        self.directory = directory
+        # {reference name: {key: array}} arrays of the npz files already read
+        self.npz_arrays = {}
+
+    def get_reference_name(self, filename):
+        # discipline names hold dots, only the known extensions are removed
+        name = basename(filename)
+        for extension in self.EXTENSIONS:
+            if name.endswith(extension):
+                return name[:-len(extension)]
+        return name
+
+    def get_reference_path(self, filename):
+        return join(self.directory, f'{self.get_reference_name(filename)}.npz')
+
+    def write(self, filename, jacobian):
+        '''
+        Write the jacobian dict {output: {input: block}} of a test in the store
+        '''
+        name = self.get_reference_name(filename)
+        blocks = []
+        arrays = {'dense': [], 'csr_data': [],
+                  'csr_indices': [], 'csr_indptr': []}
+        dense_size, data_size, indptr_size = 0, 0, 0
+        for output_name, jac_output in jacobian.items():
+            for input_name, block in jac_output.items():
+                if issparse(block):
+                    block = csr_matrix(block)
+                else:
+                    block = np.atleast_2d(np.asarray(block))
+                    if np.count_nonzero(block) <= self.SPARSE_DENSITY * block.size:
+                        block = csr_matrix(block)
+                if issparse(block) and block.nnz == 0:
+                    block_format, location = 'zero', []
+                elif issparse(block):
+                    arrays['csr_data'].append(block.data)
+                    arrays['csr_indices'].append(block.indices)
+                    arrays['csr_indptr'].append(block.indptr)
+                    block_format, location = 'csr', [data_size, indptr_size]
+                    data_size += block.nnz
+                    indptr_size += len(block.indptr)
+                else:
+                    arrays['dense'].append(block.ravel())
+                    block_format, location = 'dense', [dense_size]
+                    dense_size += block.size
+                blocks.append([output_name, input_name,
+                               block_format, list(block.shape), location])
+        arrays = {key: np.concatenate(values)
+                  for key, values in arrays.items() if values}
+        arrays[self.MANIFEST_KEY] = np.array(json.dumps(blocks))
+
+        self.npz_arrays.pop(name, None)
+        # write next to the target then replace it, a reader never sees a partial file
+        file_descriptor, tmp_path = tempfile.mkstemp(
+            dir=self.directory, suffix='.npz')
+        os.close(file_descriptor)
+        with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_LZMA) as npz_file:
+            for key, array in arrays.items():
+                with npz_file.open(f'{key}.npy', 'w', force_zip64=True) as array_file:
+                    np.lib.format.write_array(
+                        array_file, array, allow_pickle=False)
+        os.replace(tmp_path, self.get_reference_path(name))
+
+    def __contains__(self, filename):
+        return exists(self.get_reference_path(filename))
+
+    def get_npz_array(self, name, key):
+        '''
+        Read one array of the npz file of a reference, the other arrays are not decompressed
+        '''
+        arrays = self.npz_arrays.setdefault(name, {})
+        if key not in arrays:
+            if not exists(self.get_reference_path(name)):
+                raise KeyError(
+                    f'No reference jacobian {name} in {self.directory}')
+            with np.load(self.get_reference_path(name)) as npz_file:
+                arrays[key] = npz_file[key]
+        return arrays[key]
+
+    def get_manifest(self, filename):
+        '''
+        Get the list of [output, input, format, shape, location] blocks of a reference jacobian
+        '''
+        name = self.get_reference_name(filename)
+        return json.loads(self.get_npz_array(name, self.MANIFEST_KEY).item())
+
+    def load(self, filename):
+        '''
+        Get the reference jacobian of a test as a lazy dict {output: {input: block}}
+        '''
+        name = self.get_reference_name(filename)
+        jacobian = {}
+        for output_name, input_name, block_format, shape, location in self.get_manifest(name):
+            jacobian.setdefault(output_name, {})[input_name] = (
+                block_format, tuple(shape), location)
+
+        return {output_name: LazyJacobianBlocks(self, name, blocks)
+                for output_name, blocks in jacobian.items()}
+
+    def get_block(self, name, block_format, shape, location):
+        '''
+        Build a single block, the block is returned as a dense array
+        '''
+        if block_format == 'zero':
+            return np.zeros(shape)
+        if block_format == 'csr':
+            data_start, indptr_start = location
+            indptr = self.get_npz_array(name, 'csr_indptr')[
+                indptr_start:indptr_start + shape[0] + 1]
+            data_end = data_start + indptr[-1]
+            return csr_matrix((self.get_npz_array(name, 'csr_data')[data_start:data_end],
+                               self.get_npz_array(name, 'csr_indices')[data_start:data_end],
+                               indptr), shape=shape).toarray()
+        dense_start = location[0]
+        return self.get_npz_array(name, 'dense')[dense_start:dense_start + shape[0] * shape[1]].reshape(shape)
+
+    def convert_pickle(self, pkl_path, remove=False):
+        '''
+        Convert a bz2 pickle written by AbstractJacobianUnittest into the store
+        '''
+        with bz2.open(pkl_path, 'rb') as pkl_file:
+            jacobian = pickle.load(pkl_file)
+        self.write(pkl_path, jacobian)
+        if remove:
+            os.remove(pkl_path)
+
+    def convert_pickle_directory(self, pkl_directory=None, remove=False):
+        '''
+        Convert all the pickles of a directory, by default the directory of the store
+        '''
+        if pkl_directory is None:
+            pkl_directory = self.directory
+        for pkl_path in sorted(glob(join(pkl_directory, '*.pkl'))):
+            self.convert_pickle(pkl_path, remove=remove)
+
+
+class LazyJacobianBlocks(Mapping):
+    '''
+    Blocks {input: array} of one output of a reference jacobian, read on access
+    '''
+
+    def __init__(self, store, name, blocks):
+        self.store = store
+        self.name = name
+        self.blocks = blocks
+        self.loaded_blocks = {}
+
+    def __getitem__(self, input_name):
+        if input_name not in self.loaded_blocks:
+            self.loaded_blocks[input_name] = self.store.get_block(
+                self.name, *self.blocks[input_name])
+        return self.loaded_blocks[input_name]
+
+    def __iter__(self):
+        return iter(self.blocks)
+
+    def __len__(self):
+        return len(self.blocks)
+
+
+def generate_test_file_pickles(jacobian_target_name, test_file):
+    '''
+    Regenerate the pickles of one test file, run in a worker process
+    '''
+    jacobian_target = import_module(jacobian_target_name)
+    from sos_trades_core.tests.core.abstract_jacobian_unit_test import AbstractJacobianUnittest
+    AbstractJacobianUnittest.launch_all_pickle_generation(
+        jacobian_target, test_file)
+    return test_file
+
+
+def launch_parallel_pickle_generation(jacobian_target, test_files=None, n_processes=4,
+                                      directory=join(dirname(__file__), 'jacobian_pkls')):
+    '''
+    Regenerate the reference jacobians of the gradient test files with a process pool,
+    one test file per task, each test writing its own file of the jacobian reference store
+    jacobian_target: test module as given to AbstractJacobianUnittest.launch_all_pickle_generation
+    '''
+    if test_files is None:
+        test_files = [basename(test_file) for test_file in sorted(
+            glob(join(dirname(jacobian_target.__file__), 'l1_test_gradient_*.py')))]
+
+    with ProcessPoolExecutor(max_workers=n_processes) as executor:
+        for test_file in executor.map(generate_test_file_pickles,
+                                      [jacobian_target.__name__] * len(test_files), test_files):
+            print(f'Jacobian pickles of {test_file} regenerated')
+
+    return JacobianReferenceStore(directory)
@@ -108,6 +108,33 @@ class AgricultureTestCase(unittest.TestCase):
         agriculture.apply_percentage(self.param)
         agriculture.compute(self.population_df, self.temperature_df)
 
+    def test_agriculture_surface_population_gradient(self):
+        '''
+        Check the precomputed derivative of the food surface wrt population against finite differences
+        '''
+        temperature_df = self.temperature_df.copy()
+        temperature_df['temp_atmo'] = np.linspace(1.1, 2.5, len(temperature_df))
+        agriculture = Agriculture(self.param)
+        agriculture.apply_percentage(self.param)
+        agriculture.compute(self.population_df, temperature_df)
+        surface_df = agriculture.food_land_surface_df.copy()
+
+        step = 1.
+        population_df = self.population_df.copy()
+        population_df['population'] = population_df['population'] + step
+        agriculture.compute(population_df, temperature_df)
+        for column in ['red meat (Gha)', 'rice and maize (Gha)', 'other (Gha)']:
+            if column == 'other (Gha)':
+                gradient = agriculture.d_other_surface_d_population()
+            else:
+                gradient = agriculture.d_land_surface_d_population(column)
+            np.testing.assert_allclose(gradient.sum(axis=1),
+                                       (agriculture.food_land_surface_df[column].values -
+                                        surface_df[column].values) / step, rtol=1e-8)
+        # the total surface is the sum of the surfaces of each food
+        np.testing.assert_allclose(surface_df.drop(columns=['years', 'total surface (Gha)']).sum(axis=1).values,
+                                   surface_df['total surface (Gha)'].values)
+
     def test_agriculture_discipline(self):
         '''
         Check discipline setup and run
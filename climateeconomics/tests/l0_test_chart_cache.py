@@ -0,0 +1,82 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import unittest
+import numpy as np
+from os.path import join, dirname
+from pandas import read_csv
+
+from sos_trades_core.execution_engine.execution_engine import ExecutionEngine
+
+
+class ChartCacheTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.name = 'Test'
+        self.model_name = 'carboncycle'
+        self.ee = ExecutionEngine(self.name)
+        ns_dict = {'ns_witness': f'{self.name}',
+                   'ns_public': f'{self.name}',
+                   'ns_ref': f'{self.name}'}
+
+        self.ee.ns_manager.add_ns_def(ns_dict)
+
+        mod_path = 'climateeconomics.sos_wrapping.sos_wrapping_witness.carboncycle.carboncycle_discipline.CarbonCycleDiscipline'
+        builder = self.ee.factory.get_builder_from_module(
+            self.model_name, mod_path)
+
+        self.ee.factory.set_builders_to_coupling_builder(builder)
+
+        self.ee.configure()
+
+        data_dir = join(dirname(__file__), 'data')
+        CO2_emissions_df_all = read_csv(
+            join(data_dir, 'co2_emissions_onestep.csv'))
+        self.CO2_emissions_df = CO2_emissions_df_all[CO2_emissions_df_all['years'] >= 2020]
+        self.CO2_emissions_df.index = np.arange(2020, 2101)
+
+        self.ee.dm.set_values_from_dict(
+            {f'{self.name}.CO2_emissions_df': self.CO2_emissions_df})
+        self.ee.execute()
+        self.disc = self.ee.dm.get_disciplines_with_name(
+            f'{self.name}.{self.model_name}')[0]
+
+    def test_charts_cached_until_next_run(self):
+
+        chart_filters = self.disc.get_chart_filter_list()
+        graph_list = self.disc.get_post_processing_list(chart_filters)
+        self.assertIs(self.disc.get_post_processing_list(chart_filters), graph_list)
+
+        self.ee.execute()
+        self.assertIsNot(self.disc.get_post_processing_list(chart_filters), graph_list)
+
+    def test_charts_rebuilt_on_new_values(self):
+
+        chart_filters = self.disc.get_chart_filter_list()
+        graph_list = self.disc.get_post_processing_list(chart_filters)
+
+        # values set without a run, as when a study is reloaded
+        carboncycle_df = self.ee.dm.get_value(
+            f'{self.name}.{self.model_name}.carboncycle_detail_df').copy()
+        carboncycle_df['atmo_conc'] *= 2.
+        self.ee.dm.set_values_from_dict(
+            {f'{self.name}.{self.model_name}.carboncycle_detail_df': carboncycle_df})
+
+        self.assertIsNot(self.disc.get_post_processing_list(chart_filters), graph_list)
+
+
+if '__main__' == __name__:
+    unittest.main()
@@ -0,0 +1,83 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import unittest
+import numpy as np
+
+from climateeconomics.core.tools.continuation_solver import ContinuationSolver
+
+
+class QuadraticStudy():
+    '''
+    Study minimizing (x - alpha)**2 + alpha * x**4 by gradient descent from its design variable
+    '''
+    iterations = []
+
+    def __init__(self, alpha):
+        self.alpha = alpha
+        self.x = np.zeros(3)
+
+    def set_warm_start_values(self, warm_start_values):
+        self.x = warm_start_values['x'].copy()
+
+    def get_warm_start_values(self):
+        return {'x': self.x}
+
+    def run(self):
+        for iteration in range(10000):
+            gradient = 2. * (self.x - self.alpha) + 4. * self.alpha * self.x ** 3
+            if np.linalg.norm(gradient) < 1e-8:
+                break
+            self.x = self.x - 0.1 * gradient
+        QuadraticStudy.iterations.append(iteration)
+
+
+class ContinuationSolverTest(unittest.TestCase):
+
+    def setUp(self):
+        QuadraticStudy.iterations = []
+        self.alpha_list = np.linspace(1., 0., 11)
+
+    def solve_independently(self):
+        results = {}
+        for alpha in self.alpha_list:
+            study = QuadraticStudy(alpha)
+            study.run()
+            results[alpha] = study.get_warm_start_values()
+        return results
+
+    def test_continuation(self):
+
+        cold_results = self.solve_independently()
+        cold_iterations = sum(QuadraticStudy.iterations)
+
+        for n_chains in [1, 2]:
+            QuadraticStudy.iterations = []
+            solver = ContinuationSolver(QuadraticStudy, self.alpha_list, n_chains=n_chains)
+            if n_chains == 2:
+                self.assertListEqual([chain[0] for chain in solver.get_chains()], [0., 1.])
+            results = solver.run()
+
+            self.assertListEqual(list(results.keys()), sorted(self.alpha_list))
+            for alpha, values in results.items():
+                np.testing.assert_allclose(values['x'], cold_results[alpha]['x'], atol=1e-8)
+            self.assertLess(sum(QuadraticStudy.iterations), cold_iterations)
+
+        with self.assertRaises(ValueError):
+            ContinuationSolver(QuadraticStudy, self.alpha_list, n_chains=3)
+
+
+if '__main__' == __name__:
+    unittest.main()
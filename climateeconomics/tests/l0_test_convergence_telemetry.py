@@ -0,0 +1,106 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from climateeconomics.core.tools.convergence_telemetry import ConvergenceTelemetry
+
+
+class FakeDiscipline():
+
+    def __init__(self, inputs_dict, name='Test.Discipline'):
+        self._data_in = inputs_dict
+        self.name = name
+
+    def get_disc_full_name(self):
+        return self.name
+
+    def get_sosdisc_inputs(self, name):
+        return self._data_in[name]
+
+
+class ConvergenceTelemetryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.years = np.arange(2020, 2031)
+
+    def get_df(self, column, value):
+        return pd.DataFrame({'years': self.years, column: value * np.ones(len(self.years))})
+
+    def run_iteration(self, telemetry, value):
+        telemetry.record_discipline(FakeDiscipline({'temperature_df': self.get_df('temp_atmo', 2.0 * value),
+                                                    'damage_frac': 0.1}, 'Test.Macroeconomics'),
+                                    {'economics_df': self.get_df('gross_output', value),
+                                     'damage_df': self.get_df('damages', value)})
+        # temperature_df is read unchanged by a second discipline, it is only one new value
+        telemetry.record_discipline(FakeDiscipline({'temperature_df': self.get_df('temp_atmo', 2.0 * value)},
+                                                   'Test.Damage'),
+                                    {})
+
+    def test_residuals(self):
+        telemetry = ConvergenceTelemetry(['economics_df', 'temperature_df'])
+        for value in [1.0, 1.5, 1.6]:
+            self.run_iteration(telemetry, value)
+
+        history_df = telemetry.get_history_df()
+        self.assertListEqual(list(history_df.columns), [
+                             'economics_df', 'temperature_df'])
+        # the rows of the variables are the shared iterations of the MDA run
+        self.assertListEqual(list(history_df.index), [(1, 2), (1, 3)])
+        np.testing.assert_allclose(history_df['economics_df'].values,
+                                   [0.5 / 1.5, 0.1 / 1.6])
+        np.testing.assert_allclose(history_df['temperature_df'].values,
+                                   [0.5 / 1.5, 0.1 / 1.6])
+
+        final_residuals = telemetry.get_final_residuals()
+        self.assertAlmostEqual(final_residuals['economics_df'], 0.1 / 1.6)
+        telemetry.reset()
+        self.assertTrue(telemetry.get_history_df().empty)
+
+    def test_mda_runs(self):
+        telemetry = ConvergenceTelemetry(['economics_df', 'temperature_df'])
+        for value in [1.0, 1.5]:
+            self.run_iteration(telemetry, value)
+        # Macroeconomics is executed again on the converged temperature, another input changed
+        telemetry.record_discipline(FakeDiscipline({'temperature_df': self.get_df('temp_atmo', 3.0),
+                                                    'damage_frac': 0.2}, 'Test.Macroeconomics'),
+                                    {'economics_df': self.get_df('gross_output', 2.0)})
+        self.assertEqual(telemetry.mda_run, 2)
+        telemetry.start_mda_run()
+        self.run_iteration(telemetry, 1.0)
+
+        history_df = telemetry.get_history_df()
+        self.assertListEqual(list(history_df.index), [(1, 2), (2, 1), (3, 1)])
+        np.testing.assert_allclose(history_df.loc[(2, 1), 'economics_df'], 0.5 / 2.0)
+        # only the last MDA run gives the final residuals
+        final_residuals = telemetry.get_final_residuals()
+        self.assertAlmostEqual(final_residuals['economics_df'], 1.0)
+        self.assertAlmostEqual(final_residuals['temperature_df'], 1.0 / 2.0)
+
+    def test_activate(self):
+        execution_engine = FakeDiscipline({})
+        self.assertIsNone(ConvergenceTelemetry.get_telemetry(execution_engine))
+        telemetry = ConvergenceTelemetry.activate(execution_engine)
+        self.assertIs(ConvergenceTelemetry.get_telemetry(
+            execution_engine), telemetry)
+        ConvergenceTelemetry.deactivate(execution_engine)
+        self.assertIsNone(ConvergenceTelemetry.get_telemetry(execution_engine))
+
+
+if '__main__' == __name__:
+    unittest.main()
@@ -0,0 +1,117 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import unittest
+
+from climateeconomics.core.tools.coupling_graph import CouplingGraph
+
+
+class FakeDiscipline():
+    '''
+    Configured discipline, inputs and outputs are full names including the dynamic ones
+    '''
+
+    def __init__(self, full_name, input_names, output_names):
+        self.full_name = full_name
+        self.input_names = [f'Study.{name}' for name in input_names]
+        self.output_names = [f'Study.{name}' for name in output_names]
+
+    def get_disc_full_name(self):
+        return self.full_name
+
+    def get_input_data_names(self):
+        return self.input_names
+
+    def get_output_data_names(self):
+        return self.output_names
+
+
+class FakeCoupling(FakeDiscipline):
+
+    def __init__(self, full_name, sos_disciplines):
+        super().__init__(full_name, [], [])
+        self.sos_disciplines = sos_disciplines
+        for discipline in sos_disciplines:
+            self.input_names.extend(discipline.get_input_data_names())
+            self.output_names.extend(discipline.get_output_data_names())
+
+
+class CouplingGraphTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # damage_df and population_df are dynamic outputs, they are known once configured
+        self.economics = FakeDiscipline('Study.Macroeconomics',
+                                        ['damage_df', 'population_df',
+                                            'Macroeconomics.init_gross_output'],
+                                        ['economics_df'])
+        self.population = FakeDiscipline('Study.Population',
+                                         ['economics_df'], ['population_df'])
+        self.damage = FakeDiscipline('Study.Damage',
+                                     ['economics_df', 'temperature_df'], ['damage_df'])
+        self.temperature = FakeDiscipline('Study.Temperature',
+                                          ['forcing_df'], ['temperature_df'])
+        self.utility = FakeDiscipline('Study.Utility',
+                                      ['economics_df', 'population_df'], ['functions.welfare_objective'])
+        self.forcing = FakeDiscipline('Study.Forcing', [], ['forcing_df'])
+
+    def test_split_disciplines(self):
+        coupling = FakeCoupling('Study', [self.utility, self.economics, self.population,
+                                          self.damage, self.temperature, self.forcing])
+        graph = CouplingGraph.from_coupling(coupling)
+
+        components = graph.get_strongly_connected_components()
+        self.assertIn(['Study.Macroeconomics', 'Study.Population',
+                       'Study.Damage'], components)
+        order = graph.get_topological_order()
+        self.assertLess(order.index('Study.Forcing'),
+                        order.index('Study.Temperature'))
+        self.assertLess(order.index('Study.Temperature'),
+                        order.index('Study.Damage'))
+        self.assertEqual(order[-1], 'Study.Utility')
+
+        upstream, coupled, downstream = graph.split_disciplines()
+        self.assertListEqual(upstream, ['Study.Forcing', 'Study.Temperature'])
+        self.assertListEqual(
+            coupled, ['Study.Macroeconomics', 'Study.Population', 'Study.Damage'])
+        self.assertListEqual(downstream, ['Study.Utility'])
+        self.assertEqual(graph.get_saved_evaluations(10), 27)
+        self.assertIn('60 in one coupling, 33 with a sub-MDA (27 saved)',
+                      graph.get_report(10))
+
+    def test_same_full_name(self):
+        # two disciplines with the same full name are both kept
+        invest_energy = FakeDiscipline('Study.InvestmentDistribution',
+                                       ['energy_investment'], ['invest_energy_mix'])
+        invest_ccs = FakeDiscipline('Study.InvestmentDistribution',
+                                    ['energy_investment'], ['invest_ccs_mix'])
+        coupling = FakeCoupling('Study', [invest_energy, invest_ccs])
+        graph = CouplingGraph.from_coupling(coupling)
+        self.assertListEqual(graph.disciplines, ['Study.InvestmentDistribution',
+                                                 'Study.InvestmentDistribution (2)'])
+
+    def test_nested_coupling(self):
+        # a nested coupling is one discipline without its internal variables as inputs
+        core = FakeCoupling(
+            'Study.Core', [self.economics, self.population, self.damage])
+        coupling = FakeCoupling(
+            'Study', [core, self.temperature, self.forcing])
+        graph = CouplingGraph.from_coupling(coupling)
+        self.assertListEqual(graph.get_topological_order(),
+                             ['Study.Forcing', 'Study.Temperature', 'Study.Core'])
+        self.assertListEqual(graph.split_disciplines()[1], [])
+
+
+if '__main__' == __name__:
+    unittest.main()
@@ -223,6 +223,25 @@ class CropTestCase(unittest.TestCase):
         crop.configure_parameters_update(self.param)
         crop.compute()
 
+    def test_crop_model_detail_outputs(self):
+        '''
+        The coupling outputs do not depend on the computation of the detail outputs
+        '''
+        crop = Crop(self.param)
+        crop.configure_parameters_update(self.param)
+        crop.compute()
+        techno_prices = crop.techno_prices.copy()
+        food_land_surface_df = crop.food_land_surface_df.copy()
+
+        crop_lean = Crop(self.param)
+        crop_lean.configure_parameters_update(self.param)
+        crop_lean.compute(detail_outputs=False)
+        self.assertIsNone(crop_lean.food_land_surface_percentage_df)
+        self.assertNotIn('Price crop ($/t)', crop_lean.mix_detailed_prices)
+        pd.testing.assert_frame_equal(crop_lean.techno_prices, techno_prices)
+        pd.testing.assert_frame_equal(
+            crop_lean.food_land_surface_df, food_land_surface_df)
+
     def test_crop_discipline(self):
         '''
         Check discipline setup and run
@@ -0,0 +1,110 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from climateeconomics.core.core_witness.damage_model import DamageModel
+from climateeconomics.core.tools.tangent_driver import TangentDriver
+
+
+class DamageModelTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.year_start = 2020
+        self.year_end = 2100
+        years = np.arange(self.year_start, self.year_end + 1)
+        self.economics_df = pd.DataFrame({'years': years,
+                                          'gross_output': np.linspace(130.0, 400.0, len(years))})
+        self.temperature_df = pd.DataFrame({'years': years,
+                                            'temp_atmo': np.linspace(1.1, 4.0, len(years))})
+
+    def get_param(self, time_step, tipping_point=True):
+        return {'year_start': self.year_start, 'year_end': self.year_end, 'time_step': time_step,
+                'init_damag_int': 0.0, 'damag_int': 0.0, 'damag_quad': 0.0022, 'damag_expo': 2.0,
+                'tipping_point': tipping_point, 'tp_a1': 20.46, 'tp_a2': 2, 'tp_a3': 6.081,
+                'tp_a4': 6.754, 'frac_damage_prod': 0.3, 'total_emissions_damage_ref': 18.0,
+                'damage_constraint_factor': np.ones(len(np.arange(self.year_start, self.year_end + 1,
+                                                                  time_step)))}
+
+    def get_coarse_df(self, df, time_step):
+        return df[df['years'].isin(np.arange(self.year_start, self.year_end + 1, time_step))].reset_index(drop=True)
+
+    def test_time_step_damages(self):
+        '''
+        With a time step of 5 years, damages are the annual damages on the coarse years
+        '''
+        for tipping_point in [True, False]:
+            damage_df, _ = DamageModel(self.get_param(1, tipping_point)).compute(
+                self.economics_df, self.temperature_df)
+            coarse_damage_df, _ = DamageModel(self.get_param(5, tipping_point)).compute(
+                self.get_coarse_df(self.economics_df, 5), self.get_coarse_df(self.temperature_df, 5))
+
+            annual_damage_df = damage_df.loc[coarse_damage_df['years'].values]
+            np.testing.assert_allclose(coarse_damage_df['years'].values,
+                                       np.arange(self.year_start, self.year_end + 1, 5))
+            for column in ['damages', 'damage_frac_output']:
+                np.testing.assert_allclose(
+                    coarse_damage_df[column].values, annual_damage_df[column].values)
+
+    def test_time_step_co2_damage_price(self):
+        '''
+        With constant damages, the CO2 damage price of the coarse years is the annual one:
+        the 25 years window and the discount are counted in years, not in time steps
+        '''
+        economics_df = self.economics_df.assign(gross_output=150.0)
+        temperature_df = self.temperature_df.assign(temp_atmo=2.0)
+        _, co2_damage_price_df = DamageModel(self.get_param(1)).compute(
+            economics_df, temperature_df)
+        _, coarse_co2_damage_price_df = DamageModel(self.get_param(5)).compute(
+            self.get_coarse_df(economics_df, 5), self.get_coarse_df(temperature_df, 5))
+
+        annual_price = co2_damage_price_df.set_index('years').loc[
+            coarse_co2_damage_price_df['years'].values, 'CO2_damage_price'].values
+        np.testing.assert_allclose(
+            coarse_co2_damage_price_df['CO2_damage_price'].values, annual_price)
+
+    def test_time_step_gradient(self):
+        '''
+        The analytic gradients with a time step of 5 years match complex step derivatives
+        '''
+        time_step = 5
+        economics_df = self.get_coarse_df(self.economics_df, time_step)
+        temperature_df = self.get_coarse_df(self.temperature_df, time_step)
+        param = self.get_param(time_step)
+        model = DamageModel(param)
+        model.compute(economics_df, temperature_df)
+        _, ddamages_temp_atmo, ddamages_gross_output, _, dconstraint_temp_atmo, dconstraint_economics = \
+            model.compute_gradient()
+
+        def compute_damage(inputs):
+            damage_df, co2_damage_price_df = DamageModel(param).compute(
+                inputs['economics_df'], inputs['temperature_df'])
+            return {'damage_df': damage_df, 'co2_damage_price_df': co2_damage_price_df}
+
+        tangent_driver = TangentDriver(compute_damage, {'economics_df': economics_df,
+                                                        'temperature_df': temperature_df})
+        output_variables = [('damage_df', 'damages'),
+                            ('co2_damage_price_df', 'CO2_damage_price')]
+        self.assertTrue(tangent_driver.check_jacobian(np.vstack((ddamages_temp_atmo, dconstraint_temp_atmo)),
+                                                      [('temperature_df', 'temp_atmo')], output_variables))
+        self.assertTrue(tangent_driver.check_jacobian(np.vstack((ddamages_gross_output, dconstraint_economics)),
+                                                      [('economics_df', 'gross_output')], output_variables))
+
+
+if '__main__' == __name__:
+    unittest.main()
@@ -148,6 +148,25 @@ class ForestTestCase(unittest.TestCase):
 
         forest.compute(self.param)
 
+    def test_forest_model_detail_outputs(self):
+        '''
+        The coupling outputs do not depend on the computation of the detail outputs
+        '''
+        forest = Forest(self.param)
+        forest.compute(self.param)
+        CO2_land_emissions = forest.CO2_emitted_df['emitted_CO2_evol_cumulative'].values.copy()
+        forest_surface = forest.forest_surface_df['global_forest_surface'].values.copy()
+
+        forest_lean = Forest(self.param)
+        forest_lean.compute(self.param, detail_outputs=False)
+        self.assertNotIn('delta_CO2_emitted', forest_lean.CO2_emitted_df)
+        self.assertNotIn('protected_forest_surface',
+                         forest_lean.forest_surface_df)
+        np.testing.assert_allclose(
+            forest_lean.CO2_emitted_df['emitted_CO2_evol_cumulative'].values, CO2_land_emissions)
+        np.testing.assert_allclose(
+            forest_lean.forest_surface_df['global_forest_surface'].values, forest_surface)
+
     def test_forest_discipline_low_deforestation(self):
         '''
         Check discipline setup and run
@@ -0,0 +1,234 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from climateeconomics.core.tools.fused_coupling import FusedCoupling
+
+YEARS = np.arange(2020, 2031)
+
+
+class BaseDiscipline():
+    '''
+    Default methods of the execution engine disciplines
+    '''
+
+    def setup_sos_disciplines(self):
+        pass
+
+    def init_execution(self):
+        pass
+
+
+class ProductionDiscipline(BaseDiscipline):
+    '''
+    production = invest + 0.5 * sin(damage), objective = sum(production ** 2)
+    '''
+    DESC_IN = {'invest_df': {'type': 'dataframe'},
+               'damage_df': {'type': 'dataframe'}}
+    DESC_OUT = {'production_df': {'type': 'dataframe'},
+                'production_objective': {'type': 'array'}}
+
+    def run(self):
+        invest_df, damage_df = self.get_sosdisc_inputs(
+            ['invest_df', 'damage_df'])
+        production = invest_df['invest'].values + \
+            0.5 * np.sin(damage_df['damage'].values)
+        self.store_sos_outputs_values({'production_df': pd.DataFrame({'years': YEARS, 'production': production}),
+                                       'production_objective': np.array([np.sum(production ** 2)])})
+
+    def compute_sos_jacobian(self):
+        damage = self.get_sosdisc_inputs('damage_df')['damage'].values
+        production = self.get_sosdisc_outputs(
+            'production_df')['production'].values
+        self.set_partial_derivative_for_other_types(
+            ('production_df', 'production'), ('invest_df', 'invest'), np.identity(len(YEARS)))
+        self.set_partial_derivative_for_other_types(
+            ('production_df', 'production'), ('damage_df', 'damage'), np.diag(0.5 * np.cos(damage)))
+        self.set_partial_derivative_for_other_types(
+            ('production_objective',), ('invest_df', 'invest'), 2.0 * production)
+        self.set_partial_derivative_for_other_types(
+            ('production_objective',), ('damage_df', 'damage'), 2.0 * production * 0.5 * np.cos(damage))
+
+
+class DamageDiscipline(BaseDiscipline):
+    '''
+    damage = gain * cumsum(production) / (1 + cumsum(production)) with a dynamic gain input
+    '''
+    DESC_IN = {'production_df': {'type': 'dataframe'},
+               'damage_model': {'type': 'string', 'default': 'gain'}}
+    DESC_OUT = {'damage_df': {'type': 'dataframe'}}
+
+    def setup_sos_disciplines(self):
+        dynamic_inputs = {}
+        if 'damage_model' in self._data_in and self.get_sosdisc_inputs('damage_model') == 'gain':
+            dynamic_inputs['gain'] = {'type': 'float', 'default': 0.8}
+            self.set_dynamic_default_values({'gain': 0.8})
+        self.add_inputs(dynamic_inputs)
+
+    def run(self):
+        production_df, gain = self.get_sosdisc_inputs(
+            ['production_df', 'gain'])
+        cumulated = np.cumsum(production_df['production'].values)
+        self.store_sos_outputs_values({'damage_df': pd.DataFrame({'years': YEARS,
+                                                                  'damage': gain * cumulated / (1.0 + cumulated)})})
+
+    def compute_sos_jacobian(self):
+        production_df, gain = self.get_sosdisc_inputs(
+            ['production_df', 'gain'])
+        cumulated = np.cumsum(production_df['production'].values)
+        d_cumulated = np.tril(np.ones((len(YEARS), len(YEARS))))
+        self.set_partial_derivative_for_other_types(
+            ('damage_df', 'damage'), ('production_df', 'production'),
+            np.diag(gain / (1.0 + cumulated) ** 2) @ d_cumulated)
+        self.set_partial_derivative_for_other_types(
+            ('damage_df', 'damage'), ('gain',), cumulated / (1.0 + cumulated))
+
+
+class FusedDiscipline():
+    '''
+    Inputs of the fused discipline, as given by the data manager
+    '''
+
+    def __init__(self, values):
+        self.values = values
+        self._data_in = {name: {} for name in values}
+
+    def get_sosdisc_inputs(self, keys=None):
+        if keys is None:
+            return dict(self.values)
+        return self.values[keys]
+
+    def set_dynamic_default_values(self, default_values_dict):
+        for name, value in default_values_dict.items():
+            self.values.setdefault(name, value)
+            self._data_in[name] = {}
+
+
+class FusedCouplingTestCase(unittest.TestCase):
+
+    DISCIPLINES = {'Production': ProductionDiscipline,
+                   'Damage': DamageDiscipline}
+
+    def setUp(self):
+        self.invest_df = pd.DataFrame(
+            {'years': YEARS, 'invest': np.linspace(1.0, 2.0, len(YEARS))})
+        self.initial_values = {'production_df': pd.DataFrame({'years': YEARS, 'production': np.ones(len(YEARS))}),
+                               'damage_df': None}
+
+    def get_fused_coupling(self, values):
+        fused_discipline = FusedDiscipline(values)
+        fused_coupling = FusedCoupling(fused_discipline, self.DISCIPLINES)
+        fused_coupling.setup()
+        fused_coupling.init_execution()
+        return fused_coupling
+
+    def solve(self, invest_df, gain=0.8):
+        values = {'invest_df': invest_df,
+                  'damage_model': 'gain', 'gain': gain}
+        fused_coupling = self.get_fused_coupling(values)
+        outputs = fused_coupling.solve(
+            values, self.initial_values, tolerance=1.0e-14)
+        return fused_coupling, outputs
+
+    def test_desc(self):
+        self.assertListEqual(FusedCoupling.get_coupling_names(self.DISCIPLINES),
+                             ['damage_df', 'production_df'])
+        desc_in, desc_out = FusedCoupling.get_desc(self.DISCIPLINES)
+        self.assertListEqual(list(desc_in), ['invest_df', 'damage_model'])
+        self.assertListEqual(list(desc_out), [
+                             'production_df', 'production_objective', 'damage_df'])
+
+    def test_dynamic_inputs(self):
+        fused_discipline = FusedDiscipline(
+            {'invest_df': self.invest_df, 'damage_model': 'gain'})
+        fused_coupling = FusedCoupling(fused_discipline, self.DISCIPLINES)
+        dynamic_inputs = fused_coupling.setup()
+
+        self.assertListEqual(list(dynamic_inputs), ['gain'])
+        self.assertEqual(fused_discipline.values['gain'], 0.8)
+        self.assertListEqual(fused_coupling.disciplines['Damage'].get_input_names(),
+                             ['production_df', 'damage_model', 'gain'])
+
+    def test_solve(self):
+        fused_coupling, outputs = self.solve(self.invest_df)
+
+        # Newton converges in a few iterations to the fixed point of the system
+        self.assertLess(fused_coupling.n_iterations, 8)
+        production = outputs['production_df']['production'].values
+        cumulated = np.cumsum(production)
+        damage = outputs['damage_df']['damage'].values
+        np.testing.assert_allclose(damage, 0.8 * cumulated / (1.0 + cumulated),
+                                   rtol=1.0e-12)
+        np.testing.assert_allclose(production, self.invest_df['invest'].values + 0.5 * np.sin(damage),
+                                   rtol=1.0e-12)
+        np.testing.assert_allclose(outputs['production_objective'], [
+                                   np.sum(production ** 2)], rtol=1.0e-12)
+
+    def test_max_iter(self):
+        values = {'invest_df': self.invest_df,
+                  'damage_model': 'gain', 'gain': 0.8}
+        fused_coupling = self.get_fused_coupling(values)
+        with self.assertLogs('climateeconomics.core.tools.fused_coupling', level='WARNING') as logs:
+            fused_coupling.solve(values, self.initial_values,
+                                 tolerance=1.0e-14, max_iter=2)
+
+        # as for the MDA, the last iterate is kept and a warning is logged
+        self.assertEqual(fused_coupling.n_iterations, 2)
+        self.assertGreater(fused_coupling.residual, 1.0e-14)
+        self.assertIn('maximum number of iterations 2', logs.output[0])
+
+    def test_missing_initial_value(self):
+        self.initial_values['production_df'] = None
+        with self.assertRaises(ValueError):
+            self.solve(self.invest_df)
+
+    def test_total_derivatives(self):
+        fused_coupling, outputs = self.solve(self.invest_df)
+        total_derivatives = fused_coupling.compute_total_derivatives()
+
+        self.assertNotIn((('production_df', 'production'), ('damage_df', 'damage')),
+                         total_derivatives)
+        epsilon = 1.0e-6
+        for index in [0, 5]:
+            invest_plus, invest_minus = self.invest_df.copy(), self.invest_df.copy()
+            invest_plus.loc[index, 'invest'] += epsilon
+            invest_minus.loc[index, 'invest'] -= epsilon
+            outputs_plus = self.solve(invest_plus)[1]
+            outputs_minus = self.solve(invest_minus)[1]
+            for y_key in [('production_df', 'production'), ('damage_df', 'damage')]:
+                finite_differences = (outputs_plus[y_key[0]][y_key[1]].values -
+                                      outputs_minus[y_key[0]][y_key[1]].values) / (2.0 * epsilon)
+                np.testing.assert_allclose(total_derivatives[(y_key, ('invest_df', 'invest'))][:, index],
+                                           finite_differences, rtol=1.0e-6, atol=1.0e-9)
+            finite_differences = (outputs_plus['production_objective'] -
+                                  outputs_minus['production_objective']) / (2.0 * epsilon)
+            np.testing.assert_allclose(total_derivatives[(('production_objective',), ('invest_df', 'invest'))][:, index],
+                                       finite_differences, rtol=1.0e-6)
+
+        # derivatives wrt a dynamic input
+        outputs_plus = self.solve(self.invest_df, gain=0.8 + epsilon)[1]
+        outputs_minus = self.solve(self.invest_df, gain=0.8 - epsilon)[1]
+        finite_differences = (outputs_plus['damage_df']['damage'].values -
+                              outputs_minus['damage_df']['damage'].values) / (2.0 * epsilon)
+        np.testing.assert_allclose(np.ravel(total_derivatives[(('damage_df', 'damage'), ('gain',))]),
+                                   finite_differences, rtol=1.0e-6, atol=1.0e-9)
+
+
+if '__main__' == __name__:
+    unittest.main()
@@ -0,0 +1,90 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import bz2
+import pickle
+import shutil
+import tempfile
+import unittest
+from os.path import join, exists
+
+import numpy as np
+
+from climateeconomics.tests.jacobian_reference_store import JacobianReferenceStore
+
+
+class JacobianReferenceStoreTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.mkdtemp()
+        nb_years = 81
+        self.jacobian = {'Test.population_df': {'Test.economics_df': np.identity(nb_years) * 0.5,
+                                                'Test.temperature_df': np.tril(np.ones((nb_years, nb_years)))},
+                         'Test.utility_df': {'Test.economics_df': np.zeros((nb_years, nb_years))}}
+
+    def tearDown(self):
+
+        shutil.rmtree(self.directory)
+
+    def test_write_and_load(self):
+
+        store = JacobianReferenceStore(self.directory)
+        store.write('jacobian_population_discipline.pkl', self.jacobian)
+
+        # a new store reads the manifest held by the npz file
+        store = JacobianReferenceStore(self.directory)
+        self.assertIn('jacobian_population_discipline.pkl', store)
+        self.assertNotIn('jacobian_utility_discipline.pkl', store)
+        blocks = store.get_manifest('jacobian_population_discipline.pkl')
+        self.assertListEqual([block[2] for block in blocks],
+                             ['csr', 'dense', 'zero'])
+
+        jacobian = store.load('jacobian_population_discipline.pkl')
+        self.assertListEqual(list(jacobian['Test.population_df'].keys()),
+                             ['Test.economics_df', 'Test.temperature_df'])
+        # blocks are only read when accessed
+        self.assertDictEqual(jacobian['Test.population_df'].loaded_blocks, {})
+        self.assertListEqual(list(store.npz_arrays['jacobian_population_discipline']),
+                             [JacobianReferenceStore.MANIFEST_KEY])
+        for output_name, jac_output in self.jacobian.items():
+            for input_name, block in jac_output.items():
+                np.testing.assert_array_equal(
+                    jacobian[output_name][input_name], block)
+
+    def test_convert_pickle(self):
+
+        pkl_path = join(self.directory, 'jacobian_utility_discipline.pkl')
+        with bz2.open(pkl_path, 'wb') as pkl_file:
+            pickle.dump(self.jacobian, pkl_file)
+
+        store = JacobianReferenceStore(self.directory)
+        store.convert_pickle_directory(remove=True)
+        self.assertFalse(exists(pkl_path))
+        jacobian = store.load(pkl_path)
+        np.testing.assert_array_equal(
+            jacobian['Test.population_df']['Test.temperature_df'], self.jacobian['Test.population_df']['Test.temperature_df'])
+
+
+    def test_dotted_reference_name(self):
+
+        store = JacobianReferenceStore(self.directory)
+        store.write('jacobian_WITNESS.EnergyMix.biodiesel.pkl', self.jacobian)
+        self.assertIn('jacobian_WITNESS.EnergyMix.biodiesel.pkl', store)
+        self.assertNotIn('jacobian_WITNESS.EnergyMix.pkl', store)
+
+
+if '__main__' == __name__:
+    unittest.main()
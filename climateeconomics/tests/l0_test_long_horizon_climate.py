@@ -0,0 +1,178 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import tracemalloc
+import unittest
+import numpy as np
+import pandas as pd
+
+from climateeconomics.core.core_witness.carbon_cycle_model import CarbonCycle
+from climateeconomics.core.core_witness.tempchange_model_v2 import TempChange
+from climateeconomics.core.tools.tangent_driver import TangentDriver
+
+
+class LongHorizonClimateTest(unittest.TestCase):
+
+    def get_carbon_cycle_param(self, year_end):
+        return {'year_start': 2020, 'year_end': year_end, 'time_step': 1,
+                'conc_lower_strata': 1720, 'conc_upper_strata': 360, 'conc_atmo': 588,
+                'init_conc_atmo': 878.412, 'init_upper_strata': 460, 'init_lower_strata': 1740,
+                'b_twelve': 0.12, 'b_twentythree': 0.007, 'lo_mat': 10, 'lo_mu': 100, 'lo_ml': 1000,
+                'alpha': 0.5, 'beta': 0.5, 'ppm_ref': 280, 'scale_factor_atmo_conc': 0.01,
+                'rockstrom_constraint_ref': 490, 'minimum_ppm_constraint_ref': 10, 'minimum_ppm_limit': 250}
+
+    def get_temperature_inputs(self, year_end, ghg_cycle_df):
+        return {'year_start': 2020, 'year_end': year_end, 'time_step': 1,
+                'init_temp_ocean': 0.02794825, 'init_temp_atmo': 1.05, 'eq_temp_impact': 3.1,
+                'temperature_model': 'DICE', 'forcing_model': 'DICE', 'ghg_cycle_df': ghg_cycle_df,
+                'init_forcing_nonco': 0.83, 'hundred_forcing_nonco': 1.1422,
+                'climate_upper': 0.1005, 'transfer_upper': 0.088, 'transfer_lower': 0.025,
+                'forcing_eq_co2': 3.74, 'pre_indus_co2_concentration_ppm': 278.,
+                'lo_tocean': -1.0, 'up_tatmo': 12.0, 'up_tocean': 20.0, 'alpha': 0.5, 'beta': 0.5,
+                'temperature_obj_option': TempChange.INTEGRAL_OBJECTIVE, 'temperature_change_ref': 0.2,
+                'temperature_end_constraint_limit': 1.5, 'temperature_end_constraint_ref': 3.}
+
+    def get_emissions_df(self, year_end):
+        years = np.arange(2020, year_end + 1)
+        return pd.DataFrame({'years': years,
+                             'total_emissions': 35. * np.exp(-0.01 * (years - 2020)) + np.sin(years / 7.)},
+                            index=years)
+
+    def get_ghg_cycle_df(self, carboncycle_df):
+        # other gases are only used by the forcing models other than DICE
+        return pd.DataFrame({'years': carboncycle_df['years'].values,
+                             'co2_ppm': carboncycle_df['ppm'].values,
+                             'ch4_ppm': 1.9, 'n2o_ppm': 0.33})
+
+    def run_climate(self, year_end):
+        '''
+        Run the carbon cycle and the temperature and linearise them with operators
+        '''
+        carbon_cycle = CarbonCycle(self.get_carbon_cycle_param(year_end))
+        carboncycle_df, _ = carbon_cycle.compute(
+            {'CO2_emissions_df': self.get_emissions_df(year_end)})
+        ghg_cycle_df = self.get_ghg_cycle_df(carboncycle_df)
+        inputs = self.get_temperature_inputs(year_end, ghg_cycle_df)
+        temperature = TempChange(inputs)
+        temperature.compute(inputs)
+        d_ppm_d_emissions = carbon_cycle.compute_d_total_emissions_operator(
+            'ppm')
+        d_temp_d_ppm, _ = temperature.compute_d_temp_atmo_operator()
+
+        return d_ppm_d_emissions, d_temp_d_ppm
+
+    def test_operators_tangent(self):
+
+        year_end = 2100
+        d_ppm_d_emissions, d_temp_d_ppm = self.run_climate(year_end)
+        nb_years = d_ppm_d_emissions.shape[0]
+        directions = np.random.default_rng(0).standard_normal((3, nb_years))
+
+        def compute_carbon_cycle(inputs):
+            model = CarbonCycle(self.get_carbon_cycle_param(year_end))
+            carboncycle_df, _ = model.compute(inputs)
+            return {'carboncycle_df': carboncycle_df}
+
+        carbon_driver = TangentDriver(compute_carbon_cycle,
+                                      {'CO2_emissions_df': self.get_emissions_df(year_end)})
+        derivatives = carbon_driver.compute_directional_derivatives([('CO2_emissions_df', 'total_emissions')],
+                                                                    [('carboncycle_df', 'ppm')], directions)
+        np.testing.assert_allclose(
+            d_ppm_d_emissions.matmat(directions.T).T, derivatives, rtol=1e-6, atol=1e-10)
+
+        carboncycle_df = compute_carbon_cycle(
+            {'CO2_emissions_df': self.get_emissions_df(year_end)})['carboncycle_df']
+        ghg_cycle_df = self.get_ghg_cycle_df(carboncycle_df)
+
+        def compute_temperature(inputs):
+            model = TempChange(inputs)
+            return {'temperature_df': model.compute(inputs)}
+
+        temperature_driver = TangentDriver(compute_temperature,
+                                           self.get_temperature_inputs(year_end, ghg_cycle_df))
+        derivatives = temperature_driver.compute_directional_derivatives([('ghg_cycle_df', 'co2_ppm')],
+                                                                         [('temperature_df', 'temp_atmo')], directions)
+        np.testing.assert_allclose(
+            d_temp_d_ppm.matmat(directions.T).T, derivatives, rtol=1e-6, atol=1e-10)
+
+        # the transposed products are consistent with the direct ones
+        adjoint = np.ones(nb_years)
+        np.testing.assert_allclose(d_temp_d_ppm.rmatvec(adjoint) @ directions.T,
+                                   adjoint @ d_temp_d_ppm.matmat(directions.T))
+
+    def test_operators_dense_jacobians(self):
+
+        # the disciplines use the dense jacobians whatever the horizon, the operators give the
+        # same derivatives on both sides of 2100
+        for year_end in [2100, 2150]:
+            carbon_cycle = CarbonCycle(self.get_carbon_cycle_param(year_end))
+            carboncycle_df, _ = carbon_cycle.compute(
+                {'CO2_emissions_df': self.get_emissions_df(year_end)})
+            d_atmoconc_d_totalemissions = carbon_cycle.compute_d_total_emissions()[0]
+            np.testing.assert_allclose(carbon_cycle.compute_d_total_emissions_operator().to_array(),
+                                       d_atmoconc_d_totalemissions, rtol=1e-10, atol=1e-14)
+
+            ghg_cycle_df = self.get_ghg_cycle_df(carboncycle_df)
+            inputs = self.get_temperature_inputs(year_end, ghg_cycle_df)
+            temperature = TempChange(inputs)
+            temperature.compute(inputs)
+            np.testing.assert_allclose(temperature.compute_d_temp_atmo_operator()[0].to_array(),
+                                       temperature.compute_d_temp_atmo()[0], rtol=1e-10, atol=1e-14)
+
+            inputs['temperature_model'] = 'FUND'
+            temperature = TempChange(inputs)
+            temperature.compute(inputs)
+            np.testing.assert_allclose(temperature.compute_d_temp_d_forcing_fund_operator().to_array(),
+                                       temperature.compute_d_temp_d_forcing_fund(), rtol=1e-10, atol=1e-14)
+
+    def test_carbon_cycle_operator_at_lower_bound(self):
+
+        # atmo_conc stays at lo_mat, the first years keep the gradients of the dense initialisation
+        param = self.get_carbon_cycle_param(2150)
+        param['lo_mat'] = 2000.
+        carbon_cycle = CarbonCycle(param)
+        carbon_cycle.compute({'CO2_emissions_df': self.get_emissions_df(2150)})
+        d_atmoconc_d_totalemissions = carbon_cycle.compute_d_total_emissions()[0]
+        self.assertNotEqual(d_atmoconc_d_totalemissions[2, 0], 0.)
+
+        operator = carbon_cycle.compute_d_total_emissions_operator()
+        np.testing.assert_allclose(operator.to_array(), d_atmoconc_d_totalemissions,
+                                   rtol=1e-10, atol=1e-14)
+        # the transposed products go through the same initialisation
+        np.testing.assert_allclose(operator.rmatmat(np.identity(operator.shape[0])),
+                                   d_atmoconc_d_totalemissions.T, rtol=1e-10, atol=1e-14)
+
+    def test_long_horizon_memory_budget(self):
+
+        year_end = 2300
+        nb_years = year_end - 2020 + 1
+        # budget of a single dense (nb_years, nb_years) jacobian block
+        memory_budget = nb_years ** 2 * 8
+
+        tracemalloc.start()
+        d_ppm_d_emissions, d_temp_d_ppm = self.run_climate(year_end)
+        # gradient of the sum of temperatures wrt emissions, chained by adjoint products
+        gradient = d_ppm_d_emissions.rmatvec(
+            d_temp_d_ppm.rmatvec(np.ones(nb_years)))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.assertEqual(gradient.shape, (nb_years,))
+        self.assertTrue(np.all(np.isfinite(gradient)))
+        self.assertLess(peak, memory_budget)
+
+
+if '__main__' == __name__:
+    unittest.main()
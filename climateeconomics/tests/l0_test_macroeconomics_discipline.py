@@ -20,6 +20,7 @@ from pandas import DataFrame, read_csv
 from os.path import join, dirname
 
 from sos_trades_core.execution_engine.execution_engine import ExecutionEngine
+from climateeconomics.core.core_witness.climateeco_discipline import ClimateEcoDiscipline
 from scipy.interpolate import interp1d
 
 
@@ -157,7 +158,22 @@ class MacroDiscTest(unittest.TestCase):
 
         disc = self.ee.dm.get_disciplines_with_name(
             f'{self.name}.{self.model_name}')[0]
+        economics_df = self.ee.dm.get_value(f'{self.name}.economics_df')
+
+        # a lean run gives the same coupling outputs without the detailed economics_df
+        ClimateEcoDiscipline.set_lean_mode(True)
+        try:
+            disc.run()
+        finally:
+            ClimateEcoDiscipline.set_lean_mode(False)
+        self.assertTrue(disc.detail_outputs_missing)
+        # output growth is only set at year_start
+        self.assertTrue(
+            (disc.macro_model.economics_df['output_growth'].values[1:] == 0.0).all())
+        pd.testing.assert_frame_equal(disc.get_sosdisc_outputs('economics_df'), economics_df)
+
         filterr = disc.get_chart_filter_list()
         graph_list = disc.get_post_processing_list(filterr)
+        self.assertIn('output_growth', disc.get_sosdisc_outputs('economics_detail_df'))
 #         for graph in graph_list:
 #             graph.to_plotly().show()
@@ -0,0 +1,108 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import unittest
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from climateeconomics.core.tools.monte_carlo import MonteCarloRunner, StreamingStatistics
+
+
+class FakeDataManager():
+
+    def __init__(self):
+        self.values = {'Study.Temperature.eq_temp_impact': 3.1,
+                       'Study.temperature_df': None,
+                       'Study.welfare_objective': None}
+
+    def get_all_namespaces_from_var_name(self, var_name):
+        return [name for name in self.values if name.endswith(f'.{var_name}')]
+
+    def get_value(self, full_name):
+        return self.values[full_name]
+
+
+class FakeExecutionEngine():
+    '''
+    Temperature proportional to the equilibrium temperature impact
+    '''
+
+    def __init__(self):
+        self.dm = FakeDataManager()
+
+    def load_study_from_input_dict(self, values_dict):
+        self.dm.values.update(values_dict)
+
+    def execute(self):
+        eq_temp_impact = self.dm.values['Study.Temperature.eq_temp_impact']
+        years = np.arange(2020, 2101, 10)
+        self.dm.values['Study.temperature_df'] = pd.DataFrame(
+            {'years': years, 'temp_atmo': eq_temp_impact * np.linspace(0.4, 1.0, len(years))})
+        self.dm.values['Study.welfare_objective'] = np.array(
+            [-eq_temp_impact])
+
+
+class FakeStudy():
+
+    def __init__(self):
+        self.execution_engine = FakeExecutionEngine()
+
+
+def build_fake_study():
+    return FakeStudy()
+
+
+class MonteCarloTestCase(unittest.TestCase):
+
+    def test_streaming_statistics(self):
+        rng = np.random.default_rng(1)
+        samples = np.column_stack(
+            (rng.normal(0.0, 1.0, 4000), rng.uniform(2.0, 4.0, 4000)))
+        statistics = StreamingStatistics()
+        for sample in samples:
+            statistics.update(sample)
+        statistics_df = statistics.get_dataframe(years=[2020, 2021])
+
+        np.testing.assert_allclose(
+            statistics_df['mean'], samples.mean(axis=0))
+        np.testing.assert_allclose(
+            statistics_df['std'], samples.std(axis=0, ddof=1))
+        for column, probability in [('P5', 0.05), ('P50', 0.5), ('P95', 0.95)]:
+            np.testing.assert_allclose(statistics_df[column], np.quantile(samples, probability, axis=0),
+                                       atol=0.05)
+
+    def test_runner(self):
+        outputs = {'temperature_df': 'temp_atmo', 'welfare_objective': None}
+        for n_processes in [1, 2]:
+            runner = MonteCarloRunner(build_fake_study, {'eq_temp_impact': stats.uniform(2.0, 2.0)},
+                                      outputs, n_samples=200, n_processes=n_processes, seed=3)
+            results = runner.run()
+            eq_temp_impact = runner.get_samples()['eq_temp_impact'].values
+
+            temperature_df = results['temperature_df']
+            self.assertListEqual(list(temperature_df.columns), [
+                                 'years', 'mean', 'std', 'P5', 'P50', 'P95'])
+            self.assertEqual(temperature_df['years'].values[-1], 2100)
+            self.assertAlmostEqual(temperature_df['mean'].values[-1],
+                                   eq_temp_impact.mean())
+            self.assertAlmostEqual(results['welfare_objective']['P50'].values[0],
+                                   -np.median(eq_temp_impact), delta=0.05)
+            self.assertEqual(runner.n_failed, 0)
+
+
+if '__main__' == __name__:
+    unittest.main()
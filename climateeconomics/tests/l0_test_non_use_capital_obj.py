@@ -20,6 +20,7 @@ from os.path import join, dirname
 from pandas import DataFrame, read_csv
 
 from sos_trades_core.execution_engine.execution_engine import ExecutionEngine
+from climateeconomics.core.core_witness.non_use_capital_objective_model import NonUseCapitalObjective
 
 
 class NonUseCapitalObjDiscTest(unittest.TestCase):
@@ -213,3 +214,44 @@ class NonUseCapitalObjDiscTest(unittest.TestCase):
         graph_list = disc.get_post_processing_list(filter)
         # for graph in graph_list:
         #    graph.to_plotly().show()
+
+    def test_model_capital_keys(self):
+
+        years = np.arange(2020, 2101)
+        inputs_dict = {'year_start': 2020,
+                       'year_end': 2100,
+                       'non_use_capital_obj_ref': 100.,
+                       'alpha': 0.5,
+                       'gamma': 0.5,
+                       'non_use_capital_cons_limit': 40000.,
+                       'non_use_capital_cons_ref': 20000.,
+                       'is_dev': False}
+        for techno, loss in [('FossilGas', 12.), ('Refinery', 16.)]:
+            inputs_dict[f'methane.{techno}.non_use_capital'] = pd.DataFrame(
+                {'years': years, techno: loss})
+            inputs_dict[f'methane.{techno}.techno_capital'] = pd.DataFrame(
+                {'years': years, techno: 10. * loss})
+
+        # keys found in the inputs at each compute
+        model = NonUseCapitalObjective(inputs_dict)
+        model.compute(inputs_dict)
+        objective = model.get_objective()
+        energy_capital = model.get_energy_capital_trillion_dollars()
+
+        # keys resolved once, the techno arrays are filled in place
+        model.set_capital_keys(['methane.FossilGas.non_use_capital', 'methane.Refinery.non_use_capital'],
+                               ['methane.FossilGas.techno_capital', 'methane.Refinery.techno_capital'])
+        model.compute(inputs_dict)
+        non_use_capital_array = model.capital_arrays['non_use_capital']
+        model.compute(inputs_dict)
+        self.assertIs(non_use_capital_array,
+                      model.capital_arrays['non_use_capital'])
+
+        self.assertEqual(objective, model.get_objective())
+        np.testing.assert_array_equal(energy_capital['energy_capital'].values,
+                                      model.get_energy_capital_trillion_dollars()['energy_capital'].values)
+        self.assertListEqual(model.get_non_use_capital_df()['Sum of non use capital'].values.tolist(),
+                             [28.] * len(years))
+        detail_df = model.get_capital_detail_df('non_use_capital', inputs_dict)
+        self.assertListEqual(detail_df.columns.tolist(),
+                             ['years', 'Sum of non use capital', 'FossilGas', 'Refinery'])
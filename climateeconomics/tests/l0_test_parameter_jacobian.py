@@ -0,0 +1,72 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import unittest
+import numpy as np
+
+from climateeconomics.core.tools.parameter_jacobian import parameter_jacobian
+
+
+class CumulativeModel():
+
+    def __init__(self):
+        self.year_start = 2020
+        self.year_end = 2100
+        self.time_step = 1
+        self.factor = 2.0
+        self.info = {'delay': 1, 'price': np.array([1., 2.])}
+        self.n_calls = 0
+
+    @parameter_jacobian('factor', 'info')
+    def compute_d_cum(self):
+        self.n_calls += 1
+        nb_years = len(np.arange(self.year_start,
+                                 self.year_end + 1, self.time_step))
+        return np.tril(np.ones((nb_years, nb_years))) * self.factor, np.identity(nb_years)
+
+
+class ParameterJacobianTestCase(unittest.TestCase):
+
+    def test_cache(self):
+        model = CumulativeModel()
+        d_cum, identity = model.compute_d_cum()
+        self.assertEqual(d_cum.shape, (81, 81))
+        self.assertIs(model.compute_d_cum()[0], d_cum)
+        self.assertEqual(model.n_calls, 1)
+        # cached blocks cannot be modified in place
+        with self.assertRaises(ValueError):
+            identity[0, 0] = 2.
+
+        # the blocks are computed again when the years or the parameters change
+        model.year_end = 2050
+        self.assertEqual(model.compute_d_cum()[0].shape, (31, 31))
+        model.factor = 3.0
+        np.testing.assert_almost_equal(model.compute_d_cum()[0][-1], 3.)
+        model.info = {'delay': 1, 'price': np.array([1., 3.])}
+        model.compute_d_cum()
+        self.assertEqual(model.n_calls, 4)
+        # same values in a new dict
+        model.info = {'delay': 1, 'price': np.array([1., 3.])}
+        model.compute_d_cum()
+        self.assertEqual(model.n_calls, 4)
+
+        # each model has its own blocks
+        other_model = CumulativeModel()
+        other_model.compute_d_cum()
+        self.assertEqual(other_model.n_calls, 1)
+
+
+if '__main__' == __name__:
+    unittest.main()
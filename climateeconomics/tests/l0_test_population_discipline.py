@@ -20,6 +20,7 @@ from os.path import join, dirname
 from pandas import DataFrame, read_csv
 
 from sos_trades_core.execution_engine.execution_engine import ExecutionEngine
+from climateeconomics.core.core_witness.climateeco_discipline import ClimateEcoDiscipline
 from scipy.interpolate import interp1d
 import pickle
 import time
@@ -92,9 +93,52 @@ class PopDiscTest(unittest.TestCase):
             f'{self.name}.{self.model_name}')[0]
         filter = disc.get_chart_filter_list()
         graph_list = disc.get_post_processing_list(filter)
+        # charts are cached until the next run
+        self.assertIs(disc.get_post_processing_list(filter), graph_list)
+        self.ee.execute()
+        self.assertIsNot(disc.get_post_processing_list(filter), graph_list)
 #         for graph in graph_list:
 #             graph.to_plotly().show()
 
+    def test_lean_mode(self):
+
+        data_dir = join(dirname(__file__), 'data')
+        years = np.arange(2020, 2101, 1)
+        economics_df_y = pd.DataFrame(
+            {'years': years, 'output_net_of_d': 130.187 * 1.02**np.arange(len(years))})
+        economics_df_y.index = years
+        temperature_df_all = read_csv(
+            join(data_dir, 'temperature_data_onestep.csv'))
+
+        values_dict = {f'{self.name}.year_start': 2020,
+                       f'{self.name}.year_end': 2100,
+                       f'{self.name}.economics_df': economics_df_y,
+                       f'{self.name}.temperature_df': temperature_df_all
+                       }
+        self.ee.dm.set_values_from_dict(values_dict)
+
+        # detail outputs are not stored by a lean run
+        ClimateEcoDiscipline.set_lean_mode(True)
+        try:
+            self.ee.execute()
+        finally:
+            ClimateEcoDiscipline.set_lean_mode(False)
+        disc = self.ee.dm.get_disciplines_with_name(
+            f'{self.name}.{self.model_name}')[0]
+        self.assertIsNotNone(self.ee.dm.get_value(
+            f'{self.name}.population_df'))
+        self.assertIsNone(self.ee.dm.get_value(
+            f'{self.name}.{self.model_name}.death_dict'))
+        self.assertTrue(disc.detail_outputs_missing)
+
+        # the charts request runs the discipline once with its detail outputs
+        disc.get_post_processing_list(disc.get_chart_filter_list())
+        self.assertFalse(disc.detail_outputs_missing)
+        death_dict = self.ee.dm.get_value(
+            f'{self.name}.{self.model_name}.death_dict')
+        self.assertListEqual(sorted(death_dict.keys()),
+                             ['base', 'climate', 'total'])
+
     def test_economicdegrowth(self):
 
         data_dir = join(dirname(__file__), 'data')
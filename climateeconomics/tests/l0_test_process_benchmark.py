@@ -0,0 +1,78 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import unittest
+import tempfile
+import json
+from os.path import join
+from shutil import rmtree
+
+from climateeconomics.core.tools.process_benchmark import ProcessBenchmark
+
+
+class ProcessBenchmarkTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        rmtree(self.directory)
+
+    def test_history(self):
+        for extension in ['csv', 'json']:
+            benchmark = ProcessBenchmark(join(self.directory, f'history.{extension}'),
+                                         processes=['dice_model', 'witness'],
+                                         linearization_modes=['auto', 'adjoint'])
+            # the linearization modes only apply to witness
+            self.assertEqual(len(benchmark.get_combinations()), 9)
+            self.assertIn(('dice_model', 'GSNewtonMDA', 1, ProcessBenchmark.NO_LINEARIZATION),
+                          benchmark.get_combinations())
+            for process, sub_mda_class, wall_time in [('dice_model', 'MDAGaussSeidel', 2.0),
+                                                      ('dice_model', 'GSNewtonMDA', 1.0),
+                                                      ('dice_model', 'GSNewtonMDA', 3.0),
+                                                      ('dice_model', 'GSPureNewtonMDA', 1.5),
+                                                      ('witness', 'GSNewtonMDA', 60.0)]:
+                benchmark.append_to_history({'process': process, 'sub_mda_class': sub_mda_class,
+                                             'n_processes': 1, 'linearization_mode': 'auto',
+                                             'status': 'done', 'wall_time': wall_time,
+                                             'discipline_calls': 10, 'max_mda_iterations': 5})
+            benchmark.append_to_history({'process': 'witness', 'sub_mda_class': 'GSPureNewtonMDA',
+                                         'n_processes': 1, 'linearization_mode': 'auto',
+                                         'status': 'failed', 'error': 'ValueError()'})
+
+            history_df = benchmark.load_history()
+            self.assertEqual(len(history_df), 6)
+            fastest_df = benchmark.get_fastest_configurations(history_df)
+            self.assertListEqual(list(fastest_df['process']), [
+                                 'dice_model', 'witness'])
+            self.assertListEqual(list(fastest_df['sub_mda_class']), [
+                                 'GSPureNewtonMDA', 'GSNewtonMDA'])
+
+    def test_run_dice(self):
+        benchmark = ProcessBenchmark(join(self.directory, 'history.csv'), processes=['dice_model'],
+                                     sub_mda_classes=['MDAGaussSeidel'])
+        records_df = benchmark.run()
+        self.assertListEqual(list(records_df['status']), ['done'])
+        self.assertEqual(records_df.loc[0, 'linearize_time'], 0.0)
+        self.assertGreater(records_df.loc[0, 'discipline_calls'], 0)
+        self.assertGreater(records_df.loc[0, 'max_mda_iterations'], 0)
+        # iterations of each MDA
+        mda_iterations = json.loads(records_df.loc[0, 'mda_iterations'])
+        self.assertEqual(max(mda_iterations.values()),
+                         records_df.loc[0, 'max_mda_iterations'])
+
+
+if '__main__' == __name__:
+    unittest.main()
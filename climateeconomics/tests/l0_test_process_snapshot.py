@@ -0,0 +1,210 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import unittest
+import tempfile
+from shutil import rmtree
+
+from sos_trades_core.execution_engine.execution_engine import ExecutionEngine
+
+from climateeconomics.core.tools.process_snapshot import ProcessSnapshotCache, BuildRecorder
+
+
+class SoSCoupling():
+    pass
+
+
+class Macroeconomics():
+    pass
+
+
+class Namespace():
+
+    def __init__(self, value):
+        self.value = value
+
+    def get_value(self):
+        return self.value
+
+
+class FakeBuilder():
+
+    def __init__(self, sos_name, cls):
+        self.sos_name = sos_name
+        self.cls = cls
+        self.args = {'sos_name': sos_name, 'ee': None}
+
+    def set_builder_info(self, key, value):
+        self.args[key] = value
+
+
+class FakeFactory():
+
+    def __init__(self, ee):
+        self.ee = ee
+        self.process_builds = 0
+
+    def get_builder_from_module(self, sos_name, mod_path):
+        return FakeBuilder(sos_name, {f'{__name__}.Macroeconomics': Macroeconomics}[mod_path])
+
+    def create_builder_coupling(self, sos_name):
+        return FakeBuilder(sos_name, SoSCoupling)
+
+    def get_builder_from_process(self, repo, process, **process_args):
+        self.process_builds += 1
+        self.ee.ns_manager.add_ns_def(
+            {'ns_witness': f'{self.ee.study_name}.{process_args["process_level"]}'})
+        self.ee.post_processing_manager.add_post_processing_module_to_namespace(
+            'ns_witness', 'post_processing_witness')
+        coupling = self.create_builder_coupling('Core')
+        coupling.set_builder_info('cls_builder', [self.get_builder_from_module(
+            'Macroeconomics', f'{__name__}.Macroeconomics')])
+        coupling.set_builder_info('with_data_io', True)
+        return [coupling]
+
+
+class FakeNamespaceManager():
+
+    def __init__(self):
+        self.shared_ns_dict = {}
+
+    def add_ns_def(self, ns_dict):
+        self.shared_ns_dict.update(
+            {name: Namespace(value) for name, value in ns_dict.items()})
+
+
+class FakePostProcessingManager():
+
+    def __init__(self):
+        self.modules = []
+
+    def add_post_processing_module_to_namespace(self, namespace, module):
+        self.modules.append((namespace, module))
+
+
+class FakeExecutionEngine():
+
+    def __init__(self, study_name, factory=None):
+        self.study_name = study_name
+        self.ns_manager = FakeNamespaceManager()
+        self.post_processing_manager = FakePostProcessingManager()
+        self.factory = FakeFactory(self) if factory is None else factory
+
+
+class ProcessSnapshotTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        ProcessSnapshotCache.snapshots = {}
+
+    def tearDown(self):
+        rmtree(self.directory)
+        ProcessSnapshotCache.snapshots = {}
+
+    def test_snapshot(self):
+        ee = FakeExecutionEngine('Study1')
+        # the process defines ns_witness to its current value, it is still part of the snapshot
+        ee.ns_manager.add_ns_def({'ns_witness': 'Study1.val'})
+        builders = ProcessSnapshotCache(self.directory).get_builders(
+            ee, 'repo', 'witness', process_level='val')
+        self.assertEqual(ee.factory.process_builds, 1)
+        self.assertEqual(builders[0].sos_name, 'Core')
+
+        # a new session with the same process and arguments reloads the json snapshot
+        ProcessSnapshotCache.snapshots = {}
+        ee2 = FakeExecutionEngine('Study2')
+        ee2.ns_manager.add_ns_def({'ns_witness': 'Study2.dev'})
+        builders2 = ProcessSnapshotCache(self.directory).get_builders(
+            ee2, 'repo', 'witness', process_level='val')
+        self.assertEqual(ee2.factory.process_builds, 0)
+        self.assertEqual(
+            ee2.ns_manager.shared_ns_dict['ns_witness'].get_value(), 'Study2.val')
+        self.assertListEqual(ee2.post_processing_manager.modules,
+                             [('ns_witness', 'post_processing_witness')])
+        self.assertEqual(builders2[0].cls, SoSCoupling)
+        self.assertTrue(builders2[0].args['with_data_io'])
+        sub_builder = builders2[0].args['cls_builder'][0]
+        self.assertEqual(sub_builder.sos_name, 'Macroeconomics')
+        self.assertEqual(sub_builder.cls, Macroeconomics)
+
+        # other arguments are another snapshot
+        ee3 = FakeExecutionEngine('Study3')
+        ProcessSnapshotCache(self.directory).get_builders(
+            ee3, 'repo', 'witness', process_level='dev')
+        self.assertEqual(ee3.factory.process_builds, 1)
+
+    def test_recorder(self):
+        ee = FakeExecutionEngine('Study')
+        with BuildRecorder(ee) as recorder:
+            ee.ns_manager.add_ns_def({'ns_witness': 'Study'})
+            ee.ns_manager.add_ns_def({'ns_witness': 'Study.val', 'ns_ref': 'Study'})
+            ee.post_processing_manager.add_post_processing_module_to_namespace(
+                'ns_witness', 'post_processing_witness')
+        self.assertDictEqual(recorder.namespaces, {
+                             'ns_witness': 'Study.val', 'ns_ref': 'Study'})
+        self.assertListEqual(recorder.post_processings, [
+                             ['ns_witness', 'post_processing_witness']])
+        self.assertEqual(
+            ee.ns_manager.shared_ns_dict['ns_witness'].get_value(), 'Study.val')
+        # the methods of the managers are restored
+        self.assertNotIn('add_ns_def', vars(ee.ns_manager))
+        self.assertNotIn('add_post_processing_module_to_namespace',
+                         vars(ee.post_processing_manager))
+
+    def test_execution_engine(self):
+        '''
+        Restore the snapshot of witness_wo_energy in a study with other namespaces and compare
+        it to the process built without snapshot
+        '''
+        repo = 'climateeconomics.sos_processes.iam'
+        ee = ExecutionEngine('Study1')
+        ee.ns_manager.add_ns_def({'ns_witness': 'Study1'})
+        ProcessSnapshotCache().get_builders(ee, repo, 'witness_wo_energy')
+
+        ee_snapshot = ExecutionEngine('Study2')
+        ee_snapshot.ns_manager.add_ns_def({'ns_witness': 'Study2.Other'})
+        builders_snapshot = ProcessSnapshotCache().get_builders(
+            ee_snapshot, repo, 'witness_wo_energy')
+        ee_process = ExecutionEngine('Study2')
+        ee_process.ns_manager.add_ns_def({'ns_witness': 'Study2.Other'})
+        builders_process = ee_process.factory.get_builder_from_process(
+            repo, 'witness_wo_energy')
+
+        for execution_engine, builders in [(ee_snapshot, builders_snapshot), (ee_process, builders_process)]:
+            execution_engine.ns_manager.add_ns_def({'ns_functions': 'Study2',
+                                                    'ns_optim': 'Study2',
+                                                    'ns_public': 'Study2'})
+            execution_engine.factory.set_builders_to_coupling_builder(builders)
+            execution_engine.configure()
+
+        self.assertDictEqual(self.get_namespaces(ee_snapshot),
+                             self.get_namespaces(ee_process))
+        self.assertEqual(ee_snapshot.ns_manager.shared_ns_dict['ns_witness'].get_value(),
+                         'Study2')
+        self.assertListEqual(self.get_discipline_names(ee_snapshot),
+                             self.get_discipline_names(ee_process))
+
+    @staticmethod
+    def get_namespaces(ee):
+        return {name: namespace.get_value() for name, namespace in ee.ns_manager.shared_ns_dict.items()}
+
+    @staticmethod
+    def get_discipline_names(ee):
+        return sorted(discipline['reference'].get_disc_full_name()
+                      for discipline in ee.dm.disciplines_dict.values())
+
+
+if '__main__' == __name__:
+    unittest.main()
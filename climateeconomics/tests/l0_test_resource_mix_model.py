@@ -0,0 +1,162 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from climateeconomics.core.core_resources.resource_mix.resource_mix import ResourceMixModel
+
+
+class ResourceMixModelTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.year_start = 2020
+        self.year_end = 2050
+        self.years = np.arange(self.year_start, self.year_end + 1)
+        self.resource_list = ResourceMixModel.RESOURCE_LIST[:3]
+        self.conversion_dict = {resource: {'production': 2.0 + i, 'stock': 0.5 + i,
+                                           'price': 1.5 + i, 'global_demand': 3.0 + i}
+                                for i, resource in enumerate(self.resource_list)}
+        self.types = ['type_a', 'type_b']
+        n_years = len(self.years)
+
+        self.inputs_dict = {'year_start': self.year_start,
+                            'year_end': self.year_end,
+                            'resource_list': self.resource_list,
+                            'conversion_dict': self.conversion_dict,
+                            'non_modeled_resource_price': pd.DataFrame({'years': self.years,
+                                                                        'non_modeled_resource': np.full(n_years, 12.0)})}
+        demand = {'years': self.years}
+        for i, resource in enumerate(self.resource_list):
+            type_values = {resource_type: np.linspace(1.0 + i + j, 10.0 + i + j, n_years)
+                           for j, resource_type in enumerate(self.types)}
+            self.inputs_dict[f'{resource}.resource_price'] = pd.DataFrame(
+                {'years': self.years, 'price': np.linspace(50.0 + i, 80.0 + i, n_years)})
+            for variable, factor in [('predictable_production', 1.0), ('resource_stock', 0.2),
+                                     ('use_stock', 0.3), ('recycled_production', 0.1)]:
+                self.inputs_dict[f'{resource}.{variable}'] = pd.DataFrame(
+                    {'years': self.years, **{resource_type: factor * values
+                                             for resource_type, values in type_values.items()}})
+            # the demand crosses the available resource so that the ratio is capped on some years only
+            demand[resource] = np.linspace(0.5, 40.0, n_years) * (1.0 + 0.5 * i)
+        self.inputs_dict['resources_demand'] = pd.DataFrame(demand)
+        self.inputs_dict['resources_demand_woratio'] = pd.DataFrame(demand)
+
+    def compute_model(self, inputs_dict=None):
+        if inputs_dict is None:
+            inputs_dict = self.inputs_dict
+        model = ResourceMixModel(inputs_dict)
+        model.configure_parameters(inputs_dict)
+        model.compute(inputs_dict)
+        return model
+
+    def sum_types(self, resource, variable):
+        return self.inputs_dict[f'{resource}.{variable}'][self.types].sum(axis=1).values
+
+    def test_resource_arrays(self):
+        '''
+        Each (years, resource) array is the sum of the resource types converted in Mt,
+        and the dataframes are built on these arrays
+        '''
+        model = self.compute_model()
+
+        for i, resource in enumerate(self.resource_list):
+            conversion = self.conversion_dict[resource]
+            np.testing.assert_allclose(model.resource_production[:, i],
+                                       self.sum_types(resource, 'predictable_production') * conversion['production'])
+            np.testing.assert_allclose(model.resource_stock[:, i],
+                                       self.sum_types(resource, 'resource_stock') * conversion['stock'])
+            np.testing.assert_allclose(model.resource_use[:, i],
+                                       self.sum_types(resource, 'use_stock') * conversion['stock'])
+            np.testing.assert_allclose(model.resource_recycled_production[:, i],
+                                       self.sum_types(resource, 'recycled_production') * conversion['stock'])
+            np.testing.assert_allclose(model.resource_price[:, i],
+                                       self.inputs_dict[f'{resource}.resource_price']['price'].values *
+                                       conversion['price'])
+
+        for data_frame, array in [(model.all_resource_production, model.resource_production),
+                                  (model.all_resource_stock, model.resource_stock),
+                                  (model.all_resource_use, model.resource_use),
+                                  (model.all_resource_recycled_production, model.resource_recycled_production),
+                                  (model.all_resource_ratio_usable_demand, model.resource_ratio_usable_demand)]:
+            self.assertListEqual(list(data_frame.columns), self.resource_list)
+            np.testing.assert_array_equal(data_frame.index.values, self.years)
+            np.testing.assert_array_equal(data_frame.values, array)
+
+        # non modeled resource prices are added next to the modeled ones
+        np.testing.assert_allclose(model.all_resource_price['non_modeled_resource'].values, 12.0)
+
+    def test_resource_demand_conversion(self):
+        '''
+        The demand of every resource of the list is converted, not only the last one
+        '''
+        model = self.compute_model()
+
+        for resource in self.resource_list:
+            np.testing.assert_allclose(model.resource_demand[resource].values,
+                                       self.inputs_dict['resources_demand'][resource].values *
+                                       self.conversion_dict[resource]['global_demand'])
+
+    def test_ratio_usable_demand(self):
+        '''
+        The usable demand ratio is the available resource over the demand without ratio,
+        capped to 100%, and its diagonal gradients match finite differences
+        '''
+        model = self.compute_model()
+
+        for i, resource in enumerate(self.resource_list):
+            available = model.resource_stock[:, i] + model.resource_production[:, i] + \
+                model.resource_recycled_production[:, i]
+            demand = self.inputs_dict['resources_demand_woratio'][resource].values * \
+                self.conversion_dict[resource]['global_demand']
+            ratio = np.minimum(available / demand, 1.0) * 100.0
+            np.testing.assert_allclose(model.resource_ratio_usable_demand[:, i], ratio)
+            # the test data goes through both branches of the cap
+            self.assertTrue(np.any(ratio < 100.0) and np.any(ratio == 100.0))
+
+        epsilon = 1.0e-6
+        for i, resource in enumerate(self.resource_list):
+            d_ratio_d_stock, d_ratio_d_demand, d_ratio_d_recycling = model.get_derivative_ratio(
+                resource)
+            np.testing.assert_array_equal(d_ratio_d_stock, d_ratio_d_recycling)
+
+            # the stock enters the available resource through the stock conversion factor
+            for variable, d_ratio, conversion in [('resource_stock', d_ratio_d_stock,
+                                                   self.conversion_dict[resource]['stock']),
+                                                  ('recycled_production', d_ratio_d_recycling,
+                                                   self.conversion_dict[resource]['stock'])]:
+                inputs_dict = dict(self.inputs_dict)
+                data_frame = inputs_dict[f'{resource}.{variable}'].copy()
+                data_frame[self.types[0]] = data_frame[self.types[0]] + epsilon
+                inputs_dict[f'{resource}.{variable}'] = data_frame
+                ratio_fd = (self.compute_model(inputs_dict).resource_ratio_usable_demand[:, i] -
+                            model.resource_ratio_usable_demand[:, i]) / epsilon
+                np.testing.assert_allclose(np.diag(d_ratio) * conversion, ratio_fd,
+                                           rtol=1.0e-4, atol=1.0e-6)
+
+            inputs_dict = dict(self.inputs_dict)
+            data_frame = inputs_dict['resources_demand_woratio'].copy()
+            data_frame[resource] = data_frame[resource] + epsilon
+            inputs_dict['resources_demand_woratio'] = data_frame
+            ratio_fd = (self.compute_model(inputs_dict).resource_ratio_usable_demand[:, i] -
+                        model.resource_ratio_usable_demand[:, i]) / epsilon
+            np.testing.assert_allclose(np.diag(d_ratio_d_demand), ratio_fd,
+                                       rtol=1.0e-4, atol=1.0e-6)
+
+
+if '__main__' == __name__:
+    unittest.main()
@@ -0,0 +1,98 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import unittest
+import numpy as np
+import pandas as pd
+
+from climateeconomics.core.tools.scenario_data_builder import ScenarioDataBuilder
+
+
+class ScenarioDataBuilderTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.name = 'Test'
+        tag = ScenarioDataBuilder.SCENARIO_TAG
+        years = np.arange(2020, 2101)
+        self.emissions_df = pd.DataFrame(
+            {'years': years, 'total_emissions': np.linspace(38.3, 0., len(years))})
+        self.base_data = [{f'{self.name}.{tag}.year_start': 2020,
+                           f'{self.name}.{tag}.CO2_emissions_df': self.emissions_df},
+                          {f'{self.name}.epsilon0': 1.0}]
+
+    def test_scenario_data(self):
+
+        tag = ScenarioDataBuilder.SCENARIO_TAG
+        scenario_builder = ScenarioDataBuilder(self.base_data)
+        for forcing_model in ['DICE', 'Myhre']:
+            scenario_builder.add_scenario(
+                f'scenario_{forcing_model}', {f'{self.name}.{tag}.Temperature.forcing_model': forcing_model})
+
+        self.assertListEqual(scenario_builder.scenario_list,
+                             ['scenario_DICE', 'scenario_Myhre'])
+
+        values_dict = scenario_builder.get_values_dict()
+        self.assertEqual(len(values_dict), 7)
+        self.assertEqual(values_dict[f'{self.name}.epsilon0'], 1.0)
+        self.assertEqual(
+            values_dict[f'{self.name}.scenario_Myhre.Temperature.forcing_model'], 'Myhre')
+        # base dataframes are shared between scenarios
+        self.assertIs(values_dict[f'{self.name}.scenario_DICE.CO2_emissions_df'],
+                      values_dict[f'{self.name}.scenario_Myhre.CO2_emissions_df'])
+
+        scenario_data = scenario_builder.get_scenario_data('scenario_DICE')
+        self.assertEqual(len(scenario_data), 3)
+        self.assertNotIn(f'{self.name}.epsilon0', scenario_data)
+
+    def test_override_base_value(self):
+
+        tag = ScenarioDataBuilder.SCENARIO_TAG
+        scenario_builder = ScenarioDataBuilder(self.base_data)
+        scenario_builder.add_scenario('scenario_1')
+        scenario_builder.add_scenario(
+            'scenario_2', {f'{self.name}.{tag}.year_start': 2030})
+
+        values_dict = scenario_builder.get_values_dict()
+        self.assertEqual(values_dict[f'{self.name}.scenario_1.year_start'], 2020)
+        self.assertEqual(values_dict[f'{self.name}.scenario_2.year_start'], 2030)
+
+        with self.assertRaises(ValueError):
+            scenario_builder.add_scenario(f'scenario_{tag}')
+
+    def test_copy_values(self):
+
+        scenario_builder = ScenarioDataBuilder(self.base_data)
+        scenario_builder.add_scenario('scenario_1')
+        scenario_builder.add_scenario('scenario_2')
+
+        # shared values are read-only, an in-place edit is seen by every scenario
+        values_dict = scenario_builder.get_values_dict()
+        values_dict[f'{self.name}.scenario_1.CO2_emissions_df'].loc[0,
+                                                                   'total_emissions'] = 0.
+        self.assertEqual(
+            values_dict[f'{self.name}.scenario_2.CO2_emissions_df'].loc[0, 'total_emissions'], 0.)
+
+        self.emissions_df.loc[0, 'total_emissions'] = 38.3
+        values_dict = scenario_builder.get_values_dict(copy_values=True)
+        values_dict[f'{self.name}.scenario_1.CO2_emissions_df'].loc[0,
+                                                                   'total_emissions'] = 0.
+        self.assertEqual(
+            values_dict[f'{self.name}.scenario_2.CO2_emissions_df'].loc[0, 'total_emissions'], 38.3)
+        self.assertEqual(self.emissions_df.loc[0, 'total_emissions'], 38.3)
+
+
+if '__main__' == __name__:
+    unittest.main()
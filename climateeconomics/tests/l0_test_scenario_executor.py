@@ -0,0 +1,157 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import unittest
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+
+from climateeconomics.core.tools.scenario_executor import ScenarioExecutor
+from climateeconomics.sos_processes.iam.witness.witness_coarse_ms_optim_process.process import SCENARIO_MAP
+from climateeconomics.sos_processes.iam.witness.witness_optim_sub_process.usecase_witness_optim_sub import OPTIM_NAME
+
+
+class DataManagerRecorder():
+
+    def __init__(self):
+        self.values = {}
+
+    def set_values_from_dict(self, values_dict):
+        self.values.update(values_dict)
+
+
+class ExecutionEngineRecorder():
+
+    def __init__(self):
+        self.dm = DataManagerRecorder()
+
+
+class ScenarioExecutorTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.scenario_list = ['scenario_1', 'scenario_2']
+        self.base_df = pd.DataFrame({'years': np.arange(2020, 2101)})
+        self.values_dict = {'Study.epsilon0': 1.0,
+                            'Study.n_subcouplings_parallel': 2,
+                            'Study.optimization scenarios.scenario_list': self.scenario_list,
+                            'Study.optimization scenarios.NormalizationReferences.ref': 2.0,
+                            'Study.optimization scenarios.scenario_2.Optim.WITNESS.gamma': 0.5,
+                            'Study.optimization scenarios.scenario_1.Optim.alpha': 0.0,
+                            'Study.optimization scenarios.scenario_1.Optim.base_df': self.base_df,
+                            'Study.optimization scenarios.scenario_2.Optim.alpha': 1.0,
+                            'Study.optimization scenarios.scenario_2.Optim.base_df': self.base_df}
+
+    def get_executor(self, **kwargs):
+        executor = ScenarioExecutor('repo', 'process', 'Study', 'optimization scenarios', self.scenario_list,
+                                    self.values_dict, ['Optim.utility_df'], ns_to_update=['ns_witness'], **kwargs)
+        # the multi-scenario process shifts the namespaces of the scenario process below the
+        # scatter node and defines ns_ref at the scatter node
+        executor.ms_namespaces = {'ns_witness': 'Study.optimization scenarios.Optim.WITNESS',
+                                  'ns_ref': 'Study.optimization scenarios.NormalizationReferences'}
+        executor.scenario_namespaces = {'ns_witness': 'Study.Optim.WITNESS',
+                                        'ns_ref': 'Study.Optim.NormalizationReferences'}
+        return executor
+
+    def test_scenario_values(self):
+        executor = self.get_executor()
+        scenario_values = executor.get_scenario_values('scenario_2')
+        self.assertDictEqual(scenario_values, {'Study.epsilon0': 1.0,
+                                               'Study.Optim.NormalizationReferences.ref': 2.0,
+                                               'Study.Optim.WITNESS.gamma': 0.5,
+                                               'Study.Optim.alpha': 1.0,
+                                               'Study.Optim.base_df': self.base_df})
+        # values are not copied for the scenarios
+        self.assertIs(scenario_values['Study.Optim.base_df'], self.base_df)
+
+    def test_name_mapping(self):
+        executor = self.get_executor()
+        name_mapping = executor.get_name_mapping('scenario_1')
+        self.assertListEqual(name_mapping['Study.optimization scenarios.scenario_1.Optim.WITNESS'],
+                             ['Study.Optim.WITNESS'])
+        self.assertListEqual(name_mapping['Study.optimization scenarios.NormalizationReferences'],
+                             ['Study.Optim.NormalizationReferences'])
+        self.assertListEqual(name_mapping['Study.optimization scenarios.scenario_1'], [
+                             'Study'])
+
+    def test_process_namespaces(self):
+        '''
+        Names of usecase_witness_ms_optim mapped with the namespaces of the processes
+        '''
+        executor = ScenarioExecutor('climateeconomics.sos_processes.iam.witness', 'witness_coarse_optim_process',
+                                    'Study', 'optimization scenarios', self.scenario_list, self.values_dict,
+                                    ['Optim.utility_df'], ms_process='witness_coarse_ms_optim_process',
+                                    ns_to_update=SCENARIO_MAP['ns_to_update'])
+        name_mapping = executor.get_name_mapping('scenario_1')
+        self.assertListEqual(name_mapping['Study.optimization scenarios.NormalizationReferences'],
+                             [f'Study.{OPTIM_NAME}.NormalizationReferences'])
+
+    def test_failed_futures(self):
+        executor = self.get_executor()
+        done_future, broken_future = Future(), Future()
+        done_future.set_result(
+            ('scenario_1', {'Optim.utility_df': self.base_df}, None))
+        broken_future.set_exception(
+            BrokenProcessPool('A process in the process pool was terminated abruptly'))
+        pending = {done_future: 'scenario_1', broken_future: 'scenario_2'}
+        executor.wait_results(pending)
+
+        self.assertDictEqual(pending, {})
+        self.assertListEqual(list(executor.results), ['scenario_1'])
+        self.assertListEqual(list(executor.errors), ['scenario_2'])
+        self.assertIn('BrokenProcessPool', executor.errors['scenario_2'])
+
+    def test_results_streaming(self):
+        finished = []
+        ee = ExecutionEngineRecorder()
+        executor = self.get_executor(execution_engine=ee,
+                                     on_result=lambda scenario, outputs: finished.append(scenario))
+        utility_df = pd.DataFrame({'years': [2020], 'welfare': [1.]})
+        executor.add_result('scenario_2', {'Optim.utility_df': utility_df}, None)
+        executor.add_result('scenario_1', None, 'ValueError()')
+
+        self.assertListEqual(finished, ['scenario_2'])
+        self.assertDictEqual(executor.errors, {'scenario_1': 'ValueError()'})
+        self.assertIs(
+            ee.dm.values['Study.optimization scenarios.scenario_2.Optim.utility_df'], utility_df)
+
+    def test_gather_study(self):
+        executor = self.get_executor()
+        ee = executor.build_gather_study()
+        self.assertIs(executor.execution_engine, ee)
+        self.assertListEqual(ee.dm.get_value('Study.optimization scenarios.scenario_list'),
+                             self.scenario_list)
+
+        utility_df = pd.DataFrame({'years': [2020], 'welfare': [1.]})
+        executor.add_result(
+            'scenario_1', {'Optim.utility_df': utility_df}, None)
+        pd.testing.assert_frame_equal(ee.dm.get_value('Study.optimization scenarios.scenario_1.Optim.utility_df'),
+                                      utility_df)
+        # the scenarios not run yet have no value
+        self.assertIsNone(ee.dm.get_value(
+            'Study.optimization scenarios.scenario_2.Optim.utility_df'))
+
+    def test_dataframe_outputs(self):
+        executor = self.get_executor(execution_engine=ExecutionEngineRecorder())
+        executor.dataframe_outputs = True
+        with self.assertRaises(TypeError):
+            executor.add_result(
+                'scenario_1', {'Optim.utility_df': np.array([1.])}, None)
+        self.assertDictEqual(executor.results, {})
+
+
+if '__main__' == __name__:
+    unittest.main()
@@ -0,0 +1,140 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import unittest
+import numpy as np
+import pandas as pd
+
+from climateeconomics.core.tools.scenario_results_cube import ScenarioResultsCube, get_pareto_front, \
+    get_scenario_results_cube
+
+
+class DataManager():
+    '''
+    Values of the study by full name, counts the reads
+    '''
+
+    def __init__(self, values):
+        self.values = values
+        self.n_reads = 0
+
+    def get_value(self, full_name):
+        self.n_reads += 1
+        return self.values.get(full_name)
+
+    def set_values_from_dict(self, values_dict):
+        self.values.update(values_dict)
+
+
+class ExecutionEngine():
+
+    def __init__(self, values):
+        self.dm = DataManager(values)
+
+
+class ScenarioResultsCubeTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.years = np.arange(2020, 2101)
+        self.scenario_list = ['scenario_1', 'scenario_2', 'scenario_3']
+        self.df_per_scenario = {'utility_df': {}, 'temperature_detail_df': {}}
+        for i, scenario in enumerate(self.scenario_list):
+            self.df_per_scenario['utility_df'][scenario] = pd.DataFrame(
+                {'years': self.years, 'welfare': np.linspace(1., 2., len(self.years)) * (i + 1)})
+            # temperature is only available from 2030 in the last scenario
+            temp_years = self.years if i < 2 else self.years[10:]
+            self.df_per_scenario['temperature_detail_df'][scenario] = pd.DataFrame(
+                {'years': temp_years, 'temp_atmo': np.ones(len(temp_years)) * (3 - i)})
+
+    def test_cube(self):
+
+        cube = ScenarioResultsCube(self.scenario_list, self.years)
+        variables = {'welfare': ('utility_df', 'welfare'),
+                     'temp_atmo': ('temperature_detail_df', 'temp_atmo')}
+        cube.add_variables(self.df_per_scenario, variables)
+
+        self.assertEqual(cube.values.shape, (3, len(self.years), 2))
+        np.testing.assert_almost_equal(
+            cube.get_at_year('welfare', 2100), [2., 4., 6.])
+        np.testing.assert_almost_equal(
+            cube.get('welfare', ['scenario_2'])[0], self.df_per_scenario['utility_df']['scenario_2']['welfare'].values)
+        self.assertTrue(np.all(np.isnan(cube.get('temp_atmo')[2, :10])))
+        np.testing.assert_almost_equal(
+            cube.get('temp_atmo')[2, 10:], 1.)
+        self.assertListEqual(
+            cube.get_dict('temp_atmo')['scenario_1'], [3.] * len(self.years))
+
+        with self.assertRaises(KeyError):
+            cube.get_at_year('welfare', 2101)
+        with self.assertRaises(KeyError):
+            cube.get_at_year('welfare', 2050.5)
+
+    def test_get_scenario_results_cube(self):
+
+        execution_engine = ExecutionEngine({f'ms.{scenario}.{df_path}': df_dict[scenario]
+                                            for df_path, df_dict in self.df_per_scenario.items()
+                                            for scenario in self.scenario_list})
+        dm = execution_engine.dm
+        variables = {'welfare': ('utility_df', 'welfare')}
+        cube = get_scenario_results_cube(
+            execution_engine, 'ms', self.scenario_list, self.years, variables)
+        self.assertEqual(dm.n_reads, len(self.scenario_list))
+
+        # the cube is reused without reading the data manager
+        self.assertIs(get_scenario_results_cube(
+            execution_engine, 'ms', self.scenario_list, self.years, variables), cube)
+        self.assertEqual(dm.n_reads, len(self.scenario_list))
+        # only the dataframes of a new variable are read
+        variables['temp_atmo'] = ('temperature_detail_df', 'temp_atmo')
+        self.assertIs(get_scenario_results_cube(
+            execution_engine, 'ms', self.scenario_list, self.years, variables), cube)
+        self.assertEqual(dm.n_reads, 2 * len(self.scenario_list))
+
+        # new values in the data manager, e.g. a new run or a reloaded study
+        utility_df = self.df_per_scenario['utility_df']['scenario_1'].copy()
+        utility_df['welfare'] = 10.
+        dm.set_values_from_dict({'ms.scenario_1.utility_df': utility_df})
+        new_cube = get_scenario_results_cube(
+            execution_engine, 'ms', self.scenario_list, self.years, variables)
+        self.assertIsNot(new_cube, cube)
+        np.testing.assert_almost_equal(
+            new_cube.get_at_year('welfare', 2100), [10., 4., 6.])
+
+    def test_scenario_not_run(self):
+
+        self.df_per_scenario['utility_df']['scenario_2'] = None
+        cube = ScenarioResultsCube(self.scenario_list, self.years)
+        cube.add_variables(self.df_per_scenario, {
+                           'welfare': ('utility_df', 'welfare')})
+        self.assertTrue(np.all(np.isnan(cube.get('welfare')[1])))
+        np.testing.assert_almost_equal(
+            cube.get_at_year('welfare', 2100)[[0, 2]], [2., 6.])
+
+    def test_pareto_front(self):
+
+        pareto_x, pareto_y = get_pareto_front(
+            [3., 1., 2., 4.], [2., 1., 3., 4.])
+        self.assertListEqual(pareto_x, [1., 2., 4.])
+        self.assertListEqual(pareto_y, [1., 3., 4.])
+
+        pareto_x, pareto_y = get_pareto_front(
+            [3., 1., np.nan, 4.], [2., 1., 3., np.nan])
+        self.assertListEqual(pareto_x, [1., 3.])
+        self.assertListEqual(pareto_y, [1., 2.])
+
+
+if '__main__' == __name__:
+    unittest.main()
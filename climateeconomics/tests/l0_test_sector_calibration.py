@@ -0,0 +1,90 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import unittest
+import numpy as np
+import pandas as pd
+from os.path import join, dirname
+
+from climateeconomics.core.core_sectorization.sector_calibration import SectorCalibration, calibrate_sectors
+
+
+class SectorCalibrationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        data_dir = join(dirname(__file__), 'data', 'sectorization_fitting')
+        hist_invest = pd.read_csv(join(data_dir, 'hist_invest_sectors.csv'))
+        self.hist_energy = pd.read_csv(join(data_dir, 'hist_energy_sect.csv'))
+        hist_workforce = pd.read_csv(
+            join(data_dir, 'hist_workforce_sect.csv'))
+        self.hist_gdp = pd.read_csv(join(data_dir, 'hist_gdp_sect.csv'))
+        self.hist_capital = pd.read_csv(
+            join(data_dir, 'hist_capital_sect.csv'))
+        years = np.arange(2000, 2021)
+        self.inputs_dict = {'year_start': 2000, 'year_end': 2020, 'time_step': 1,
+                            'productivity_start': 0.27357, 'capital_start': 139.1369,
+                            'productivity_gr_start': 0.004781, 'decline_rate_tfp': 0.02387787,
+                            'depreciation_capital': 0.058, 'frac_damage_prod': 0.3,
+                            'damage_to_productivity': True, 'init_output_growth': 0,
+                            'output_alpha': 0.86537, 'output_gamma': 0.5,
+                            'energy_eff_k': 0.05085, 'energy_eff_cst': 0.9835,
+                            'energy_eff_xzero': 2012.8327, 'energy_eff_max': 3.5165,
+                            'capital_utilisation_ratio': 0.8, 'max_capital_utilisation_ratio': 0.95,
+                            'scaling_factor_energy_production': 1e3, 'ref_emax_enet_constraint': 60e3}
+        self.coupling_inputs = {'sector_investment': pd.DataFrame({'years': years, 'investment': hist_invest['Services']}),
+                                'energy_production': pd.DataFrame({'years': years, 'Total production': self.hist_energy['Services']}),
+                                'workforce_df': pd.DataFrame({'years': years, 'workforce': hist_workforce['Services']}),
+                                'damage_df': pd.DataFrame({'years': years, 'damage_frac_output': np.linspace(0., 0.05, len(years))})}
+
+    def get_calibration(self):
+        return SectorCalibration('Services', self.inputs_dict, self.coupling_inputs,
+                                 self.hist_gdp, self.hist_capital, self.hist_energy)
+
+    def test_01_analytic_jacobian(self):
+        calibration = self.get_calibration()
+        x0 = calibration.get_initial_values()
+        jacobian = calibration.compute_jacobian(x0)
+        jacobian_fd = np.zeros_like(jacobian)
+        for i_param in range(len(x0)):
+            step = 1e-6 * max(1., abs(x0[i_param]))
+            x_plus, x_minus = x0.copy(), x0.copy()
+            x_plus[i_param] += step
+            x_minus[i_param] -= step
+            jacobian_fd[:, i_param] = (calibration.compute_residuals(x_plus) -
+                                       calibration.compute_residuals(x_minus)) / (2 * step)
+
+        np.testing.assert_allclose(jacobian, jacobian_fd, atol=1e-8)
+
+    def test_02_calibration(self):
+        calibration = self.get_calibration()
+        initial_error = np.sum(calibration.compute_residuals(
+            calibration.get_initial_values())**2)
+        sector_calibrations = calibrate_sectors([calibration], least_squares_options={
+                                                'max_nfev': 10})
+        calibration = sector_calibrations['Services']
+        self.assertLess(calibration.get_error(), initial_error)
+
+        lower_bnd, upper_bnd = calibration.get_bounds()
+        fitted_values = np.array(
+            list(calibration.get_fitted_parameters().values()))
+        self.assertTrue(np.all(fitted_values >= lower_bnd))
+        self.assertTrue(np.all(fitted_values <= upper_bnd))
+        design_var_values = calibration.get_design_var_values('usecase.SectorsOpt')
+        self.assertListEqual(design_var_values['usecase.SectorsOpt.prod_start_services_in'],
+                             [calibration.get_fitted_parameters()['productivity_start']])
+
+
+if '__main__' == __name__:
+    unittest.main()
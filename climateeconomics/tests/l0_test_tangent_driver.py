@@ -0,0 +1,149 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import unittest
+import numpy as np
+import pandas as pd
+
+from climateeconomics.core.tools.tangent_driver import TangentDriver, PartialDerivativesRecorder
+
+
+def compute_stock(inputs):
+    '''
+    Stock with a constant decay rate fed by yearly emissions
+    '''
+    emissions = inputs['emissions_df']['emissions'].values
+    stock = np.zeros(len(emissions), dtype=emissions.dtype)
+    stock[0] = inputs['init_stock']
+    for i in range(1, len(emissions)):
+        stock[i] = stock[i - 1] * (1. - inputs['decay']) + emissions[i - 1]
+    return {'stock_df': pd.DataFrame({'years': inputs['emissions_df']['years'].values, 'stock': stock}),
+            'stock_objective': np.array([stock.sum() ** 2])}
+
+
+class StockJacobianSetter():
+    '''
+    Stands for the discipline base class, keeps the partial derivatives as given
+    '''
+
+    def __init__(self):
+        self.partial_derivatives_set = []
+
+    def set_partial_derivative_for_other_types(self, y_key_column, x_key_column, value):
+        self.partial_derivatives_set.append((y_key_column, x_key_column))
+
+
+class RecordedStockJacobianSetter(PartialDerivativesRecorder, StockJacobianSetter):
+    pass
+
+
+class TangentDriverTest(unittest.TestCase):
+
+    def setUp(self):
+
+        years = np.arange(2020, 2101)
+        self.emissions_df = pd.DataFrame(
+            {'years': years, 'emissions': np.linspace(40., 10., len(years))})
+        self.inputs_dict = {'emissions_df': self.emissions_df,
+                            'init_stock': 800., 'decay': 0.02}
+        nb_years = len(years)
+        # d_stock[i] / d_emissions[j] = (1 - decay) ** (i - 1 - j) for j < i
+        exponent = np.arange(nb_years)[:, None] - 1 - np.arange(nb_years)[None, :]
+        self.d_stock_d_emissions = np.where(
+            exponent >= 0, 0.98 ** np.maximum(exponent, 0), 0.)
+
+    def test_jacobian(self):
+
+        tangent_driver = TangentDriver(compute_stock, self.inputs_dict)
+        jacobian = tangent_driver.compute_jacobian(
+            [('emissions_df', 'emissions'), 'init_stock'], [('stock_df', 'stock')])
+
+        np.testing.assert_allclose(
+            jacobian[:, :-1], self.d_stock_d_emissions, atol=1e-12)
+        np.testing.assert_allclose(
+            jacobian[:, -1], 0.98 ** np.arange(len(self.emissions_df)))
+        # inputs are not modified by the perturbed runs
+        self.assertFalse(np.iscomplexobj(self.emissions_df['emissions']))
+
+    def test_check_jacobian(self):
+
+        tangent_driver = TangentDriver(compute_stock, self.inputs_dict)
+        stock = compute_stock(self.inputs_dict)['stock_df']['stock'].values
+        d_objective = 2. * stock.sum() * self.d_stock_d_emissions.sum(axis=0)
+        jacobian = np.vstack((self.d_stock_d_emissions, d_objective))
+        input_variables = [('emissions_df', 'emissions')]
+        output_variables = [('stock_df', 'stock'), 'stock_objective']
+
+        self.assertTrue(tangent_driver.check_jacobian(
+            jacobian, input_variables, output_variables))
+        jacobian[10, 5] += 0.1
+        self.assertFalse(tangent_driver.check_jacobian(
+            jacobian, input_variables, output_variables))
+
+    def test_directional_derivatives(self):
+
+        n_runs = []
+
+        def compute_stock_counted(inputs):
+            n_runs.append(1)
+            return compute_stock(inputs)
+
+        tangent_driver = TangentDriver(compute_stock_counted, self.inputs_dict)
+        directions = np.random.default_rng(0).standard_normal(
+            (2, len(self.emissions_df)))
+        derivatives = tangent_driver.compute_directional_derivatives(
+            [('emissions_df', 'emissions')], [('stock_df', 'stock')], directions)
+
+        np.testing.assert_allclose(
+            derivatives, directions @ self.d_stock_d_emissions.T, atol=1e-10)
+        # one model run per direction
+        self.assertEqual(len(n_runs), 2)
+
+    def test_recorded_partial_derivatives(self):
+
+        stock = compute_stock(self.inputs_dict)['stock_df']['stock'].values
+        d_objective = 2. * stock.sum() * self.d_stock_d_emissions.sum(axis=0)
+        recorder = RecordedStockJacobianSetter()
+        recorder.set_partial_derivative_for_other_types(
+            ('stock_df', 'stock'), ('emissions_df', 'emissions'), self.d_stock_d_emissions)
+        recorder.set_partial_derivative_for_other_types(
+            ('stock_objective',), ('emissions_df', 'emissions'), d_objective)
+
+        # the base class still gets the partial derivatives
+        self.assertEqual(recorder.partial_derivatives_set,
+                         [(('stock_df', 'stock'), ('emissions_df', 'emissions')),
+                          (('stock_objective',), ('emissions_df', 'emissions'))])
+        self.assertListEqual(list(recorder.partial_derivatives.keys()),
+                             [(('stock_df', 'stock'), ('emissions_df', 'emissions')),
+                              ('stock_objective', ('emissions_df', 'emissions'))])
+
+        tangent_driver = TangentDriver(compute_stock, self.inputs_dict)
+        input_variables = [('emissions_df', 'emissions'), 'init_stock']
+        output_variables = [('stock_df', 'stock'), 'stock_objective']
+        jacobian = tangent_driver.assemble_jacobian(
+            recorder.partial_derivatives, input_variables, output_variables)
+
+        nb_years = len(self.emissions_df)
+        self.assertEqual(jacobian.shape, (nb_years + 1, nb_years + 1))
+        # the block wrt init_stock is not set
+        np.testing.assert_array_equal(jacobian[:, -1], 0.)
+        self.assertTrue(tangent_driver.check_jacobian(
+            jacobian[:, :-1], input_variables[:1], output_variables))
+        self.assertFalse(tangent_driver.check_jacobian(
+            jacobian, input_variables, output_variables))
+
+
+if '__main__' == __name__:
+    unittest.main()
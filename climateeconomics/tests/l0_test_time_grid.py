@@ -0,0 +1,90 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import unittest
+import numpy as np
+import pandas as pd
+
+from climateeconomics.core.tools.time_grid import TimeGrid, interpolate_to_annual
+
+
+class TimeGridTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.time_grid = TimeGrid(2020, 2100, 5)
+        self.years = self.time_grid.years
+        self.df = pd.DataFrame({'years': self.years,
+                                'output': 100. + 2. * (self.years - 2020)})
+
+    def annual_model(self, values):
+        # annual stock with a yearly inflow
+        return np.cumsum(values) * 0.1 + values ** 2
+
+    def test_interpolation(self):
+
+        self.assertEqual(len(self.years), 17)
+        annual_df = self.time_grid.to_annual(self.df)
+        self.assertListEqual(list(annual_df['years']), list(range(2020, 2101)))
+        # a linear profile is exactly interpolated
+        np.testing.assert_almost_equal(
+            annual_df['output'].values, 100. + 2. * np.arange(81))
+        pd.testing.assert_frame_equal(
+            self.time_grid.to_grid(annual_df).reset_index(drop=True), self.df.astype({'output': float}))
+        pd.testing.assert_frame_equal(
+            interpolate_to_annual(self.df).reset_index(drop=True), annual_df.reset_index(drop=True))
+
+        # on an annual grid dataframes are not copied
+        annual_grid = TimeGrid(2020, 2100, 1)
+        self.assertIs(annual_grid.to_annual(self.df), self.df)
+
+    def test_complex_interpolation(self):
+
+        # complex step derivatives go through the interpolation
+        complex_df = self.df.astype({'output': complex})
+        complex_df['output'] += 1e-30j * (self.years - 2020)
+        annual_df = self.time_grid.to_annual(complex_df)
+        self.assertTrue(np.iscomplexobj(annual_df['output'].values))
+        np.testing.assert_almost_equal(
+            annual_df['output'].values.real, 100. + 2. * np.arange(81))
+        np.testing.assert_allclose(
+            annual_df['output'].values.imag, 1e-30 * np.arange(81))
+        np.testing.assert_allclose(
+            interpolate_to_annual(complex_df)['output'].values, annual_df['output'].values)
+
+    def test_project_jacobian(self):
+
+        values = self.df['output'].values
+        annual_values = self.time_grid.interpolation_matrix @ values
+        annual_jacobian = np.tril(np.ones((81, 81))) * 0.1 + \
+            np.diag(2. * annual_values)
+        jacobian = self.time_grid.project_jacobian(annual_jacobian)
+        self.assertEqual(jacobian.shape, (17, 17))
+
+        def grid_model(grid_values):
+            annual_output = self.annual_model(
+                self.time_grid.interpolation_matrix @ grid_values)
+            return annual_output[self.time_grid.grid_index]
+
+        eps = 1e-6
+        for i in [0, 8, 16]:
+            perturbed_values = values.astype(float)
+            perturbed_values[i] += eps
+            np.testing.assert_allclose((grid_model(perturbed_values) - grid_model(values)) / eps,
+                                       jacobian[:, i], rtol=1e-4, atol=1e-6)
+
+
+if '__main__' == __name__:
+    unittest.main()
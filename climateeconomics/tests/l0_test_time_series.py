@@ -0,0 +1,73 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from climateeconomics.core.tools.time_series import TimeSeries, as_time_series
+
+
+class TimeSeriesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.years = np.arange(2020, 2031)
+        self.df = pd.DataFrame({'years': self.years,
+                                'gross_output': np.linspace(130.0, 180.0, len(self.years)),
+                                'net_output': np.linspace(120.0, 170.0, len(self.years))})
+
+    def test_dataframe_conversion(self):
+        time_series = as_time_series(self.df)
+        self.assertIs(as_time_series(time_series), time_series)
+        self.assertListEqual(time_series.columns, ['gross_output', 'net_output'])
+        self.assertTrue(time_series.values.flags['C_CONTIGUOUS'])
+        self.assertEqual(time_series.dtype, np.float64)
+
+        # columns are views on the block
+        time_series['net_output'][0] = 0.0
+        self.assertEqual(time_series.values[0, 1], 0.0)
+        self.assertEqual(self.df['net_output'].values[0], 120.0)
+
+        df = as_time_series(self.df, ['gross_output']).to_dataframe()
+        self.assertListEqual(list(df.columns), ['years', 'gross_output'])
+        self.assertListEqual(list(df.index), list(self.years))
+        np.testing.assert_array_equal(df['gross_output'].values,
+                                      self.df['gross_output'].values)
+
+    def test_columns_and_years(self):
+        time_series = TimeSeries.from_dataframe(self.df)
+        time_series['damages'] = 1.0
+        self.assertIn('damages', time_series)
+        np.testing.assert_array_equal(time_series['damages'],
+                                      np.ones(len(self.years)))
+
+        # a complex column makes the block complex for complex step derivatives
+        time_series['gross_output'] = time_series['gross_output'] + 1e-30j
+        self.assertEqual(time_series.dtype, np.complex128)
+        self.assertEqual(time_series['net_output'].dtype, np.complex128)
+
+        np.testing.assert_array_equal(time_series.get('damages', [2022, 2025]),
+                                      [1.0, 1.0])
+        selection = time_series.select_years(self.years[2:5])
+        self.assertEqual(len(selection), 3)
+        self.assertEqual(selection['net_output'][0],
+                         time_series['net_output'][2])
+        with self.assertRaises(KeyError):
+            time_series.get('damages', [2019])
+
+
+if '__main__' == __name__:
+    unittest.main()
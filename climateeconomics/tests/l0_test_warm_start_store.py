@@ -0,0 +1,95 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import os
+import unittest
+import tempfile
+import shutil
+import numpy as np
+import pandas as pd
+
+from climateeconomics.core.tools.warm_start_store import WarmStartStore
+
+
+class WarmStartStoreTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.mkdtemp()
+        self.usecase_name = 'climateeconomics.sos_processes.iam.witness.witness_coarse.usecase_witness_coarse_new'
+        years = np.arange(2020, 2101)
+        self.values_dict = {'WITNESS.economics_df': pd.DataFrame({'years': years,
+                                                                  'gross_output': np.linspace(130., 400., len(years))}),
+                            'WITNESS.fossil_investment_array_mix': np.linspace(1., 2., 8),
+                            'WITNESS.alpha': 0.5,
+                            'WITNESS.energy_list': ['fossil', 'renewable']}
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_save_load(self):
+
+        store = WarmStartStore(self.directory)
+        key = store.save(self.usecase_name, {'year_end': 2100, 'time_step': 1}, self.values_dict)
+        self.assertEqual(key, WarmStartStore.get_snapshot_key(
+            self.usecase_name, {'time_step': 1, 'year_end': 2100}))
+
+        # the manifest is read back by a new store
+        values_dict = WarmStartStore(self.directory).load(key)
+        # non numerical values are not stored
+        self.assertNotIn('WITNESS.energy_list', values_dict)
+        pd.testing.assert_frame_equal(values_dict['WITNESS.economics_df'].reset_index(drop=True),
+                                      self.values_dict['WITNESS.economics_df'])
+        np.testing.assert_array_equal(values_dict['WITNESS.fossil_investment_array_mix'],
+                                      self.values_dict['WITNESS.fossil_investment_array_mix'])
+        self.assertEqual(values_dict['WITNESS.alpha'], 0.5)
+        self.assertIsInstance(values_dict['WITNESS.alpha'], float)
+
+    def test_shared_directory(self):
+
+        # two stores opened on the same directory keep the snapshots of each other
+        store = WarmStartStore(self.directory)
+        other_store = WarmStartStore(self.directory)
+        key = store.save(self.usecase_name, {'year_end': 2100}, self.values_dict)
+        other_key = other_store.save('other_usecase', {'year_end': 2100}, self.values_dict)
+
+        manifest = WarmStartStore(self.directory).manifest
+        self.assertSetEqual(set(manifest), {key, other_key})
+        # temporary files are renamed once written
+        self.assertSetEqual(set(os.listdir(self.directory)),
+                            {WarmStartStore.MANIFEST_NAME, f'{key}.npz', f'{other_key}.npz'})
+
+    def test_find_nearest(self):
+
+        store = WarmStartStore(self.directory)
+        self.assertIsNone(store.find_nearest(self.usecase_name, {'year_end': 2100}))
+
+        key_2100 = store.save(self.usecase_name, {'year_end': 2100, 'temperature_model': 'DICE'},
+                              self.values_dict)
+        key_2150 = store.save(self.usecase_name, {'year_end': 2150, 'temperature_model': 'FUND'},
+                              self.values_dict)
+        store.save('other_usecase', {'year_end': 2100, 'temperature_model': 'FUND'}, self.values_dict)
+
+        self.assertEqual(store.find_nearest(self.usecase_name, {'year_end': 2100, 'temperature_model': 'DICE'}),
+                         key_2100)
+        # the nearest snapshot has the fewest different structural parameters
+        self.assertEqual(store.find_nearest(self.usecase_name, {'year_end': 2200, 'temperature_model': 'DICE'}),
+                         key_2100)
+        self.assertEqual(store.find_nearest(self.usecase_name, {'year_end': 2200, 'temperature_model': 'FUND'}),
+                         key_2150)
+
+
+if '__main__' == __name__:
+    unittest.main()
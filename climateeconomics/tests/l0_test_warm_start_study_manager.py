@@ -0,0 +1,72 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import unittest
+import tempfile
+import shutil
+import numpy as np
+
+from climateeconomics.core.tools.warm_start_store import WarmStartStore
+from climateeconomics.sos_processes.iam.witness.witness_coarse.usecase_witness_coarse_new import Study
+
+
+class WarmStartStudyManagerTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_save_load_warm_start(self):
+
+        study = Study()
+        study.warm_start_directory = self.directory
+        # the store is empty, the study keeps its own values
+        study.load_data()
+        self.assertListEqual(study.load_warm_start(), [])
+
+        dm = study.execution_engine.dm
+        full_name = dm.get_all_namespaces_from_var_name('energy_investment')[0]
+        energy_investment = dm.get_value(full_name).copy()
+        energy_investment['energy_investment'] = energy_investment['energy_investment'] * 1.5
+        study.execution_engine.load_study_from_input_dict(
+            {full_name: energy_investment})
+
+        key = study.save_warm_start()
+        store = WarmStartStore(self.directory)
+        self.assertEqual(store.find_nearest(study.get_usecase_name(), study.get_structural_parameters()),
+                         key)
+        self.assertIn(study.get_relative_name(full_name),
+                      store.manifest[key]['variables'])
+
+        # a new study of the usecase starts from the snapshot
+        new_study = Study()
+        new_study.warm_start_directory = self.directory
+        new_study.load_data()
+        new_energy_investment = new_study.execution_engine.dm.get_value(full_name)
+        np.testing.assert_allclose(new_energy_investment['energy_investment'].values,
+                                   energy_investment['energy_investment'].values)
+
+        # values with other years are not set
+        warm_start_values = store.load(key)
+        relative_name = study.get_relative_name(full_name)
+        warm_start_values[relative_name] = warm_start_values[relative_name].iloc[:10]
+        self.assertNotIn(full_name, new_study.set_warm_start_values(warm_start_values))
+
+
+if '__main__' == __name__:
+    unittest.main()
@@ -0,0 +1,136 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import unittest
+import numpy as np
+import pandas as pd
+
+from climateeconomics.sos_wrapping.sos_wrapping_witness.post_proc_witness_optim.post_processing_witness_full import \
+    get_multilevel_df, get_CO2_breakdown_multilevel_df, get_CO2_per_use
+
+
+class FakeDiscipline():
+
+    def __init__(self, inputs, outputs=None):
+        self.inputs = inputs
+        self.outputs = {} if outputs is None else outputs
+
+    def get_sosdisc_inputs(self, name):
+        return self.inputs[name]
+
+    def get_sosdisc_outputs(self, name):
+        return self.outputs[name]
+
+
+class FakeDataManager():
+
+    def __init__(self, disciplines):
+        self.disciplines = disciplines
+
+    def get_disciplines_with_name(self, name):
+        return [self.disciplines[name]]
+
+
+class FakeExecutionEngine():
+
+    def __init__(self, disciplines):
+        self.dm = FakeDataManager(disciplines)
+
+
+class MultilevelDataframeTestCase(unittest.TestCase):
+    '''
+    Energy mix multilevel dataframes of the witness optim post-processing on a fake energy mix
+    '''
+
+    def setUp(self):
+        self.years = np.arange(2020, 2026)
+        nb_years = len(self.years)
+        self.technos = {'methane': ['FossilGas', 'Methanation'],
+                        'hydrogen.gaseous_hydrogen': ['WaterGasShift']}
+        disciplines = {'Test.EnergyMix': FakeDiscipline({'energy_list': list(self.technos),
+                                                         'year_start': 2020, 'year_end': 2025})}
+        for i_energy, (energy, techno_list) in enumerate(self.technos.items()):
+            disciplines[f'Test.EnergyMix.{energy}'] = FakeDiscipline(
+                {'technologies_list': techno_list})
+            for i_techno, techno in enumerate(techno_list):
+                factor = 10. * i_energy + i_techno + 1.
+                carbon_emissions = pd.DataFrame({'years': self.years,
+                                                 techno: np.ones(nb_years) * factor,
+                                                 'electricity': np.ones(nb_years)})
+                # only the first techno of each energy has production
+                # emissions
+                if i_techno == 0:
+                    carbon_emissions['production'] = np.ones(nb_years) * 0.5
+                disciplines[f'Test.EnergyMix.{energy}.{techno}'] = FakeDiscipline(
+                    {'scaling_factor_techno_production': 1e3,
+                     'scaling_factor_invest_level': 1e3,
+                     'invest_level': pd.DataFrame({'years': self.years, 'invest': np.ones(nb_years) * factor}),
+                     'data_fuel_dict': {'CO2_per_use': 2., 'CO2_per_use_unit': 'kg/kWh',
+                                        'high_calorific_value': 13.9}},
+                    {'techno_production': pd.DataFrame({'years': self.years,
+                                                        f'{energy} (TWh)': np.arange(nb_years) * factor}),
+                     'CO2_emissions_detailed': carbon_emissions,
+                     'techno_prices': pd.DataFrame({'years': self.years, techno: np.ones(nb_years) * factor,
+                                                    f'{techno}_wotaxes': np.ones(nb_years) * factor / 2.})})
+        self.ee = FakeExecutionEngine(disciplines)
+
+    def test_multilevel_df(self):
+        multilevel_df, years = get_multilevel_df(self.ee, 'Test')
+
+        np.testing.assert_array_equal(years, self.years)
+        self.assertListEqual(multilevel_df.index.tolist(), [('methane', 'FossilGas'), ('methane', 'Methanation'),
+                                                            ('hydrogen.gaseous_hydrogen', 'WaterGasShift')])
+        self.assertEqual(multilevel_df.shape, (3, 5 * len(self.years)))
+        np.testing.assert_almost_equal(multilevel_df.loc[('methane', 'Methanation'), 'production'].values,
+                                       np.arange(len(self.years)) * 2. * 1e3)
+        np.testing.assert_almost_equal(multilevel_df.loc[('methane', 'Methanation'), 'CO2_per_kWh'].values,
+                                       2. + 2.)
+        np.testing.assert_almost_equal(multilevel_df.loc[('hydrogen.gaseous_hydrogen', 'WaterGasShift'),
+                                                         'price_per_kWh_wotaxes'].values, 5.5)
+        # aggregation per energy
+        invest_df = multilevel_df['invest'].groupby(level=0).sum()
+        np.testing.assert_almost_equal(
+            invest_df.loc['methane'].values, 3. * 1e3)
+
+        multilevel_df, years = get_multilevel_df(
+            self.ee, 'Test', columns=['production'])
+        self.assertEqual(multilevel_df.shape, (3, len(self.years)))
+
+    def test_CO2_breakdown_multilevel_df(self):
+        multilevel_df, years = get_CO2_breakdown_multilevel_df(
+            self.ee, 'Test')
+
+        np.testing.assert_almost_equal(multilevel_df.loc[('methane', 'FossilGas'), 'CO2_from_production'].values,
+                                       0.5)
+        # no production emissions for this techno, the values of the
+        # previous techno are not reused
+        np.testing.assert_almost_equal(multilevel_df.loc[('methane', 'Methanation'), 'CO2_from_production'].values,
+                                       0.)
+        np.testing.assert_almost_equal(multilevel_df.loc[('methane', 'Methanation'), 'CO2_after_use'].values,
+                                       2. + 2.)
+        np.testing.assert_almost_equal(multilevel_df.loc[('methane', 'Methanation'),
+                                                         'CO2_from_other_consumption'].values, 1.)
+
+    def test_CO2_per_use(self):
+        techno_disc = FakeDiscipline({'data_fuel_dict': {'CO2_per_use': 2.75, 'CO2_per_use_unit': 'kg/kg',
+                                                         'high_calorific_value': 13.9}})
+        np.testing.assert_almost_equal(
+            get_CO2_per_use(techno_disc, 3), 2.75 / 13.9)
+        np.testing.assert_almost_equal(get_CO2_per_use(
+            FakeDiscipline({'data_fuel_dict': {}}), 3), 0.)
+
+
+if '__main__' == __name__:
+    unittest.main()
@@ -22,6 +22,9 @@ from pandas import DataFrame, read_csv
 
 from sos_trades_core.execution_engine.execution_engine import ExecutionEngine
 from sos_trades_core.tests.core.abstract_jacobian_unit_test import AbstractJacobianUnittest
+from climateeconomics.core.core_witness.carbon_cycle_model import CarbonCycle
+from climateeconomics.core.tools.tangent_driver import TangentDriver, PartialDerivativesRecorder
+from climateeconomics.sos_wrapping.sos_wrapping_witness.carboncycle.carboncycle_discipline import CarbonCycleDiscipline
 
 
 class CarboncycleJacobianDiscTest(AbstractJacobianUnittest):
@@ -126,3 +129,66 @@ class CarboncycleJacobianDiscTest(AbstractJacobianUnittest):
                                      f'{self.name}.ppm_objective',
                                      f'{self.name}.rockstrom_limit_constraint',
                                      f'{self.name}.minimum_ppm_constraint'])
+
+    def test_execute_tangent_check(self):
+        '''
+        Check the jacobian set by the carbon cycle discipline against the core model
+        with a few complex step directions
+        '''
+        self.model_name = 'carboncycle'
+        ns_dict = {'ns_witness': f'{self.name}',
+                   'ns_ref': f'{self.name}',
+                   'ns_public': f'{self.name}'}
+
+        self.ee.ns_manager.add_ns_def(ns_dict)
+
+        mod_path = f'{__name__}.RecordedCarbonCycleDiscipline'
+        builder = self.ee.factory.get_builder_from_module(
+            self.model_name, mod_path)
+
+        self.ee.factory.set_builders_to_coupling_builder(builder)
+
+        self.ee.configure()
+
+        data_dir = join(dirname(__file__), 'data')
+
+        emission_df_all = read_csv(
+            join(data_dir, 'co2_emissions_onestep.csv'))
+
+        emission_df_y = emission_df_all[emission_df_all['years'] >= 2020][['years',
+                                                                           'total_emissions', 'cum_total_emissions']]
+        emission_df_y.index = np.arange(2020, 2101)
+
+        values_dict = {f'{self.name}.CO2_emissions_df': emission_df_y}
+
+        self.ee.dm.set_values_from_dict(values_dict)
+
+        disc = self.ee.root_process.sos_disciplines[0]
+
+        # the reference check runs compute_sos_jacobian, the partial derivatives are recorded
+        self.check_jacobian(location=dirname(__file__), filename=f'jacobian_carbon_cycle_discipline1.pkl',
+                            discipline=disc, step=1e-15, derr_approx='complex_step',
+                            inputs=[f'{self.name}.CO2_emissions_df'],
+                            outputs=[f'{self.name}.carboncycle_df',
+                                     f'{self.name}.ppm_objective',
+                                     f'{self.name}.rockstrom_limit_constraint',
+                                     f'{self.name}.minimum_ppm_constraint'])
+
+        def compute_carbon_cycle(inputs):
+            carboncycle = CarbonCycle(inputs)
+            carboncycle_df, ppm_objective = carboncycle.compute(inputs)
+            return {'carboncycle_df': carboncycle_df, 'ppm_objective': ppm_objective,
+                    'rockstrom_limit_constraint': carboncycle.rockstrom_limit_constraint,
+                    'minimum_ppm_constraint': carboncycle.minimum_ppm_constraint}
+
+        input_variables = [('CO2_emissions_df', 'total_emissions')]
+        output_variables = [('carboncycle_df', 'atmo_conc'), 'ppm_objective',
+                            'rockstrom_limit_constraint', 'minimum_ppm_constraint']
+        tangent_driver = TangentDriver(compute_carbon_cycle, disc.get_sosdisc_inputs())
+        jacobian = tangent_driver.assemble_jacobian(disc.partial_derivatives,
+                                                    input_variables, output_variables)
+        self.assertTrue(tangent_driver.check_jacobian(jacobian, input_variables, output_variables))
+
+
+class RecordedCarbonCycleDiscipline(PartialDerivativesRecorder, CarbonCycleDiscipline):
+    pass
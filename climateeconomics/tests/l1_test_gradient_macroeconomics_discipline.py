@@ -22,6 +22,9 @@ from scipy.interpolate import interp1d
 
 from sos_trades_core.execution_engine.execution_engine import ExecutionEngine
 from sos_trades_core.tests.core.abstract_jacobian_unit_test import AbstractJacobianUnittest
+from climateeconomics.core.core_witness.macroeconomics_model_v1 import MacroEconomics
+from climateeconomics.core.tools.tangent_driver import TangentDriver, PartialDerivativesRecorder
+from climateeconomics.sos_wrapping.sos_wrapping_witness.macroeconomics.macroeconomics_discipline import MacroeconomicsDiscipline
 
 
 class MacroEconomicsJacobianDiscTest(AbstractJacobianUnittest):
@@ -619,6 +622,92 @@ class MacroEconomicsJacobianDiscTest(AbstractJacobianUnittest):
                                       f'{self.name}.delta_capital_constraint',
                                       f'{self.name}.delta_capital_constraint_dc'])
 
+    def test_macro_economics_tangent_check(self):
+        '''
+        Check the output gradients set by the macroeconomics discipline wrt energy production
+        against the core model with a few complex step directions
+        '''
+        self.model_name = 'Macroeconomics'
+        ns_dict = {'ns_witness': f'{self.name}',
+                   'ns_energy_mix': f'{self.name}',
+                   'ns_public': f'{self.name}',
+                   'ns_functions': f'{self.name}',
+                   'ns_ref': f'{self.name}'}
+
+        self.ee.ns_manager.add_ns_def(ns_dict)
+
+        mod_path = f'{__name__}.RecordedMacroeconomicsDiscipline'
+        builder = self.ee.factory.get_builder_from_module(
+            self.model_name, mod_path)
+
+        self.ee.factory.set_builders_to_coupling_builder(builder)
+
+        self.ee.configure()
+
+        inputs_dict = {f'{self.name}.year_start': self.year_start,
+                       f'{self.name}.year_end': self.year_end,
+                       f'{self.name}.time_step': self.time_step,
+                       f'{self.name}.init_rate_time_pref': 0.015,
+                       f'{self.name}.conso_elasticity': 1.45,
+                       f'{self.name}.{self.model_name}.damage_to_productivity': False,
+                       f'{self.name}.frac_damage_prod': 0.3,
+                       f'{self.name}.share_energy_investment': self.share_energy_investment,
+                       f'{self.name}.energy_production': self.energy_supply_df,
+                       f'{self.name}.damage_df': self.damage_df,
+                       f'{self.name}.population_df': self.population_df,
+                       f'{self.name}.total_investment_share_of_gdp': self.total_invest,
+                       f'{self.name}.CO2_taxes': self.default_CO2_tax,
+                       f'{self.name}.{self.model_name}.CO2_tax_efficiency': self.default_co2_efficiency,
+                       f'{self.name}.co2_emissions_Gt': self.co2_emissions_gt,
+                       f'{self.name}.working_age_population_df': self.working_age_population_df,
+                       f'{self.name}.energy_capital': self.energy_capital,
+                       f'{self.name}.alpha': 0.5
+                       }
+
+        self.ee.load_study_from_input_dict(inputs_dict)
+
+        disc = self.ee.root_process.sos_disciplines[0]
+
+        # the reference check runs compute_sos_jacobian, the partial derivatives are recorded
+        self.check_jacobian(location=dirname(__file__), filename=f'jacobian_macroeconomics_discipline.pkl',
+                            discipline=disc, step=1e-15, derr_approx='complex_step',
+                            inputs=[f'{self.name}.energy_production',
+                                    f'{self.name}.damage_df',
+                                    f'{self.name}.share_energy_investment',
+                                    f'{self.name}.total_investment_share_of_gdp',
+                                    f'{self.name}.co2_emissions_Gt',
+                                    f'{self.name}.CO2_taxes',
+                                    f'{self.name}.population_df',
+                                    f'{self.name}.working_age_population_df',
+                                    f'{self.name}.energy_capital'],
+                            outputs=[f'{self.name}.economics_df',
+                                     f'{self.name}.energy_investment',
+                                     f'{self.name}.pc_consumption_constraint',
+                                     f'{self.name}.global_investment_constraint',
+                                     f'{self.name}.emax_enet_constraint',
+                                     f'{self.name}.delta_capital_objective',
+                                     f'{self.name}.delta_capital_objective_weighted',
+                                     f'{self.name}.delta_capital_constraint',
+                                     f'{self.name}.delta_capital_constraint_dc',
+                                     f'{self.name}.delta_capital_lintoquad'])
+
+        macro_model = disc.macro_model
+
+        def compute_macroeconomics(inputs):
+            economics_df = MacroEconomics(macro_model.param).compute(inputs)[0]
+            return {'economics_df': economics_df}
+
+        input_variables = [('energy_production', 'Total production')]
+        output_variables = [('economics_df', 'gross_output'), ('economics_df', 'output_net_of_d')]
+        tangent_driver = TangentDriver(compute_macroeconomics, macro_model.inputs)
+        jacobian = tangent_driver.assemble_jacobian(disc.partial_derivatives,
+                                                    input_variables, output_variables)
+        self.assertTrue(tangent_driver.check_jacobian(jacobian, input_variables, output_variables))
+
+
+class RecordedMacroeconomicsDiscipline(PartialDerivativesRecorder, MacroeconomicsDiscipline):
+    pass
+
 
 if '__main__' == __name__:
     cls = MacroEconomicsJacobianDiscTest()
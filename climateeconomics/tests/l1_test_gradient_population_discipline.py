@@ -17,6 +17,9 @@ limitations under the License.
 from os.path import join, dirname
 from sos_trades_core.execution_engine.execution_engine import ExecutionEngine
 from sos_trades_core.tests.core.abstract_jacobian_unit_test import AbstractJacobianUnittest
+from climateeconomics.core.core_witness.population_model import Population
+from climateeconomics.core.tools.tangent_driver import TangentDriver, PartialDerivativesRecorder
+from climateeconomics.sos_wrapping.sos_wrapping_witness.population.population_discipline import PopulationDiscipline
 import pandas as pd
 import numpy as np
 
@@ -33,7 +36,8 @@ class PopulationJacobianDiscTest(AbstractJacobianUnittest):
 
         self.ee.ns_manager.add_ns_def(ns_dict)
 
-        mod_path = 'climateeconomics.sos_wrapping.sos_wrapping_witness.population.population_discipline.PopulationDiscipline'
+        # the recorded discipline only keeps a copy of the partial derivatives it sets
+        mod_path = f'{__name__}.RecordedPopulationDiscipline'
         builder = self.ee.factory.get_builder_from_module(
             self.model_name, mod_path)
 
@@ -355,3 +359,43 @@ class PopulationJacobianDiscTest(AbstractJacobianUnittest):
                             discipline=disc_techno, inputs=[f'{self.name}.economics_df', f'{self.name}.temperature_df'],
                             outputs=[
                                 f'{self.name}.population_df',f'{self.name}.working_age_population_df'], step=1e-15, derr_approx='complex_step')
+
+    def test_population_discipline_tangent_check(self):
+        '''
+        Check the jacobian set by the population discipline wrt economics_df and temperature_df
+        against the core model with a few complex step directions
+        '''
+        values_dict = {f'{self.name}.economics_df': self.economics_df_y,
+                       f'{self.name}.year_start': self.year_start,
+                       f'{self.name}.year_end': self.year_end,
+                       f'{self.name}.temperature_df': self.temperature_df
+                       }
+
+        self.ee.load_study_from_input_dict(values_dict)
+
+        disc = self.ee.root_process.sos_disciplines[0]
+
+        # the reference check runs compute_sos_jacobian, which sets and records the blocks of
+        # both inputs
+        self.check_jacobian(location=dirname(__file__), filename=f'jacobian_population_discipline_output.pkl',
+                            discipline=disc, inputs=[f'{self.name}.economics_df'], outputs=[
+                f'{self.name}.population_df'], step=1e-15, derr_approx='complex_step')
+
+        def compute_population(inputs):
+            model = Population(inputs)
+            population_detail_df, _, _, _, _, _, working_age_population_df = model.compute(inputs)
+            return {'population_df': pd.DataFrame({'population': population_detail_df['total'].values / model.million}),
+                    'working_age_population_df': pd.DataFrame(
+                        {'population_1570': working_age_population_df['population_1570'].values / model.million})}
+
+        input_variables = [('economics_df', 'output_net_of_d'), ('temperature_df', 'temp_atmo')]
+        output_variables = [('population_df', 'population'),
+                            ('working_age_population_df', 'population_1570')]
+        tangent_driver = TangentDriver(compute_population, disc.get_sosdisc_inputs())
+        jacobian = tangent_driver.assemble_jacobian(disc.partial_derivatives,
+                                                    input_variables, output_variables)
+        self.assertTrue(tangent_driver.check_jacobian(jacobian, input_variables, output_variables))
+
+
+class RecordedPopulationDiscipline(PartialDerivativesRecorder, PopulationDiscipline):
+    pass
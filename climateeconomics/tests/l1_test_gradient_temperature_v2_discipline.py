@@ -22,6 +22,9 @@ from pandas import DataFrame, read_csv
 
 from sos_trades_core.execution_engine.execution_engine import ExecutionEngine
 from sos_trades_core.tests.core.abstract_jacobian_unit_test import AbstractJacobianUnittest
+from climateeconomics.core.core_witness.tempchange_model_v2 import TempChange
+from climateeconomics.core.tools.tangent_driver import TangentDriver, PartialDerivativesRecorder
+from climateeconomics.sos_wrapping.sos_wrapping_witness.tempchange_v2.tempchange_discipline import TempChangeDiscipline
 
 
 class TemperatureJacobianDiscTest(AbstractJacobianUnittest):
@@ -375,6 +378,77 @@ class TemperatureJacobianDiscTest(AbstractJacobianUnittest):
         self.check_jacobian(location=dirname(__file__), filename=f'jacobian_temperature_discipline_etminan_lower.pkl', discipline=disc_techno, step=1e-10, inputs=[f'{self.name}.carboncycle_df'],
                             outputs=[f'{self.name}.{self.model_name}.forcing_detail_df', f'{self.name}.temperature_df', f'{self.name}.temperature_objective', f'{self.name}.temperature_constraint'], output_column='CO2 forcing', derr_approx='finite_differences')
 
+    def test_04_temperature_discipline_tangent_check_DICE(self):
+        '''
+        Check the DICE jacobian set by the temperature discipline against the core model
+        with a few complex step directions
+        '''
+        self.model_name = 'temperature'
+        ns_dict = {'ns_witness': f'{self.name}',
+                   'ns_public': f'{self.name}',
+                   'ns_ref': f'{self.name}'}
+
+        self.ee.ns_manager.add_ns_def(ns_dict)
+
+        mod_path = f'{__name__}.RecordedTempChangeDiscipline'
+        builder = self.ee.factory.get_builder_from_module(
+            self.model_name, mod_path)
+
+        self.ee.factory.set_builders_to_coupling_builder(builder)
+
+        self.ee.configure()
+
+        data_dir = join(dirname(__file__), 'data')
+        carboncycle_df_ally = read_csv(
+            join(data_dir, 'carbon_cycle_data_onestep.csv'))
+        ghg_cycle_df = carboncycle_df_ally[carboncycle_df_ally['years'] >= 2020]
+
+        ghg_cycle_df['co2_ppm'] = ghg_cycle_df['ppm']
+        ghg_cycle_df['ch4_ppm'] = ghg_cycle_df['ppm'] * 1222 / 296
+        ghg_cycle_df['n2o_ppm'] = ghg_cycle_df['ppm'] * 296 / 296
+        ghg_cycle_df = ghg_cycle_df[['years', 'co2_ppm', 'ch4_ppm', 'n2o_ppm']]
+        ghg_cycle_df.index = np.arange(2020, 2101, 1)
+
+        values_dict = {f'{self.name}.year_start': 2020,
+                       f'{self.name}.year_end': 2100,
+                       f'{self.name}.time_step': 1,
+                       f'{self.name}.ghg_cycle_df': ghg_cycle_df,
+                       f'{self.name}.alpha': 0.5,
+                       f'{self.name}.{self.model_name}.temperature_model': 'DICE',
+                       }
+
+        self.ee.load_study_from_input_dict(values_dict)
+
+        disc = self.ee.root_process.sos_disciplines[0]
+
+        # the reference check runs compute_sos_jacobian, the partial derivatives are recorded
+        self.check_jacobian(location=dirname(__file__),
+                            filename=f'jacobian_temperature_discipline_DICE.pkl',
+                            discipline=disc,
+                            step=1e-15,
+                            inputs=[f'{self.name}.ghg_cycle_df'],
+                            outputs=[f'{self.name}.temperature_df',
+                                     f'{self.name}.temperature_constraint',
+                                     f'{self.name}.{self.model_name}.forcing_detail_df',
+                                     ],
+                            derr_approx='complex_step')
+
+        def compute_temperature(inputs):
+            model = TempChange(inputs)
+            return {'temperature_df': model.compute(inputs),
+                    'temperature_constraint': model.temperature_end_constraint}
+
+        input_variables = [('ghg_cycle_df', 'co2_ppm')]
+        output_variables = [('temperature_df', 'temp_atmo'), 'temperature_constraint']
+        tangent_driver = TangentDriver(compute_temperature, disc.get_sosdisc_inputs())
+        jacobian = tangent_driver.assemble_jacobian(disc.partial_derivatives,
+                                                    input_variables, output_variables)
+        self.assertTrue(tangent_driver.check_jacobian(jacobian, input_variables, output_variables))
+
+
+class RecordedTempChangeDiscipline(PartialDerivativesRecorder, TempChangeDiscipline):
+    pass
+
 
 if '__main__' == __name__:
     cls = TemperatureJacobianDiscTest()
@@ -0,0 +1,111 @@
+'''
+Copyright 2022 Airbus SAS
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+import unittest
+
+import numpy as np
+import pandas as pd
+from sos_trades_core.execution_engine.execution_engine import ExecutionEngine
+
+from climateeconomics.sos_processes.iam.witness_wo_energy.datacase_witness_wo_energy import DataStudy as datacase_witness
+from climateeconomics.sos_processes.iam.witness_wo_energy.process import CLIMATE_ECONOMY_CORE_NAME
+from climateeconomics.sos_processes.iam.witness.witness.usecase_witness_fused_climate_economy import Study
+
+
+class WitnessFusedClimateEconomyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.name = 'Test'
+        self.year_start = 2020
+        self.year_end = 2100
+        self.years = np.arange(self.year_start, self.year_end + 1)
+
+    def build_witness_wo_energy(self, fused_climate_economy):
+        ee = ExecutionEngine(self.name)
+        builder = ee.factory.get_builder_from_process(
+            'climateeconomics.sos_processes.iam', 'witness_wo_energy',
+            fused_climate_economy=fused_climate_economy)
+        ee.ns_manager.add_ns_def({'ns_functions': self.name,
+                                  'ns_optim': self.name,
+                                  'ns_public': self.name})
+        ee.factory.set_builders_to_coupling_builder(builder)
+        ee.configure()
+
+        dc_witness = datacase_witness(
+            self.year_start, self.year_end, fused_climate_economy=fused_climate_economy)
+        dc_witness.study_name = self.name
+        values_dict = {}
+        for dict_item in dc_witness.setup_usecase():
+            values_dict.update(dict_item)
+        nb_years = len(self.years)
+        # energy outputs
+        values_dict[f'{self.name}.energy_production'] = pd.DataFrame(
+            {'years': self.years, 'Total production': np.linspace(173340.0, 44748.6, nb_years)})
+        values_dict[f'{self.name}.co2_emissions_Gt'] = pd.DataFrame(
+            {'years': self.years, 'Total CO2 emissions': np.linspace(38.1, 0.0, nb_years)})
+        values_dict[f'{self.name}.energy_mean_price'] = pd.DataFrame(
+            {'years': self.years, 'energy_price': np.linspace(110.0, 253.0, nb_years)})
+        values_dict[f'{self.name}.CO2_taxes'] = pd.DataFrame(
+            {'years': self.years, 'CO2_tax': 50.0})
+        values_dict[f'{self.name}.tolerance'] = 1.0e-12
+        values_dict[f'{self.name}.sub_mda_class'] = 'GSPureNewtonMDA'
+        ee.load_study_from_input_dict(values_dict)
+
+        return ee
+
+    def test_01_fused_process_configure(self):
+        ee = self.build_witness_wo_energy(True)
+
+        self.assertEqual(len(ee.dm.get_disciplines_with_name(
+            f'{self.name}.{CLIMATE_ECONOMY_CORE_NAME}')), 1)
+        for sos_name in ['Macroeconomics', 'Damage', 'Population', 'Temperature_change']:
+            self.assertListEqual(ee.dm.get_disciplines_with_name(
+                f'{self.name}.{sos_name}'), [])
+        # the local inputs of the datacase are set on the fused discipline
+        self.assertTrue(ee.dm.get_value(
+            f'{self.name}.{CLIMATE_ECONOMY_CORE_NAME}.tipping_point'))
+        self.assertTrue(ee.dm.get_value(
+            f'{self.name}.{CLIMATE_ECONOMY_CORE_NAME}.damage_to_productivity'))
+
+    def test_02_fused_process_results(self):
+        ee_coupled = self.build_witness_wo_energy(False)
+        ee_coupled.execute()
+        ee_fused = self.build_witness_wo_energy(True)
+        ee_fused.execute()
+
+        for var_name, column in [('economics_df', 'output_net_of_d'), ('temperature_df', 'temp_atmo'),
+                                 ('population_df', 'population'), ('CO2_taxes', 'CO2_tax')]:
+            np.testing.assert_allclose(ee_fused.dm.get_value(f'{self.name}.{var_name}')[column].values,
+                                       ee_coupled.dm.get_value(
+                                           f'{self.name}.{var_name}')[column].values,
+                                       rtol=1.0e-8)
+        np.testing.assert_allclose(ee_fused.dm.get_value(f'{self.name}.welfare_objective'),
+                                   ee_coupled.dm.get_value(
+                                       f'{self.name}.welfare_objective'),
+                                   rtol=1.0e-8)
+
+    def test_03_fused_usecase(self):
+        usecase = Study()
+        usecase.load_data()
+
+        ee = usecase.execution_engine
+        self.assertEqual(len(ee.dm.get_disciplines_with_name(
+            f'{usecase.study_name}.{CLIMATE_ECONOMY_CORE_NAME}')), 1)
+        self.assertTrue(ee.dm.get_value(
+            f'{usecase.study_name}.{CLIMATE_ECONOMY_CORE_NAME}.tipping_point'))
+
+
+if '__main__' == __name__:
+    unittest.main()